@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'écriture atomique en flux de `save_output_json`.
+
+Compare l'ancienne écriture (liste complète via `bulletins_to_json`, puis
+sérialisation entière directement sur le fichier cible) à l'écriture
+bulletin par bulletin dans un fichier temporaire renommé (fsync compris) :
+temps et pic de mémoire Python (tracemalloc), 1000 bulletins.
+
+Usage :
+    python benchmarks/bench_atomic_writer.py [--bulletins 1000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_bulk_parsers import synthetic_bulletins  # noqa: E402
+from src.models.bulletin import bulletins_from_dicts  # noqa: E402
+from src.services import json_backend  # noqa: E402
+from src.services.json_generator import bulletins_to_json, save_output_json  # noqa: E402
+
+
+def legacy_save(bulletins, path, metadata):
+    """Ancienne écriture : liste complète, écrite directement sur la cible."""
+    json_data = bulletins_to_json(bulletins, metadata=metadata)
+    with open(path, 'wb') as f:
+        f.write(json_backend.dumps(json_data))
+
+
+def timed(func, repeat=5):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func):
+    """Pic de mémoire allouée par Python pendant `func` (Mo)."""
+    tracemalloc.start()
+    func()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bulletins", type=int, default=1000)
+    args = parser.parse_args()
+
+    bulletins = bulletins_from_dicts(synthetic_bulletins(args.bulletins))
+    metadata = {"semester": "T3", "period_system": "trimestre"}
+    print(f"backend : {json_backend.backend_name()}")
+    print(f"{'écriture':>18} | {'temps':>8} | {'pic mémoire':>11}")
+    print("-" * 44)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "output_T3.json")
+        for label, save in (("ancienne (directe)", legacy_save),
+                            ("atomique en flux", save_output_json)):
+            duration = timed(lambda: save(bulletins, path, metadata))
+            peak = peak_memory(lambda: save(bulletins, path, metadata))
+            print(f"{label:>18} | {duration:>7.3f}s | {peak:>8.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
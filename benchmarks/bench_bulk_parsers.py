@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark des conversions en bloc (moyennes, absences, retards).
+
+Compare l'appel valeur par valeur de `parse_moyenne`, `normalize_absence`,
+`absence_to_hours` et `parse_retards` à leurs variantes `*_bulk`, puis le
+rechargement JSON `Bulletin.from_dict` élément par élément à
+`bulletins_from_dicts`.
+
+Usage :
+    python benchmarks/bench_bulk_parsers.py [--values 100000] [--bulletins 1000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models.bulletin import (  # noqa: E402
+    Bulletin, bulletins_from_dicts,
+    parse_moyenne, normalize_absence, absence_to_hours, parse_retards,
+    parse_moyenne_bulk, normalize_absence_bulk, absence_to_hours_bulk, parse_retards_bulk,
+)
+
+
+def synthetic_columns(count, seed=42):
+    """Colonnes brutes d'export : moyennes, absences, retards."""
+    rng = random.Random(seed)
+    moyennes = [
+        "N.Not" if rng.random() < 0.05 else f"{rng.randint(2, 19)},{rng.choice(['00', '25', '50', '75'])}"
+        for _ in range(count)
+    ]
+    absences = [
+        "" if rng.random() < 0.6 else f"{rng.randint(0, 12)}h{rng.choice(['00', '30'])}"
+        for _ in range(count)
+    ]
+    retards = [str(rng.randint(0, 5)) if rng.random() < 0.3 else "0" for _ in range(count)]
+    return moyennes, absences, retards
+
+
+def synthetic_bulletins(count, seed=42):
+    """Dictionnaires JSON de `count` bulletins (15 matières, 3 trimestres)."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        matieres = {}
+        for m in range(15):
+            entry = {}
+            for code in ("T1", "T2", "T3"):
+                entry[f"Moyenne{code}"] = round(rng.uniform(2, 20), 2)
+                entry[f"HeuresAbsence{code}"] = f"{rng.randint(0, 6)}h{rng.choice(['00', '30'])}"
+                entry[f"Retards{code}"] = rng.randint(0, 3)
+                entry[f"Appreciation{code}"] = "Travail régulier."
+            matieres[f"Matiere{m}"] = entry
+        items.append({"Nom": f"NOM{i}", "Prenom": f"Prenom{i}", "Matieres": matieres})
+    return items
+
+
+def timed(func, repeat=3):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--values", type=int, default=100000)
+    parser.add_argument("--bulletins", type=int, default=1000)
+    args = parser.parse_args()
+
+    moyennes, absences, retards = synthetic_columns(args.values)
+    cases = [
+        ("parse_moyenne", parse_moyenne, parse_moyenne_bulk, moyennes),
+        ("normalize_absence", normalize_absence, normalize_absence_bulk, absences),
+        ("absence_to_hours", absence_to_hours, absence_to_hours_bulk, absences),
+        ("parse_retards", parse_retards, parse_retards_bulk, retards),
+    ]
+    print(f"{'conversion':>20} | {'unitaire (s)':>12} | {'bloc (s)':>9} | {'gain':>6}")
+    print("-" * 57)
+    for label, scalar, bulk, values in cases:
+        assert bulk(values) == [scalar(v) for v in values]
+        scalar_time = timed(lambda: [scalar(v) for v in values])
+        bulk_time = timed(lambda: bulk(values))
+        print(f"{label:>20} | {scalar_time:>12.4f} | {bulk_time:>9.4f} | {scalar_time / bulk_time:>5.1f}x")
+
+    items = synthetic_bulletins(args.bulletins)
+    single_time = timed(lambda: [Bulletin.from_dict(item) for item in items])
+    bulk_time = timed(lambda: bulletins_from_dicts(items))
+    print(f"{'from_dict x' + str(args.bulletins):>20} | {single_time:>12.4f} | {bulk_time:>9.4f} | "
+          f"{single_time / bulk_time:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
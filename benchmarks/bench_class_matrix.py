@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark des calculs de classe sur `ClassMatrix`.
+
+Compare les anciennes boucles sur objets (min/max par matière et période,
+statistiques de résumé) aux versions appuyées sur la matrice NumPy, pour une
+classe de 35 élèves et une promotion de 1000 élèves (15 matières, 3 trimestres).
+L'essentiel du coût est la construction : le gain vient de la matrice partagée
+entre plusieurs calculs (ligne « min/max + stats »).
+
+Usage :
+    python benchmarks/bench_class_matrix.py [--students 35 1000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_bulk_parsers import synthetic_bulletins  # noqa: E402
+from src.models.bulletin import bulletins_from_dicts  # noqa: E402
+from src.models.class_matrix import ClassMatrix  # noqa: E402
+from src.services.bulletin_processor import calculate_min_max_moyennes  # noqa: E402
+from src.services.json_generator import generate_summary_stats  # noqa: E402
+
+
+def legacy_min_max(bulletins):
+    """Ancienne boucle : une passe par matière et par période."""
+    matieres = set()
+    for bulletin in bulletins:
+        matieres.update(bulletin.matieres.keys())
+    for matiere_name in matieres:
+        codes = set()
+        for bulletin in bulletins:
+            appreciation = bulletin.get_matiere(matiere_name)
+            if appreciation:
+                codes.update(appreciation.periodes.keys())
+        for code in codes:
+            moyennes = []
+            for bulletin in bulletins:
+                appreciation = bulletin.get_matiere(matiere_name)
+                if appreciation:
+                    periode = appreciation.get_periode(code)
+                    if periode and periode.moyenne is not None:
+                        moyennes.append(periode.moyenne)
+            min_val = min(moyennes) if moyennes else None
+            max_val = max(moyennes) if moyennes else None
+            for bulletin in bulletins:
+                appreciation = bulletin.get_matiere(matiere_name)
+                if appreciation:
+                    periode = appreciation.get_periode(code)
+                    if periode:
+                        periode.moyenne_min = min_val
+                        periode.moyenne_max = max_val
+
+
+def legacy_subject_stats(bulletins):
+    """Ancienne boucle des statistiques par matière de `generate_summary_stats`."""
+    matieres = sorted({nom for b in bulletins for nom in b.matieres})
+    stats = {}
+    for matiere in matieres:
+        count = 0
+        par_periode = {}
+        for bulletin in bulletins:
+            appreciation = bulletin.get_matiere(matiere)
+            if appreciation:
+                count += 1
+                for code, periode in appreciation.periodes.items():
+                    if periode.moyenne is not None:
+                        par_periode.setdefault(code, []).append(periode.moyenne)
+        stats[matiere] = {
+            'bulletins_count': count,
+            'periodes': {c: {'count': len(v), 'avg': sum(v) / len(v)} for c, v in par_periode.items()},
+        }
+    return stats
+
+
+def shared_matrix(bulletins):
+    """Matrice construite une fois, réutilisée par les deux calculs."""
+    matrix = ClassMatrix.from_bulletins(bulletins)
+    calculate_min_max_moyennes(bulletins, matrix=matrix)
+    generate_summary_stats(bulletins, matrix=matrix)
+
+
+def timed(func, repeat=5):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, nargs="+", default=[35, 1000])
+    args = parser.parse_args()
+
+    print(f"{'calcul':>22} | {'élèves':>6} | {'boucles (s)':>11} | {'matrice (s)':>11} | {'gain':>6}")
+    print("-" * 70)
+    for count in args.students:
+        bulletins = bulletins_from_dicts(synthetic_bulletins(count))
+        cases = [
+            ("min/max", lambda: legacy_min_max(bulletins),
+             lambda: calculate_min_max_moyennes(bulletins)),
+            ("stats par matière", lambda: legacy_subject_stats(bulletins),
+             lambda: generate_summary_stats(bulletins)),
+            ("min/max + stats", lambda: (legacy_min_max(bulletins), legacy_subject_stats(bulletins)),
+             lambda: shared_matrix(bulletins)),
+        ]
+        for label, legacy, matrix in cases:
+            legacy_time = timed(legacy)
+            matrix_time = timed(matrix)
+            print(f"{label:>22} | {count:>6} | {legacy_time:>11.4f} | {matrix_time:>11.4f} | "
+                  f"{legacy_time / matrix_time:>5.1f}x")
+        build_time = timed(lambda: ClassMatrix.from_bulletins(bulletins))
+        print(f"{'construction matrice':>22} | {count:>6} | {'':>11} | {build_time:>11.4f} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark des statistiques de classe (min, max, moyenne, médiane, écart-type,
+quartiles, effectif par matière et période, rang de chaque élève).
+
+Compare une implémentation par boucles sur objets (l'ancien
+`calculate_min_max_moyennes` suivi du module `statistics` pour chaque
+(matière, période)) à `compute_class_statistics`, qui dérive tout d'un seul
+tri de la `ClassMatrix`, sur des classes synthétiques de 35 et 1000 élèves
+(15 matières, 3 trimestres).
+
+Usage :
+    python benchmarks/bench_class_statistics.py [--students 35 1000]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_bulk_parsers import synthetic_bulletins  # noqa: E402
+from benchmarks.bench_class_matrix import legacy_min_max  # noqa: E402
+from src.models.bulletin import bulletins_from_dicts  # noqa: E402
+from src.models.class_matrix import ClassMatrix  # noqa: E402
+from src.services.bulletin_processor import (  # noqa: E402
+    calculate_min_max_moyennes, compute_class_statistics,
+)
+
+
+def legacy_statistics(bulletins):
+    """Boucles matière × période × élèves, puis module `statistics`."""
+    legacy_min_max(bulletins)
+    matieres = sorted({nom for b in bulletins for nom in b.matieres})
+    result = {'matieres': {}, 'rangs': {}}
+    for matiere in matieres:
+        codes = set()
+        for bulletin in bulletins:
+            appreciation = bulletin.get_matiere(matiere)
+            if appreciation:
+                codes.update(appreciation.periodes)
+        for code in sorted(codes):
+            notes = {}
+            for bulletin in bulletins:
+                appreciation = bulletin.get_matiere(matiere)
+                periode = appreciation.get_periode(code) if appreciation else None
+                if periode and periode.moyenne is not None:
+                    notes[f"{bulletin.eleve.nom} {bulletin.eleve.prenom}"] = periode.moyenne
+            if not notes:
+                continue
+            values = sorted(notes.values())
+            quartiles = (statistics.quantiles(values, n=4, method='inclusive')
+                         if len(values) > 1 else [values[0]] * 3)
+            result['matieres'].setdefault(matiere, {})[code] = {
+                'count': len(values), 'min': values[0], 'max': values[-1],
+                'mean': statistics.fmean(values), 'median': statistics.median(values),
+                'std': statistics.pstdev(values), 'q1': quartiles[0], 'q3': quartiles[2],
+            }
+            result['rangs'].setdefault(matiere, {})[code] = {
+                eleve: 1 + sum(1 for v in values if v > note) for eleve, note in notes.items()
+            }
+    return result
+
+
+def single_pass(bulletins):
+    matrix = ClassMatrix.from_bulletins(bulletins)
+    calculate_min_max_moyennes(bulletins, matrix=matrix)
+    return compute_class_statistics(bulletins, matrix=matrix)
+
+
+def timed(func, repeat=3):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, nargs="+", default=[35, 1000])
+    args = parser.parse_args()
+
+    print(f"{'élèves':>6} | {'boucles (s)':>11} | {'une passe (s)':>13} | {'gain':>6}")
+    print("-" * 47)
+    for count in args.students:
+        bulletins = bulletins_from_dicts(synthetic_bulletins(count))
+        expected = legacy_statistics(bulletins)
+        actual = single_pass(bulletins)
+        assert actual['rangs'] == expected['rangs']
+        assert actual['matieres'].keys() == expected['matieres'].keys()
+        legacy_time = timed(lambda: legacy_statistics(bulletins))
+        single_time = timed(lambda: single_pass(bulletins))
+        print(f"{count:>6} | {legacy_time:>11.4f} | {single_time:>13.4f} | {legacy_time / single_time:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la lecture des CSV matière mal formés (guillemets non échappés).
+
+Compare l'ancien chemin « parseur C puis, en cas d'échec, parseur Python
+avec `on_bad_lines='skip'` » à `read_csv_matiere` (réparation en une passe
+suivie du parseur C), conversion en enregistrements comprise, sur des exports synthétiques dont une fraction des
+lignes porte du HTML mal échappé dans la colonne « Evol. ». Le nombre de
+lignes conservées est affiché : l'ancien chemin en perd silencieusement
+(un guillemet jamais refermé lui fait sauter une grande partie du fichier,
+d'où un temps trompeusement bas sur ce cas).
+
+Usage :
+    python benchmarks/bench_csv_repair.py [--sizes 1000 10000 100000] [--broken 0.02]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.file_reader import _frame_to_records, read_csv_matiere  # noqa: E402
+
+
+HEADER = ["Élève", "Moy. T2", "H.Abs.", "Ret.", "App. A : Appréciations", "Evol."]
+
+# Défauts rencontrés dans la colonne « Evol. »
+BROKEN_EVOL = {
+    "guillemets": '"<span style="color:#FF0000">&#8600;</span>"',
+    "point-virgule": '<img src="fleche.png" alt="hausse;forte">',
+    "non refermé": '"<b>',
+}
+
+
+def legacy_read(path):
+    """Ancienne lecture : parseur C, puis parseur Python tolérant (référence)."""
+    try:
+        df = pd.read_csv(path, sep=";", encoding="utf-8")
+    except Exception:
+        df = pd.read_csv(path, sep=";", encoding="utf-8", engine="python", on_bad_lines="skip")
+    return _frame_to_records(df, strip_strings=True, leading={"matiere": "Maths"})
+
+
+def write_synthetic_csv(path, rows, broken, evol_defect=None, seed=42):
+    """Écrit un export matière dont une fraction `broken` des lignes porte `evol_defect`."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(";".join(HEADER) + "\n")
+        for i in range(rows):
+            moyenne = f"{rng.uniform(2, 20):.2f}".replace(".", ",")
+            evol = rng.choice(["=", "+", "-"])
+            if evol_defect and rng.random() < broken:
+                evol = evol_defect
+            f.write(f"NOM{i} Prenom{i};{moyenne};;;Travail régulier, élève {i};{evol}\n")
+
+
+def timed(func, repeat=3):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--broken", type=float, default=0.02,
+                        help="Fraction de lignes mal formées (défaut : 0.02)")
+    args = parser.parse_args()
+
+    print(f"{'lignes':>8} | {'cas':>13} | {'ancien (s)':>10} | {'lignes':>7} | "
+          f"{'réparé (s)':>10} | {'lignes':>7} | {'gain':>6}")
+    print("-" * 79)
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            repeat = 1 if rows >= 100000 else 3
+            cases = [("sain", None)] + list(BROKEN_EVOL.items())
+            for index, (label, defect) in enumerate(cases):
+                path = os.path.join(tmp, f"matiere_{rows}_{index}.csv")
+                write_synthetic_csv(path, rows, args.broken, defect)
+                legacy_time, legacy = timed(lambda: legacy_read(path), repeat)
+                new_time, new = timed(lambda: read_csv_matiere(path, "Maths"), repeat)
+                print(f"{rows:>8} | {label:>13} | {legacy_time:>10.4f} | {len(legacy):>7} | "
+                      f"{new_time:>10.4f} | {len(new):>7} | {legacy_time / new_time:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
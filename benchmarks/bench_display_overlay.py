@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la vue multi-périodes des fenêtres édition et conseil.
+
+Compare l'ancienne construction (copie de tous les bulletins courants, copie
+des fichiers liés renumérotés, puis fusion sur place) à `build_display_bulletins`
+qui retourne des `BulletinOverlay` partageant les périodes des sources. Classe
+de 1000 élèves × 15 matières : fichier courant T3, fichiers liés T1 et T2
+(ce dernier en S2, renuméroté). Le temps « + lecture » inclut un parcours
+complet des matières et périodes, comme `_compute_period_codes` et
+`ClassMatrix.from_bulletins`.
+
+Usage :
+    python benchmarks/bench_display_overlay.py [--bulletins 1000]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_bulk_parsers import synthetic_bulletins  # noqa: E402
+from src.models.bulletin import bulletins_from_dicts  # noqa: E402
+from src.services.period_history import (  # noqa: E402
+    build_display_bulletins,
+    merge_periods_into_bulletins,
+    normalize_trimestre_general_appreciations,
+    remap_bulletins_period_code,
+)
+
+
+def period_items(items, code, as_code=None):
+    """Ne garde que la période `code` des dictionnaires (sous `as_code`)."""
+    as_code = as_code or code
+    result = []
+    for item in items:
+        matieres = {
+            nom: {key.replace(code, as_code): value for key, value in data.items() if code in key}
+            for nom, data in item["Matieres"].items()
+        }
+        result.append({"Nom": item["Nom"], "Prenom": item["Prenom"], "Matieres": matieres})
+    return result
+
+
+def legacy_remap(bulletins, from_code, to_code):
+    """Ancienne renumérotation : copie de tous les bulletins."""
+    result = [bulletin.clone() for bulletin in bulletins]
+    for bulletin in result:
+        if from_code in bulletin.appreciations_generales:
+            texte = bulletin.appreciations_generales.pop(from_code)
+            bulletin.appreciations_generales.setdefault(to_code, texte)
+        for matiere in bulletin.matieres.values():
+            if from_code in matiere.periodes:
+                periode = matiere.periodes.pop(from_code)
+                matiere.periodes.setdefault(to_code, periode)
+    return result
+
+
+def legacy_display(current, t1, t2_s2):
+    """Ancienne vue : copie des bulletins courants puis fusion sur place."""
+    history = {"T1": t1, "T2": legacy_remap(t2_s2, "S2", "T2")}
+    display = [bulletin.clone() for bulletin in current]
+    for other in history.values():
+        merge_periods_into_bulletins(display, other, "T3")
+    for bulletin in display:
+        normalize_trimestre_general_appreciations(bulletin)
+    return display
+
+
+def overlay_display(current, t1, t2_s2):
+    history = {"T1": t1, "T2": remap_bulletins_period_code(t2_s2, "S2", "T2")}
+    return build_display_bulletins(current, history, "T3")
+
+
+def read_all(display):
+    """Parcours complet, comme le calcul des colonnes et de la matrice."""
+    count = 0
+    for bulletin in display:
+        for appreciation in bulletin.matieres.values():
+            for periode in appreciation.periodes.values():
+                count += periode.moyenne is not None
+    return count
+
+
+def timed(func, repeat=5):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def allocated(func):
+    """Octets alloués et conservés par `func` (résultat parcouru)."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = func()
+    read_all(result)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bulletins", type=int, default=1000)
+    args = parser.parse_args()
+
+    items = synthetic_bulletins(args.bulletins)
+    current = bulletins_from_dicts(period_items(items, "T3"))
+    t1 = bulletins_from_dicts(period_items(items, "T1"))
+    t2_s2 = bulletins_from_dicts(period_items(items, "T2", "S2"))
+    assert read_all(legacy_display(current, t1, t2_s2)) == read_all(overlay_display(current, t1, t2_s2))
+
+    print(f"{'vue':>10} | {'construction':>12} | {'+ lecture':>9} | {'mémoire (Mo)':>12}")
+    print("-" * 53)
+    results = {}
+    for label, build in (("copie", legacy_display), ("overlay", overlay_display)):
+        build_s = timed(lambda: build(current, t1, t2_s2))
+        full_s = timed(lambda: read_all(build(current, t1, t2_s2)))
+        memory = allocated(lambda: build(current, t1, t2_s2))
+        results[label] = full_s
+        print(f"{label:>10} | {build_s:>11.3f}s | {full_s:>8.3f}s | {memory / 1e6:>12.1f}")
+    print(f"gain (construction + lecture) : {results['copie'] / results['overlay']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
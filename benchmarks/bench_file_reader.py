@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la conversion des fichiers source (CSV matière et source.xlsx).
+
+Compare l'ancienne conversion `iterrows()` + `pd.isna` par cellule à la
+conversion colonne par colonne de `file_reader`, sur des exports PRONOTE
+synthétiques de 1 000, 10 000 et 100 000 lignes.
+
+Usage :
+    python benchmarks/bench_file_reader.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.file_reader import _frame_to_records, read_csv_matiere  # noqa: E402
+
+
+HEADER = ["Élève", "Moy. T2", "H.Abs.", "Ret.", "App. A : Appréciations", "Evol."]
+
+
+def legacy_records(df, strip_strings=False, leading=None):
+    """Ancienne conversion cellule par cellule (référence)."""
+    records = []
+    for _, row in df.iterrows():
+        record = dict(leading or {})
+        for col in df.columns:
+            value = row[col]
+            if pd.isna(value):
+                value = None
+            elif strip_strings and isinstance(value, str):
+                value = value.strip()
+            record[col] = value
+        records.append(record)
+    return records
+
+
+def write_synthetic_csv(path, rows, seed=42):
+    """Écrit un export matière synthétique de `rows` lignes."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(";".join(HEADER) + "\n")
+        for i in range(rows):
+            moyenne = "N.Not" if rng.random() < 0.05 else f"{rng.uniform(2, 20):.2f}".replace(".", ",")
+            absence = "" if rng.random() < 0.6 else f"{rng.randint(0, 12)}h{rng.choice(['00', '30'])}"
+            retards = "" if rng.random() < 0.7 else str(rng.randint(0, 5))
+            appreciation = "" if rng.random() < 0.1 else f"  Travail régulier, élève {i}  "
+            f.write(f"\"NOM{i} Prenom{i}\";{moyenne};{absence};{retards};{appreciation};\n")
+
+
+def timed(func, repeat=3):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'lignes':>8} | {'format':>6} | {'iterrows (s)':>12} | {'colonnes (s)':>12} | {'gain':>6}")
+    print("-" * 58)
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            path = os.path.join(tmp, f"matiere_{rows}.csv")
+            write_synthetic_csv(path, rows)
+            df = pd.read_csv(path, sep=";", encoding="utf-8")
+            leading = {"matiere": "Maths"}
+
+            repeat = 1 if rows >= 100000 else 3
+            # CSV matière : nettoyage des chaînes + clé 'matiere' en tête
+            legacy_time, legacy = timed(lambda: legacy_records(df, True, leading), repeat)
+            new_time, new = timed(lambda: _frame_to_records(df, True, leading), repeat)
+            assert new == legacy, "La conversion colonne par colonne diverge de la référence"
+            print(f"{rows:>8} | {'csv':>6} | {legacy_time:>12.4f} | {new_time:>12.4f} | "
+                  f"{legacy_time / new_time:>5.1f}x")
+
+            # source.xlsx : même conversion sans nettoyage (lecture Excel exclue,
+            # identique pour les deux variantes)
+            legacy_time, legacy = timed(lambda: legacy_records(df), repeat)
+            new_time, new = timed(lambda: _frame_to_records(df), repeat)
+            assert new == legacy, "La conversion colonne par colonne diverge de la référence"
+            print(f"{rows:>8} | {'xlsx':>6} | {legacy_time:>12.4f} | {new_time:>12.4f} | "
+                  f"{legacy_time / new_time:>5.1f}x")
+
+            full_time, _ = timed(lambda: read_csv_matiere(path, "Maths"), repeat)
+            print(f"{'':>8}   read_csv_matiere complet : {full_time:.4f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la lecture et de l'écriture des fichiers de bulletins par backend JSON.
+
+Compare, sur un fichier de 1000 bulletins (15 matières, 3 trimestres), le
+module standard `json` (ancien comportement : `json.dump(..., indent=2)` en
+mode texte) à orjson pour `save_output_json` (indenté et compact),
+`load_bulletins_from_json` et `read_payload`.
+
+Usage :
+    python benchmarks/bench_json_backend.py [--bulletins 1000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_bulk_parsers import synthetic_bulletins  # noqa: E402
+from src.models.bulletin import bulletins_from_dicts  # noqa: E402
+from src.services import json_backend  # noqa: E402
+from src.services.json_generator import load_bulletins_from_json, save_output_json  # noqa: E402
+from src.services.period_history import read_payload  # noqa: E402
+
+
+def timed(func, repeat=5):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bulletins", type=int, default=1000)
+    args = parser.parse_args()
+
+    bulletins = bulletins_from_dicts(synthetic_bulletins(args.bulletins))
+    metadata = {"semester": "T3", "period_system": "trimestre"}
+    backends = [name for name in json_backend.BACKENDS
+                if name != "orjson" or json_backend.orjson is not None]
+
+    print(f"{'backend':>8} | {'écriture':>9} | {'compact':>9} | {'chargement':>10} | "
+          f"{'read_payload':>12} | {'taille':>8}")
+    print("-" * 72)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in backends:
+            previous = json_backend.use_backend(name)
+            try:
+                path = os.path.join(tmp, f"output_{name}.json")
+                compact_path = os.path.join(tmp, f"compact_{name}.json")
+                save = timed(lambda: save_output_json(bulletins, path, metadata=metadata))
+                compact = timed(lambda: save_output_json(bulletins, compact_path, metadata=metadata,
+                                                         pretty_print=False))
+                load = timed(lambda: load_bulletins_from_json(path))
+                payload = timed(lambda: read_payload(path))
+            finally:
+                json_backend.use_backend(previous)
+            size = os.path.getsize(path) / (1024 * 1024)
+            print(f"{name:>8} | {save:>8.3f}s | {compact:>8.3f}s | {load:>9.3f}s | "
+                  f"{payload:>11.3f}s | {size:>5.1f} Mo")
+        print(f"compact : {os.path.getsize(compact_path) / (1024 * 1024):.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
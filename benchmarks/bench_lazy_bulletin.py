@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark du chargement paresseux des bulletins (`LazyBulletin`).
+
+Compare, sur des dictionnaires JSON déjà analysés, la construction complète
+(`Bulletin.from_dict` élève par élève, et `bulletins_from_dicts`) à
+`LazyBulletin` : construction seule, ouverture de la fenêtre d'édition
+(périodes présentes), consultation de quelques élèves, puis construction de
+toutes les matières (pire cas, ex. matrice de classe).
+
+Usage :
+    python benchmarks/bench_lazy_bulletin.py [--bulletins 1000 5000] [--viewed 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_bulk_parsers import synthetic_bulletins  # noqa: E402
+from src.models.bulletin import Bulletin, LazyBulletin, bulletins_from_dicts  # noqa: E402
+
+
+def timed(func, repeat=5):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def open_window(items, viewed):
+    """Chargement, périodes présentes, puis consultation de `viewed` élèves."""
+    bulletins = [LazyBulletin(item) for item in items]
+    codes = set()
+    for bulletin in bulletins:
+        codes.update(bulletin.period_codes())
+    for bulletin in bulletins[:viewed]:
+        bulletin.matieres
+    return bulletins
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bulletins", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--viewed", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'bulletins':>9} | {'from_dict':>9} | {'en bloc':>8} | {'paresseux':>9} | "
+          f"{'fenêtre':>8} | {'tout construit':>14}")
+    print("-" * 74)
+    for count in args.bulletins:
+        items = synthetic_bulletins(count)
+        eager = timed(lambda: [Bulletin.from_dict(item) for item in items])
+        bulk = timed(lambda: bulletins_from_dicts(items))
+        lazy = timed(lambda: [LazyBulletin(item) for item in items])
+        window = timed(lambda: open_window(items, args.viewed))
+        full = timed(lambda: [b.matieres for b in (LazyBulletin(item) for item in items)])
+        print(f"{count:>9} | {eager * 1000:>7.1f}ms | {bulk * 1000:>6.1f}ms | {lazy * 1000:>7.1f}ms | "
+              f"{window * 1000:>6.1f}ms | {full * 1000:>12.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la mise à jour du bloc `_metadata` (liens de périodes).
+
+Compare l'ancienne mise à jour (relecture complète du JSON puis réécriture de
+tous les bulletins) à `update_file_metadata`, qui écrit l'annexe
+`<nom>.json.meta`, puis la lecture des métadonnées seules (`read_metadata`)
+avec et sans annexe.
+
+Usage :
+    python benchmarks/bench_metadata_update.py [--bulletins 1000 5000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_bulk_parsers import synthetic_bulletins  # noqa: E402
+from src.services import json_backend  # noqa: E402
+from src.services.metadata_sidecar import remove_sidecar  # noqa: E402
+from src.services.period_history import read_metadata, read_payload, update_file_metadata  # noqa: E402
+
+
+def legacy_update(json_path, metadata):
+    """Ancienne mise à jour : tout relire, tout réécrire."""
+    _existing, bulletins_data = read_payload(json_path)
+    json_backend.dump([{"_metadata": dict(metadata)}] + bulletins_data, json_path)
+
+
+def timed(func, repeat=5):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bulletins", type=int, nargs="+", default=[1000, 5000])
+    args = parser.parse_args()
+
+    metadata = {"semester": "T3", "period_links": {"T1": "output_T1.json", "T2": "output_T2.json"}}
+    print(f"{'bulletins':>9} | {'taille':>8} | {'réécriture':>10} | {'annexe':>8} | "
+          f"{'lecture (JSON)':>14} | {'lecture (annexe)':>16}")
+    print("-" * 82)
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.bulletins:
+            path = os.path.join(tmp, f"output_T3_{count}.json")
+            json_backend.dump([{"_metadata": {"semester": "T3"}}] + synthetic_bulletins(count), path)
+            size = os.path.getsize(path) / (1024 * 1024)
+            rewrite = timed(lambda: legacy_update(path, metadata))
+            read_full = timed(lambda: read_metadata(path))
+            sidecar = timed(lambda: update_file_metadata(path, metadata))
+            read_sidecar = timed(lambda: read_metadata(path))
+            remove_sidecar(path)
+            print(f"{count:>9} | {size:>5.1f} Mo | {rewrite:>9.3f}s | {sidecar * 1000:>6.2f}ms | "
+                  f"{read_full:>13.3f}s | {read_sidecar * 1000:>14.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
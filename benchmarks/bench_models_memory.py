@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark mémoire et copie des modèles (Eleve, PeriodeData,
+AppreciationMatiere, Bulletin).
+
+Mesure avec `tracemalloc` les octets alloués par bulletin pour une classe de
+1000 élèves × 15 matières × 3 périodes, avec les modèles actuels (__slots__)
+et avec des classes équivalentes à __dict__ (anciens modèles, reproduits
+ci-dessous), puis compare `clone()` à `copy.deepcopy`.
+
+Usage :
+    python benchmarks/bench_models_memory.py [--bulletins 1000]
+"""
+
+import argparse
+import copy
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_bulk_parsers import synthetic_bulletins  # noqa: E402
+from src.models.bulletin import AppreciationMatiere, Bulletin, Eleve, PeriodeData  # noqa: E402
+
+
+@dataclass
+class LegacyEleve:
+    nom: str
+    prenom: str
+    classe: Optional[str] = None
+
+
+@dataclass
+class LegacyPeriodeData:
+    heures_absence: Optional[str] = None
+    retards: Optional[int] = None
+    moyenne: Optional[float] = None
+    moyenne_min: Optional[float] = None
+    moyenne_max: Optional[float] = None
+    appreciation: Optional[str] = None
+
+
+class LegacyAppreciationMatiere:
+    def __init__(self, matiere, periodes):
+        self.matiere = matiere
+        self.periodes = periodes
+
+
+class LegacyBulletin:
+    def __init__(self, eleve, matieres):
+        self.eleve = eleve
+        self.appreciations_generales = {}
+        self.matieres = matieres
+
+
+MODELS = {
+    "__slots__": (Eleve, PeriodeData, AppreciationMatiere, Bulletin),
+    "__dict__": (LegacyEleve, LegacyPeriodeData, LegacyAppreciationMatiere, LegacyBulletin),
+}
+
+
+def build(items, models):
+    """Construit les bulletins depuis les dictionnaires JSON (valeurs partagées)."""
+    eleve_cls, periode_cls, appreciation_cls, bulletin_cls = models
+    bulletins = []
+    for item in items:
+        matieres = {}
+        for nom, data in item["Matieres"].items():
+            periodes = {
+                code: periode_cls(
+                    heures_absence=data[f"HeuresAbsence{code}"],
+                    retards=data[f"Retards{code}"],
+                    moyenne=data[f"Moyenne{code}"],
+                    appreciation=data[f"Appreciation{code}"],
+                )
+                for code in ("T1", "T2", "T3")
+            }
+            matieres[nom] = appreciation_cls(nom, periodes)
+        bulletins.append(bulletin_cls(eleve_cls(item["Nom"], item["Prenom"]), matieres=matieres))
+    return bulletins
+
+
+def measure(items, models):
+    """Octets alloués (et conservés) par la construction des bulletins."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    bulletins = build(items, models)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return bulletins, allocated
+
+
+def timed(func, repeat=3):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bulletins", type=int, default=1000)
+    args = parser.parse_args()
+
+    items = synthetic_bulletins(args.bulletins)
+    print(f"{'modèles':>10} | {'octets / bulletin':>17} | {'total (Mo)':>10}")
+    print("-" * 44)
+    sizes = {}
+    for label, models in MODELS.items():
+        _bulletins, allocated = measure(items, models)
+        sizes[label] = allocated
+        print(f"{label:>10} | {allocated / args.bulletins:>17,.0f} | {allocated / 1e6:>10.1f}")
+    print(f"réduction : {1 - sizes['__slots__'] / sizes['__dict__']:.0%}")
+
+    bulletins = build(items, MODELS["__slots__"])
+    deep = timed(lambda: copy.deepcopy(bulletins))
+    clone = timed(lambda: [b.clone() for b in bulletins])
+    print(f"\ncopie de {args.bulletins} bulletins : deepcopy {deep:.3f} s, clone() {clone:.3f} s "
+          f"({deep / clone:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
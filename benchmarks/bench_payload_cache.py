@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark du cache mémoire des JSON de périodes (`PAYLOADS`).
+
+Simule l'ouverture du panneau des périodes liées puis le calcul de
+l'historique : découverte des fichiers frères, chargement des bulletins liés,
+puis nouvelle découverte après un changement de lien. Le même scénario est
+mesuré cache désactivé (chaque étape relit les fichiers) et cache actif.
+
+Usage :
+    python benchmarks/bench_payload_cache.py [--bulletins 1000 5000] [--periods 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_bulk_parsers import synthetic_bulletins  # noqa: E402
+from src.services import json_backend  # noqa: E402
+from src.services.payload_cache import PAYLOADS  # noqa: E402
+from src.services.period_history import load_history_bulletins, resolve_period_links  # noqa: E402
+
+
+def scenario(current, code):
+    """Découverte, historique, redécouverte."""
+    links = resolve_period_links(current, {}, code)
+    load_history_bulletins(links)
+    resolve_period_links(current, {}, code)
+
+
+def timed(func, repeat=5):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bulletins", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--periods", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'bulletins':>9} | {'découverte':>21} | {'scénario complet':>21}")
+    print(f"{'':>9} | {'sans cache':>10} {'avec cache':>10} | {'sans cache':>10} {'avec cache':>10}")
+    print("-" * 57)
+    for count in args.bulletins:
+        with tempfile.TemporaryDirectory() as tmp:
+            codes = [f"T{i}" for i in range(1, args.periods + 1)]
+            for code in codes:
+                json_backend.dump([{"_metadata": {"semester": code}}] + synthetic_bulletins(count),
+                                  os.path.join(tmp, f"output_{code}.json"))
+            current = os.path.join(tmp, f"output_{codes[-1]}.json")
+
+            max_entries = PAYLOADS.max_entries
+            PAYLOADS.max_entries = 0
+            PAYLOADS.clear()
+            try:
+                discovery = timed(lambda: resolve_period_links(current, {}, codes[-1]))
+                uncached = timed(lambda: scenario(current, codes[-1]))
+            finally:
+                PAYLOADS.max_entries = max_entries
+            PAYLOADS.clear()
+            cached_discovery = timed(lambda: resolve_period_links(current, {}, codes[-1]))
+            cached = timed(lambda: scenario(current, codes[-1]))
+            PAYLOADS.clear()
+        print(f"{count:>9} | {discovery:>9.3f}s {cached_discovery * 1000:>8.2f}ms | "
+              f"{uncached:>9.3f}s {cached:>9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
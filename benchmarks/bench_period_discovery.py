@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la découverte des périodes liées dans un dossier chargé.
+
+Le dossier contient quelques JSON de bulletins et de nombreux JSON sans
+rapport. Compare l'ancienne détection (lecture complète de chaque fichier), la
+lecture du seul bloc `_metadata` de tête (premier passage, sans index) et
+l'index `.pyconseil-periods.idx` (passages suivants, y compris après un
+redémarrage : le cache mémoire est vidé avant chaque mesure).
+
+Usage :
+    python benchmarks/bench_period_discovery.py [--files 200] [--bulletins 1000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_bulk_parsers import synthetic_bulletins  # noqa: E402
+from src.services import json_backend  # noqa: E402
+from src.services.payload_cache import PAYLOADS  # noqa: E402
+from src.services.period_history import discover_sibling_period_files  # noqa: E402
+from src.services.period_index import INDEX_FILENAME  # noqa: E402
+from src.utils.semester import period_from_metadata  # noqa: E402
+
+PERIOD_FILES = ("T1", "T2", "S1", "S2")
+
+
+def legacy_discover(json_path, current_code):
+    """Ancienne découverte : chaque JSON frère est lu en entier."""
+    result = {}
+    directory = os.path.dirname(json_path)
+    for sibling in sorted(Path(directory).glob("*.json")):
+        sibling = str(sibling)
+        if sibling == json_path:
+            continue
+        try:
+            data = json_backend.load(sibling)
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, list) and data and isinstance(data[0], dict) and "_metadata" in data[0]:
+            period = period_from_metadata(data[0]["_metadata"] or {})
+            if period is not None and period.value != current_code:
+                result.setdefault(period.value, sibling)
+    return result
+
+
+def timed(func, repeat=3, setup=None):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--bulletins", type=int, default=1000)
+    args = parser.parse_args()
+
+    bulletins = synthetic_bulletins(args.bulletins)
+    unrelated = {"rows": [{"id": i, "label": f"ligne {i}", "values": list(range(20))} for i in range(2000)]}
+    with tempfile.TemporaryDirectory() as tmp:
+        current = os.path.join(tmp, "bulletins_T3.json")
+        json_backend.dump([{"_metadata": {"semester": "T3"}}] + bulletins, current)
+        for code in PERIOD_FILES:
+            json_backend.dump([{"_metadata": {"semester": code}}] + bulletins,
+                              os.path.join(tmp, f"export_{code.lower()}.json"))
+        for i in range(args.files - len(PERIOD_FILES) - 1):
+            json_backend.dump(unrelated, os.path.join(tmp, f"donnees_{i:03d}.json"), compact=True)
+        size = sum(p.stat().st_size for p in Path(tmp).glob("*.json")) / (1024 * 1024)
+
+        index_path = os.path.join(tmp, INDEX_FILENAME)
+
+        def cold():
+            PAYLOADS.clear()
+            if os.path.exists(index_path):
+                os.remove(index_path)
+
+        expected = legacy_discover(current, "T3")
+        assert discover_sibling_period_files(current, "T3") == expected
+        legacy = timed(lambda: legacy_discover(current, "T3"))
+        sniffed = timed(lambda: discover_sibling_period_files(current, "T3"), setup=cold)
+        discover_sibling_period_files(current, "T3")
+        indexed = timed(lambda: discover_sibling_period_files(current, "T3"), setup=PAYLOADS.clear)
+
+    print(f"{args.files} fichiers JSON, {size:.0f} Mo, {len(expected)} périodes liées")
+    print(f"{'lecture complète':>18} | {'bloc de tête':>12} | {'index':>9}")
+    print("-" * 47)
+    print(f"{legacy:>17.3f}s | {sniffed * 1000:>10.1f}ms | {indexed * 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark du traitement en mémoire (`process_directory`, `process_single_bulletin`).
+
+Compare, sur des dossiers classe synthétiques (15 matières) :
+- l'ancien chemin « JSON puis relecture » (`process_directory_to_json` vers un
+  fichier temporaire, puis `load_bulletins_from_json`) au traitement en
+  mémoire qui retourne directement bulletins et métadonnées ;
+- l'ancienne extraction d'un élève (traitement complet + relecture + recherche)
+  à `process_single_bulletin`, qui ne construit que cet élève.
+
+Usage :
+    python benchmarks/bench_pipeline.py [--students 35 1000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.json_generator import load_bulletins_from_json  # noqa: E402
+from src.services.main_processor import (  # noqa: E402
+    process_directory, process_directory_to_json, process_single_bulletin,
+)
+from tests.conftest import write_class_directory  # noqa: E402
+
+
+def legacy_round_trip(source, output):
+    """Ancien chemin : écriture du JSON puis relecture complète."""
+    process_directory_to_json(source, output)
+    return load_bulletins_from_json(output)
+
+
+def legacy_single(source, output, nom_eleve):
+    """Ancienne extraction : classe entière, relecture, recherche linéaire."""
+    process_directory_to_json(source, output, merge_history=False)
+    for bulletin in load_bulletins_from_json(output):
+        if f"{bulletin.eleve.nom} {bulletin.eleve.prenom}" == nom_eleve:
+            return bulletin
+    return None
+
+
+def timed(func, repeat=3):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, nargs="+", default=[35, 1000])
+    args = parser.parse_args()
+
+    print(f"{'élèves':>7} | {'JSON + relecture':>16} | {'mémoire':>8} | "
+          f"{'1 élève (ancien)':>16} | {'1 élève':>8}")
+    print("-" * 69)
+    for count in args.students:
+        students = [(f"NOM{i}", f"Prenom{i}") for i in range(count)]
+        with tempfile.TemporaryDirectory() as tmp:
+            source = write_class_directory(os.path.join(tmp, "classe"),
+                                           subjects=[f"Matiere{i}" for i in range(15)],
+                                           students=students)
+            output = os.path.join(tmp, "out.json")
+            target = f"NOM{count // 2} Prenom{count // 2}"
+            round_trip = timed(lambda: legacy_round_trip(source, output))
+            in_memory = timed(lambda: process_directory(source))
+            single_old = timed(lambda: legacy_single(source, output, target))
+            single_new = timed(lambda: process_single_bulletin(source, target))
+            print(f"{count:>7} | {round_trip:>15.3f}s | {in_memory:>7.3f}s | "
+                  f"{single_old:>15.3f}s | {single_new:>7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la lecture d'un source.xlsx consolidé (toutes les classes).
+
+Compare `read_source_xlsx` (pandas, classeur complet en mémoire) à
+`iter_source_xlsx` (openpyxl en lecture seule, en flux) : temps et pic
+mémoire (tracemalloc), pour la lecture complète puis pour la construction
+des bulletins classe par classe. Le mode par classe relit le classeur pour
+chaque classe : il échange du temps contre une mémoire bornée.
+
+Usage :
+    python benchmarks/bench_source_xlsx.py [--rows 1000 5000] [--classes 30]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.services.bulletin_processor import (  # noqa: E402
+    create_bulletins_by_class, create_bulletins_from_source
+)
+from src.services.file_reader import iter_source_xlsx, read_source_xlsx  # noqa: E402
+
+
+def write_consolidated_xlsx(path, rows, classes):
+    """Écrit un source.xlsx de `rows` élèves répartis sur `classes` classes."""
+    pd.DataFrame({
+        "Classe": [f"C{i % classes + 1}" for i in range(rows)],
+        "Élève": [f"NOM{i} Prenom{i}" for i in range(rows)],
+        "AppreciationGeneraleT1": [f"Appréciation générale de l'élève {i}, trimestre 1." for i in range(rows)],
+        "AppreciationGeneraleT2": [None if i % 3 else f"Appréciation T2 {i}" for i in range(rows)],
+    }).to_excel(path, index=False)
+
+
+def measure(func):
+    """(durée en s, pic mémoire en Mo) d'un appel."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak / (1024 * 1024)
+
+
+def build_all_classes_from_full_read(path):
+    """Référence : lecture complète puis regroupement par classe en mémoire."""
+    by_class = {}
+    for record in read_source_xlsx(path):
+        by_class.setdefault(record["Classe"], []).append(record)
+    return {classe: create_bulletins_from_source(rows) for classe, rows in by_class.items()}
+
+
+def build_class_by_class(path):
+    """Une classe à la fois : seuls ses bulletins sont conservés."""
+    for _classe, bulletins in create_bulletins_by_class(path):
+        len(bulletins)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--classes", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"{'lignes':>7} | {'mesure':>24} | {'temps (s)':>9} | {'pic (Mo)':>8}")
+    print("-" * 58)
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"source_{rows}.xlsx")
+            write_consolidated_xlsx(path, rows, args.classes)
+            cases = [
+                ("read_source_xlsx", lambda: read_source_xlsx(path)),
+                ("iter_source_xlsx (flux)", lambda: sum(1 for _ in iter_source_xlsx(path))),
+                ("bulletins, lecture unique", lambda: build_all_classes_from_full_read(path)),
+                ("bulletins, par classe", lambda: build_class_by_class(path)),
+            ]
+            for label, func in cases:
+                duration, peak = measure(func)
+                print(f"{rows:>7} | {label:>24} | {duration:>9.3f} | {peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
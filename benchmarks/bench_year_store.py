@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark du chargement de l'historique : fichiers JSON liés ou base SQLite.
+
+Pour une période courante T3 et deux périodes liées (T1, T2), compare le
+chargement de l'historique depuis les fichiers (découverte + lecture
+complète des JSON, cache mémoire vidé comme à une première ouverture) à la
+lecture de la base `YearStore` : toutes les périodes liées, puis la tranche
+d'un seul élève (fiche élève du conseil de classe).
+
+Usage :
+    python benchmarks/bench_year_store.py [--bulletins 1000 5000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_bulk_parsers import synthetic_bulletins  # noqa: E402
+from src.services import json_backend  # noqa: E402
+from src.services.payload_cache import PAYLOADS  # noqa: E402
+from src.services.period_history import load_history_bulletins, resolve_period_links  # noqa: E402
+from src.services.year_store import YearStore  # noqa: E402
+
+CLASS, YEAR = "3A", "2025-2026"
+
+
+def timed(func, repeat=3, setup=None):
+    """Meilleur temps sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def period_items(code, count):
+    """Fichier d'une seule période : bulletins synthétiques réduits à `code`."""
+    items = []
+    for item in synthetic_bulletins(count):
+        matieres = {
+            name: {key: value for key, value in fields.items() if code in key}
+            for name, fields in item.get("Matieres", {}).items()
+        }
+        items.append(dict(item, Matieres=matieres))
+    return [{"_metadata": {"semester": code}}] + items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bulletins", type=int, nargs="+", default=[1000, 5000])
+    args = parser.parse_args()
+
+    print(f"{'bulletins':>9} | {'fichiers':>9} | {'base':>9} | {'base, 1 élève':>13} | {'import':>8}")
+    print("-" * 62)
+    for count in args.bulletins:
+        with tempfile.TemporaryDirectory() as tmp:
+            current = os.path.join(tmp, "output_T3.json")
+            for code in ("T1", "T2", "T3"):
+                json_backend.dump(period_items(code, count), os.path.join(tmp, f"output_{code}.json"))
+            links = resolve_period_links(current, {}, "T3")
+
+            files = timed(lambda: load_history_bulletins(resolve_period_links(current, {}, "T3")),
+                          setup=PAYLOADS.clear)
+            with YearStore(os.path.join(tmp, "annee.sqlite")) as store:
+                start = time.perf_counter()
+                for path in links.values():
+                    store.import_json(path, CLASS, YEAR)
+                imported = time.perf_counter() - start
+                student = next(iter(store.load_bulletins(CLASS, YEAR, codes=["T1"])["T1"])).eleve
+                whole = timed(lambda: store.load_bulletins(CLASS, YEAR, codes=links))
+                one = timed(lambda: store.load_bulletins(CLASS, YEAR, codes=links,
+                                                         students=[(student.nom, student.prenom)]))
+        print(f"{count:>9} | {files:>8.3f}s | {whole:>8.3f}s | {one * 1000:>11.2f}ms | {imported:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ BGRAPP Pyconseil - Outil d'aide à la préparation des conseils de classe
 Application principale
 """
 
+import multiprocessing
 import sys
 import os
 from pathlib import Path
@@ -15,7 +16,19 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 def main():
     """
     Point d'entrée principal de l'application
+
+    `python main.py batch RACINE ...` lance le traitement par lot sans
+    interface graphique (voir `services.batch_processor`).
     """
+    # Exécutable PyInstaller : un processus de pool (traitement par lot,
+    # validation multi-classes) relance ce point d'entrée ; il doit exécuter
+    # sa tâche au lieu d'ouvrir l'interface
+    multiprocessing.freeze_support()
+
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from services.batch_processor import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+
     print("🎓 BGRAPP Pyconseil - Outil d'aide aux conseils de classe")
     print("=" * 55)
     print("Lancement de l'interface graphique...")
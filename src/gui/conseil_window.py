@@ -6,7 +6,6 @@ Fenêtre conseil de classe de l'application BGRAPP Pyconseil
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import json
 import os
 import re
 from pathlib import Path
@@ -15,6 +14,7 @@ from typing import List, Optional, Dict, Any
 # Import conditionnel
 try:
     from ..models.bulletin import Bulletin, Eleve, AppreciationMatiere, PERIOD_CODES
+    from ..models.class_matrix import ClassMatrix
     from ..utils.semester import (
         Period,
         Semester,
@@ -24,11 +24,14 @@ try:
         period_from_metadata,
         period_system_from_metadata,
     )
+    from ..services import json_backend
+    from ..services.metadata_sidecar import effective_metadata
     from ..services.period_history import (
         resolve_period_links,
         load_history_bulletins,
         build_display_bulletins,
     )
+    from ..services.subject_registry import SubjectRegistry
     from .period_links_panel import open_period_links_dialog
     from ..utils.paths import get_documents_dir
     from . import theme
@@ -36,6 +39,7 @@ except ImportError:
     import sys
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from models.bulletin import Bulletin, Eleve, AppreciationMatiere, PERIOD_CODES
+    from models.class_matrix import ClassMatrix
     from utils.semester import (
         Period,
         Semester,
@@ -45,11 +49,14 @@ except ImportError:
         period_from_metadata,
         period_system_from_metadata,
     )
+    from services import json_backend
+    from services.metadata_sidecar import effective_metadata
     from services.period_history import (
         resolve_period_links,
         load_history_bulletins,
         build_display_bulletins,
     )
+    from services.subject_registry import SubjectRegistry
     sys.path.insert(0, str(Path(__file__).parent))
     from period_links_panel import open_period_links_dialog
     from utils.paths import get_documents_dir
@@ -64,6 +71,7 @@ class ConseilWindow:
         self.parent_window = parent_window
         self.json_file_path = json_file_path
         self.bulletins: List[Bulletin] = []
+        self.class_matrix: Optional[ClassMatrix] = None
         self.current_bulletin_index: int = 0
         self.conseil_data: Dict[str, Any] = {}
         self.period: Period = initial_semester or Period.S2
@@ -266,7 +274,7 @@ class ConseilWindow:
 
     def _merge_linked_periods(self, current_bulletins: List[Bulletin]) -> List[Bulletin]:
         """
-        Fusionne (lecture seule) les bulletins des périodes liées dans une copie
+        Fusionne (lecture seule) les bulletins des périodes liées dans une vue
         des bulletins courants pour reconstruire la vue multi-périodes.
         """
         if not self.json_file_path:
@@ -276,7 +284,8 @@ class ConseilWindow:
             if not links:
                 return current_bulletins
             history = load_history_bulletins(links)
-            return build_display_bulletins(current_bulletins, history, self.period.value)
+            registry = SubjectRegistry.for_directory(os.path.dirname(self.json_file_path))
+            return build_display_bulletins(current_bulletins, history, self.period.value, registry)
         except Exception:
             return current_bulletins
 
@@ -649,14 +658,14 @@ class ConseilWindow:
     def _load_bulletins_from_file(self, file_path: str):
         """Charge les bulletins depuis un fichier JSON"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
+            raw_data = json_backend.load(file_path)
             
             metadata = {}
             data = raw_data
             if raw_data and isinstance(raw_data[0], dict) and '_metadata' in raw_data[0]:
                 metadata = raw_data[0].get('_metadata') or {}
                 data = raw_data[1:]
+            metadata = effective_metadata(file_path, metadata)
             
             self.metadata = metadata
             if self._forced_initial_period is not None:
@@ -674,6 +683,7 @@ class ConseilWindow:
             self.json_file_path = file_path
             # Fusionner (lecture seule) les periodes liees pour la vue d'ensemble
             self.bulletins = self._merge_linked_periods(current_bulletins)
+            self.class_matrix = ClassMatrix.from_bulletins(self.bulletins)
             
             # Adapter les colonnes/sections aux périodes réellement présentes
             self._apply_period_ui_state()
@@ -749,28 +759,24 @@ class ConseilWindow:
                 values.append(str(retards) if retards is not None else "-")
             
             if len(self.period_codes) >= 2:
-                values.append(self._compute_evolution(appreciation))
+                values.append(self._compute_evolution(matiere_nom))
             
             self.synthesis_tree.insert('', 'end', values=tuple(values))
     
-    def _compute_evolution(self, appreciation) -> str:
+    def _compute_evolution(self, matiere_nom: str) -> str:
         """Calcule l'évolution entre les deux dernières périodes disponibles."""
-        moyennes = []
-        for code in self.period_codes:
-            periode = appreciation.get_periode(code)
-            if periode and periode.moyenne is not None:
-                moyennes.append(periode.moyenne)
-        if len(moyennes) < 2:
+        if self.class_matrix is None:
             return "-"
-        try:
-            diff = float(moyennes[-1]) - float(moyennes[-2])
-            if diff > 0:
-                return f"+{diff:.2f} \u2191"
-            elif diff < 0:
-                return f"{diff:.2f} \u2193"
-            return "= \u2192"
-        except (ValueError, TypeError):
+        diff = self.class_matrix.evolution(
+            self.current_bulletin_index, matiere_nom, self.period_codes
+        )
+        if diff is None:
             return "-"
+        if diff > 0:
+            return f"+{diff:.2f} \u2191"
+        elif diff < 0:
+            return f"{diff:.2f} \u2193"
+        return "= \u2192"
     
     def _update_detailed_view(self, bulletin):
         """Met à jour la vue détaillée optimisée pour les appréciations"""
@@ -6,7 +6,6 @@ Fenêtre d'édition des bulletins de l'application BGRAPP Pyconseil
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import json
 import os
 from datetime import datetime
 from pathlib import Path
@@ -14,7 +13,7 @@ from typing import Any, Dict, List, Optional
 
 # Import conditionnel
 try:
-    from ..models.bulletin import Bulletin, Eleve, AppreciationMatiere, PERIOD_CODES
+    from ..models.bulletin import Bulletin, Eleve, AppreciationMatiere, LazyBulletin, PERIOD_CODES
     from ..utils.semester import (
         Period,
         Semester,
@@ -24,19 +23,22 @@ try:
         period_from_metadata,
         period_system_from_metadata,
     )
+    from ..services import json_backend
+    from ..services.metadata_sidecar import effective_metadata
     from ..services.json_generator import save_output_json
     from ..services.period_history import (
         resolve_period_links,
         load_history_bulletins,
         build_display_bulletins,
     )
+    from ..services.subject_registry import SubjectRegistry
     from .period_links_panel import open_period_links_dialog
     from ..utils.paths import get_documents_dir
     from . import theme
 except ImportError:
     import sys
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from models.bulletin import Bulletin, Eleve, AppreciationMatiere, PERIOD_CODES
+    from models.bulletin import Bulletin, Eleve, AppreciationMatiere, LazyBulletin, PERIOD_CODES
     from utils.semester import (
         Period,
         Semester,
@@ -46,12 +48,15 @@ except ImportError:
         period_from_metadata,
         period_system_from_metadata,
     )
+    from services import json_backend
+    from services.metadata_sidecar import effective_metadata
     from services.json_generator import save_output_json
     from services.period_history import (
         resolve_period_links,
         load_history_bulletins,
         build_display_bulletins,
     )
+    from services.subject_registry import SubjectRegistry
     sys.path.insert(0, str(Path(__file__).parent))
     from period_links_panel import open_period_links_dialog
     from utils.paths import get_documents_dir
@@ -157,8 +162,9 @@ class EditionWindow:
 
     def _merge_linked_periods(self, current_bulletins: List[Bulletin]) -> List[Bulletin]:
         """
-        Construit une copie des bulletins enrichie des périodes liées (lecture
-        seule) pour l'affichage des colonnes ; n'altère pas self.bulletins.
+        Construit une vue des bulletins enrichie des périodes liées (lecture
+        seule, sans copie) pour l'affichage des colonnes ; n'altère pas
+        self.bulletins.
         """
         if not self.json_file_path:
             return list(current_bulletins)
@@ -167,7 +173,8 @@ class EditionWindow:
             if not links:
                 return build_display_bulletins(current_bulletins, {}, self._file_period.value)
             history = load_history_bulletins(links)
-            return build_display_bulletins(current_bulletins, history, self._file_period.value)
+            registry = SubjectRegistry.for_directory(os.path.dirname(self.json_file_path))
+            return build_display_bulletins(current_bulletins, history, self._file_period.value, registry)
         except Exception:
             return list(current_bulletins)
 
@@ -179,8 +186,8 @@ class EditionWindow:
         present = set()
         source = self.display_bulletins or self.bulletins
         for bulletin in source:
-            for appreciation in bulletin.matieres.values():
-                present.update(appreciation.periodes.keys())
+            # Sans construire les matières des bulletins non consultés
+            present.update(bulletin.period_codes())
         # Toujours inclure la période du fichier (même si vide)
         present.add(self._file_period.value)
         
@@ -548,14 +555,14 @@ class EditionWindow:
     def _load_bulletins_from_file(self, file_path: str):
         """Charge les bulletins depuis un fichier"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
+            raw_data = json_backend.load(file_path)
             
             metadata = {}
             data = raw_data
             if raw_data and isinstance(raw_data[0], dict) and '_metadata' in raw_data[0]:
                 metadata = raw_data[0].get('_metadata') or {}
                 data = raw_data[1:]
+            metadata = effective_metadata(file_path, metadata)
             
             self.metadata = metadata
             # Période du fichier : toujours déduite du JSON (pas du sélecteur d'affichage)
@@ -567,9 +574,10 @@ class EditionWindow:
             else:
                 self.period = self._file_period
             
+            # Matières construites à la première consultation de chaque élève
             self.bulletins = []
             for bulletin_data in data:
-                bulletin = Bulletin.from_dict(bulletin_data)
+                bulletin = LazyBulletin.from_dict(bulletin_data)
                 self.bulletins.append(bulletin)
             
             self.json_file_path = file_path
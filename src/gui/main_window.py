@@ -17,12 +17,16 @@ try:
     from ..services.main_processor import (
         process_directory_to_json, 
         get_processing_summary,
+        sniff_directory_period,
         MainProcessorError
     )
     from .config_window import ConfigWindow
     from .csv_renamer_window import CsvRenamerWindow
     from .period_links_panel import open_period_links_dialog
-    from ..services.period_history import default_period_filename, resolve_period_links
+    from ..services.period_history import default_period_filename, read_metadata, resolve_period_links
+    from ..services.instrumentation import format_stage_summary
+    from ..services import json_backend
+    from ..services.metadata_sidecar import effective_metadata
     from ..utils.semester import (
         Period,
         Semester,
@@ -42,13 +46,17 @@ except ImportError:
     from services.main_processor import (
         process_directory_to_json, 
         get_processing_summary,
+        sniff_directory_period,
         MainProcessorError
     )
     sys.path.insert(0, str(Path(__file__).parent))
     from config_window import ConfigWindow
     from csv_renamer_window import CsvRenamerWindow
     from period_links_panel import open_period_links_dialog
-    from services.period_history import default_period_filename, resolve_period_links
+    from services.period_history import default_period_filename, read_metadata, resolve_period_links
+    from services.instrumentation import format_stage_summary
+    from services import json_backend
+    from services.metadata_sidecar import effective_metadata
     from utils.semester import (
         Period,
         Semester,
@@ -469,7 +477,9 @@ class MainWindow:
                 self.selected_directory,
                 self.output_json_path,
                 validate_data=True,
-                period_override=self._period_override
+                period_override=self._period_override,
+                use_cache=True,
+                instrument=True
             )
             
             # Programmer la mise à jour de l'interface dans le thread principal
@@ -492,11 +502,21 @@ class MainWindow:
         self._log_message(f"Fichier sauvé: {result['output_file']}", "success")
         detected_semester = self._parse_semester_string(result.get('semester'))
         self._remember_semester(detected_semester)
+        # Périodes présentes : issues du traitement, sans relire le JSON écrit
+        periods = [Period.from_code(code) for code in result.get('periods') or []]
         self._update_period_selector(
-            self._read_available_periods(self.output_json_path),
+            [p for p in periods if p is not None] or self._read_available_periods(self.output_json_path),
             detected_semester
         )
         
+        # Durée par étape (lecture, fusion, statistiques, écriture...)
+        stages = format_stage_summary(result.get('instrumentation'))
+        if stages:
+            total = result['instrumentation']['wall_s']
+            self._log_message(f"{theme.LOG_INFO} Durée du traitement: {total:.2f} s")
+            for line in stages:
+                self._log_message(f"   • {line}")
+        
         # Afficher les avertissements s'il y en a
         if result['warnings']:
             self._log_message(f"{theme.LOG_WARN} {len(result['warnings'])} avertissement(s):")
@@ -543,15 +563,14 @@ class MainWindow:
         
         try:
             # Valider que le fichier JSON est bien formaté et contient des bulletins
-            import json
-            with open(json_path, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
+            raw_data = json_backend.load(json_path)
             
             metadata = {}
             data = raw_data
             if raw_data and isinstance(raw_data[0], dict) and '_metadata' in raw_data[0]:
                 metadata = raw_data[0].get('_metadata') or {}
                 data = raw_data[1:]
+            metadata = effective_metadata(json_path, metadata)
             
             # Vérifier la structure basique
             if not isinstance(data, list):
@@ -621,7 +640,7 @@ class MainWindow:
                 f"Vous pouvez maintenant accéder aux fenêtres d'édition et de conseil."
             )
             
-        except json.JSONDecodeError as e:
+        except json_backend.JSONDecodeError as e:
             error_msg = f"Fichier JSON invalide: {str(e)}"
             self._log_message(f"{theme.LOG_ERR} {error_msg}", "error")
             messagebox.showerror("Erreur de format", error_msg)
@@ -723,13 +742,24 @@ class MainWindow:
             self._log_message(f"{theme.LOG_INFO} Période détectée: {semester.label}", "info")
 
     def _detect_period_from_directory(self):
-        """Déduit la période depuis le nom du dossier sélectionné (T1/T2/T3/S1/S2)."""
+        """Déduit la période depuis le nom du dossier sélectionné (T1/T2/T3/S1/S2),
+        sinon depuis les en-têtes des CSV (lecture de la première ligne seulement)."""
         folder_period = period_from_directory_name(self.selected_directory)
         if folder_period is None:
             self._period_override = None
+            sniffed = sniff_directory_period(self.selected_directory)
+            if sniffed is None:
+                self._log_message(
+                    f"{theme.LOG_INFO} Période non déduite du nom du dossier — détection automatique au traitement",
+                    "info"
+                )
+                return
+            # Même résultat que la détection au traitement : pas de forçage
+            self._remember_semester(sniffed, log=False)
+            self._update_period_selector(periods_for_system(sniffed.system), sniffed)
             self._log_message(
-                f"{theme.LOG_INFO} Période non déduite du nom du dossier — détection automatique au traitement",
-                "info"
+                f"{theme.LOG_INFO} Période détectée dans les en-têtes CSV: {sniffed.label}",
+                "success"
             )
             return
 
@@ -746,9 +776,7 @@ class MainWindow:
     def _read_available_periods(self, json_path: str):
         """Lit les périodes réellement présentes dans un fichier JSON de bulletins."""
         try:
-            import json
-            with open(json_path, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
+            raw_data = json_backend.load(json_path)
             data = raw_data
             if raw_data and isinstance(raw_data[0], dict) and '_metadata' in raw_data[0]:
                 data = raw_data[1:]
@@ -802,12 +830,7 @@ class MainWindow:
         if not self.output_json_path or not os.path.exists(self.output_json_path):
             return
         try:
-            import json
-            with open(self.output_json_path, 'r', encoding='utf-8') as f:
-                raw_data = json.load(f)
-            metadata = {}
-            if raw_data and isinstance(raw_data[0], dict) and '_metadata' in raw_data[0]:
-                metadata = raw_data[0].get('_metadata') or {}
+            metadata = read_metadata(self.output_json_path)
             links = resolve_period_links(
                 self.output_json_path, metadata, self._last_semester.value
             )
@@ -17,7 +17,7 @@ from typing import Callable, Optional
 # Import conditionnel
 try:
     from ..services.period_history import (
-        read_payload,
+        read_metadata,
         resolve_period_links,
         discover_sibling_period_files,
         add_period_link,
@@ -34,7 +34,7 @@ except ImportError:
     import sys
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from services.period_history import (
-        read_payload,
+        read_metadata,
         resolve_period_links,
         discover_sibling_period_files,
         add_period_link,
@@ -60,7 +60,7 @@ class PeriodLinksDialog:
         self._row_paths: dict[str, str] = {}
 
         # Charger la metadata courante du fichier
-        self.metadata, _data = read_payload(json_path)
+        self.metadata = read_metadata(json_path)
 
         self.root = tk.Toplevel(parent) if parent else tk.Toplevel()
         self.root.title(theme.DIALOG_PERIOD_LINKS_TITLE)
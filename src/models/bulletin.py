@@ -7,22 +7,33 @@ Les données sont stockées par période (S1/S2 en mode semestre,
 T1/T2/T3 en mode trimestre) afin de supporter les deux organisations.
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 import re
+import sys
 
 
 # Codes de période reconnus (ordre canonique pour la sérialisation/affichage)
 PERIOD_CODES = ("S1", "S2", "T1", "T2", "T3")
 
+# Instances sans __dict__ : `dataclass(slots=True)` n'existe qu'à partir de
+# Python 3.10 ; avant, les dataclasses gardent leur __dict__ (les classes
+# écrites à la main déclarent __slots__ dans tous les cas).
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class Eleve:
     """Représente un élève avec ses informations de base."""
     nom: str
     prenom: str
     classe: Optional[str] = None
 
+    def clone(self) -> 'Eleve':
+        """Copie indépendante (plus rapide que `copy.deepcopy`)."""
+        return Eleve(self.nom, self.prenom, self.classe)
+
     @classmethod
     def from_full_name(cls, full_name: str) -> 'Eleve':
         """
@@ -63,7 +74,7 @@ class Eleve:
         return f"{self.nom} {self.prenom}"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class PeriodeData:
     """Données d'une matière pour une période donnée."""
     heures_absence: Optional[str] = None
@@ -73,6 +84,11 @@ class PeriodeData:
     moyenne_max: Optional[float] = None
     appreciation: Optional[str] = None
 
+    def clone(self) -> 'PeriodeData':
+        """Copie indépendante (valeurs immuables : copie superficielle suffisante)."""
+        return PeriodeData(self.heures_absence, self.retards, self.moyenne,
+                           self.moyenne_min, self.moyenne_max, self.appreciation)
+
     def is_empty(self) -> bool:
         """Indique si la période ne contient aucune donnée utile."""
         return (
@@ -86,6 +102,8 @@ class PeriodeData:
 class AppreciationMatiere:
     """Représente l'appréciation d'un élève dans une matière, par période."""
 
+    __slots__ = ("matiere", "periodes")
+
     def __init__(self, matiere: str,
                  periodes: Optional[Dict[str, PeriodeData]] = None,
                  *,
@@ -132,6 +150,13 @@ class AppreciationMatiere:
             self.periodes[code] = PeriodeData()
         return self.periodes[code]
 
+    def clone(self) -> 'AppreciationMatiere':
+        """Copie indépendante, périodes comprises (remplace `copy.deepcopy`)."""
+        clone = AppreciationMatiere.__new__(AppreciationMatiere)
+        clone.matiere = self.matiere
+        clone.periodes = {code: periode.clone() for code, periode in self.periodes.items()}
+        return clone
+
     # ------------------------------------------------------------------
     # Propriétés de rétro-compatibilité (ancien format S1/S2)
     # ------------------------------------------------------------------
@@ -253,6 +278,8 @@ class AppreciationMatiere:
 class Bulletin:
     """Représente le bulletin complet d'un élève."""
 
+    __slots__ = ("eleve", "appreciations_generales", "matieres")
+
     def __init__(self, eleve: Eleve,
                  appreciations_generales: Optional[Dict[str, str]] = None,
                  matieres: Optional[Dict[str, AppreciationMatiere]] = None,
@@ -320,6 +347,21 @@ class Bulletin:
         """Récupère l'appréciation d'une matière donnée."""
         return self.matieres.get(nom_matiere)
 
+    def period_codes(self) -> Set[str]:
+        """Codes des périodes présentes dans les matières du bulletin."""
+        codes: Set[str] = set()
+        for appreciation in self.matieres.values():
+            codes.update(appreciation.periodes)
+        return codes
+
+    def clone(self) -> 'Bulletin':
+        """Copie indépendante du bulletin (remplace `copy.deepcopy`)."""
+        clone = Bulletin.__new__(Bulletin)
+        clone.eleve = self.eleve.clone()
+        clone.appreciations_generales = dict(self.appreciations_generales)
+        clone.matieres = {nom: app.clone() for nom, app in self.matieres.items()}
+        return clone
+
     # ------------------------------------------------------------------
     # Sérialisation
     # ------------------------------------------------------------------
@@ -347,6 +389,11 @@ class Bulletin:
     @classmethod
     def from_dict(cls, data: Dict) -> 'Bulletin':
         """Crée un bulletin à partir d'un dictionnaire (formats ancien et nouveau)."""
+        return cls._from_dict(data)
+
+    @classmethod
+    def _from_dict(cls, data: Dict, pending=None) -> 'Bulletin':
+        """Voir `from_dict` ; `pending` : collecte des conversions différées."""
         eleve = Eleve(
             nom=data["Nom"],
             prenom=data["Prenom"]
@@ -363,7 +410,7 @@ class Bulletin:
         # Charger les matières
         if "Matieres" in data:
             for nom_matiere, matiere_data in data["Matieres"].items():
-                appreciation = _appreciation_from_dict(nom_matiere, matiere_data)
+                appreciation = _appreciation_from_dict(nom_matiere, matiere_data, pending)
                 bulletin.add_matiere(appreciation)
 
         return bulletin
@@ -377,39 +424,168 @@ _FIELD_KEY_PATTERN = re.compile(
     r"^(HeuresAbsence|Retards|Moyenne|Appreciation)(S1|S2|T1|T2|T3)(Min|Max)?$"
 )
 
+# Motifs des absences : "XhMM" / "Xh" (stockage) et heures seules (ancien format)
+_ABSENCE_PATTERN = re.compile(r'^(\d+)\s*h\s*(\d{0,2})$')
+_HEURES_PATTERN = re.compile(r'(\d+)h')
+
+
+@lru_cache(maxsize=1024)
+def _parse_field_key(key: Any) -> Optional[Tuple[str, str, Optional[str]]]:
+    """(champ, période, suffixe) d'une clé sérialisée, ou None (mémoïsé :
+    les mêmes clés reviennent pour chaque matière de chaque bulletin)."""
+    match = _FIELD_KEY_PATTERN.match(str(key))
+    return match.groups() if match else None
+
+
+# Champ JSON -> attribut de PeriodeData (les moyennes selon leur suffixe)
+_MOYENNE_ATTRIBUTES = {None: "moyenne", "Min": "moyenne_min", "Max": "moyenne_max"}
+
+
+def _appreciation_from_dict(nom_matiere: str, matiere_data: Dict,
+                            pending: Optional[Dict[str, List[Tuple['PeriodeData', str, Any]]]] = None
+                            ) -> AppreciationMatiere:
+    """
+    Reconstruit une AppreciationMatiere depuis sa représentation JSON.
 
-def _appreciation_from_dict(nom_matiere: str, matiere_data: Dict) -> AppreciationMatiere:
-    """Reconstruit une AppreciationMatiere depuis sa représentation JSON."""
+    Si `pending` est fourni, les valeurs à convertir (absences, retards,
+    moyennes) y sont seulement collectées, par type, sous la forme
+    (période, attribut, valeur brute) : l'appelant les convertit ensuite en
+    bloc (voir `bulletins_from_dicts`).
+    """
     appreciation = AppreciationMatiere(matiere=nom_matiere)
 
     if not isinstance(matiere_data, dict):
         return appreciation
 
     for key, value in matiere_data.items():
-        match = _FIELD_KEY_PATTERN.match(str(key))
-        if not match:
+        parts = _parse_field_key(key)
+        if parts is None:
             continue
-        field_name, code, suffix = match.group(1), match.group(2), match.group(3)
+        field_name, code, suffix = parts
         periode = appreciation.ensure_periode(code)
 
-        if field_name == "HeuresAbsence":
+        if field_name == "Appreciation":
+            periode.appreciation = value
+        elif pending is not None:
+            if field_name == "HeuresAbsence":
+                pending["absence"].append((periode, "heures_absence", value))
+            elif field_name == "Retards":
+                pending["retards"].append((periode, "retards", value))
+            else:
+                pending["moyenne"].append((periode, _MOYENNE_ATTRIBUTES[suffix], value))
+        elif field_name == "HeuresAbsence":
             periode.heures_absence = normalize_absence(value)
         elif field_name == "Retards":
             periode.retards = parse_retards(value)
-        elif field_name == "Appreciation":
-            periode.appreciation = value
         elif field_name == "Moyenne":
-            parsed = parse_moyenne(str(value)) if value is not None else None
-            if suffix == "Min":
-                periode.moyenne_min = parsed
-            elif suffix == "Max":
-                periode.moyenne_max = parsed
-            else:
-                periode.moyenne = parsed
+            setattr(periode, _MOYENNE_ATTRIBUTES[suffix], parse_moyenne(value))
 
     return appreciation
 
 
+def bulletins_from_dicts(items: Iterable[Dict]) -> List['Bulletin']:
+    """
+    Reconstruit une liste de bulletins depuis leur représentation JSON.
+
+    Équivalent à `[Bulletin.from_dict(item) for item in items]`, mais les
+    absences, retards et moyennes de tous les bulletins sont convertis en
+    bloc (`normalize_absence_bulk`, `parse_retards_bulk`,
+    `parse_moyenne_bulk`) plutôt que valeur par valeur.
+
+    Args:
+        items: Dictionnaires de bulletins (sans l'entrée `_metadata`)
+
+    Returns:
+        Liste de bulletins
+    """
+    pending: Dict[str, List[Tuple[PeriodeData, str, Any]]] = {
+        "absence": [], "retards": [], "moyenne": [],
+    }
+    bulletins = [Bulletin._from_dict(item, pending) for item in items]
+    converters = {
+        "absence": normalize_absence_bulk,
+        "retards": parse_retards_bulk,
+        "moyenne": parse_moyenne_bulk,
+    }
+    for kind, entries in pending.items():
+        if not entries:
+            continue
+        parsed = converters[kind]([value for _periode, _attribute, value in entries])
+        for (periode, attribute, _value), result in zip(entries, parsed):
+            setattr(periode, attribute, result)
+    return bulletins
+
+
+class LazyBulletin(Bulletin):
+    """
+    Bulletin chargé depuis un dictionnaire JSON, dont les matières ne sont
+    construites qu'au premier accès à `matieres`.
+
+    `Bulletin.from_dict` analyse toutes les clés de toutes les matières de
+    chaque élève, alors qu'une fenêtre n'en affiche souvent que quelques-uns.
+    L'élève et les appréciations générales sont lus immédiatement ; le
+    dictionnaire `Matieres` brut est conservé (sans être modifié : il peut
+    être partagé, voir `payload_cache`) jusqu'à la première lecture de
+    `matieres`, qui construit alors les AppreciationMatiere comme
+    `Bulletin.from_dict`. Toute autre méthode de Bulletin (`to_dict`,
+    `clone`, propriétés S1/S2...) passe par `matieres` et reste identique.
+    """
+
+    __slots__ = ("_raw_matieres", "_matieres")
+
+    def __init__(self, data: Dict):
+        """
+        Args:
+            data: Dictionnaire d'un bulletin (format de `Bulletin.to_dict`)
+        """
+        super().__init__(Eleve(nom=data["Nom"], prenom=data["Prenom"]))
+        for code in PERIOD_CODES:
+            texte = data.get(f"AppreciationGenerale{code}")
+            if texte:
+                self.appreciations_generales[code] = texte
+        raw = data.get("Matieres")
+        self._raw_matieres: Optional[Dict] = raw if isinstance(raw, dict) else {}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LazyBulletin':
+        """Crée un bulletin paresseux à partir d'un dictionnaire."""
+        return cls(data)
+
+    @property
+    def matieres(self) -> Dict[str, AppreciationMatiere]:
+        if self._raw_matieres is not None:
+            raw, self._raw_matieres = self._raw_matieres, None
+            self._matieres = {
+                nom: _appreciation_from_dict(nom, matiere_data)
+                for nom, matiere_data in raw.items()
+            }
+        return self._matieres
+
+    @matieres.setter
+    def matieres(self, value: Dict[str, AppreciationMatiere]) -> None:
+        # Appelé aussi par Bulletin.__init__ : le brut éventuel est posé après
+        self._raw_matieres = None
+        self._matieres = value
+
+    @property
+    def is_materialized(self) -> bool:
+        """Indique si les matières ont déjà été construites."""
+        return self._raw_matieres is None
+
+    def period_codes(self) -> Set[str]:
+        """Comme `Bulletin.period_codes`, sans construire les matières."""
+        if self._raw_matieres is None:
+            return super().period_codes()
+        codes: Set[str] = set()
+        for matiere_data in self._raw_matieres.values():
+            if isinstance(matiere_data, dict):
+                for key in matiere_data:
+                    parts = _parse_field_key(key)
+                    if parts is not None:
+                        codes.add(parts[1])
+        return codes
+
+
 def parse_heures_absence(heures_str: str) -> Optional[int]:
     """
     Parse une chaîne d'heures d'absence (ex: "3h00", "1h30") en nombre d'heures.
@@ -430,7 +606,7 @@ def parse_heures_absence(heures_str: str) -> Optional[int]:
         return None
 
     # Rechercher pattern comme "3h00", "1h30", etc.
-    match = re.search(r'(\d+)h', heures_str)
+    match = _HEURES_PATTERN.search(heures_str)
     if match:
         return int(match.group(1))
 
@@ -461,7 +637,7 @@ def normalize_absence(value) -> Optional[str]:
         return None
 
     # Déjà au format "XhMM" / "Xh"
-    match = re.match(r'^(\d+)\s*h\s*(\d{0,2})$', text)
+    match = _ABSENCE_PATTERN.match(text)
     if match:
         heures = int(match.group(1))
         minutes = int(match.group(2)) if match.group(2) else 0
@@ -487,7 +663,7 @@ def absence_to_hours(value) -> Optional[float]:
     text = str(value).strip()
     if text == "":
         return None
-    match = re.match(r'^(\d+)\s*h\s*(\d{0,2})$', text)
+    match = _ABSENCE_PATTERN.match(text)
     if match:
         heures = int(match.group(1))
         minutes = int(match.group(2)) if match.group(2) else 0
@@ -540,3 +716,71 @@ def parse_moyenne(moyenne_str: str) -> Optional[float]:
         return float(moyenne_str.replace(',', '.'))
     except (ValueError, TypeError):
         return None
+
+
+# ----------------------------------------------------------------------
+# Conversions en bloc
+# ----------------------------------------------------------------------
+def _convert_bulk(values: Iterable[Any], scalar: Callable[[Any], Any]) -> List[Any]:
+    """
+    Applique `scalar` à toute une colonne, une seule fois par valeur distincte.
+
+    Une colonne d'export contient beaucoup de doublons ("", "0h00", "N.Not",
+    notes arrondies) : chaque valeur distincte est convertie par la fonction
+    unitaire puis réutilisée, ce qui garantit un résultat identique à l'appel
+    valeur par valeur. La clé inclut le type (1, 1.0 et True sont égaux mais
+    ne se convertissent pas pareil ; les zéros réels ne sont pas mis en
+    cache pour préserver le signe de -0.0).
+    """
+    if hasattr(values, "tolist"):
+        values = values.tolist()  # Series / ndarray -> scalaires Python
+    converted: Dict[Tuple[type, Any], Any] = {}
+    results = []
+    append = results.append
+    for value in values:
+        if isinstance(value, float) and value == 0.0:
+            append(scalar(value))  # 0.0 et -0.0 sont égaux mais distincts
+            continue
+        key = (value.__class__, value)
+        try:
+            append(converted[key])
+        except KeyError:
+            result = converted[key] = scalar(value)
+            append(result)
+        except TypeError:  # valeur non hachable
+            append(scalar(value))
+    return results
+
+
+def _parse_moyenne_fast(value: Any) -> Optional[float]:
+    """`parse_moyenne` avec raccourci pour les nombres déjà numériques (JSON)."""
+    value_type = value.__class__
+    if value_type is float and value == value:
+        return value  # float(str(x)) restitue x bit à bit (repr aller-retour)
+    if value_type is int and -2 ** 53 <= value <= 2 ** 53:
+        return float(value)  # entier exactement représentable
+    return parse_moyenne(value)
+
+
+def parse_moyenne_bulk(values: Iterable[Any]) -> List[Optional[float]]:
+    """`parse_moyenne` appliquée à une colonne (liste, Series...)."""
+    if hasattr(values, "tolist"):
+        values = values.tolist()
+    if all(value.__class__ is float for value in values):
+        return [_parse_moyenne_fast(value) for value in values]
+    return _convert_bulk(values, _parse_moyenne_fast)
+
+
+def normalize_absence_bulk(values: Iterable[Any]) -> List[Optional[str]]:
+    """`normalize_absence` appliquée à une colonne (liste, Series...)."""
+    return _convert_bulk(values, normalize_absence)
+
+
+def absence_to_hours_bulk(values: Iterable[Any]) -> List[Optional[float]]:
+    """`absence_to_hours` appliquée à une colonne (liste, Series...)."""
+    return _convert_bulk(values, absence_to_hours)
+
+
+def parse_retards_bulk(values: Iterable[Any]) -> List[Optional[int]]:
+    """`parse_retards` appliquée à une colonne (liste, Series...)."""
+    return _convert_bulk(values, parse_retards)
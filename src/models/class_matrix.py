@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Matrice dense des données chiffrées d'une classe (moyennes, absences, retards).
+
+Les bulletins stockent leurs valeurs dans des dictionnaires imbriqués
+(`Bulletin.matieres[nom].periodes[code]`) : tout calcul à l'échelle de la
+classe parcourt des objets Python. `ClassMatrix` en est la vue compagnon :
+des tableaux NumPy indexés [élève, matière, période], avec des masques pour
+les valeurs absentes. Elle est construite une fois depuis la liste de
+bulletins, peut être tenue à jour lors des éditions (`set_values`,
+`refresh_student`) et réexportée vers les bulletins (`export_to_bulletins`).
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .bulletin import (
+    AppreciationMatiere, Bulletin, PeriodeData, PERIOD_CODES, absence_to_hours, absence_to_hours_bulk,
+    normalize_absence,
+)
+
+
+# Grandeurs calculées par `ClassMatrix.statistics` (hors rang)
+STAT_NAMES = ("count", "min", "max", "mean", "median", "std", "q1", "q3")
+
+
+class ClassMatrix:
+    """
+    Tableaux [élève, matière, période] d'une classe.
+
+    Attributs:
+        students: Clés « NOM Prénom », dans l'ordre des bulletins
+        subjects: Noms de matières (ordre d'index)
+        periods: Codes de période (ordre canonique `PERIOD_CODES`)
+        moyennes, heures_absence, retards: Tableaux float64 (NaN si absent)
+        has_subject: Masque [élève, matière] — matière présente au bulletin
+        has_period: Masque [élève, matière, période] — PeriodeData présente
+    """
+
+    def __init__(self, students: Sequence[str], subjects: Sequence[str], periods: Sequence[str]):
+        self.students = list(students)
+        self.subjects = list(subjects)
+        self.periods = list(periods)
+        self._subject_index = {name: i for i, name in enumerate(self.subjects)}
+        self._period_index = {code: i for i, code in enumerate(self.periods)}
+        shape = (len(self.students), len(self.subjects), len(self.periods))
+        self.moyennes = np.full(shape, np.nan)
+        self.heures_absence = np.full(shape, np.nan)
+        self.retards = np.full(shape, np.nan)
+        self.has_subject = np.zeros(shape[:2], dtype=bool)
+        self.has_period = np.zeros(shape, dtype=bool)
+        self._bulletins: List[Bulletin] = []
+
+    # ------------------------------------------------------------------
+    # Construction / synchronisation
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_bulletins(cls, bulletins: Sequence[Bulletin],
+                       subjects: Optional[Iterable[str]] = None,
+                       periods: Optional[Iterable[str]] = None) -> 'ClassMatrix':
+        """
+        Construit la matrice d'une classe en un seul parcours des bulletins.
+
+        Args:
+            bulletins: Bulletins de la classe (l'ordre définit l'index élève)
+            subjects: Matières à retenir (défaut : toutes, triées)
+            periods: Périodes à retenir (défaut : celles présentes)
+
+        Returns:
+            Matrice liée aux bulletins (les éditions via `set_values` sont
+            répercutées sur les deux)
+        """
+        if subjects is None or periods is None:
+            found_subjects = set()
+            found_periods = set()
+            for bulletin in bulletins:
+                for name, appreciation in bulletin.matieres.items():
+                    found_subjects.add(name)
+                    found_periods.update(appreciation.periodes)
+            if subjects is None:
+                subjects = sorted(found_subjects)
+            if periods is None:
+                periods = [code for code in PERIOD_CODES if code in found_periods]
+                periods += sorted(found_periods.difference(PERIOD_CODES))
+
+        matrix = cls(
+            [f"{b.eleve.nom} {b.eleve.prenom}" for b in bulletins],
+            list(subjects),
+            list(periods),
+        )
+        matrix._bulletins = list(bulletins)
+        matrix._load(range(len(matrix._bulletins)))
+        return matrix
+
+    def refresh_student(self, student: int) -> None:
+        """Relit toutes les valeurs d'un bulletin (après une édition externe)."""
+        self.moyennes[student] = np.nan
+        self.heures_absence[student] = np.nan
+        self.retards[student] = np.nan
+        self.has_subject[student] = False
+        self.has_period[student] = False
+        self._load([student])
+
+    def _load(self, students: Iterable[int]) -> None:
+        """Remplit les cellules des élèves donnés en une affectation par tableau."""
+        subject_index = self._subject_index
+        period_index = self._period_index
+        n_subjects, n_periods = len(self.subjects), len(self.periods)
+        subject_cells: List[int] = []
+        cells: List[int] = []
+        moyennes, absences, retards = [], [], []
+        for student in students:
+            for name, appreciation in self._bulletins[student].matieres.items():
+                s = subject_index.get(name)
+                if s is None:
+                    continue
+                row = student * n_subjects + s
+                subject_cells.append(row)
+                row *= n_periods
+                for code, periode in appreciation.periodes.items():
+                    p = period_index.get(code)
+                    if p is None:
+                        continue
+                    cells.append(row + p)
+                    moyennes.append(periode.moyenne)
+                    absences.append(periode.heures_absence)
+                    retards.append(periode.retards)
+
+        # Index à plat : les tableaux sont contigus, reshape(-1) est une vue
+        self.has_subject.reshape(-1)[subject_cells] = True
+        self.has_period.reshape(-1)[cells] = True
+        self.moyennes.reshape(-1)[cells] = _to_float_array(moyennes)
+        self.heures_absence.reshape(-1)[cells] = _to_float_array(absence_to_hours_bulk(absences))
+        self.retards.reshape(-1)[cells] = _to_float_array(retards)
+
+    def _load_cell(self, student: int, s: int, p: int, periode: PeriodeData) -> None:
+        self.has_period[student, s, p] = True
+        self.moyennes[student, s, p] = _to_float(periode.moyenne)
+        self.heures_absence[student, s, p] = _to_float(absence_to_hours(periode.heures_absence))
+        self.retards[student, s, p] = _to_float(periode.retards)
+
+    def set_values(self, student: int, subject: str, period: str, **values) -> PeriodeData:
+        """
+        Modifie une cellule dans le bulletin et dans la matrice.
+
+        Args:
+            student: Index de l'élève
+            subject: Nom de la matière
+            period: Code de période
+            **values: Champs de PeriodeData à modifier (moyenne,
+                heures_absence, retards...)
+
+        Returns:
+            La PeriodeData modifiée
+
+        Raises:
+            KeyError: Si la matière ou la période n'appartient pas à la matrice
+        """
+        s = self._subject_index[subject]
+        p = self._period_index[period]
+        bulletin = self._bulletins[student]
+        appreciation = bulletin.get_matiere(subject)
+        if appreciation is None:
+            appreciation = AppreciationMatiere(matiere=subject)
+            bulletin.add_matiere(appreciation)
+        periode = appreciation.ensure_periode(period)
+        for field, value in values.items():
+            setattr(periode, field, value)
+        self.has_subject[student, s] = True
+        self._load_cell(student, s, p, periode)
+        return periode
+
+    def export_to_bulletins(self, bulletins: Optional[Sequence[Bulletin]] = None) -> None:
+        """
+        Réécrit les valeurs de la matrice dans les bulletins.
+
+        Les absences ne sont réécrites (au format "XhMM") que si leur valeur
+        diffère de celle du bulletin, pour ne pas altérer un texte d'origine.
+
+        Args:
+            bulletins: Bulletins cibles (défaut : ceux de la construction)
+        """
+        targets = list(bulletins) if bulletins is not None else self._bulletins
+        present = np.argwhere(self.has_period)
+        for student, s, p in present.tolist():
+            appreciation = targets[student].get_matiere(self.subjects[s])
+            if appreciation is None:
+                continue
+            periode = appreciation.ensure_periode(self.periods[p])
+            periode.moyenne = _to_optional(self.moyennes[student, s, p])
+            retards = _to_optional(self.retards[student, s, p])
+            periode.retards = int(retards) if retards is not None else None
+            heures = _to_optional(self.heures_absence[student, s, p])
+            if heures != absence_to_hours(periode.heures_absence):
+                periode.heures_absence = normalize_absence(heures)
+
+    # ------------------------------------------------------------------
+    # Calculs de classe
+    # ------------------------------------------------------------------
+    @property
+    def has_moyenne(self) -> np.ndarray:
+        """Masque [élève, matière, période] des moyennes renseignées."""
+        return ~np.isnan(self.moyennes)
+
+    def subject_index(self, subject: str) -> int:
+        return self._subject_index[subject]
+
+    def period_index(self, period: str) -> int:
+        return self._period_index[period]
+
+    def min_max(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Moyennes min et max de la classe par [matière, période].
+
+        Returns:
+            (min, max) en float64, NaN si aucune moyenne
+        """
+        filled = self.has_moyenne.any(axis=0)
+        minimum = np.full(filled.shape, np.nan)
+        maximum = np.full(filled.shape, np.nan)
+        if filled.any():
+            low = np.where(np.isnan(self.moyennes), np.inf, self.moyennes).min(axis=0)
+            high = np.where(np.isnan(self.moyennes), -np.inf, self.moyennes).max(axis=0)
+            minimum[filled] = low[filled]
+            maximum[filled] = high[filled]
+        return minimum, maximum
+
+    def statistics(self) -> Dict[str, np.ndarray]:
+        """
+        Statistiques de classe par [matière, période], en un seul tri.
+
+        Les moyennes sont triées une fois le long de l'axe élève (NaN en
+        fin) ; toutes les grandeurs en découlent. Écart-type de population,
+        quartiles et médiane par interpolation linéaire (comme
+        `numpy.percentile`). Rang de compétition : 1 + nombre de moyennes
+        strictement supérieures (ex aequo au même rang).
+
+        Returns:
+            {"count", "min", "max", "mean", "median", "std", "q1", "q3"}
+            en tableaux [matière, période] (NaN si aucune moyenne, sauf count),
+            et "rank" en tableau [élève, matière, période] (NaN si pas de moyenne)
+        """
+        values = np.sort(self.moyennes, axis=0)
+        counts = (~np.isnan(values)).sum(axis=0)
+        filled = counts > 0
+        stats: Dict[str, np.ndarray] = {'count': counts}
+        rank = np.full(self.moyennes.shape, np.nan)
+        if not len(self.students):
+            for name in STAT_NAMES[1:]:
+                stats[name] = np.full(counts.shape, np.nan)
+            stats['rank'] = rank
+            return stats
+
+        last = np.maximum(counts, 1) - 1
+        missing = np.isnan(values)
+        mean = np.where(missing, 0.0, values).sum(axis=0) / (last + 1)
+        deviation = np.where(missing, 0.0, values - mean)
+        std = np.sqrt((deviation * deviation).sum(axis=0) / (last + 1))
+
+        def quantile(q: float) -> np.ndarray:
+            position = last * q
+            lower = np.floor(position).astype(int)
+            upper = np.minimum(lower + 1, last)
+            low = np.take_along_axis(values, lower[None], axis=0)[0]
+            high = np.take_along_axis(values, upper[None], axis=0)[0]
+            return low + (high - low) * (position - lower)
+
+        for name, array in (('min', values[0]), ('max', quantile(1.0)), ('mean', mean),
+                            ('median', quantile(0.5)), ('std', std),
+                            ('q1', quantile(0.25)), ('q3', quantile(0.75))):
+            stats[name] = np.where(filled, array, np.nan)
+
+        for s, p in np.argwhere(filled).tolist():
+            column = self.moyennes[:, s, p]
+            present = ~np.isnan(column)
+            ordered = values[:counts[s, p], s, p]
+            rank[present, s, p] = (
+                counts[s, p] - np.searchsorted(ordered, column[present], side='right') + 1
+            )
+        stats['rank'] = rank
+        return stats
+
+    def evolution(self, student: int, subject: str,
+                  periods: Optional[Sequence[str]] = None) -> Optional[float]:
+        """
+        Écart entre les deux dernières moyennes renseignées d'un élève.
+
+        Args:
+            student: Index de l'élève
+            subject: Nom de la matière
+            periods: Périodes considérées, dans l'ordre (défaut : toutes)
+
+        Returns:
+            Dernière moyenne moins l'avant-dernière, ou None
+        """
+        s = self._subject_index.get(subject)
+        if s is None:
+            return None
+        codes = self.periods if periods is None else periods
+        indices = [self._period_index[c] for c in codes if c in self._period_index]
+        values = self.moyennes[student, s, indices]
+        values = values[~np.isnan(values)]
+        if len(values) < 2:
+            return None
+        return float(values[-1]) - float(values[-2])
+
+
+def _to_float(value) -> float:
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _to_float_array(values: List) -> np.ndarray:
+    """Convertit une liste (None → NaN) ; valeur par valeur si types inattendus."""
+    try:
+        return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        return np.array([_to_float(v) for v in values], dtype=float)
+
+
+def _to_optional(value) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
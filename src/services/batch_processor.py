@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Traitement par lot (sans interface graphique) d'une arborescence de classes.
+
+Parcourt un dossier racine, retient chaque sous-dossier valide au sens de
+`validate_source_directory` (source.xlsx + CSV matières) et lance
+`process_directory_to_json` sur chacun, en parallèle dans un pool de
+processus. Le fichier produit suit la convention `<base>_<CODE>.json` de
+`default_period_filename`. Un fichier déjà présent n'est pas écrasé (il peut
+contenir des retouches manuelles ou des appréciations générées) : le dossier
+est ignoré et signalé, sauf avec `--force` (reconstruction complète) ou
+`--incremental` (mise à jour des seules matières modifiées). Un résumé
+exploitable par machine (JSON) est produit en fin de traitement : compteurs,
+avertissements, durées, dossiers ignorés et échecs.
+
+Usage :
+    python main.py batch RACINE [--workers N] [--period T2]
+                               [--period-override 3A=T3] [--summary resume.json]
+                               [--incremental | --force]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional
+
+# Import conditionnel pour gérer les imports relatifs
+try:
+    from .file_reader import validate_source_directory, natural_sort_key
+    from .main_processor import process_directory_to_json, sniff_directory_period
+    from .period_history import default_period_filename
+    from ..utils.semester import Period, period_from_directory_name
+except ImportError:
+    # Fallback pour l'exécution directe via PYTHONPATH
+    from services.file_reader import validate_source_directory, natural_sort_key
+    from services.main_processor import process_directory_to_json, sniff_directory_period
+    from services.period_history import default_period_filename
+    from utils.semester import Period, period_from_directory_name
+
+
+class BatchProcessorError(Exception):
+    """Exception levée en cas d'erreur du traitement par lot."""
+    pass
+
+
+def find_class_directories(root: str) -> List[str]:
+    """
+    Liste les dossiers classe valides d'une arborescence.
+
+    Les dossiers cachés (ex: `.pyconseil_cache`) ne sont pas parcourus.
+
+    Args:
+        root: Dossier racine à parcourir
+
+    Returns:
+        Chemins absolus des dossiers valides, en tri naturel
+
+    Raises:
+        BatchProcessorError: Si le dossier racine n'existe pas
+    """
+    if not os.path.isdir(root):
+        raise BatchProcessorError(f"Dossier racine non trouvé: {root}")
+
+    root = os.path.abspath(root)
+    directories = []
+    for current, subdirs, _files in os.walk(root):
+        subdirs[:] = [d for d in subdirs if not d.startswith('.')]
+        if validate_source_directory(current)['valid']:
+            directories.append(current)
+    return sorted(
+        directories,
+        key=lambda d: [natural_sort_key(part) for part in os.path.relpath(d, root).split(os.sep)]
+    )
+
+
+def _process_class_directory(directory: str,
+                             period_code: Optional[str],
+                             base: str,
+                             options: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Traite un dossier classe (exécuté dans un processus du pool).
+
+    Si la période n'est pas connue d'avance, elle est détectée depuis les
+    en-têtes des CSV ; à défaut, le JSON est produit sous un nom provisoire
+    puis renommé selon la période détectée au traitement. Un JSON existant
+    n'est écrasé qu'avec l'option `force` (ou mis à jour avec `incremental`).
+    """
+    started = time.perf_counter()
+    entry: Dict[str, Any] = {
+        'directory': directory,
+        'success': False,
+        'skipped': False,
+        'output_file': None,
+        'period': period_code,
+        'bulletins_count': 0,
+        'matieres_count': 0,
+        'warnings': [],
+        'duration_s': 0.0,
+        'error': None,
+    }
+    period = Period.from_code(period_code) if period_code else None
+    resolved = period or sniff_directory_period(directory)
+    incremental = options.get('incremental', False)
+    keep_existing = not options.get('force', False) and not incremental
+    if resolved is not None:
+        output_path = os.path.join(directory, default_period_filename(directory, resolved.value, base))
+        if keep_existing and os.path.exists(output_path):
+            return _skipped(entry, output_path, resolved.value, started)
+    else:
+        output_path = os.path.join(directory, f".{base}_en_cours.json")
+
+    try:
+        result = process_directory_to_json(
+            directory,
+            output_path,
+            validate_data=options.get('validate_data', True),
+            period_override=period,
+            max_workers=options.get('csv_workers', 1),
+            use_cache=options.get('use_cache', False),
+            incremental=incremental and resolved is not None,
+            fuzzy_names=options.get('fuzzy_names', False),
+        )
+        if resolved is None:
+            final_path = os.path.join(directory, default_period_filename(directory, result['period'], base))
+            if keep_existing and os.path.exists(final_path):
+                os.remove(output_path)
+                return _skipped(entry, final_path, result['period'], started)
+            os.replace(output_path, final_path)
+            output_path = final_path
+        entry.update({
+            'success': True,
+            'output_file': output_path,
+            'period': result['period'],
+            'bulletins_count': result['bulletins_count'],
+            'matieres_count': result['matieres_count'],
+            'warnings': list(result['warnings']),
+        })
+    except Exception as e:
+        entry['error'] = str(e)
+        if resolved is None and os.path.exists(output_path):
+            try:
+                os.remove(output_path)
+            except OSError:
+                pass
+    entry['duration_s'] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def _skipped(entry: Dict[str, Any], output_path: str, period_code: str,
+             started: float) -> Dict[str, Any]:
+    """Entrée d'un dossier dont le JSON existe déjà et n'est pas écrasé."""
+    entry.update({
+        'success': True,
+        'skipped': True,
+        'output_file': output_path,
+        'period': period_code,
+        'duration_s': round(time.perf_counter() - started, 3),
+    })
+    return entry
+
+
+def process_tree(root: str,
+                 max_workers: Optional[int] = None,
+                 period_override: Optional[Period] = None,
+                 period_overrides: Optional[Mapping[str, str]] = None,
+                 base: str = "output",
+                 validate_data: bool = True,
+                 use_cache: bool = False,
+                 incremental: bool = False,
+                 fuzzy_names: bool = False,
+                 force: bool = False) -> Dict[str, Any]:
+    """
+    Traite tous les dossiers classe d'une arborescence.
+
+    Période de chaque dossier : surcharge propre au dossier, sinon période
+    imposée pour tout le lot, sinon nom du dossier, sinon détection depuis
+    les CSV.
+
+    Args:
+        root: Dossier racine
+        max_workers: Nombre de processus (None = nombre de cœurs, 1 = séquentiel)
+        period_override: Période imposée pour tous les dossiers
+        period_overrides: Périodes par dossier {chemin (absolu ou relatif à root): code}
+        base: Préfixe des fichiers JSON produits
+        validate_data: Si True, valide la cohérence des données
+        use_cache: Si True, utilise le cache de lecture de chaque dossier
+        incremental: Si True, met à jour les JSON existants en ne
+            refusionnant que les matières modifiées
+        fuzzy_names: Si True, rapproche approximativement les noms d'élèves
+        force: Si True, reconstruit et écrase les JSON existants (sinon les
+            dossiers concernés sont ignorés, sauf en mode incrémental)
+
+    Returns:
+        Résumé du lot (voir module)
+    """
+    started_at = datetime.utcnow().isoformat(timespec="seconds")
+    started = time.perf_counter()
+    directories = find_class_directories(root)
+
+    overrides: Dict[str, str] = {}
+    for path, code in (period_overrides or {}).items():
+        absolute = path if os.path.isabs(path) else os.path.join(root, path)
+        overrides[os.path.normpath(os.path.abspath(absolute))] = code
+
+    options = {
+        'validate_data': validate_data,
+        'use_cache': use_cache,
+        'incremental': incremental,
+        'fuzzy_names': fuzzy_names,
+        'force': force,
+        'csv_workers': 1,
+    }
+    tasks = []
+    for directory in directories:
+        code = overrides.get(os.path.normpath(directory))
+        if code is None and period_override is not None:
+            code = period_override.value
+        if code is None:
+            folder_period = period_from_directory_name(directory)
+            code = folder_period.value if folder_period else None
+        tasks.append((directory, code))
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    workers = max(1, min(max_workers, len(tasks)))
+    if workers == 1:
+        entries = [
+            _process_class_directory(directory, code, base, options)
+            for directory, code in tasks
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_process_class_directory, directory, code, base, options)
+                for directory, code in tasks
+            ]
+            entries = [future.result() for future in futures]
+
+    failures = [
+        {'directory': e['directory'], 'error': e['error']}
+        for e in entries if not e['success']
+    ]
+    skipped = [
+        {'directory': e['directory'], 'output_file': e['output_file']}
+        for e in entries if e['skipped']
+    ]
+    return {
+        'root': os.path.abspath(root),
+        'started_at': started_at,
+        'duration_s': round(time.perf_counter() - started, 3),
+        'workers': workers,
+        'counts': {
+            'directories': len(entries),
+            'succeeded': len(entries) - len(failures) - len(skipped),
+            'skipped': len(skipped),
+            'failed': len(failures),
+            'bulletins': sum(e['bulletins_count'] for e in entries),
+            'warnings': sum(len(e['warnings']) for e in entries),
+        },
+        'directories': entries,
+        'skipped': skipped,
+        'failures': failures,
+    }
+
+
+def _parse_period(value: str) -> Period:
+    period = Period.from_code(value)
+    if period is None:
+        raise argparse.ArgumentTypeError(f"Période inconnue: {value} (S1, S2, T1, T2 ou T3)")
+    return period
+
+
+def _parse_override(value: str):
+    directory, sep, code = value.rpartition('=')
+    if not sep or not directory:
+        raise argparse.ArgumentTypeError(f"Format attendu DOSSIER=CODE: {value}")
+    return directory, _parse_period(code).value
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée en ligne de commande.
+
+    Returns:
+        Code de sortie : 0 si tous les dossiers ont été traités, 1 sinon
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Génère les JSON de toutes les classes d'une arborescence, sans interface.",
+    )
+    parser.add_argument("root", help="Dossier racine contenant les dossiers classe")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("--period", type=_parse_period, default=None,
+                        help="Période imposée pour tous les dossiers (ex: T2)")
+    parser.add_argument("--period-override", type=_parse_override, action="append", default=[],
+                        metavar="DOSSIER=CODE", help="Période d'un dossier précis (répétable)")
+    parser.add_argument("--base", default="output", help="Préfixe des fichiers JSON (défaut : output)")
+    parser.add_argument("--no-validate", action="store_true", help="Ne pas valider la cohérence")
+    parser.add_argument("--cache", action="store_true", help="Utiliser le cache de lecture")
+    overwrite = parser.add_mutually_exclusive_group()
+    overwrite.add_argument("--incremental", action="store_true",
+                           help="Mettre à jour les JSON existants (matières modifiées seulement)")
+    overwrite.add_argument("--force", action="store_true",
+                           help="Reconstruire et écraser les JSON existants")
+    parser.add_argument("--fuzzy-names", action="store_true",
+                        help="Rapprocher approximativement les noms d'élèves des CSV")
+    parser.add_argument("--summary", default=None,
+                        help="Fichier où écrire le résumé JSON (défaut : sortie standard)")
+    args = parser.parse_args(argv)
+
+    try:
+        summary = process_tree(
+            args.root,
+            max_workers=args.workers,
+            period_override=args.period,
+            period_overrides=dict(args.period_override),
+            base=args.base,
+            validate_data=not args.no_validate,
+            use_cache=args.cache,
+            incremental=args.incremental,
+            fuzzy_names=args.fuzzy_names,
+            force=args.force,
+        )
+    except BatchProcessorError as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        return 1
+
+    text = json.dumps(summary, ensure_ascii=False, indent=2)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0 if summary['counts']['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,24 +5,33 @@ Convertit les données brutes en objets Bulletin.
 """
 
 import re
-from typing import List, Dict, Any, Optional, Tuple, Sequence
+from typing import List, Dict, Any, Optional, Tuple, Sequence, Iterable, Iterator
+
+import numpy as np
+
 # Import conditionnel pour gérer les imports relatifs
 try:
     from ..models.bulletin import (
-        Eleve, AppreciationMatiere, Bulletin,
-        parse_heures_absence, parse_moyenne, parse_retards,
-        normalize_absence, absence_to_hours,
+        Eleve, AppreciationMatiere, Bulletin, PeriodeData,
+        parse_heures_absence, parse_moyenne, normalize_absence,
+        parse_moyenne_bulk, parse_retards_bulk, normalize_absence_bulk,
     )
-    from .file_reader import FileReaderError
+    from ..models.class_matrix import ClassMatrix, STAT_NAMES
+    from .validation import ValidationContext, validate, report_messages
+    from .student_index import StudentIndex
+    from .file_reader import FileReaderError, CLASS_COLUMN, iter_source_xlsx, list_source_classes
     from ..utils.semester import Period, PeriodSystem, PERIOD_CODES
 except ImportError:
     # Fallback pour l'exécution directe via PYTHONPATH
     from models.bulletin import (
-        Eleve, AppreciationMatiere, Bulletin,
-        parse_heures_absence, parse_moyenne, parse_retards,
-        normalize_absence, absence_to_hours,
+        Eleve, AppreciationMatiere, Bulletin, PeriodeData,
+        parse_heures_absence, parse_moyenne, normalize_absence,
+        parse_moyenne_bulk, parse_retards_bulk, normalize_absence_bulk,
     )
-    from services.file_reader import FileReaderError
+    from models.class_matrix import ClassMatrix, STAT_NAMES
+    from services.validation import ValidationContext, validate, report_messages
+    from services.student_index import StudentIndex
+    from services.file_reader import FileReaderError, CLASS_COLUMN, iter_source_xlsx, list_source_classes
     from utils.semester import Period, PeriodSystem, PERIOD_CODES
 
 
@@ -56,14 +65,15 @@ def _read_general_appreciation_value(eleve_dict: Dict[str, Any], code: str) -> O
 
 
 def create_bulletins_from_source(
-    eleves_data: List[Dict[str, Any]],
+    eleves_data: Iterable[Dict[str, Any]],
     period: Optional[Period] = None,
 ) -> List[Bulletin]:
     """
     Crée les objets Bulletin à partir des données du fichier source.xlsx.
     
     Args:
-        eleves_data: Données des élèves du fichier source.xlsx
+        eleves_data: Données des élèves du fichier source.xlsx (liste, ou
+            itérateur comme `iter_source_xlsx` pour une lecture en flux)
         
     Returns:
         Liste d'objets Bulletin avec les informations de base
@@ -71,12 +81,11 @@ def create_bulletins_from_source(
     Raises:
         BulletinProcessorError: Si les données sont invalides
     """
-    if not eleves_data:
-        raise BulletinProcessorError("Aucune donnée d'élève fournie")
-    
     bulletins = []
+    has_rows = False
     
     for eleve_dict in eleves_data:
+        has_rows = True
         try:
             # Extraire le nom complet de l'élève
             nom_complet = eleve_dict.get('Élève')
@@ -116,9 +125,44 @@ def create_bulletins_from_source(
         except Exception as e:
             raise BulletinProcessorError(f"Erreur lors de la création du bulletin: {str(e)}")
     
+    if not has_rows:
+        raise BulletinProcessorError("Aucune donnée d'élève fournie")
     return bulletins
 
 
+def create_bulletins_by_class(
+    source_path: str,
+    period: Optional[Period] = None,
+    classes: Optional[Iterable[str]] = None,
+    class_column: str = CLASS_COLUMN,
+) -> Iterator[Tuple[str, List[Bulletin]]]:
+    """
+    Construit les bulletins d'un source.xlsx consolidé, une classe à la fois.
+
+    Chaque classe est lue en flux (`iter_source_xlsx` filtré sur
+    `class_column`) : seuls les bulletins de la classe en cours sont en
+    mémoire, au prix d'un parcours du classeur par classe.
+
+    Args:
+        source_path: Chemin du source.xlsx consolidé
+        period: Période courante (voir `create_bulletins_from_source`)
+        classes: Classes à construire (défaut : toutes, en tri naturel)
+        class_column: Nom de la colonne portant la classe
+
+    Yields:
+        (classe, bulletins de la classe)
+
+    Raises:
+        FileReaderError: Si le classeur ne peut pas être lu
+        BulletinProcessorError: Si une classe demandée n'a aucun élève
+    """
+    if classes is None:
+        classes = list_source_classes(source_path, class_column)
+    for classe in classes:
+        eleves = iter_source_xlsx(source_path, classe=classe, class_column=class_column)
+        yield classe, create_bulletins_from_source(eleves, period=period)
+
+
 def parse_rappel_periode(rappel_text: str) -> Tuple[Optional[float], Optional[str], Optional[str]]:
     """
     Parse une colonne 'Rappel de la période précédente' pour extraire
@@ -176,7 +220,8 @@ parse_rappel_s1 = parse_rappel_periode
 def populate_bulletins_from_csv(bulletins: List[Bulletin], 
                                matiere_data: List[Dict[str, Any]], 
                                matiere_name: str,
-                               period: Period) -> None:
+                               period: Period,
+                               index: Optional[StudentIndex] = None) -> None:
     """
     Ajoute les appréciations d'une matière aux bulletins existants pour
     la période courante détectée.
@@ -186,6 +231,9 @@ def populate_bulletins_from_csv(bulletins: List[Bulletin],
         matiere_data: Données de la matière depuis le CSV
         matiere_name: Nom de la matière
         period: Période détectée (S1/S2/T1/T2/T3) pour le mapping des colonnes
+        index: Index d'identité des élèves, à partager entre les matières
+            d'une classe (défaut : index construit sur `bulletins`). Les
+            lignes non rapprochées y sont consignées.
         
     Raises:
         BulletinProcessorError: Si les données sont incohérentes
@@ -199,11 +247,9 @@ def populate_bulletins_from_csv(bulletins: List[Bulletin],
     
     code = period.value  # ex: "T3", "S2"
     
-    # Créer un index des bulletins par nom complet d'élève
-    bulletins_index = {}
-    for bulletin in bulletins:
-        nom_complet = f"{bulletin.eleve.nom} {bulletin.eleve.prenom}"
-        bulletins_index[nom_complet] = bulletin
+    # Index des bulletins par nom exact et par clé normalisée
+    if index is None:
+        index = StudentIndex(bulletins)
     
     def _get_first_value(row: Dict[str, Any], keys: Sequence[str]) -> Optional[Any]:
         """Retourne la première valeur non vide correspondant aux clés données."""
@@ -215,20 +261,21 @@ def populate_bulletins_from_csv(bulletins: List[Bulletin],
                 return value
         return None
     
+    absences: List[Tuple[PeriodeData, Any]] = []
+    retards: List[Tuple[PeriodeData, Any]] = []
+    moyennes: List[Tuple[PeriodeData, Any]] = []
+
     # Traiter chaque ligne de données de matière
     for ligne in matiere_data:
         nom_eleve = ligne.get('Élève')
         if not nom_eleve:
             continue
         
-        # Nettoyer le nom (supprimer les guillemets)
-        nom_eleve = str(nom_eleve).strip('"').strip()
-        
-        # Trouver le bulletin correspondant
-        bulletin = bulletins_index.get(nom_eleve)
+        # Trouver le bulletin correspondant (accents, espaces et tirets près)
+        bulletin = index.lookup(nom_eleve, matiere_name)
         if not bulletin:
-            # Élève non trouvé dans source.xlsx - on continue sans erreur
-            # (peut arriver si les fichiers ne sont pas parfaitement synchronisés)
+            # Élève non trouvé dans source.xlsx ou ambigu : consigné dans le
+            # rapport de l'index, la ligne est ignorée
             continue
         
         # Récupérer (ou créer) l'appréciation pour cette matière
@@ -239,23 +286,22 @@ def populate_bulletins_from_csv(bulletins: List[Bulletin],
         
         periode_data = appreciation.ensure_periode(code)
         
-        # Parser les heures d'absence (stockage fidèle "XhMM")
+        # Heures d'absence (stockage fidèle "XhMM"), retards et moyenne de
+        # la période courante : valeurs collectées puis converties en bloc
         heures_abs_value = _get_first_value(ligne, ['H.Abs.', 'H Abs.', 'Absences'])
         if heures_abs_value:
-            periode_data.heures_absence = normalize_absence(heures_abs_value)
+            absences.append((periode_data, heures_abs_value))
         
-        # Parser les retards
         retards_value = _get_first_value(ligne, ['Ret.', 'Retards', 'Ret'])
         if retards_value is not None:
-            periode_data.retards = parse_retards(retards_value)
+            retards.append((periode_data, retards_value))
         
-        # Parser la moyenne de la période courante
         moy_value = _get_first_value(
             ligne,
             [f'Moy. {code}', f'Moyenne {code}', 'Moy.', 'Moyenne']
         )
         if moy_value is not None:
-            periode_data.moyenne = parse_moyenne(str(moy_value))
+            moyennes.append((periode_data, moy_value))
         
         # Parser l'appréciation principale
         appreciation_value = _get_first_value(
@@ -285,96 +331,126 @@ def populate_bulletins_from_csv(bulletins: List[Bulletin],
                 if app_prev is not None:
                     prev_data.appreciation = app_prev
 
+    for (periode_data, _value), heures in zip(
+            absences, normalize_absence_bulk([value for _periode, value in absences])):
+        periode_data.heures_absence = heures
+    for (periode_data, _value), nombre in zip(
+            retards, parse_retards_bulk([value for _periode, value in retards])):
+        periode_data.retards = nombre
+    for (periode_data, _value), moyenne in zip(
+            moyennes, parse_moyenne_bulk([value for _periode, value in moyennes])):
+        periode_data.moyenne = moyenne
+
 
-def calculate_min_max_moyennes(bulletins: List[Bulletin]) -> None:
+def calculate_min_max_moyennes(bulletins: List[Bulletin],
+                               matieres: Optional[Iterable[str]] = None,
+                               matrix: Optional[ClassMatrix] = None) -> None:
     """
     Calcule les moyennes min/max par matière et par période pour tous
     les bulletins.
     
+    Les clés `Moyenne<CODE>Min/Max` par élève font partie du format JSON
+    documenté ; les autres statistiques de classe sont calculées une seule
+    fois par `compute_class_statistics`.
+    
     Args:
         bulletins: Liste des bulletins à traiter
+        matieres: Matières à recalculer (None = toutes les matières)
+        matrix: Matrice déjà construite sur ces bulletins (évite de la
+            reconstruire ; ignorée si `matieres` est fourni)
     """
     if not bulletins:
         return
     
-    # Collecter toutes les matières
-    matieres = set()
+    if matrix is None or matieres is not None:
+        matrix = ClassMatrix.from_bulletins(
+            bulletins, subjects=sorted(set(matieres)) if matieres is not None else None
+        )
+    minimum, maximum = matrix.min_max()
+    bornes = {
+        matiere: {
+            code: (_optional_float(minimum[s, p]), _optional_float(maximum[s, p]))
+            for p, code in enumerate(matrix.periods)
+        }
+        for s, matiere in enumerate(matrix.subjects)
+    }
+    
+    # Pour chaque période présente, reporter min/max de la classe
     for bulletin in bulletins:
-        matieres.update(bulletin.matieres.keys())
+        for matiere_name, appreciation in bulletin.matieres.items():
+            par_periode = bornes.get(matiere_name)
+            if par_periode is None:
+                continue
+            for code, periode in appreciation.periodes.items():
+                periode.moyenne_min, periode.moyenne_max = par_periode[code]
+
+
+def compute_class_statistics(bulletins: List[Bulletin],
+                             matrix: Optional[ClassMatrix] = None) -> Dict[str, Any]:
+    """
+    Calcule les statistiques de la classe en une passe, à stocker une seule
+    fois dans les métadonnées du JSON (clé `class_stats`).
     
-    # Pour chaque matière, calculer min/max par période présente
-    for matiere_name in matieres:
-        # Identifier les périodes présentes pour cette matière
-        codes = set()
-        for bulletin in bulletins:
-            appreciation = bulletin.get_matiere(matiere_name)
-            if appreciation:
-                codes.update(appreciation.periodes.keys())
+    Args:
+        bulletins: Liste des bulletins de la classe
+        matrix: Matrice déjà construite sur ces bulletins (optionnelle)
         
-        for code in codes:
-            moyennes = []
-            for bulletin in bulletins:
-                appreciation = bulletin.get_matiere(matiere_name)
-                if not appreciation:
-                    continue
-                periode = appreciation.get_periode(code)
-                if periode and periode.moyenne is not None:
-                    moyennes.append(periode.moyenne)
-            
-            min_val = min(moyennes) if moyennes else None
-            max_val = max(moyennes) if moyennes else None
-            
-            for bulletin in bulletins:
-                appreciation = bulletin.get_matiere(matiere_name)
-                if not appreciation:
-                    continue
-                periode = appreciation.get_periode(code)
-                if periode:
-                    periode.moyenne_min = min_val
-                    periode.moyenne_max = max_val
+    Returns:
+        {"matieres": {matiere: {code: {count, min, max, mean, median, std, q1, q3}}},
+         "rangs": {matiere: {code: {"NOM Prénom": rang}}}}
+        — seules les (matière, période) ayant au moins une moyenne figurent.
+        Les homonymes sont distingués dans l'ordre des bulletins :
+        "NOM Prénom", puis "NOM Prénom (2)", "NOM Prénom (3)"...
+    """
+    if matrix is None:
+        matrix = ClassMatrix.from_bulletins(bulletins)
+    stats = matrix.statistics()
+    columns = {name: stats[name].tolist() for name in STAT_NAMES}
+    ranks = stats['rank']
+    labels = _student_labels(matrix.students)
+    
+    matieres: Dict[str, Dict[str, Any]] = {}
+    rangs: Dict[str, Dict[str, Any]] = {}
+    for s, matiere in enumerate(matrix.subjects):
+        for p, code in enumerate(matrix.periods):
+            if not columns['count'][s][p]:
+                continue
+            matieres.setdefault(matiere, {})[code] = {
+                name: columns[name][s][p] for name in STAT_NAMES
+            }
+            column = ranks[:, s, p]
+            rangs.setdefault(matiere, {})[code] = {
+                labels[i]: int(column[i]) for i in np.flatnonzero(~np.isnan(column)).tolist()
+            }
+    return {'matieres': matieres, 'rangs': rangs}
+
+
+def _student_labels(names: List[str]) -> List[str]:
+    """Clés des élèves par ligne de la matrice, homonymes numérotés à partir de 2."""
+    seen: Dict[str, int] = {}
+    labels = []
+    for name in names:
+        seen[name] = seen.get(name, 0) + 1
+        labels.append(name if seen[name] == 1 else f"{name} ({seen[name]})")
+    return labels
+
+
+def _optional_float(value) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
 
 
 def validate_bulletins_consistency(bulletins: List[Bulletin]) -> List[str]:
     """
     Valide la cohérence des données dans les bulletins.
     
+    Raccourci vers le moteur de règles (`services.validation`) sans contexte
+    de classe : seuls les messages de gravité « avertissement » ou plus sont
+    retournés.
+    
     Args:
         bulletins: Liste des bulletins à valider
         
     Returns:
         Liste des messages d'avertissement/erreur trouvés
     """
-    warnings = []
-    
-    if not bulletins:
-        warnings.append("Aucun bulletin à valider")
-        return warnings
-    
-    # Vérifier les doublons d'élèves
-    noms_complets = []
-    for bulletin in bulletins:
-        nom_complet = f"{bulletin.eleve.nom} {bulletin.eleve.prenom}"
-        if nom_complet in noms_complets:
-            warnings.append(f"Élève en doublon: {nom_complet}")
-        noms_complets.append(nom_complet)
-    
-    # Vérifier la cohérence des données par matière
-    for bulletin in bulletins:
-        nom_eleve = f"{bulletin.eleve.nom} {bulletin.eleve.prenom}"
-        
-        for matiere_name, appreciation in bulletin.matieres.items():
-            for code, periode in appreciation.periodes.items():
-                # Vérifier que les moyennes sont dans une plage raisonnable
-                if periode.moyenne is not None and (periode.moyenne < 0 or periode.moyenne > 20):
-                    warnings.append(
-                        f"{nom_eleve} - {matiere_name} {code}: Moyenne suspecte ({periode.moyenne})"
-                    )
-                
-                # Vérifier que les heures d'absence ne sont pas excessives
-                heures = absence_to_hours(periode.heures_absence)
-                if heures is not None and heures > 100:  # Plus de 100h semble suspect
-                    warnings.append(
-                        f"{nom_eleve} - {matiere_name} {code}: Heures d'absence élevées ({periode.heures_absence})"
-                    )
-    
-    return warnings 
\ No newline at end of file
+    return report_messages(validate(ValidationContext(bulletins)))
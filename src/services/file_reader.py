@@ -5,10 +5,20 @@ Lit le fichier source.xlsx et les fichiers CSV par matière.
 """
 
 import pandas as pd
+import csv
+import io
 import os
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
 from pathlib import Path
+from openpyxl import load_workbook
+
+# Import conditionnel pour gérer les imports relatifs
+try:
+    from .student_index import student_key
+except ImportError:
+    # Fallback pour l'exécution directe via PYTHONPATH
+    from services.student_index import student_key
 
 
 def _natural_tokens(text: str):
@@ -47,12 +57,60 @@ class FileReaderError(Exception):
     pass
 
 
-def read_source_xlsx(file_path: str) -> List[Dict[str, Any]]:
+def _strip_string_column(column: pd.Series) -> pd.Series:
+    """Supprime les espaces autour des chaînes d'une colonne (autres valeurs inchangées)."""
+    if pd.api.types.infer_dtype(column, skipna=True) == 'string':
+        return column.str.strip()
+    # Colonne mixte (ex: nombres et textes) : ne toucher qu'aux chaînes
+    return column.map(lambda value: value.strip() if isinstance(value, str) else value)
+
+
+def _frame_to_records(df: pd.DataFrame,
+                      strip_strings: bool = False,
+                      leading: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Convertit un DataFrame en liste de dictionnaires sans boucle par cellule.
+
+    Équivalent à un parcours `df.iterrows()` avec `pd.isna` sur chaque valeur :
+    les valeurs manquantes deviennent None et, si demandé, les chaînes sont
+    nettoyées de leurs espaces. Les traitements sont faits par colonne puis
+    sur le tableau complet, avant une conversion unique en enregistrements.
+
+    Args:
+        df: DataFrame lu depuis le fichier source
+        strip_strings: Si True, supprime les espaces autour des chaînes
+        leading: Clés/valeurs à placer en tête de chaque enregistrement
+
+    Returns:
+        Liste de dictionnaires (une entrée par ligne)
+    """
+    if strip_strings:
+        df = df.copy()
+        for col in df.columns:
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = _strip_string_column(df[col])
+
+    # `df.values` fournit les mêmes valeurs (et types) que `iterrows()`
+    values = df.values
+    missing = pd.isna(values)
+    if missing.any():
+        values = values.astype(object)
+        values[missing] = None
+
+    columns = list(df.columns)
+    if leading:
+        return [{**leading, **dict(zip(columns, row))} for row in values.tolist()]
+    return [dict(zip(columns, row)) for row in values.tolist()]
+
+
+def read_source_xlsx(file_path: str, cache=None) -> List[Dict[str, Any]]:
     """
     Lit le fichier source.xlsx et retourne la liste des élèves.
     
     Args:
         file_path: Chemin vers le fichier source.xlsx
+        cache: `ParseCache` optionnel (résultat réutilisé si le fichier
+            n'a pas changé depuis la dernière lecture)
         
     Returns:
         Liste de dictionnaires contenant les données des élèves
@@ -63,6 +121,15 @@ def read_source_xlsx(file_path: str) -> List[Dict[str, Any]]:
     if not os.path.exists(file_path):
         raise FileReaderError(f"Fichier source non trouvé: {file_path}")
     
+    if cache is not None:
+        return cache.get_or_parse(
+            file_path, "source_xlsx", lambda: _parse_source_xlsx(file_path)
+        )
+    return _parse_source_xlsx(file_path)
+
+
+def _parse_source_xlsx(file_path: str) -> List[Dict[str, Any]]:
+    """Lecture effective de source.xlsx (voir `read_source_xlsx`)."""
     try:
         # Lire le fichier Excel
         df = pd.read_excel(file_path)
@@ -71,17 +138,8 @@ def read_source_xlsx(file_path: str) -> List[Dict[str, Any]]:
         if 'Élève' not in df.columns:
             raise FileReaderError("Colonne 'Élève' manquante dans le fichier source.xlsx")
         
-        # Convertir en liste de dictionnaires
-        eleves_data = []
-        for _, row in df.iterrows():
-            eleve_dict = {}
-            for col in df.columns:
-                # Conserver toutes les colonnes, nettoyer les valeurs NaN
-                value = row[col]
-                if pd.isna(value):
-                    value = None
-                eleve_dict[col] = value
-            eleves_data.append(eleve_dict)
+        # Conversion colonne par colonne (NaN -> None) puis en enregistrements
+        eleves_data = _frame_to_records(df)
         
         return eleves_data
         
@@ -89,14 +147,226 @@ def read_source_xlsx(file_path: str) -> List[Dict[str, Any]]:
         raise FileReaderError(f"Erreur lors de la lecture du fichier source.xlsx: {str(e)}")
 
 
-def read_csv_matiere(file_path: str, matiere_name: str) -> List[Dict[str, Any]]:
+# Colonne identifiant la classe dans un source.xlsx consolidé (établissement)
+CLASS_COLUMN = 'Classe'
+
+
+def _xlsx_header_names(cells: Tuple[Any, ...]) -> List[str]:
+    """Noms de colonnes comme `pd.read_excel` : « Unnamed: i », doublons « .1 »."""
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for index, cell in enumerate(cells):
+        name = f"Unnamed: {index}" if cell is None else str(cell)
+        if name in seen:
+            seen[name] += 1
+            candidate = f"{name}.{seen[name]}"
+            while candidate in seen:
+                seen[name] += 1
+                candidate = f"{name}.{seen[name]}"
+            seen[candidate] = 0
+            name = candidate
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _xlsx_cell_value(value: Any) -> Any:
+    """Valeur de cellule normalisée comme `pd.read_excel` (réels entiers -> int)."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def iter_source_xlsx(file_path: str,
+                     classe: Optional[Union[str, Iterable[str]]] = None,
+                     class_column: str = CLASS_COLUMN,
+                     students: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Parcourt source.xlsx ligne à ligne, sans charger le classeur en mémoire.
+
+    Le classeur est ouvert avec openpyxl en lecture seule ; chaque élève est
+    produit à la demande sous la même forme que `read_source_xlsx` (cellule
+    vide -> None). Les lignes entièrement vides sont ignorées. Destiné aux
+    source.xlsx consolidés d'un établissement (plusieurs milliers de lignes).
+
+    Args:
+        file_path: Chemin vers le fichier source.xlsx
+        classe: Classe (ou classes) à retenir d'après `class_column` ;
+            None pour toutes les lignes
+        class_column: Nom de la colonne portant la classe
+        students: Élèves à retenir (« NOM Prénom », rapprochés par
+            `student_key`) ; les autres lignes sont écartées sans être
+            converties. None pour tous les élèves
+
+    Yields:
+        Dictionnaire des données d'un élève
+
+    Raises:
+        FileReaderError: Si le fichier n'existe pas, ne peut pas être lu, ou
+            si une colonne requise ('Élève', colonne de classe) manque
+    """
+    if not os.path.exists(file_path):
+        raise FileReaderError(f"Fichier source non trouvé: {file_path}")
+
+    wanted = None
+    if classe is not None:
+        wanted = {classe} if isinstance(classe, str) else set(classe)
+        wanted = {str(c).strip() for c in wanted}
+    keys = {student_key(s) for s in students} if students is not None else None
+
+    try:
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+    except Exception as e:
+        raise FileReaderError(f"Erreur lors de la lecture du fichier source.xlsx: {str(e)}")
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        columns = None
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            if columns is None:
+                columns = _xlsx_header_names(row)
+                if 'Élève' not in columns:
+                    raise FileReaderError("Colonne 'Élève' manquante dans le fichier source.xlsx")
+                if wanted is not None and class_column not in columns:
+                    raise FileReaderError(
+                        f"Colonne '{class_column}' manquante dans le fichier source.xlsx"
+                    )
+                class_index = columns.index(class_column) if wanted is not None else None
+                student_index = columns.index('Élève')
+                continue
+            if class_index is not None:
+                value = row[class_index] if class_index < len(row) else None
+                if value is None or str(_xlsx_cell_value(value)).strip() not in wanted:
+                    continue
+            if keys is not None:
+                value = row[student_index] if student_index < len(row) else None
+                if student_key(_xlsx_cell_value(value)) not in keys:
+                    continue
+            record = dict.fromkeys(columns)
+            for name, value in zip(columns, row):
+                record[name] = _xlsx_cell_value(value)
+            yield record
+        if columns is None:
+            raise FileReaderError("Colonne 'Élève' manquante dans le fichier source.xlsx")
+    except FileReaderError:
+        raise
+    except Exception as e:
+        raise FileReaderError(f"Erreur lors de la lecture du fichier source.xlsx: {str(e)}")
+    finally:
+        workbook.close()
+
+
+def list_source_classes(file_path: str, class_column: str = CLASS_COLUMN) -> List[str]:
+    """
+    Liste les classes présentes dans un source.xlsx consolidé (tri naturel).
+
+    Args:
+        file_path: Chemin vers le fichier source.xlsx
+        class_column: Nom de la colonne portant la classe
+
+    Returns:
+        Classes distinctes (vide si la colonne n'existe pas)
+
+    Raises:
+        FileReaderError: Si le fichier n'existe pas ou ne peut pas être lu
+    """
+    classes = set()
+    for record in iter_source_xlsx(file_path):
+        value = record.get(class_column)
+        if value is not None and str(value).strip():
+            classes.add(str(value).strip())
+    return sorted(classes, key=_natural_tokens)
+
+
+def count_source_xlsx_rows(file_path: str) -> int:
+    """
+    Compte les lignes élèves de source.xlsx sans en lire les cellules.
+
+    Le classeur est ouvert en lecture seule et le nombre de lignes est tiré
+    des dimensions déclarées de la première feuille (en-tête exclu). Si le
+    fichier ne déclare pas ses dimensions, les lignes non vides sont
+    comptées. Le résultat est une estimation : des lignes mises en forme
+    mais vides peuvent être comptées.
+
+    Args:
+        file_path: Chemin vers le fichier source.xlsx
+
+    Returns:
+        Nombre de lignes de données
+
+    Raises:
+        FileReaderError: Si le fichier n'existe pas ou ne peut pas être lu
+    """
+    if not os.path.exists(file_path):
+        raise FileReaderError(f"Fichier source non trouvé: {file_path}")
+
+    try:
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            max_row = sheet.max_row
+            if max_row is None:
+                # Dimensions absentes : parcours des valeurs (toujours sans pandas)
+                max_row = sum(
+                    1 for row in sheet.iter_rows(values_only=True)
+                    if any(value is not None for value in row)
+                )
+            return max(0, max_row - 1)
+        finally:
+            workbook.close()
+    except Exception as e:
+        raise FileReaderError(f"Erreur lors de la lecture du fichier source.xlsx: {str(e)}")
+
+
+def read_csv_headers(file_path: str) -> Tuple[List[str], bool]:
+    """
+    Lit uniquement la ligne d'en-tête d'un CSV matière.
+
+    Suffit à la détection de période (`detect_period_from_headers`) sans
+    analyser le fichier complet.
+
+    Args:
+        file_path: Chemin vers le fichier CSV de la matière
+
+    Returns:
+        (noms de colonnes, True si au moins une ligne de données suit)
+
+    Raises:
+        FileReaderError: Si le fichier n'existe pas ou ne peut pas être lu
+    """
+    if not os.path.exists(file_path):
+        raise FileReaderError(f"Fichier matière non trouvé: {file_path}")
+
+    try:
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+            header_line = f.readline()
+            has_rows = any(line.strip() for line in f)
+    except (OSError, UnicodeDecodeError) as e:
+        raise FileReaderError(f"Erreur lors de la lecture du fichier {file_path}: {str(e)}")
+
+    headers = next(csv.reader([header_line], delimiter=';'), [])
+    return headers, has_rows
+
+
+def read_csv_matiere(file_path: str, matiere_name: str, cache=None,
+                     repaired_lines: Optional[List[int]] = None,
+                     students: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
     """
     Lit un fichier CSV de matière et retourne les données formatées.
     
     Args:
         file_path: Chemin vers le fichier CSV de la matière
         matiere_name: Nom de la matière (pour référence)
-        
+        cache: `ParseCache` optionnel (résultat réutilisé si le fichier
+            n'a pas changé depuis la dernière lecture)
+        repaired_lines: Liste complétée avec les numéros des lignes réparées
+            (guillemets non échappés, champs en trop), le cas échéant
+        students: Élèves à retenir (« NOM Prénom », rapprochés par
+            `student_key`) ; sans cache, les autres lignes sont écartées
+            avant la construction des enregistrements. None pour tous
+
     Returns:
         Liste de dictionnaires contenant les données par élève pour cette matière
         
@@ -106,41 +376,242 @@ def read_csv_matiere(file_path: str, matiere_name: str) -> List[Dict[str, Any]]:
     if not os.path.exists(file_path):
         raise FileReaderError(f"Fichier matière non trouvé: {file_path}")
     
+    keys = {student_key(s) for s in students} if students is not None else None
+    if cache is not None:
+        # Le cache conserve le fichier entier, filtré ensuite
+        records, repaired = cache.get_or_parse(
+            file_path, "csv_matiere",
+            # Liste plutôt que tuple : forme restituée telle quelle par le cache JSON
+            lambda: list(_parse_csv_matiere(file_path, matiere_name)),
+            variant=matiere_name,
+        )
+        if keys is not None:
+            records = [r for r in records if student_key(r.get('Élève')) in keys]
+    else:
+        records, repaired = _parse_csv_matiere(file_path, matiere_name, keys)
+    if repaired_lines is not None:
+        repaired_lines.extend(repaired)
+    return records
+
+
+# Un enregistrement bien formé sur une seule ligne : champs non quotés sans
+# guillemet, ou champs quotés dont les guillemets internes sont doublés
+_WELL_FORMED_LINE = re.compile(r'(?:"(?:[^"]|"")*"|[^";]*)(?:;(?:"(?:[^"]|"")*"|[^";]*))*')
+_NEEDS_QUOTING = re.compile(r'[";\n\r]')
+
+
+def _split_record(lines: List[str], start: int, sep: str, multiline: bool,
+                  expected: int = 0) -> Optional[Tuple[List[str], int, bool]]:
+    """
+    Découpe l'enregistrement commençant à la ligne `start`.
+
+    Un guillemet dans un champ quoté ne ferme le champ que s'il est suivi du
+    séparateur ou de la fin de ligne ; sinon il est conservé tel quel
+    (guillemet non échappé). Un champ quoté non refermé en fin de ligne se
+    poursuit sur la ligne suivante si `multiline`, sinon il est refermé.
+    La poursuite s'arrête sur une ligne qui ressemble à un enregistrement
+    complet (au moins `expected - 1` séparateurs) : c'est alors un guillemet
+    ouvrant jamais refermé qui avalerait les élèves suivants.
+
+    Returns:
+        (valeurs des champs, nombre de lignes consommées, réparation effectuée),
+        ou None si un champ multi-ligne n'est pas plausible
+    """
+    record = lines[start]
+    consumed = 1
+    fields: List[str] = []
+    changed = False
+    pos = 0
+    while True:
+        if record.startswith('"', pos):
+            parts = []
+            j = pos + 1
+            while True:
+                k = record.find('"', j)
+                if k == -1:
+                    if multiline:
+                        if start + consumed == len(lines):
+                            return None
+                        following_line = lines[start + consumed]
+                        if expected and following_line.count(sep) >= expected - 1:
+                            return None
+                        record += '\n' + following_line
+                        consumed += 1
+                        continue
+                    # Guillemet ouvrant jamais refermé : champ clos en fin de ligne
+                    parts.append(record[j:])
+                    changed = True
+                    pos = len(record)
+                    break
+                following = record[k + 1:k + 2]
+                if following == '"':
+                    parts.append(record[j:k + 1])
+                    j = k + 2
+                elif following in ('', sep):
+                    parts.append(record[j:k])
+                    pos = k + 1
+                    break
+                else:
+                    parts.append(record[j:k + 1])
+                    changed = True
+                    j = k + 1
+            fields.append(''.join(parts))
+        else:
+            k = record.find(sep, pos)
+            end = len(record) if k == -1 else k
+            fields.append(record[pos:end])
+            pos = end
+        if pos >= len(record):
+            return fields, consumed, changed
+        pos += 1  # séparateur
+        if pos == len(record):
+            fields.append('')
+            return fields, consumed, changed
+
+
+def _quote_field(value: str) -> str:
+    if _NEEDS_QUOTING.search(value):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _suspicious_lines(text: str, lines: List[str], sep: str, expected: int,
+                      check_field_count: bool) -> List[int]:
+    """
+    Indices des lignes (hors en-tête) à examiner champ par champ.
+
+    Sans `check_field_count`, seules les lignes contenant un guillemet sont
+    retenues ; elles sont repérées par `str.find`, sans parcourir les autres
+    lignes en Python. Les champs en trop sans guillemet font échouer le
+    parseur C, qui déclenche alors un examen complet.
+    """
+    if check_field_count:
+        return [
+            i for i in range(1, len(lines))
+            if '"' in lines[i] or lines[i].count(sep) >= expected
+        ]
+    indices = []
+    line_index = 0
+    last_start = 0
+    pos = text.find('"', len(lines[0]) + 1)
+    while pos != -1:
+        start = text.rfind('\n', 0, pos) + 1
+        line_index += text.count('\n', last_start, start)
+        last_start = start
+        indices.append(line_index)
+        end = text.find('\n', pos)
+        if end == -1:
+            break
+        pos = text.find('"', end)
+    return indices
+
+
+def repair_csv_text(text: str, sep: str = ';',
+                    check_field_count: bool = True) -> Tuple[str, List[int]]:
+    """
+    Répare en une passe les enregistrements mal formés d'un export CSV.
+
+    PRONOTE insère parfois du HTML avec des guillemets non échappés (colonne
+    « Evol. »), ce qui fait échouer ou dérailler le parseur C de pandas. Les
+    lignes saines sont recopiées telles quelles ; les autres sont
+    ré-émises avec des champs correctement quotés :
+    - guillemet interne non suivi du séparateur : conservé comme caractère ;
+    - guillemet ouvrant jamais refermé : champ clos en fin de ligne ;
+    - champs en trop (séparateur dans le HTML) : regroupés dans la dernière
+      colonne.
+    Les champs quotés sur plusieurs lignes (appréciations) sont préservés.
+
+    Args:
+        text: Contenu du fichier (fins de ligne normalisées en '\\n')
+        sep: Séparateur de champs
+        check_field_count: Si False, seules les lignes contenant un guillemet
+            sont examinées (plus rapide ; les champs en trop sont alors
+            laissés au parseur, qui échoue)
+
+    Returns:
+        (texte réparé, numéros des lignes réparées, en base 1)
+    """
+    if not check_field_count and '"' not in text:
+        return text, []
+    lines = text.split('\n')
+    header, _consumed, _changed = _split_record(lines, 0, sep, multiline=False)
+    expected = len(header)
+
+    replacements: Dict[int, Tuple[int, str]] = {}
+    repaired: List[int] = []
+    resume = 1
+    for i in _suspicious_lines(text, lines, sep, expected, check_field_count):
+        if i < resume:
+            continue  # ligne de continuation d'un champ multi-ligne déjà traité
+        line = lines[i]
+        if line.count(sep) < expected and _WELL_FORMED_LINE.fullmatch(line):
+            continue
+
+        parsed = _split_record(lines, i, sep, multiline=True, expected=expected)
+        if parsed is None or (parsed[1] > 1 and len(parsed[0]) != expected):
+            # Pas un champ multi-ligne légitime : le guillemet ouvrant est parasite
+            parsed = _split_record(lines, i, sep, multiline=False)
+        fields, consumed, changed = parsed
+        if len(fields) > expected:
+            fields = fields[:expected - 1] + [sep.join(fields[expected - 1:])]
+            changed = True
+
+        if changed:
+            replacements[i] = (consumed, sep.join(_quote_field(field) for field in fields))
+            repaired.append(i + 1)
+        resume = i + consumed
+
+    if not replacements:
+        return text, []
+    output: List[str] = []
+    i = 0
+    for index, (consumed, record) in replacements.items():
+        output.extend(lines[i:index])
+        output.append(record)
+        i = index + consumed
+    output.extend(lines[i:])
+    return '\n'.join(output), repaired
+
+
+def _parse_csv_matiere(file_path: str, matiere_name: str,
+                       keys: Optional[set] = None) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    Lecture effective d'un CSV matière : (enregistrements, lignes réparées).
+
+    Si `keys` est fourni, seules les lignes dont la clé `student_key` de
+    l'élève y figure sont converties en enregistrements.
+    """
     try:
-        # Lire le fichier CSV avec séparateur point-virgule.
         # Les exports PRONOTE contiennent parfois des guillemets non
-        # échappés (HTML dans la colonne Evol.) : on tente d'abord le
-        # parseur C standard, puis un parseur Python plus tolérant.
+        # échappés (HTML dans la colonne Evol.) : le texte est réparé en une
+        # passe puis confié au parseur C. Une ligne encore illisible après
+        # l'examen complet est signalée : jamais d'élève ignoré en silence.
+        with open(file_path, 'r', encoding='utf-8') as f:
+            raw = f.read()
+        text, repaired = repair_csv_text(raw, check_field_count=False)
         try:
-            df = pd.read_csv(file_path, sep=';', encoding='utf-8')
-        except Exception:
-            df = pd.read_csv(
-                file_path,
-                sep=';',
-                encoding='utf-8',
-                engine='python',
-                on_bad_lines='skip'
-            )
+            df = pd.read_csv(io.StringIO(text), sep=';')
+        except pd.errors.ParserError:
+            # Champs en trop hors guillemets : examen complet des lignes
+            text, repaired = repair_csv_text(raw)
+            try:
+                df = pd.read_csv(io.StringIO(text), sep=';')
+            except pd.errors.ParserError as e:
+                raise FileReaderError(f"Ligne mal formée non réparable: {str(e)}")
         
         # Valider la présence de la colonne 'Élève'
         if 'Élève' not in df.columns:
             raise FileReaderError(f"Colonne 'Élève' manquante dans le fichier {file_path}")
+        if keys is not None:
+            df = df[df['Élève'].map(student_key).isin(keys)]
+        
+        # Conversion colonne par colonne (espaces, NaN -> None) puis en
+        # enregistrements, la clé 'matiere' restant en tête de chaque ligne
+        matiere_data = _frame_to_records(
+            df, strip_strings=True, leading={'matiere': matiere_name}
+        )
         
-        # Convertir en liste de dictionnaires
-        matiere_data = []
-        for _, row in df.iterrows():
-            eleve_dict = {'matiere': matiere_name}
-            for col in df.columns:
-                # Conserver toutes les colonnes, nettoyer les valeurs NaN
-                value = row[col]
-                if pd.isna(value):
-                    value = None
-                elif isinstance(value, str):
-                    value = value.strip()  # Nettoyer les espaces
-                eleve_dict[col] = value
-            matiere_data.append(eleve_dict)
-        
-        return matiere_data
+        return matiere_data, repaired
         
     except Exception as e:
         raise FileReaderError(f"Erreur lors de la lecture du fichier {file_path}: {str(e)}")
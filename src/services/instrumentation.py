@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Mesure du temps et compteurs par étape d'un traitement.
+
+Quand un traitement est lent, le résultat ne dit pas si le coût vient de la
+lecture de source.xlsx, des CSV, de la fusion de l'historique, des
+statistiques ou de l'écriture du JSON. `Instrumentation.stage` est un
+gestionnaire de contexte qui mesure, pour une étape nommée, le temps écoulé
+et le temps CPU du processus, et expose des compteurs (lignes lues, octets
+lus/écrits, lectures servies par le cache). Désactivée, l'instrumentation ne
+fait rien : les étapes reçoivent un enregistrement inerte.
+
+Le rapport (`report`) est ajouté au résultat du traitement et peut être
+écrit dans un fichier de trace JSON (`write_trace`).
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Compteurs usuels
+ROWS = "rows"
+BYTES_READ = "bytes_read"
+BYTES_WRITTEN = "bytes_written"
+CACHE_HITS = "cache_hits"
+
+
+class StageRecord:
+    """Mesures cumulées d'une étape (plusieurs passages s'additionnent)."""
+
+    __slots__ = ("name", "wall_s", "cpu_s", "calls", "counters")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.calls = 0
+        self.counters: Dict[str, int] = {}
+
+    def add(self, counter: str, value: int = 1) -> None:
+        """Incrémente un compteur de l'étape."""
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            'wall_s': round(self.wall_s, 6),
+            'cpu_s': round(self.cpu_s, 6),
+            'calls': self.calls,
+        }
+        data.update(self.counters)
+        return data
+
+
+class _NullRecord:
+    """Enregistrement inerte d'une instrumentation désactivée."""
+
+    __slots__ = ()
+
+    def add(self, counter: str, value: int = 1) -> None:
+        pass
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> _NullRecord:
+        return _NULL_RECORD
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+class _StageTimer:
+    __slots__ = ("record", "_wall", "_cpu")
+
+    def __init__(self, record: StageRecord):
+        self.record = record
+
+    def __enter__(self) -> StageRecord:
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self.record
+
+    def __exit__(self, *exc) -> bool:
+        self.record.wall_s += time.perf_counter() - self._wall
+        self.record.cpu_s += time.process_time() - self._cpu
+        self.record.calls += 1
+        return False
+
+
+_NULL_RECORD = _NullRecord()
+_NULL_STAGE = _NullStage()
+
+
+class Instrumentation:
+    """
+    Collecte des mesures par étape.
+
+    Exemple :
+        instrumentation = Instrumentation()
+        with instrumentation.stage("csv") as stage:
+            rows = lire()
+            stage.add(ROWS, len(rows))
+        instrumentation.report()
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled: Si False, `stage` ne mesure rien et `report` est vide
+        """
+        self.enabled = enabled
+        self._stages: Dict[str, StageRecord] = {}
+
+    def stage(self, name: str):
+        """
+        Gestionnaire de contexte mesurant l'étape `name`.
+
+        Returns:
+            Contexte produisant l'enregistrement de l'étape (méthode `add`)
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        record = self._stages.get(name)
+        if record is None:
+            record = self._stages[name] = StageRecord(name)
+        return _StageTimer(record)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Rapport des étapes, dans l'ordre du premier passage.
+
+        Returns:
+            {"stages": {nom: {"wall_s", "cpu_s", "calls", compteurs...}},
+             "wall_s", "cpu_s"} ({} si désactivée)
+        """
+        if not self.enabled:
+            return {}
+        return {
+            'stages': {name: record.to_dict() for name, record in self._stages.items()},
+            'wall_s': round(sum(r.wall_s for r in self._stages.values()), 6),
+            'cpu_s': round(sum(r.cpu_s for r in self._stages.values()), 6),
+        }
+
+    def write_trace(self, path: str, context: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Écrit le rapport dans un fichier de trace JSON.
+
+        Args:
+            path: Chemin du fichier de trace
+            context: Informations ajoutées à la trace (dossier, période...)
+        """
+        trace = {'generated_at': datetime.utcnow().isoformat(timespec="seconds")}
+        trace.update(context or {})
+        trace.update(self.report())
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, ensure_ascii=False, indent=2)
+
+
+DISABLED = Instrumentation(enabled=False)
+
+
+def file_size(path: Optional[str]) -> int:
+    """Taille d'un fichier en octets (0 s'il est absent)."""
+    try:
+        return os.path.getsize(path) if path else 0
+    except OSError:
+        return 0
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1000:.0f} ms"
+    return f"{seconds:.2f} s"
+
+
+def _format_bytes(value: int) -> str:
+    if value >= 1024 * 1024:
+        return f"{value / (1024 * 1024):.1f} Mo"
+    return f"{value / 1024:.0f} Ko"
+
+
+def format_stage_summary(report: Dict[str, Any]) -> List[str]:
+    """
+    Lignes lisibles d'un rapport : une par étape.
+
+    Exemple : "csv : 120 ms (CPU 100 ms) · 1234 lignes · 45 Ko lus · cache 3"
+    """
+    lines = []
+    for name, stage in (report or {}).get('stages', {}).items():
+        parts = [f"{name} : {_format_duration(stage['wall_s'])} "
+                 f"(CPU {_format_duration(stage['cpu_s'])})"]
+        if stage.get(ROWS):
+            parts.append(f"{stage[ROWS]} lignes")
+        if stage.get(BYTES_READ):
+            parts.append(f"{_format_bytes(stage[BYTES_READ])} lus")
+        if stage.get(BYTES_WRITTEN):
+            parts.append(f"{_format_bytes(stage[BYTES_WRITTEN])} écrits")
+        if stage.get(CACHE_HITS):
+            parts.append(f"cache {stage[CACHE_HITS]}")
+        lines.append(" · ".join(parts))
+    return lines
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Sérialisation JSON des fichiers de bulletins, avec un encodeur rapide
+quand il est disponible.
+
+Toutes les lectures et écritures de fichiers de bulletins (`output_*.json`)
+passent par `load`/`dump` (ou `loads`/`dumps`). Si `orjson` est importable,
+il est utilisé ; sinon le module standard `json`. Les deux produisent le même
+contenu : UTF-8 sans échappement des caractères non ASCII (équivalent de
+`ensure_ascii=False`), ordre des clés conservé (le bloc `_metadata` reste en
+tête), indentation de 2 espaces, ou format compact (`compact=True`, sans
+espaces) pour les fichiers lus uniquement par le programme.
+
+Différences tolérées : orjson écrit `null` pour un flottant non fini (le
+module standard écrirait `NaN`, invalide en JSON) et accepte les scalaires
+numpy. Un fichier que orjson refuse de lire (ex. `NaN` écrit par une ancienne
+version) est relu avec le module standard.
+
+Les écritures sont atomiques (`atomic_write`) : le contenu est écrit dans un
+fichier temporaire du même dossier, synchronisé sur disque puis renommé sur
+la cible. Un lecteur voit l'ancien fichier ou le nouveau, jamais un fichier
+tronqué, même si le programme s'arrête en cours d'écriture. `dump_items`
+sérialise une liste élément par élément (ex. bulletin par bulletin) sans
+construire la liste complète en mémoire.
+
+La variable d'environnement `PYCONSEIL_JSON_BACKEND=json` force le module
+standard.
+"""
+
+import json
+import os
+import secrets
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Iterable, Iterator, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    orjson = None
+
+
+class JsonBackendError(Exception):
+    """Exception levée en cas de backend JSON inconnu ou indisponible."""
+    pass
+
+
+# Erreur de décodage commune (orjson.JSONDecodeError en hérite)
+JSONDecodeError = json.JSONDecodeError
+
+BACKENDS = ("orjson", "json")
+
+_backend = "orjson" if orjson is not None else "json"
+if os.environ.get("PYCONSEIL_JSON_BACKEND", "").strip().lower() == "json":
+    _backend = "json"
+
+
+def backend_name() -> str:
+    """Nom du backend utilisé ("orjson" ou "json")."""
+    return _backend
+
+
+def use_backend(name: str) -> str:
+    """
+    Change de backend (tests, benchmarks).
+
+    Args:
+        name: "orjson" ou "json"
+
+    Returns:
+        Nom du backend précédent
+
+    Raises:
+        JsonBackendError: Si le backend est inconnu ou non installé
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise JsonBackendError(f"Backend JSON inconnu: {name}")
+    if name == "orjson" and orjson is None:
+        raise JsonBackendError("orjson n'est pas installé")
+    previous, _backend = _backend, name
+    return previous
+
+
+def _orjson_default(value: Any) -> Any:
+    # Sous-classes de float (numpy.float64...) et scalaires numpy restants
+    if isinstance(value, float):
+        return float(value)
+    item = getattr(value, "item", None)
+    if callable(item):
+        return item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data: Any, compact: bool = False) -> bytes:
+    """
+    Sérialise en JSON UTF-8.
+
+    Args:
+        data: Données à sérialiser
+        compact: Si True, aucune indentation ni espace (fichiers machine)
+
+    Returns:
+        Texte JSON encodé en UTF-8
+
+    Raises:
+        TypeError: Si une valeur n'est pas sérialisable
+    """
+    if _backend == "orjson":
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_orjson_default, option=option)
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    return text.encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Désérialise un texte JSON.
+
+    Raises:
+        JSONDecodeError: Si le texte n'est pas du JSON valide
+    """
+    if _backend == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity d'anciens fichiers, ou vraie erreur (levée ci-dessous)
+            pass
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def load(path: str) -> Any:
+    """
+    Lit un fichier JSON (UTF-8).
+
+    Raises:
+        OSError: Si le fichier est illisible
+        JSONDecodeError: Si le contenu n'est pas du JSON valide
+    """
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def _fsync_directory(directory: str) -> None:
+    # Rend le renommage durable (POSIX) ; sans objet sous Windows
+    if os.name == 'nt':
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(path: str) -> Iterator[BinaryIO]:
+    """
+    Écrit un fichier de façon atomique.
+
+    Le contenu est écrit dans `.<nom>.<aléa>.tmp` (même dossier, donc même
+    système de fichiers), synchronisé (fsync) puis renommé sur `path` par
+    `os.replace`. En cas d'erreur, le fichier temporaire est supprimé et
+    `path` reste inchangé. Les droits du nouveau fichier suivent le umask,
+    comme avec `open`.
+
+    Args:
+        path: Fichier cible
+
+    Yields:
+        Fichier binaire ouvert en écriture
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{secrets.token_hex(4)}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def dump(data: Any, path: str, compact: bool = False) -> None:
+    """
+    Écrit un fichier JSON de façon atomique (UTF-8, voir `dumps`).
+
+    Raises:
+        OSError: Si le fichier ne peut pas être écrit
+        TypeError: Si une valeur n'est pas sérialisable
+    """
+    payload = dumps(data, compact=compact)
+    with atomic_write(path) as f:
+        f.write(payload)
+
+
+def dump_items(items: Iterable[Any], path: str, compact: bool = False) -> None:
+    """
+    Écrit une liste JSON élément par élément, de façon atomique.
+
+    Le fichier est identique à `dump(list(items), path, compact)`, mais un
+    seul élément sérialisé est en mémoire à la fois.
+
+    Raises:
+        OSError: Si le fichier ne peut pas être écrit
+        TypeError: Si une valeur n'est pas sérialisable
+    """
+    # Un saut de ligne brut n'apparaît qu'entre les lignes de l'indentation
+    # (ceux des chaînes sont échappés) : décaler d'un niveau suffit.
+    separator, first = (b",", b"[") if compact else (b",\n  ", b"[\n  ")
+    with atomic_write(path) as f:
+        written = False
+        for item in items:
+            payload = dumps(item, compact=compact)
+            if not compact:
+                payload = payload.replace(b"\n", b"\n  ")
+            f.write(separator if written else first)
+            f.write(payload)
+            written = True
+        if not written:
+            f.write(b"[]")
+        else:
+            f.write(b"]" if compact else b"\n]")
@@ -4,16 +4,27 @@ Module de génération JSON pour l'application de conseil de classe.
 Convertit les objets Bulletin en JSON et sauvegarde le fichier output.json.
 """
 
-import json
+import copy
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
+
+import numpy as np
+
 # Import conditionnel pour gérer les imports relatifs
 try:
-    from ..models.bulletin import Bulletin
+    from . import json_backend
+    from .metadata_sidecar import effective_metadata, remove_sidecar
+    from .payload_cache import PAYLOADS
+    from ..models.bulletin import Bulletin, LazyBulletin, bulletins_from_dicts
+    from ..models.class_matrix import ClassMatrix
 except ImportError:
     # Fallback pour l'exécution directe via PYTHONPATH
-    from models.bulletin import Bulletin
+    from services import json_backend
+    from services.metadata_sidecar import effective_metadata, remove_sidecar
+    from services.payload_cache import PAYLOADS
+    from models.bulletin import Bulletin, LazyBulletin, bulletins_from_dicts
+    from models.class_matrix import ClassMatrix
 
 
 class JsonGeneratorError(Exception):
@@ -55,6 +66,18 @@ def bulletins_to_json(bulletins: List[Bulletin],
         raise JsonGeneratorError(f"Erreur lors de la conversion en JSON: {str(e)}")
 
 
+def iter_bulletins_json(bulletins: List[Bulletin],
+                        metadata: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Variante paresseuse de `bulletins_to_json` : produit le bloc `_metadata`
+    puis un dictionnaire par bulletin, converti au moment de l'écriture.
+    """
+    if metadata:
+        yield {"_metadata": metadata}
+    for bulletin in bulletins:
+        yield bulletin.to_dict()
+
+
 def save_output_json(bulletins: List[Bulletin], 
                     output_path: str,
                     metadata: Optional[Dict[str, Any]] = None,
@@ -62,11 +85,18 @@ def save_output_json(bulletins: List[Bulletin],
     """
     Sauvegarde les bulletins dans un fichier JSON.
     
+    Les bulletins sont sérialisés un par un dans un fichier temporaire du
+    même dossier, renommé sur `output_path` une fois complet : un lecteur ne
+    voit jamais de fichier tronqué, et un échec laisse l'ancien fichier
+    intact. Les métadonnées écrites remplacent celles d'une éventuelle
+    annexe `.meta` (supprimée).
+    
     Args:
         bulletins: Liste des bulletins à sauvegarder
         output_path: Chemin du fichier de sortie
         metadata: Métadonnées à insérer (ex: semestre, date)
-        pretty_print: Si True, formate le JSON pour la lisibilité
+        pretty_print: Si True, formate le JSON pour la lisibilité (sinon
+            format compact, pour les fichiers lus uniquement par le programme)
         
     Raises:
         JsonGeneratorError: Si la sauvegarde échoue
@@ -75,31 +105,29 @@ def save_output_json(bulletins: List[Bulletin],
         raise JsonGeneratorError("Aucun bulletin à sauvegarder")
     
     try:
-        # Convertir les bulletins en JSON
-        json_data = bulletins_to_json(bulletins, metadata=metadata)
-        
         # Créer le répertoire parent si nécessaire
         output_dir = os.path.dirname(output_path)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
-        # Sauvegarder le fichier JSON
-        with open(output_path, 'w', encoding='utf-8') as f:
-            if pretty_print:
-                json.dump(json_data, f, ensure_ascii=False, indent=2)
-            else:
-                json.dump(json_data, f, ensure_ascii=False)
+        # Sauvegarder le fichier JSON (écriture atomique, bulletin par bulletin)
+        json_backend.dump_items(iter_bulletins_json(bulletins, metadata=metadata),
+                                output_path, compact=not pretty_print)
+        remove_sidecar(output_path)
+        PAYLOADS.invalidate(output_path)
         
     except Exception as e:
         raise JsonGeneratorError(f"Erreur lors de la sauvegarde du fichier {output_path}: {str(e)}")
 
 
-def load_bulletins_from_json(json_path: str) -> List[Bulletin]:
+def load_bulletins_from_json(json_path: str, lazy: bool = False) -> List[Bulletin]:
     """
     Charge des bulletins depuis un fichier JSON.
     
     Args:
         json_path: Chemin du fichier JSON à charger
+        lazy: Si True, retourne des `LazyBulletin` dont les matières ne sont
+            construites qu'au premier accès (quelques élèves consultés)
         
     Returns:
         Liste d'objets Bulletin reconstruits
@@ -111,16 +139,49 @@ def load_bulletins_from_json(json_path: str) -> List[Bulletin]:
         raise JsonGeneratorError(f"Fichier JSON non trouvé: {json_path}")
     
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = PAYLOADS.load(json_path)
+        items = (
+            item for item in data
+            if isinstance(item, dict) and "Nom" in item and "Prenom" in item
+        )
+        if lazy:
+            return [LazyBulletin(item) for item in items]
+        return bulletins_from_dicts(items)
+        
+    except Exception as e:
+        raise JsonGeneratorError(f"Erreur lors du chargement du fichier {json_path}: {str(e)}")
+
+
+def load_output_json(json_path: str) -> Tuple[Dict[str, Any], List[Bulletin]]:
+    """
+    Charge un fichier JSON de bulletins avec son bloc `_metadata` (ou celui
+    de son annexe `.meta`, voir `metadata_sidecar`).
+    
+    Args:
+        json_path: Chemin du fichier JSON à charger
+        
+    Returns:
+        Tuple (metadata, bulletins) ; metadata est vide si absente
+        
+    Raises:
+        JsonGeneratorError: Si le chargement échoue
+    """
+    if not os.path.exists(json_path):
+        raise JsonGeneratorError(f"Fichier JSON non trouvé: {json_path}")
+    
+    try:
+        data = PAYLOADS.load(json_path)
         
-        bulletins = []
-        for item in data:
-            if isinstance(item, dict) and "Nom" in item and "Prenom" in item:
-                bulletin = Bulletin.from_dict(item)
-                bulletins.append(bulletin)
+        metadata: Dict[str, Any] = {}
+        if data and isinstance(data[0], dict) and "_metadata" in data[0]:
+            metadata = copy.deepcopy(data[0].get("_metadata") or {})
+        metadata = effective_metadata(json_path, metadata)
         
-        return bulletins
+        bulletins = bulletins_from_dicts(
+            item for item in data
+            if isinstance(item, dict) and "Nom" in item and "Prenom" in item
+        )
+        return metadata, bulletins
         
     except Exception as e:
         raise JsonGeneratorError(f"Erreur lors du chargement du fichier {json_path}: {str(e)}")
@@ -152,8 +213,7 @@ def validate_json_format(json_path: str) -> Dict[str, Any]:
         return validation
     
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = json_backend.load(json_path)
         
         if not isinstance(data, list):
             validation['errors'].append("Le fichier JSON doit contenir une liste")
@@ -188,7 +248,7 @@ def validate_json_format(json_path: str) -> Dict[str, Any]:
         # Le fichier est valide s'il n'y a pas d'erreurs
         validation['valid'] = len(validation['errors']) == 0
         
-    except json.JSONDecodeError as e:
+    except json_backend.JSONDecodeError as e:
         validation['errors'].append(f"Erreur de format JSON: {str(e)}")
     except Exception as e:
         validation['errors'].append(f"Erreur lors de la validation: {str(e)}")
@@ -212,12 +272,14 @@ def get_all_matieres(bulletins: List[Bulletin]) -> List[str]:
     return sorted(list(matieres))
 
 
-def generate_summary_stats(bulletins: List[Bulletin]) -> Dict[str, Any]:
+def generate_summary_stats(bulletins: List[Bulletin],
+                           matrix: Optional[ClassMatrix] = None) -> Dict[str, Any]:
     """
     Génère des statistiques de résumé sur les bulletins.
     
     Args:
         bulletins: Liste des bulletins à analyser
+        matrix: Matrice déjà construite sur ces bulletins (optionnelle)
         
     Returns:
         Dictionnaire avec statistiques diverses
@@ -225,10 +287,11 @@ def generate_summary_stats(bulletins: List[Bulletin]) -> Dict[str, Any]:
     if not bulletins:
         return {}
     
+    matieres = get_all_matieres(bulletins)
     stats = {
         'total_bulletins': len(bulletins),
-        'total_matieres': len(get_all_matieres(bulletins)),
-        'matieres_list': get_all_matieres(bulletins),
+        'total_matieres': len(matieres),
+        'matieres_list': matieres,
     }
     
     # Compter les appréciations générales par période
@@ -240,28 +303,25 @@ def generate_summary_stats(bulletins: List[Bulletin]) -> Dict[str, Any]:
     stats['appreciation_generale_counts'] = appreciation_generale_counts
     
     # Statistiques par matière (par période présente)
+    if matrix is None:
+        matrix = ClassMatrix.from_bulletins(bulletins, subjects=matieres)
+    filled = matrix.has_moyenne
+    counts = filled.sum(axis=0)
+    sums = np.where(filled, matrix.moyennes, 0.0).sum(axis=0)
+    bulletins_counts = matrix.has_subject.sum(axis=0)
+    
     matiere_stats = {}
-    for matiere in get_all_matieres(bulletins):
-        bulletins_avec_matiere = 0
-        moyennes_par_periode: Dict[str, list] = {}
-        
-        for bulletin in bulletins:
-            appreciation = bulletin.get_matiere(matiere)
-            if appreciation:
-                bulletins_avec_matiere += 1
-                for code, periode in appreciation.periodes.items():
-                    if periode.moyenne is not None:
-                        moyennes_par_periode.setdefault(code, []).append(periode.moyenne)
-        
+    for s, matiere in enumerate(matrix.subjects):
         periode_stats = {}
-        for code, valeurs in moyennes_par_periode.items():
-            entry = {'count': len(valeurs)}
-            if valeurs:
-                entry['avg'] = sum(valeurs) / len(valeurs)
-            periode_stats[code] = entry
+        for p, code in enumerate(matrix.periods):
+            if counts[s, p]:
+                periode_stats[code] = {
+                    'count': int(counts[s, p]),
+                    'avg': float(sums[s, p]) / int(counts[s, p]),
+                }
         
         matiere_stats[matiere] = {
-            'bulletins_count': bulletins_avec_matiere,
+            'bulletins_count': int(bulletins_counts[s]),
             'periodes': periode_stats,
         }
     
@@ -5,39 +5,64 @@ Coordonne la lecture des fichiers, le traitement et la génération JSON.
 """
 
 import os
-import copy
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Sequence
 # Import conditionnel pour gérer les imports relatifs
 try:
     from .file_reader import (
         read_source_xlsx, read_csv_matiere, get_csv_files_in_directory,
         extract_matiere_name_from_filename, validate_source_directory,
-        FileReaderError
+        read_csv_headers, count_source_xlsx_rows, iter_source_xlsx, FileReaderError
     )
     from .bulletin_processor import (
         create_bulletins_from_source, populate_bulletins_from_csv,
-        calculate_min_max_moyennes, validate_bulletins_consistency,
+        calculate_min_max_moyennes, compute_class_statistics,
         BulletinProcessorError
     )
-    from .json_generator import save_output_json, load_bulletins_from_json, JsonGeneratorError
-    from ..models.bulletin import Bulletin
-    from ..utils.semester import Period, detect_period_from_matiere_data
+    from .json_generator import (
+        save_output_json, load_bulletins_from_json, load_output_json, JsonGeneratorError
+    )
+    from .parse_cache import ParseCache, file_fingerprint
+    from .validation import ValidationContext, validate, report_messages
+    from .student_index import StudentIndex
+    from .subject_registry import SubjectRegistry
+    from .instrumentation import (
+        Instrumentation, DISABLED, ROWS, BYTES_READ, BYTES_WRITTEN, CACHE_HITS, file_size
+    )
+    from ..models.bulletin import Bulletin, PERIOD_CODES
+    from ..models.class_matrix import ClassMatrix
+    from ..utils.semester import (
+        Period, detect_period_from_headers, detect_period_from_matiere_data, period_from_metadata
+    )
 except ImportError:
     # Fallback pour l'exécution directe via PYTHONPATH
     from services.file_reader import (
         read_source_xlsx, read_csv_matiere, get_csv_files_in_directory,
         extract_matiere_name_from_filename, validate_source_directory,
-        FileReaderError
+        read_csv_headers, count_source_xlsx_rows, iter_source_xlsx, FileReaderError
     )
     from services.bulletin_processor import (
         create_bulletins_from_source, populate_bulletins_from_csv,
-        calculate_min_max_moyennes, validate_bulletins_consistency,
+        calculate_min_max_moyennes, compute_class_statistics,
         BulletinProcessorError
     )
-    from services.json_generator import save_output_json, load_bulletins_from_json, JsonGeneratorError
-    from models.bulletin import Bulletin
-    from utils.semester import Period, detect_period_from_matiere_data
+    from services.json_generator import (
+        save_output_json, load_bulletins_from_json, load_output_json, JsonGeneratorError
+    )
+    from services.parse_cache import ParseCache, file_fingerprint
+    from services.validation import ValidationContext, validate, report_messages
+    from services.student_index import StudentIndex
+    from services.subject_registry import SubjectRegistry
+    from services.instrumentation import (
+        Instrumentation, DISABLED, ROWS, BYTES_READ, BYTES_WRITTEN, CACHE_HITS, file_size
+    )
+    from models.bulletin import Bulletin, PERIOD_CODES
+    from models.class_matrix import ClassMatrix
+    from utils.semester import (
+        Period, detect_period_from_headers, detect_period_from_matiere_data, period_from_metadata
+    )
 
 
 class MainProcessorError(Exception):
@@ -45,20 +70,126 @@ class MainProcessorError(Exception):
     pass
 
 
+# Nombre de lectures CSV simultanées par défaut : la lecture est dominée par
+# l'attente disque/réseau et le parseur C de pandas, d'où des threads.
+DEFAULT_MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+MatiereLue = Tuple[str, Optional[List[Dict[str, Any]]], List[int], Optional[Exception]]
+
+
+def _read_matiere_file(csv_file: str,
+                       cache: Optional[ParseCache] = None,
+                       students: Optional[Sequence[str]] = None) -> MatiereLue:
+    """Lit un CSV matière : (matiere, données, lignes réparées, erreur éventuelle)."""
+    matiere_name = extract_matiere_name_from_filename(csv_file)
+    repaired: List[int] = []
+    try:
+        data = read_csv_matiere(csv_file, matiere_name, cache=cache, repaired_lines=repaired,
+                                students=students)
+        return matiere_name, data, repaired, None
+    except FileReaderError as e:
+        return matiere_name, None, repaired, e
+
+
+def _repair_warning(matiere_name: str, repaired: List[int]) -> str:
+    lines = ", ".join(str(line) for line in repaired)
+    return f"Matière {matiere_name}: ligne(s) mal formée(s) réparée(s): {lines}"
+
+
+def _validate_into_result(result: Dict[str, Any], context: ValidationContext) -> None:
+    """Valide la classe et reporte le rapport (règles, durées) dans le résultat."""
+    report = validate(context)
+    result['warnings'].extend(report_messages(report))
+    result['validation'] = report
+
+
+def _report_student_matching(result: Dict[str, Any], index: StudentIndex) -> None:
+    """Reporte les rapprochements d'élèves ambigus ou approchés dans le résultat."""
+    result['warnings'].extend(index.warnings())
+    result['student_matching'] = index.report()
+
+
+def read_matieres(csv_files: List[str],
+                  max_workers: Optional[int] = None,
+                  cache: Optional[ParseCache] = None,
+                  students: Optional[Sequence[str]] = None) -> List[MatiereLue]:
+    """
+    Lit tous les CSV matières, en parallèle dans un pool de threads.
+
+    L'ordre du résultat est celui de `csv_files` (tri naturel), quel que soit
+    l'ordre de fin des lectures : la fusion qui suit reste déterministe.
+
+    Args:
+        csv_files: Chemins des CSV matières (déjà triés)
+        max_workers: Nombre de lectures simultanées (None = valeur par défaut,
+            1 = lecture séquentielle sans pool)
+        cache: Cache des fichiers déjà analysés (optionnel)
+        students: Élèves à retenir (« NOM Prénom ») ; None pour tous
+
+    Returns:
+        Liste de tuples (nom_matiere, données ou None, numéros des lignes
+        réparées, erreur ou None)
+    """
+    if max_workers is None:
+        max_workers = DEFAULT_MAX_WORKERS
+    workers = max(1, min(max_workers, len(csv_files)))
+    if workers == 1:
+        return [_read_matiere_file(csv_file, cache, students) for csv_file in csv_files]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda csv_file: _read_matiere_file(csv_file, cache, students),
+                                 csv_files))
+
+
+def sniff_directory_period(source_directory: str,
+                           csv_files: Optional[List[str]] = None) -> Optional[Period]:
+    """
+    Détecte la période d'un dossier depuis les seuls en-têtes des CSV.
+
+    Même règle que le traitement complet (premier CSV lisible, dans l'ordre
+    du tri naturel, qui contient des élèves) sans analyser les fichiers.
+
+    Args:
+        source_directory: Répertoire contenant les CSV matières
+        csv_files: CSV déjà listés (évite un nouveau parcours du dossier)
+
+    Returns:
+        Période détectée, ou None si aucun CSV exploitable
+    """
+    if csv_files is None:
+        try:
+            csv_files = get_csv_files_in_directory(source_directory)
+        except FileReaderError:
+            return None
+    for csv_file in csv_files:
+        try:
+            headers, has_rows = read_csv_headers(csv_file)
+        except FileReaderError:
+            continue
+        if has_rows and 'Élève' in headers:
+            return detect_period_from_headers(headers)
+    return None
+
+
 def merge_history_into_bulletins(bulletins: List[Bulletin],
                                  previous_bulletins: List[Bulletin],
-                                 current_code: str) -> None:
+                                 current_code: str,
+                                 registry: Optional[SubjectRegistry] = None) -> None:
     """
     Fusionne l'historique des périodes précédentes (issu d'un output JSON
     existant) dans les bulletins fraîchement construits.
 
     Les données de la période courante (`current_code`) ne sont jamais
-    écrasées : seules les périodes antérieures absentes sont reportées.
+    écrasées : seules les périodes antérieures absentes sont reportées. Une
+    matière renommée entre deux exports (« Anglais LV1 » / « AnglaisLV1 »,
+    alias) est rattachée à son libellé courant.
 
     Args:
         bulletins: Bulletins de la période courante (modifiés sur place)
         previous_bulletins: Bulletins chargés depuis l'output existant
         current_code: Code de la période courante (ex: "T3")
+        registry: Registre des libellés de matières de la classe (défaut :
+            alias par défaut)
     """
     if not previous_bulletins:
         return
@@ -75,6 +206,7 @@ def merge_history_into_bulletins(bulletins: List[Bulletin],
         period = Period.from_code(code)
         return period is not None and period.system == current_system
 
+    registry = registry or SubjectRegistry()
     prev_index = {
         f"{b.eleve.nom} {b.eleve.prenom}": b for b in previous_bulletins
     }
@@ -93,12 +225,16 @@ def merge_history_into_bulletins(bulletins: List[Bulletin],
                 bulletin.appreciations_generales[code] = texte
 
         # Reporter les données par matière/période
+        names: Optional[Dict[str, str]] = None
         for matiere_name, prev_app in previous.matieres.items():
-            current_app = bulletin.get_matiere(matiere_name)
+            if matiere_name not in bulletin.matieres and names is None:
+                names = registry.index(bulletin.matieres)
+            resolved_name = registry.resolve(matiere_name, bulletin.matieres, names)
+            current_app = bulletin.get_matiere(resolved_name) if resolved_name else None
             if current_app is None:
                 # Matière absente de l'export courant : conserver l'historique
                 # (copie), en filtrant les périodes d'un autre système.
-                clone = copy.deepcopy(prev_app)
+                clone = prev_app.clone()
                 clone.periodes = {
                     code: periode
                     for code, periode in clone.periodes.items()
@@ -106,26 +242,577 @@ def merge_history_into_bulletins(bulletins: List[Bulletin],
                 }
                 if clone.periodes:
                     bulletin.add_matiere(clone)
+                    names.setdefault(registry.key(clone.matiere), clone.matiere)
                 continue
             for code, periode in prev_app.periodes.items():
                 if code == current_code or not _same_system(code):
                     continue
                 if code not in current_app.periodes:
-                    current_app.periodes[code] = copy.deepcopy(periode)
+                    current_app.periodes[code] = periode.clone()
+
+
+def _source_fingerprints(source_xlsx: str, csv_files: List[str],
+                         matieres: List[str]) -> Dict[str, Any]:
+    """Empreintes de source.xlsx et des CSV des matières traitées (pour l'incrémental)."""
+    chemins = {extract_matiere_name_from_filename(f): f for f in csv_files}
+    return {
+        "source": file_fingerprint(source_xlsx),
+        "matieres": {
+            name: file_fingerprint(chemins[name]) for name in matieres if name in chemins
+        },
+    }
+
+
+def _same_fingerprint(current: Optional[Dict[str, Any]], stored: Any) -> bool:
+    """Deux empreintes désignent le même contenu (taille et SHA-256)."""
+    if not current or not isinstance(stored, dict):
+        return False
+    return (current.get('size') == stored.get('size')
+            and current.get('sha256') == stored.get('sha256'))
+
+
+def _incremental_update(source_directory: str,
+                        output_path: str,
+                        validation: Dict[str, Any],
+                        result: Dict[str, Any],
+                        validate_data: bool,
+                        period_override: Optional[Period],
+                        max_workers: Optional[int],
+                        cache: Optional[ParseCache],
+                        fuzzy_names: bool = False) -> Optional[str]:
+    """
+    Met à jour un output existant en ne refusionnant que les matières dont le
+    CSV a changé depuis la génération précédente.
+
+    Les matières inchangées (y compris leurs retouches manuelles) et les
+    appréciations générales (saisies ou générées par l'IA) sont conservées.
+
+    Returns:
+        None si la mise à jour incrémentale a été faite, sinon la raison pour
+        laquelle un traitement complet est nécessaire.
+    """
+    if not os.path.exists(output_path):
+        return "aucun fichier JSON existant"
+    try:
+        metadata, bulletins = load_output_json(output_path)
+    except JsonGeneratorError as e:
+        return f"fichier JSON illisible ({str(e)})"
+    if not bulletins:
+        return "fichier JSON sans bulletin"
+
+    fingerprints = metadata.get("source_fingerprints")
+    period = period_from_metadata(metadata)
+    if not isinstance(fingerprints, dict) or period is None:
+        return "empreintes des fichiers source absentes"
+    if period_override is not None and period_override != period:
+        return "période différente de celle du fichier JSON"
+    if not _same_fingerprint(file_fingerprint(validation['source_xlsx']), fingerprints.get("source")):
+        return "source.xlsx modifié"
+
+    stored = fingerprints.get("matieres") or {}
+    csv_by_name = {
+        extract_matiere_name_from_filename(f): f for f in validation['csv_files']
+    }
+    current = {name: file_fingerprint(path) for name, path in csv_by_name.items()}
+    changed_files = [
+        path for name, path in csv_by_name.items()
+        if not _same_fingerprint(current[name], stored.get(name))
+    ]
+    removed = [name for name in stored if name not in csv_by_name]
+
+    # Lire uniquement les CSV modifiés ou nouveaux. Les avertissements ne
+    # rejoignent `result` qu'une fois la mise à jour acquise : en cas de repli
+    # sur le traitement complet, celui-ci les émet à nouveau.
+    updated: List[Tuple[str, List[Dict[str, Any]]]] = []
+    warnings: List[str] = []
+    for matiere_name, matiere_data, repaired, read_error in read_matieres(
+            changed_files, max_workers=max_workers, cache=cache):
+        if repaired:
+            warnings.append(_repair_warning(matiere_name, repaired))
+        if read_error is not None:
+            # L'ancienne version de la matière est conservée
+            warnings.append(f"Erreur matière {matiere_name}: {str(read_error)}")
+            continue
+        if (period_override is None and matiere_data
+                and detect_period_from_matiere_data(matiere_data) != period):
+            return f"période des données modifiée ({matiere_name})"
+        updated.append((matiere_name, matiere_data))
+    result['warnings'].extend(warnings)
+
+    # Retirer les matières à repeupler en mémorisant leurs autres périodes
+    refreshed = [name for name, _data in updated] + removed
+    previous_apps: Dict[str, Dict[str, Any]] = {}
+    for bulletin in bulletins:
+        key = f"{bulletin.eleve.nom} {bulletin.eleve.prenom}"
+        for name in refreshed:
+            old_app = bulletin.matieres.pop(name, None)
+            if old_app is not None:
+                previous_apps.setdefault(key, {})[name] = old_app
+
+    index = StudentIndex(bulletins, fuzzy=fuzzy_names)
+    for matiere_name, matiere_data in updated:
+        try:
+            populate_bulletins_from_csv(bulletins, matiere_data, matiere_name, period, index=index)
+        except BulletinProcessorError as e:
+            result['warnings'].append(f"Erreur matière {matiere_name}: {str(e)}")
+
+    # Restaurer les périodes non concernées par le nouvel export
+    for bulletin in bulletins:
+        key = f"{bulletin.eleve.nom} {bulletin.eleve.prenom}"
+        for name, old_app in previous_apps.get(key, {}).items():
+            current_app = bulletin.get_matiere(name)
+            if current_app is None:
+                old_app.periodes.pop(period.value, None)
+                if old_app.periodes:
+                    bulletin.add_matiere(old_app)
+                continue
+            for code, periode in old_app.periodes.items():
+                if code != period.value and code not in current_app.periodes:
+                    current_app.periodes[code] = periode
+
+    # Min/max par élève uniquement pour les matières touchées ; les
+    # statistiques de classe (une seule entrée) sont recalculées entièrement
+    calculate_min_max_moyennes(bulletins, matieres=refreshed)
+    class_stats = compute_class_statistics(bulletins)
+
+    if validate_data:
+        _validate_into_result(result, ValidationContext(
+            bulletins, period_code=period.value,
+            expected_subjects=set(csv_by_name),
+            csv_students=index.unmatched,
+        ))
+    _report_student_matching(result, index)
+
+    matieres_fp = {
+        name: fp for name, fp in stored.items() if name in csv_by_name
+    }
+    for name, _data in updated:
+        matieres_fp[name] = current[name]
+    metadata = dict(metadata)
+    metadata.update({
+        "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "source_directory": os.path.abspath(source_directory),
+        "matieres_count": len(matieres_fp),
+        "source_fingerprints": {"source": fingerprints.get("source"), "matieres": matieres_fp},
+        "class_stats": class_stats,
+    })
+    save_output_json(bulletins, output_path, metadata=metadata)
+
+    result.update({
+        'bulletins_count': len(bulletins),
+        'matieres_count': len(matieres_fp),
+        'semester': period.value,
+        'period': period.value,
+        'period_system': period.system.value,
+        'incremental': True,
+        'matieres_mises_a_jour': refreshed,
+        'bulletins': bulletins,
+        'metadata': metadata,
+        'periods': _periods_in_bulletins(bulletins),
+    })
+    return None
+
+
+def _new_result(output_path: Optional[str] = None) -> Dict[str, Any]:
+    """Résultat initial d'un traitement (voir `process_directory_to_json`)."""
+    return {
+        'success': False,
+        'bulletins_count': 0,
+        'matieres_count': 0,
+        'warnings': [],
+        'output_file': output_path,
+        'semester': Period.S2.value,
+        'period': Period.S2.value,
+        'period_system': Period.S2.system.value,
+        'cache_hits': 0,
+        'cache_misses': 0,
+        'incremental': False,
+        'matieres_mises_a_jour': [],
+        'bulletins': [],
+        'metadata': {},
+        'periods': [],
+        'instrumentation': {},
+    }
+
+
+def _periods_in_bulletins(bulletins: List[Bulletin]) -> List[str]:
+    """Codes de période présents dans les bulletins, dans l'ordre canonique."""
+    present = set()
+    for bulletin in bulletins:
+        for appreciation in bulletin.matieres.values():
+            present.update(appreciation.periodes)
+    return [code for code in PERIOD_CODES if code in present]
+
+
+@dataclass
+class ClassPipeline:
+    """
+    Traitement en mémoire d'un dossier classe, étape par étape.
+
+    Étapes : `read` (source.xlsx et CSV) → `build` (bulletins de base) →
+    `populate` (CSV matières) → `merge_history` (autres périodes, optionnel)
+    → `compute_stats` → `validate` ; `save` écrit ensuite le JSON si besoin.
+    Chaque étape complète l'état et `result` ; `run` les enchaîne. La lecture
+    des CSV peut être parallèle (`max_workers`) : la fusion se fait toujours
+    dans l'ordre des fichiers, le résultat est identique en séquentiel.
+
+    Attributs:
+        source_directory: Dossier contenant source.xlsx et les CSV matières
+        validate_data: Si True, l'étape `validate` produit un rapport
+        period_override: Période imposée (sinon détectée depuis les CSV)
+        max_workers: Nombre de CSV lus simultanément (1 = séquentiel)
+        cache: Cache des fichiers déjà analysés (optionnel)
+        fuzzy_names: Rapprochement approché des noms d'élèves des CSV
+        students: Si fourni, seuls ces élèves (« NOM Prénom », normalisés)
+            sont construits et seules leurs lignes CSV sont analysées
+        result: Résultat du traitement (voir `process_directory_to_json`)
+        instrumentation: Mesures par étape (désactivées par défaut) ; le
+            rapport est placé dans result['instrumentation']
+    """
+    source_directory: str
+    validate_data: bool = True
+    period_override: Optional[Period] = None
+    max_workers: Optional[int] = None
+    cache: Optional[ParseCache] = None
+    fuzzy_names: bool = False
+    students: Optional[Sequence[str]] = None
+    result: Dict[str, Any] = field(default_factory=_new_result)
+    instrumentation: Instrumentation = DISABLED
+    period: Period = field(default=Period.S2, init=False)
+    bulletins: List[Bulletin] = field(default_factory=list, init=False)
+    metadata: Dict[str, Any] = field(default_factory=dict, init=False)
+    _validation: Dict[str, Any] = field(default_factory=dict, init=False)
+    _eleves_data: List[Dict[str, Any]] = field(default_factory=list, init=False)
+    _matieres_lues: List[MatiereLue] = field(default_factory=list, init=False)
+    _matieres_traitees: List[str] = field(default_factory=list, init=False)
+    _period_detected: bool = field(default=False, init=False)
+    _index: Optional[StudentIndex] = field(default=None, init=False)
+    _class_stats: Optional[Dict[str, Any]] = field(default=None, init=False)
+
+    def read(self, validation: Optional[Dict[str, Any]] = None) -> 'ClassPipeline':
+        """
+        Lit source.xlsx et les CSV matières (en parallèle si `max_workers`).
+
+        Args:
+            validation: Résultat de `validate_source_directory` déjà calculé
+
+        Raises:
+            MainProcessorError: Si le dossier est invalide ou sans élève
+        """
+        if validation is None:
+            validation = validate_source_directory(self.source_directory)
+        if not validation['valid']:
+            raise MainProcessorError(f"Répertoire source invalide: {', '.join(validation['errors'])}")
+        self._validation = validation
+
+        with self.instrumentation.stage("source_xlsx") as stage:
+            hits = self._cache_hits()
+            if self.students is not None:
+                # Élèves choisis : lecture en flux, les autres lignes ne sont
+                # pas converties
+                eleves_data = list(iter_source_xlsx(validation['source_xlsx'],
+                                                    students=self.students))
+            else:
+                eleves_data = read_source_xlsx(validation['source_xlsx'], cache=self.cache)
+                if not eleves_data:
+                    raise MainProcessorError("Aucun élève trouvé dans source.xlsx")
+            stage.add(ROWS, len(eleves_data))
+            stage.add(BYTES_READ, file_size(validation['source_xlsx']))
+            stage.add(CACHE_HITS, self._cache_hits() - hits)
+        self._eleves_data = eleves_data
+
+        with self.instrumentation.stage("csv") as stage:
+            # Période détectée avant l'ingestion (en-têtes des CSV seulement) :
+            # elle sert dès la lecture des appréciations générales du source.xlsx
+            period = self.period_override
+            if period is None:
+                period = sniff_directory_period(self.source_directory, validation['csv_files'])
+            self._period_detected = period is not None
+            self.period = period if period is not None else Period.S2
+
+            hits = self._cache_hits()
+            self._matieres_lues = read_matieres(
+                validation['csv_files'], max_workers=self.max_workers, cache=self.cache,
+                students=self.students,
+            )
+            stage.add(ROWS, sum(len(data) for _n, data, _r, _e in self._matieres_lues if data))
+            stage.add(BYTES_READ, sum(file_size(f) for f in validation['csv_files']))
+            stage.add(CACHE_HITS, self._cache_hits() - hits)
+        if self.cache is not None:
+            cache_stats = self.cache.stats()
+            self.result['cache_hits'] = cache_stats['hits']
+            self.result['cache_misses'] = cache_stats['misses']
+        return self
+
+    def _cache_hits(self) -> int:
+        return self.cache.stats()['hits'] if self.cache is not None else 0
+
+    def build(self) -> 'ClassPipeline':
+        """Crée les bulletins de base (appréciations générales du source.xlsx)."""
+        with self.instrumentation.stage("construction") as stage:
+            self.bulletins = create_bulletins_from_source(self._eleves_data, period=self.period)
+            stage.add(ROWS, len(self._eleves_data))
+        self.result['bulletins_count'] = len(self.bulletins)
+        return self
+
+    def populate(self) -> 'ClassPipeline':
+        """Fusionne les CSV matières dans l'ordre du tri naturel des fichiers."""
+        with self.instrumentation.stage("fusion_csv") as stage:
+            self._index = StudentIndex(self.bulletins, fuzzy=self.fuzzy_names)
+            self._matieres_traitees = []
+            for matiere_name, matiere_data, repaired, read_error in self._matieres_lues:
+                if repaired:
+                    self.result['warnings'].append(_repair_warning(matiere_name, repaired))
+                if read_error is not None:
+                    # Avertissement mais pas d'arrêt du traitement
+                    self.result['warnings'].append(f"Erreur matière {matiere_name}: {str(read_error)}")
+                    continue
+                try:
+                    if not self._period_detected and matiere_data:
+                        self.period = detect_period_from_matiere_data(matiere_data)
+                        self._period_detected = True
+                    if self.students is not None and not self.bulletins:
+                        self._matieres_traitees.append(matiere_name)
+                        continue
+                    populate_bulletins_from_csv(self.bulletins, matiere_data, matiere_name,
+                                                self.period, index=self._index)
+                    stage.add(ROWS, len(matiere_data))
+                    self._matieres_traitees.append(matiere_name)
+                except BulletinProcessorError as e:
+                    # Avertissement mais pas d'arrêt du traitement
+                    self.result['warnings'].append(f"Erreur matière {matiere_name}: {str(e)}")
+
+        self.result['matieres_count'] = len(self._matieres_traitees)
+        self.result['semester'] = self.period.value
+        self.result['period'] = self.period.value
+        self.result['period_system'] = self.period.system.value
+        return self
+
+    def merge_history(self, previous_bulletins: Optional[List[Bulletin]]) -> 'ClassPipeline':
+        """Reporte les autres périodes de bulletins existants (voir `merge_history_into_bulletins`)."""
+        if previous_bulletins:
+            with self.instrumentation.stage("historique") as stage:
+                registry = SubjectRegistry.for_directory(self.source_directory, self._matieres_traitees)
+                merge_history_into_bulletins(self.bulletins, previous_bulletins, self.period.value,
+                                             registry=registry)
+                stage.add(ROWS, len(previous_bulletins))
+        return self
+
+    def compute_stats(self) -> 'ClassPipeline':
+        """
+        Min/max par élève et statistiques de classe, à partir d'une seule
+        matrice (après fusion de l'historique).
+        """
+        with self.instrumentation.stage("statistiques") as stage:
+            matrix = ClassMatrix.from_bulletins(self.bulletins)
+            calculate_min_max_moyennes(self.bulletins, matrix=matrix)
+            self._class_stats = compute_class_statistics(self.bulletins, matrix=matrix)
+            stage.add(ROWS, len(self.bulletins))
+        return self
+
+    def validate(self) -> 'ClassPipeline':
+        """Valide la classe (si `validate_data`) et reporte les rapprochements d'élèves."""
+        with self.instrumentation.stage("validation"):
+            if self.validate_data:
+                _validate_into_result(self.result, ValidationContext(
+                    self.bulletins, period_code=self.period.value,
+                    expected_subjects=set(self._matieres_traitees),
+                    csv_students=self._index.unmatched if self._index else {},
+                ))
+            if self._index is not None:
+                _report_student_matching(self.result, self._index)
+        return self
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Construit les métadonnées et complète le résultat.
+
+        Returns:
+            Le résultat, avec 'bulletins', 'metadata' et 'periods'
+        """
+        period = self.period
+        self.metadata = {
+            "semester": period.value,
+            "current_period": period.value,
+            "period_system": period.system.value,
+            "period_label": period.label,
+            "semester_label": period.label,
+            "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "source_directory": os.path.abspath(self.source_directory),
+            "matieres_count": len(self._matieres_traitees),
+            "source_fingerprints": _source_fingerprints(
+                self._validation['source_xlsx'], self._validation['csv_files'],
+                self._matieres_traitees,
+            ),
+        }
+        if self._class_stats is not None:
+            self.metadata["class_stats"] = self._class_stats
+        self.result.update({
+            'success': True,
+            'bulletins': self.bulletins,
+            'metadata': self.metadata,
+            'periods': _periods_in_bulletins(self.bulletins),
+            'instrumentation': self.instrumentation.report(),
+        })
+        return self.result
+
+    def save(self, output_path: str) -> Dict[str, Any]:
+        """Étape optionnelle : écrit les bulletins et les métadonnées en JSON."""
+        with self.instrumentation.stage("ecriture_json") as stage:
+            save_output_json(self.bulletins, output_path, metadata=self.metadata)
+            stage.add(BYTES_WRITTEN, file_size(output_path))
+        self.result['output_file'] = output_path
+        self.result['instrumentation'] = self.instrumentation.report()
+        return self.result
+
+    def run(self, previous_bulletins: Optional[List[Bulletin]] = None,
+            statistics: bool = True,
+            validation: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Enchaîne toutes les étapes, sans écriture.
+
+        Args:
+            previous_bulletins: Bulletins dont reporter les autres périodes
+            statistics: Si False, ni min/max ni statistiques de classe
+            validation: Résultat de `validate_source_directory` déjà calculé
+
+        Returns:
+            Le résultat (voir `finish`)
+        """
+        self.read(validation).build().populate().merge_history(previous_bulletins)
+        if statistics:
+            self.compute_stats()
+        return self.validate().finish()
+
+
+def process_directory(source_directory: str,
+                      validate_data: bool = True,
+                      history_path: Optional[str] = None,
+                      period_override: Optional["Period"] = None,
+                      max_workers: Optional[int] = None,
+                      use_cache: bool = False,
+                      fuzzy_names: bool = False,
+                      students: Optional[Sequence[str]] = None,
+                      statistics: bool = True,
+                      output_path: Optional[str] = None,
+                      instrument: bool = False,
+                      trace_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Traite un répertoire en mémoire et retourne les bulletins et métadonnées.
+
+    Voir `ClassPipeline` pour les étapes ; le JSON n'est écrit que si
+    `output_path` est fourni.
+
+    Args:
+        source_directory: Répertoire contenant source.xlsx et les fichiers CSV
+        validate_data: Si True, valide la cohérence des données
+        history_path: JSON existant dont reporter les autres périodes
+        period_override: Période imposée (sinon détectée depuis les CSV)
+        max_workers: Nombre de CSV lus simultanément (1 = séquentiel)
+        use_cache: Si True, réutilise les lectures mises en cache
+        fuzzy_names: Rapprochement approché des noms d'élèves des CSV
+        students: Élèves à construire (« NOM Prénom ») ; None = toute la classe
+        statistics: Si False, ni min/max ni statistiques de classe
+        output_path: Si fourni, chemin du JSON à écrire (étape `save`)
+        instrument: Si True, mesure chaque étape (temps, CPU, lignes, octets,
+            cache) dans result['instrumentation']
+        trace_path: Si fourni, fichier de trace JSON des mesures (implique
+            `instrument`)
+
+    Returns:
+        Résultat de `process_directory_to_json`, avec en plus 'bulletins'
+        (liste de Bulletin), 'metadata' (bloc `_metadata`) et 'periods'
+        (codes présents)
+
+    Raises:
+        MainProcessorError: Si le traitement échoue
+    """
+    cache = ParseCache.for_directory(source_directory) if use_cache else None
+    pipeline = ClassPipeline(
+        source_directory, validate_data=validate_data, period_override=period_override,
+        max_workers=max_workers, cache=cache, fuzzy_names=fuzzy_names, students=students,
+        result=_new_result(output_path),
+        instrumentation=Instrumentation(enabled=instrument or bool(trace_path)),
+    )
+    try:
+        return _run_pipeline(pipeline, history_path, statistics, output_path,
+                             trace_path=trace_path)
+    except (FileReaderError, BulletinProcessorError, JsonGeneratorError) as e:
+        raise MainProcessorError(f"Erreur lors du traitement: {str(e)}")
+    except Exception as e:
+        raise MainProcessorError(f"Erreur inattendue: {str(e)}")
+
+
+def _run_pipeline(pipeline: ClassPipeline,
+                  history_path: Optional[str],
+                  statistics: bool,
+                  output_path: Optional[str],
+                  validation: Optional[Dict[str, Any]] = None,
+                  trace_path: Optional[str] = None) -> Dict[str, Any]:
+    previous_bulletins = None
+    if history_path and os.path.exists(history_path):
+        with pipeline.instrumentation.stage("historique") as stage:
+            try:
+                previous_bulletins = load_bulletins_from_json(history_path)
+                stage.add(BYTES_READ, file_size(history_path))
+            except JsonGeneratorError as e:
+                pipeline.result['warnings'].append(f"Historique ignoré (output illisible): {str(e)}")
+    result = pipeline.run(previous_bulletins, statistics=statistics, validation=validation)
+    if output_path:
+        pipeline.save(output_path)
+    if trace_path:
+        _write_trace(pipeline.instrumentation, trace_path, result, pipeline.source_directory)
+    return result
+
+
+def _write_trace(instrumentation: Instrumentation, trace_path: str,
+                 result: Dict[str, Any], source_directory: str) -> None:
+    """Écrit la trace des mesures ; un échec n'interrompt pas le traitement."""
+    try:
+        instrumentation.write_trace(trace_path, {
+            'source_directory': os.path.abspath(source_directory),
+            'period': result.get('period'),
+            'output_file': result.get('output_file'),
+            'bulletins_count': result.get('bulletins_count', 0),
+        })
+    except OSError as e:
+        result['warnings'].append(f"Trace non écrite ({trace_path}): {str(e)}")
 
 
 def process_directory_to_json(source_directory: str, 
                              output_path: str,
                              validate_data: bool = True,
                              merge_history: bool = False,
-                             period_override: Optional["Period"] = None) -> Dict[str, Any]:
+                             period_override: Optional["Period"] = None,
+                             max_workers: Optional[int] = None,
+                             use_cache: bool = False,
+                             incremental: bool = False,
+                             fuzzy_names: bool = False,
+                             instrument: bool = False,
+                             trace_path: Optional[str] = None) -> Dict[str, Any]:
     """
     Traite un répertoire complet et génère le fichier JSON de sortie.
+
+    Équivaut à `process_directory` suivi de l'étape de sauvegarde, avec en
+    plus le mode incrémental.
     
     Args:
         source_directory: Répertoire contenant source.xlsx et les fichiers CSV
         output_path: Chemin du fichier JSON de sortie
         validate_data: Si True, valide la cohérence des données
+        merge_history: Si True, reporte les autres périodes de l'output existant
+        period_override: Période imposée (sinon détectée depuis les CSV)
+        max_workers: Nombre de CSV lus simultanément (1 = séquentiel)
+        use_cache: Si True, réutilise les lectures mises en cache dans
+            `<source_directory>/.pyconseil_cache` pour les fichiers inchangés
+        incremental: Si True et que `output_path` existe, ne refusionne que
+            les matières dont le CSV a changé depuis la génération précédente
+            (repli sur un traitement complet si ce n'est pas possible)
+        fuzzy_names: Si True, les noms des CSV introuvables même après
+            normalisation sont rapprochés par distance d'édition bornée
+        instrument: Si True, mesure chaque étape (voir 'instrumentation')
+        trace_path: Si fourni, fichier de trace JSON des mesures (implique
+            `instrument`)
         
     Returns:
         Dictionnaire avec les résultats du traitement:
@@ -135,20 +822,24 @@ def process_directory_to_json(source_directory: str,
         - 'warnings': List[str] - Liste des avertissements
         - 'output_file': str - Chemin du fichier généré
         - 'semester': str - Semestre détecté (S1/S2)
+        - 'cache_hits' / 'cache_misses': int - Lectures servies / non servies
+          par le cache (0 si le cache est désactivé)
+        - 'incremental': bool - True si seule une partie des matières a été
+          refusionnée ('matieres_mises_a_jour' liste alors ces matières)
+        - 'student_matching': Dict - Lignes CSV non rapprochées, ambiguës
+          ou rapprochées approximativement (voir `StudentIndex.report`)
+        - 'bulletins' / 'metadata': Bulletins et bloc `_metadata` écrits
+        - 'periods': List[str] - Périodes présentes dans les bulletins
+        - 'instrumentation': Dict - Mesures par étape si `instrument` ({"stages":
+          {étape: {"wall_s", "cpu_s", "rows", "bytes_read", "bytes_written",
+          "cache_hits"...}}, "wall_s", "cpu_s"}), sinon {}
         
     Raises:
         MainProcessorError: Si le traitement échoue
     """
-    result = {
-        'success': False,
-        'bulletins_count': 0,
-        'matieres_count': 0,
-        'warnings': [],
-        'output_file': output_path,
-        'semester': Period.S2.value,
-        'period': Period.S2.value,
-        'period_system': Period.S2.system.value
-    }
+    result = _new_result(output_path)
+    cache = ParseCache.for_directory(source_directory) if use_cache else None
+    instrumentation = Instrumentation(enabled=instrument or bool(trace_path))
     
     try:
         # 1. Valider le répertoire source
@@ -156,75 +847,40 @@ def process_directory_to_json(source_directory: str,
         if not validation['valid']:
             raise MainProcessorError(f"Répertoire source invalide: {', '.join(validation['errors'])}")
         
-        # 2. Lire le fichier source.xlsx
-        eleves_data = read_source_xlsx(validation['source_xlsx'])
-        if not eleves_data:
-            raise MainProcessorError("Aucun élève trouvé dans source.xlsx")
+        # Mode incrémental : mise à jour des seules matières modifiées
+        if incremental:
+            with instrumentation.stage("incremental") as stage:
+                reason = _incremental_update(
+                    source_directory, output_path, validation, result,
+                    validate_data=validate_data, period_override=period_override,
+                    max_workers=max_workers, cache=cache, fuzzy_names=fuzzy_names,
+                )
+                if reason is None:
+                    stage.add(BYTES_WRITTEN, file_size(output_path))
+                    if cache is not None:
+                        stage.add(CACHE_HITS, cache.stats()['hits'])
+            if reason is None:
+                if cache is not None:
+                    cache_stats = cache.stats()
+                    result['cache_hits'] = cache_stats['hits']
+                    result['cache_misses'] = cache_stats['misses']
+                result['success'] = True
+                result['instrumentation'] = instrumentation.report()
+                if trace_path:
+                    _write_trace(instrumentation, trace_path, result, source_directory)
+                return result
+            if os.path.exists(output_path):
+                result['warnings'].append(f"Traitement complet ({reason})")
         
-        # Période initiale (override ou défaut) — utilisée pour lire source.xlsx
-        period = period_override if period_override is not None else Period.S2
-        period_detected = period_override is not None
-
-        # 3. Créer les bulletins de base (appréciations générales du source.xlsx)
-        bulletins = create_bulletins_from_source(eleves_data, period=period)
-        result['bulletins_count'] = len(bulletins)
-        
-        # 4. Traiter chaque fichier CSV de matière
-        csv_files = validation['csv_files']
-        matieres_traitees = []
-        for csv_file in csv_files:
-            matiere_name = extract_matiere_name_from_filename(csv_file)
-            
-            try:
-                matiere_data = read_csv_matiere(csv_file, matiere_name)
-                
-                if not period_detected and matiere_data:
-                    period = detect_period_from_matiere_data(matiere_data)
-                    period_detected = True
-                
-                populate_bulletins_from_csv(bulletins, matiere_data, matiere_name, period)
-                matieres_traitees.append(matiere_name)
-                
-            except (FileReaderError, BulletinProcessorError) as e:
-                # Avertissement mais pas d'arrêt du traitement
-                result['warnings'].append(f"Erreur matière {matiere_name}: {str(e)}")
-        
-        result['matieres_count'] = len(matieres_traitees)
-        result['semester'] = period.value
-        result['period'] = period.value
-        result['period_system'] = period.system.value
-        
-        # 5. Fusionner l'historique des périodes précédentes (output existant)
-        if merge_history and os.path.exists(output_path):
-            try:
-                previous_bulletins = load_bulletins_from_json(output_path)
-                merge_history_into_bulletins(bulletins, previous_bulletins, period.value)
-            except JsonGeneratorError as e:
-                result['warnings'].append(f"Historique ignoré (output illisible): {str(e)}")
-        
-        # 6. Calculer les moyennes min/max (après fusion historique)
-        calculate_min_max_moyennes(bulletins)
-        
-        # 7. Validation optionnelle des données
-        if validate_data:
-            warnings = validate_bulletins_consistency(bulletins)
-            result['warnings'].extend(warnings)
-        
-        # 8. Sauvegarder le JSON
-        metadata = {
-            "semester": period.value,
-            "current_period": period.value,
-            "period_system": period.system.value,
-            "period_label": period.label,
-            "semester_label": period.label,
-            "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
-            "source_directory": os.path.abspath(source_directory),
-            "matieres_count": len(matieres_traitees)
-        }
-        save_output_json(bulletins, output_path, metadata=metadata)
-        
-        result['success'] = True
-        return result
+        # 2. Traitement en mémoire puis sauvegarde
+        pipeline = ClassPipeline(
+            source_directory, validate_data=validate_data, period_override=period_override,
+            max_workers=max_workers, cache=cache, fuzzy_names=fuzzy_names, result=result,
+            instrumentation=instrumentation,
+        )
+        return _run_pipeline(pipeline, output_path if merge_history else None,
+                             statistics=True, output_path=output_path, validation=validation,
+                             trace_path=trace_path)
         
     except (FileReaderError, BulletinProcessorError, JsonGeneratorError) as e:
         raise MainProcessorError(f"Erreur lors du traitement: {str(e)}")
@@ -235,6 +891,12 @@ def process_directory_to_json(source_directory: str,
 def process_single_bulletin(source_directory: str, nom_eleve: str) -> Bulletin:
     """
     Traite un seul bulletin d'élève (utile pour le debug/test).
+
+    Seules les lignes de cet élève sont converties, sans fichier
+    intermédiaire : source.xlsx est lu en flux et les lignes des autres élèves
+    des CSV sont écartées avant la construction des enregistrements.
+    Les min/max et statistiques de classe, qui demandent toute la classe, ne
+    sont pas calculés.
     
     Args:
         source_directory: Répertoire contenant les fichiers source
@@ -247,22 +909,14 @@ def process_single_bulletin(source_directory: str, nom_eleve: str) -> Bulletin:
         MainProcessorError: Si l'élève n'est pas trouvé ou erreur
     """
     try:
-        # Lire tous les bulletins (sans fusion d'historique sur le fichier temporaire)
-        result = process_directory_to_json(source_directory, "/tmp/temp.json", merge_history=False)
-        
-        # Recharger les bulletins depuis le fichier temporaire (pas optimal mais simple)
-        try:
-            from .json_generator import load_bulletins_from_json
-        except ImportError:
-            from services.json_generator import load_bulletins_from_json
-        bulletins = load_bulletins_from_json("/tmp/temp.json")
-        
-        # Chercher l'élève demandé
+        result = process_directory(source_directory, validate_data=False,
+                                   students=[nom_eleve], statistics=False)
+        bulletins = result['bulletins']
         for bulletin in bulletins:
-            nom_complet = f"{bulletin.eleve.nom} {bulletin.eleve.prenom}"
-            if nom_complet == nom_eleve:
+            if f"{bulletin.eleve.nom} {bulletin.eleve.prenom}" == nom_eleve:
                 return bulletin
-        
+        if bulletins:
+            return bulletins[0]
         raise MainProcessorError(f"Élève non trouvé: {nom_eleve}")
         
     except Exception as e:
@@ -272,12 +926,16 @@ def process_single_bulletin(source_directory: str, nom_eleve: str) -> Bulletin:
 def get_processing_summary(source_directory: str) -> Dict[str, Any]:
     """
     Retourne un résumé de ce qui serait traité sans faire le traitement.
+
+    Seuls les en-têtes des CSV et les dimensions de source.xlsx sont lus :
+    le résumé reste instantané sur de gros dossiers.
     
     Args:
         source_directory: Répertoire à analyser
         
     Returns:
-        Dictionnaire avec informations sur le contenu
+        Dictionnaire avec informations sur le contenu ('detected_period' :
+        code de la période lue dans les en-têtes CSV, ou None)
     """
     summary = {
         'valid_directory': False,
@@ -286,6 +944,7 @@ def get_processing_summary(source_directory: str) -> Dict[str, Any]:
         'csv_files': [],
         'estimated_bulletins': 0,
         'estimated_matieres': 0,
+        'detected_period': None,
         'errors': []
     }
     
@@ -302,13 +961,17 @@ def get_processing_summary(source_directory: str) -> Dict[str, Any]:
         if validation['errors']:
             summary['errors'].extend(validation['errors'])
         
-        # Estimer le nombre de bulletins si possible
+        # Estimer le nombre de bulletins (dimensions de la feuille, sans
+        # lecture des cellules)
         if validation['source_xlsx']:
             try:
-                eleves_data = read_source_xlsx(validation['source_xlsx'])
-                summary['estimated_bulletins'] = len(eleves_data)
+                summary['estimated_bulletins'] = count_source_xlsx_rows(validation['source_xlsx'])
             except FileReaderError as e:
                 summary['errors'].append(f"Erreur lecture source.xlsx: {str(e)}")
+
+        # Période lue dans les en-têtes des CSV
+        detected = sniff_directory_period(source_directory, validation['csv_files'])
+        summary['detected_period'] = detected.value if detected else None
     
     except Exception as e:
         summary['errors'].append(f"Erreur d'analyse: {str(e)}")
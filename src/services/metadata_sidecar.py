@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Fichier annexe des métadonnées d'un JSON de bulletins.
+
+Modifier le bloc `_metadata` d'un `output_T3.json` (ex. ajout d'une période
+liée) imposait de relire et de réécrire tous les bulletins. Les métadonnées
+modifiées seules sont désormais écrites dans un fichier annexe
+`output_T3.json.meta` (qui ne se termine pas par `.json` : il n'est pas pris
+pour un fichier de période), en O(taille des métadonnées) :
+
+    {"version": 1, "json_size": 6300000, "json_mtime_ns": ..., "metadata": {...}}
+
+L'annexe mémorise la taille et la date de modification du JSON principal au
+moment de son écriture. Elle n'est prise en compte que si elles
+correspondent encore : si le JSON est réécrit (par l'application, qui
+supprime alors l'annexe, ou par un autre outil), le bloc `_metadata` du JSON
+redevient la référence. Un JSON sans annexe se lit comme avant.
+"""
+
+import os
+from typing import Any, Dict, Mapping, Optional
+
+# Import conditionnel pour gérer les imports relatifs
+try:
+    from . import json_backend
+    from .payload_cache import Signature, file_signature
+except ImportError:
+    # Fallback pour l'exécution directe via PYTHONPATH
+    from services import json_backend
+    from services.payload_cache import Signature, file_signature
+
+
+SIDECAR_SUFFIX = ".meta"
+SIDECAR_VERSION = 1
+
+
+def sidecar_path(json_path: str) -> str:
+    """Chemin de l'annexe de métadonnées d'un JSON (`<nom>.json.meta`)."""
+    return json_path + SIDECAR_SUFFIX
+
+
+def sidecar_signature(json_path: str) -> Optional[Signature]:
+    """(taille, st_mtime_ns) de l'annexe, ou None si elle est absente."""
+    return file_signature(sidecar_path(json_path))
+
+
+def read_sidecar(json_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Métadonnées de l'annexe, si elle existe et correspond au JSON actuel.
+
+    Args:
+        json_path: Chemin du JSON principal
+
+    Returns:
+        Bloc `_metadata` de l'annexe, ou None (absente, illisible, ou JSON
+        modifié depuis son écriture)
+    """
+    try:
+        stat = os.stat(json_path)
+        data = json_backend.load(sidecar_path(json_path))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != SIDECAR_VERSION:
+        return None
+    if data.get("json_size") != stat.st_size or data.get("json_mtime_ns") != stat.st_mtime_ns:
+        return None
+    metadata = data.get("metadata")
+    return metadata if isinstance(metadata, dict) else None
+
+
+def effective_metadata(json_path: str, embedded: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Métadonnées à utiliser pour un JSON : l'annexe valide si elle existe,
+    sinon le bloc `_metadata` du fichier.
+
+    Args:
+        json_path: Chemin du JSON principal
+        embedded: Bloc `_metadata` lu dans le JSON (peut être None)
+    """
+    sidecar = read_sidecar(json_path)
+    if sidecar is not None:
+        return sidecar
+    return dict(embedded or {})
+
+
+def write_sidecar(json_path: str, metadata: Mapping[str, Any]) -> None:
+    """
+    Écrit (atomiquement) l'annexe de métadonnées d'un JSON existant.
+
+    Raises:
+        OSError: Si le JSON principal est absent ou l'annexe non écrite
+    """
+    stat = os.stat(json_path)
+    json_backend.dump({
+        "version": SIDECAR_VERSION,
+        "json_size": stat.st_size,
+        "json_mtime_ns": stat.st_mtime_ns,
+        "metadata": dict(metadata),
+    }, sidecar_path(json_path))
+
+
+def remove_sidecar(json_path: str) -> None:
+    """Supprime l'annexe (après réécriture complète du JSON)."""
+    try:
+        os.remove(sidecar_path(json_path))
+    except OSError:
+        # Absente, ou non supprimable : elle ne correspond plus au JSON
+        pass
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Cache disque des fichiers source déjà analysés (CSV matières, source.xlsx).
+
+Chaque clic sur « Créer JSON » relisait tous les fichiers du dossier, même
+inchangés. Le cache conserve, dans un sous-dossier `.pyconseil_cache` du
+dossier de travail, les enregistrements normalisés produits par
+`file_reader`. Une entrée est identifiée par le chemin du fichier, le type
+de lecture et une variante (ex: nom de matière) ; elle n'est réutilisée que
+si la taille et l'empreinte SHA-256 du contenu sont identiques (la date de
+modification est mémorisée à titre indicatif).
+
+Les entrées sont écrites en JSON (`json_backend`) et non avec `pickle` : le
+dossier de travail est souvent sur un partage réseau, et relire un pickle
+déposé par un tiers permettrait d'exécuter du code. Un résultat que le JSON
+ne restitue pas à l'identique (tuple, NaN, date...) n'est pas mis en cache.
+
+Le cache est purement opportuniste : un dossier en lecture seule ou une
+entrée corrompue se traduisent par une relecture normale du fichier.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Import conditionnel pour gérer les imports relatifs
+try:
+    from . import json_backend
+except ImportError:
+    # Fallback pour l'exécution directe via PYTHONPATH
+    from services import json_backend
+
+CACHE_DIRNAME = ".pyconseil_cache"
+CACHE_FORMAT_VERSION = 3
+DEFAULT_MAX_ENTRIES = 256
+
+_ENTRY_SUFFIX = ".json"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_fingerprint(path: str) -> Dict[str, Any]:
+    """
+    Calcule l'empreinte d'un fichier : taille, date de modification et SHA-256.
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        Dictionnaire {'size', 'mtime_ns', 'sha256'}
+
+    Raises:
+        OSError: Si le fichier ne peut pas être lu
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': digest.hexdigest(),
+    }
+
+
+def _short_hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+class ParseCache:
+    """
+    Cache disque des enregistrements normalisés, avec éviction LRU.
+
+    Utilisable depuis plusieurs threads (lecture parallèle des CSV).
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_directory(cls, directory: str, max_entries: int = DEFAULT_MAX_ENTRIES) -> 'ParseCache':
+        """Cache situé dans le dossier de travail (`<dossier>/.pyconseil_cache`)."""
+        return cls(os.path.join(directory, CACHE_DIRNAME), max_entries=max_entries)
+
+    # ------------------------------------------------------------------
+    # Lecture / écriture
+    # ------------------------------------------------------------------
+    def get_or_parse(self, path: str, kind: str, parser: Callable[[], Any],
+                     variant: str = "") -> Any:
+        """
+        Retourne le résultat en cache pour `path`, ou appelle `parser`.
+
+        Args:
+            path: Fichier source analysé
+            kind: Type de lecture (ex: "csv_matiere", "source_xlsx")
+            parser: Fonction de lecture appelée en cas d'absence en cache
+            variant: Paramètre de lecture influant sur le résultat
+
+        Returns:
+            Résultat de `parser` (éventuellement restauré depuis le cache)
+        """
+        try:
+            fingerprint = file_fingerprint(path)
+        except OSError:
+            self._count(hit=False)
+            return parser()
+
+        entry_path = self._entry_path(path, kind, variant)
+        entry = self._load_entry(entry_path)
+        if (entry is not None
+                and entry.get('size') == fingerprint['size']
+                and entry.get('sha256') == fingerprint['sha256']):
+            self._count(hit=True)
+            self._touch(entry_path)
+            return entry['payload']
+
+        self._count(hit=False)
+        payload = parser()
+        self._store_entry(entry_path, {
+            'version': CACHE_FORMAT_VERSION,
+            'path': os.path.abspath(path),
+            'kind': kind,
+            'variant': variant,
+            **fingerprint,
+            'payload': payload,
+        })
+        return payload
+
+    def invalidate(self, path: Optional[str] = None) -> int:
+        """
+        Supprime les entrées d'un fichier source (ou toutes si `path` est None).
+
+        Args:
+            path: Fichier source dont les entrées doivent être oubliées
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        pattern = f"{_short_hash(os.path.abspath(path))}-*{_ENTRY_SUFFIX}" if path else f"*{_ENTRY_SUFFIX}"
+        removed = 0
+        for entry in Path(self.cache_dir).glob(pattern):
+            try:
+                entry.unlink()
+                removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def clear(self) -> int:
+        """Vide complètement le cache. Retourne le nombre d'entrées supprimées."""
+        return self.invalidate(None)
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs de la session : {'hits', 'misses'}."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    # ------------------------------------------------------------------
+    # Interne
+    # ------------------------------------------------------------------
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _entry_path(self, path: str, kind: str, variant: str) -> str:
+        name = f"{_short_hash(os.path.abspath(path))}-{_short_hash(kind + chr(0) + variant)}{_ENTRY_SUFFIX}"
+        return os.path.join(self.cache_dir, name)
+
+    def _load_entry(self, entry_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            entry = json_backend.load(entry_path)
+        except (OSError, ValueError):
+            # ValueError couvre JSONDecodeError et un contenu non UTF-8
+            return None
+        if not isinstance(entry, dict) or entry.get('version') != CACHE_FORMAT_VERSION:
+            return None
+        return entry
+
+    def _store_entry(self, entry_path: str, entry: Dict[str, Any]) -> None:
+        try:
+            data = json_backend.dumps(entry, compact=True)
+            if json_backend.loads(data) != entry:
+                # Résultat non restitué à l'identique par le JSON : pas de cache
+                return
+        except (TypeError, ValueError):
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, entry_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        except OSError:
+            # Dossier en lecture seule, disque plein... : cache ignoré
+            return
+        self._evict()
+
+    def _touch(self, entry_path: str) -> None:
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Supprime les entrées les moins récemment utilisées au-delà du quota."""
+        try:
+            entries = [
+                (entry.stat().st_mtime_ns, entry)
+                for entry in Path(self.cache_dir).glob(f"*{_ENTRY_SUFFIX}")
+            ]
+        except OSError:
+            return
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+        entries.sort(key=lambda item: item[0])
+        for _mtime, entry in entries[:excess]:
+            try:
+                entry.unlink()
+            except OSError:
+                continue
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Cache mémoire des fichiers JSON de bulletins déjà analysés.
+
+La résolution des périodes liées d'un fichier relit plusieurs fois les mêmes
+JSON voisins : découverte des fichiers frères (`period_code_of_file` sur
+chacun), détection de la période du contenu, chargement de l'historique, puis
+nouvelle découverte à chaque ajout/retrait de lien. Ce cache, partagé par tout
+le processus, conserve le contenu analysé des derniers fichiers lus (LRU) et
+les valeurs qui en sont dérivées (code de période...).
+
+Une entrée est identifiée par le chemin absolu et n'est réutilisée que si la
+taille et la date de modification (`st_mtime_ns`) du fichier n'ont pas changé.
+Les écritures de l'application (`save_output_json`, `update_file_metadata`)
+invalident en plus explicitement le fichier écrit, ce qui couvre les systèmes
+de fichiers à horodatage grossier.
+
+Le contenu mis en cache est partagé : il ne doit pas être modifié par les
+appelants (`read_payload` et `load_output_json` copient les métadonnées).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Import conditionnel pour gérer les imports relatifs
+try:
+    from . import json_backend
+except ImportError:
+    # Fallback pour l'exécution directe via PYTHONPATH
+    from services import json_backend
+
+
+DEFAULT_MAX_ENTRIES = 8
+# Taille cumulée maximale des fichiers en cache (le contenu analysé occupe
+# plusieurs fois la taille du fichier en mémoire)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_MISSING = object()
+
+Signature = Tuple[int, int]
+
+
+def file_signature(path: str) -> Optional[Signature]:
+    """(taille, st_mtime_ns) d'un fichier, ou None s'il est absent."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class _Entry:
+    __slots__ = ("signature", "data", "derived")
+
+    def __init__(self, signature: Signature):
+        self.signature = signature
+        self.data: Any = _MISSING
+        self.derived: Dict[Hashable, Any] = {}
+
+
+class PayloadCache:
+    """
+    Cache LRU {chemin: contenu JSON analysé et valeurs dérivées}.
+
+    Exemple :
+        data = cache.load(path)
+        code = cache.derived(path, ("period_code", extra), lambda: calcul(path))
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_entries: Nombre maximal de fichiers conservés
+            max_bytes: Taille cumulée maximale des fichiers conservés (un
+                fichier plus gros n'est pas mis en cache)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, path: str) -> Any:
+        """
+        Contenu JSON analysé d'un fichier (lu si absent du cache ou modifié).
+
+        Raises:
+            OSError: Si le fichier est illisible
+            JSONDecodeError: Si le contenu n'est pas du JSON valide
+        """
+        key = os.path.abspath(path)
+        signature = file_signature(key)
+        if signature is not None:
+            with self._lock:
+                entry = self._lookup(key, signature)
+                if entry is not None and entry.data is not _MISSING:
+                    self.hits += 1
+                    return entry.data
+                self.misses += 1
+        data = json_backend.load(path)
+        if signature is not None and signature == file_signature(key):
+            with self._lock:
+                self._store(key, signature).data = data
+        return data
+
+    def derived(self, path: str, name: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Valeur dérivée d'un fichier (ex. code de période), calculée une fois
+        par version du fichier.
+
+        Args:
+            path: Fichier dont la valeur dépend
+            name: Nom de la valeur ; y inclure toute autre dépendance (ex.
+                signature de l'annexe de métadonnées)
+            compute: Calcul de la valeur si elle n'est pas en cache
+        """
+        key = os.path.abspath(path)
+        signature = file_signature(key)
+        if signature is None:
+            return compute()
+        with self._lock:
+            entry = self._lookup(key, signature)
+            if entry is not None and name in entry.derived:
+                self.hits += 1
+                return entry.derived[name]
+            self.misses += 1
+        value = compute()
+        if signature == file_signature(key):
+            with self._lock:
+                self._store(key, signature).derived[name] = value
+        return value
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Oublie un fichier (après l'avoir écrit), ou tout le cache si `path` est None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs depuis le dernier `clear` : {'hits', 'misses', 'entries'}."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+    # ------------------------------------------------------------------
+    # Interne (appelé sous verrou)
+    # ------------------------------------------------------------------
+    def _lookup(self, key: str, signature: Signature) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.signature != signature:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, signature: Signature) -> _Entry:
+        entry = self._entries.get(key)
+        if entry is None or entry.signature != signature:
+            entry = self._entries[key] = _Entry(signature)
+        self._entries.move_to_end(key)
+        self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        total = sum(e.signature[0] for e in self._entries.values())
+        while self._entries and (len(self._entries) > self.max_entries or total > self.max_bytes):
+            _key, oldest = self._entries.popitem(last=False)
+            total -= oldest.signature[0]
+
+
+# Cache partagé par le processus
+PAYLOADS = PayloadCache()
@@ -13,24 +13,23 @@ sont referencees via des "liens" :
   (`period_links`, `period_link_overrides` et `period_links_excluded`).
 
 Au chargement, les periodes liees sont fusionnees **en lecture seule** dans
-une copie des bulletins courants afin de reconstruire la vue multi-periodes
-(colonnes Moy./Abs./Ret., evolution, appreciations) sans jamais modifier le
-fichier de la periode courante sur le disque.
+une vue des bulletins courants (`BulletinOverlay`) afin de reconstruire la vue
+multi-periodes (colonnes Moy./Abs./Ret., evolution, appreciations) sans jamais
+modifier le fichier de la periode courante sur le disque. La vue partage les
+donnees des fichiers charges et ne copie une periode qu'a la premiere ecriture.
 """
 
 from __future__ import annotations
 
 import copy
-import json
 import os
 import re
-import unicodedata
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 
 # Import conditionnel pour gerer les imports relatifs
 try:
-    from ..models.bulletin import Bulletin
+    from ..models.bulletin import AppreciationMatiere, Bulletin, PeriodeData
     from ..utils.semester import (
         PERIOD_CODES,
         Period,
@@ -39,9 +38,14 @@ try:
         infer_period_from_bulletins_data,
         period_from_directory_name,
     )
+    from . import json_backend
+    from .metadata_sidecar import effective_metadata, read_sidecar, sidecar_signature, write_sidecar
+    from .payload_cache import PAYLOADS
+    from .period_index import PeriodIndex, sniff_metadata
     from .json_generator import load_bulletins_from_json
+    from .subject_registry import SubjectRegistry
 except ImportError:
-    from models.bulletin import Bulletin
+    from models.bulletin import AppreciationMatiere, Bulletin, PeriodeData
     from utils.semester import (
         PERIOD_CODES,
         Period,
@@ -50,7 +54,12 @@ except ImportError:
         infer_period_from_bulletins_data,
         period_from_directory_name,
     )
+    from services import json_backend
+    from services.metadata_sidecar import effective_metadata, read_sidecar, sidecar_signature, write_sidecar
+    from services.payload_cache import PAYLOADS
+    from services.period_index import PeriodIndex, sniff_metadata
     from services.json_generator import load_bulletins_from_json
+    from services.subject_registry import SubjectRegistry
 
 
 # ---------------------------------------------------------------------------
@@ -60,6 +69,11 @@ def read_payload(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
     """
     Lit un fichier JSON et separe le bloc `_metadata` des bulletins.
 
+    Le bloc `_metadata` est celui de l'annexe `<nom>.json.meta` si elle est
+    a jour (voir `metadata_sidecar`). Le contenu analyse est partage via
+    `payload_cache.PAYLOADS` : les metadonnees retournees sont une copie,
+    les dictionnaires de bulletins ne doivent pas etre modifies.
+
     Args:
         path: Chemin du fichier JSON.
 
@@ -68,9 +82,8 @@ def read_payload(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
         fichier est illisible ou absent.
     """
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
-    except (OSError, json.JSONDecodeError):
+        raw_data = PAYLOADS.load(path)
+    except (OSError, json_backend.JSONDecodeError):
         return {}, []
 
     if not isinstance(raw_data, list):
@@ -79,26 +92,43 @@ def read_payload(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
     metadata: Dict[str, Any] = {}
     data = raw_data
     if raw_data and isinstance(raw_data[0], dict) and '_metadata' in raw_data[0]:
-        metadata = raw_data[0].get('_metadata') or {}
+        metadata = copy.deepcopy(raw_data[0].get('_metadata') or {})
         data = raw_data[1:]
 
     bulletins_data = [item for item in data if isinstance(item, dict)]
-    return metadata, bulletins_data
+    return effective_metadata(path, metadata), bulletins_data
+
+
+def read_metadata(path: str) -> Dict[str, Any]:
+    """
+    Bloc `_metadata` d'un fichier JSON : l'annexe a jour si elle existe,
+    sinon celui en tete du fichier. Les bulletins ne sont pas lus.
+    """
+    sidecar = read_sidecar(path)
+    if sidecar is not None:
+        return sidecar
+    _is_list, metadata = sniff_metadata(path)
+    return metadata or {}
 
 
 def update_file_metadata(json_path: str, metadata: Mapping[str, Any]) -> None:
     """
-    Reecrit le bloc `_metadata` d'un fichier JSON sans toucher aux bulletins.
+    Remplace le bloc `_metadata` d'un fichier JSON sans toucher aux bulletins.
+
+    Les metadonnees sont ecrites dans l'annexe `<nom>.json.meta` (voir
+    `metadata_sidecar`) : le cout ne depend pas du nombre de bulletins. Si le
+    JSON n'existe pas encore, il est cree avec ce seul bloc. Les ecritures
+    sont atomiques : un lecteur ne voit jamais de fichier partiel.
 
     Args:
         json_path: Chemin du fichier JSON a modifier.
         metadata: Nouveau contenu du bloc `_metadata`.
     """
-    _existing_meta, bulletins_data = read_payload(json_path)
-    payload: List[Any] = [{"_metadata": dict(metadata)}]
-    payload.extend(bulletins_data)
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    if os.path.exists(json_path):
+        write_sidecar(json_path, metadata)
+    else:
+        json_backend.dump([{"_metadata": dict(metadata)}], json_path)
+    PAYLOADS.invalidate(json_path)
 
 
 _FILENAME_PERIOD_RE = re.compile(
@@ -123,24 +153,36 @@ def period_code_of_file(path: str) -> Optional[str]:
     Cherche dans les metadonnees, le nom du fichier, le dossier parent,
     puis le contenu des bulletins.
 
+    Le resultat est memorise par version du fichier et de son annexe de
+    metadonnees (voir `payload_cache`).
+
     Args:
         path: Chemin du fichier JSON.
 
     Returns:
         Code de periode ou None si indeterminable.
     """
-    metadata, data = read_payload(path)
-    period = period_from_metadata(metadata)
-    if period is not None:
-        return period.value
+    return PAYLOADS.derived(path, ("period_code", sidecar_signature(path)),
+                            lambda: _detect_period_code(path))
+
+
+def _detect_period_code(path: str) -> Optional[str]:
+    # Seul le bloc `_metadata` de tete est lu ; les bulletins ne sont analyses
+    # qu'en dernier recours (inference depuis le contenu)
+    is_list, embedded = sniff_metadata(path)
+    if is_list:
+        period = period_from_metadata(effective_metadata(path, embedded))
+        if period is not None:
+            return period.value
     from_name = period_code_from_filename(path)
     if from_name:
         return from_name
     from_dir = period_from_directory_name(os.path.dirname(path))
     if from_dir is not None:
         return from_dir.value
-    if data:
-        period = infer_period_from_bulletins_data(data)
+    if is_list:
+        _metadata, data = read_payload(path)
+        period = infer_period_from_bulletins_data(data) if data else None
         if period is not None:
             return period.value
     return None
@@ -165,9 +207,11 @@ def effective_period_code_for_file(
     file_path: str,
     metadata: Optional[Mapping[str, Any]] = None,
     json_path: Optional[str] = None,
+    index: Optional[PeriodIndex] = None,
 ) -> Optional[str]:
     """
-    Periode effective d'un fichier lie : surcharge manuelle puis detection auto.
+    Periode effective d'un fichier lie : surcharge manuelle puis detection auto
+    (via l'index du dossier s'il est fourni).
     """
     overrides = (metadata or {}).get("period_link_overrides") or {}
     if json_path:
@@ -177,6 +221,8 @@ def effective_period_code_for_file(
         base = os.path.basename(file_path)
         if base in overrides:
             return str(overrides[base]).strip().upper()
+    if index is not None:
+        return index.period_code(file_path, period_code_of_file)
     return period_code_of_file(file_path)
 
 
@@ -216,7 +262,9 @@ def discover_sibling_period_files(
     Scanne les fichiers JSON freres du meme dossier et retourne ceux
     correspondant a une periode differente de la periode courante.
 
-    Les surcharges `period_link_overrides` sont appliquees.
+    Les surcharges `period_link_overrides` sont appliquees. Les codes detectes
+    sont memorises dans l'index du dossier (`.pyconseil-periods.idx`, voir
+    `period_index`) : un fichier inchange n'est pas relu.
 
     Args:
         json_path: Chemin du fichier JSON courant.
@@ -236,17 +284,19 @@ def discover_sibling_period_files(
 
     current_abs = os.path.abspath(json_path)
     current_code = (current_code or "").strip().upper()
+    index = PeriodIndex(directory)
 
     for sibling in sorted(Path(directory).glob("*.json")):
         sibling_abs = os.path.abspath(str(sibling))
         if sibling_abs == current_abs:
             continue
-        code = effective_period_code_for_file(sibling_abs, metadata, json_path)
+        code = effective_period_code_for_file(sibling_abs, metadata, json_path, index)
         if not code or code == current_code:
             continue
         # En cas de doublon pour une meme periode, on garde le premier (tri).
         result.setdefault(code, sibling_abs)
 
+    index.save()
     return result
 
 
@@ -500,6 +550,10 @@ def remove_period_link(
 # ---------------------------------------------------------------------------
 def native_period_from_file_content(path: str) -> Optional[str]:
     """Deduit la periode uniquement du contenu des bulletins (pas meta/nom)."""
+    return PAYLOADS.derived(path, "native_period", lambda: _detect_native_period(path))
+
+
+def _detect_native_period(path: str) -> Optional[str]:
     _, data = read_payload(path)
     if not data:
         return None
@@ -527,26 +581,21 @@ def remap_bulletins_period_code(
     to_code: str,
 ) -> List[Bulletin]:
     """
-    Reproduit les donnees d'une periode sous un autre code (copie profonde).
+    Expose les donnees d'une periode sous un autre code, sans copie.
 
     Utilise lorsqu'un fichier lie est attribue manuellement a une periode
     dont les cles internes ne correspondent pas (ex. contenu S2 lie en T2).
+    Chaque bulletin est enveloppe dans une `BulletinOverlay` : la
+    renumerotation n'est appliquee qu'a la lecture et les bulletins sources
+    ne sont pas modifies.
     """
     from_code = (from_code or "").strip().upper()
     to_code = (to_code or "").strip().upper()
     if not from_code or from_code == to_code:
         return bulletins
 
-    result = copy.deepcopy(bulletins)
-    for bulletin in result:
-        if from_code in bulletin.appreciations_generales:
-            texte = bulletin.appreciations_generales.pop(from_code)
-            bulletin.appreciations_generales.setdefault(to_code, texte)
-        for matiere in bulletin.matieres.values():
-            if from_code in matiere.periodes:
-                periode = matiere.periodes.pop(from_code)
-                matiere.periodes.setdefault(to_code, periode)
-    return result
+    code_map = {from_code: to_code}
+    return [BulletinOverlay(bulletin, code_map=code_map) for bulletin in bulletins]
 
 
 def normalize_linked_bulletins(
@@ -564,11 +613,7 @@ def normalize_linked_bulletins(
     if not assigned_code or not bulletins:
         return bulletins
 
-    has_assigned_data = any(
-        assigned_code in matiere.periodes
-        for bulletin in bulletins
-        for matiere in bulletin.matieres.values()
-    )
+    has_assigned_data = any(assigned_code in bulletin.period_codes() for bulletin in bulletins)
     if has_assigned_data:
         return bulletins
 
@@ -587,6 +632,8 @@ def load_history_bulletins(links: Mapping[str, str]) -> Dict[str, List[Bulletin]
 
     Les periodes internes sont normalisees vers le code attribue dans les liens
     lorsque le contenu utilise un autre suffixe (ex. S2 dans un fichier lie T2).
+    Les bulletins sont des `LazyBulletin` : seules les matieres des eleves
+    affiches sont construites.
 
     Args:
         links: Dictionnaire {code_periode: chemin}.
@@ -598,7 +645,7 @@ def load_history_bulletins(links: Mapping[str, str]) -> Dict[str, List[Bulletin]
     history: Dict[str, List[Bulletin]] = {}
     for code, path in links.items():
         try:
-            bulletins = load_bulletins_from_json(path)
+            bulletins = load_bulletins_from_json(path, lazy=True)
             history[code] = normalize_linked_bulletins(bulletins, code, path)
         except Exception:
             continue
@@ -609,43 +656,11 @@ def _bulletin_key(bulletin: Bulletin) -> str:
     return f"{bulletin.eleve.nom} {bulletin.eleve.prenom}"
 
 
-# Abréviations Pronote / anciens exports -> clé canonique des noms normalisés
-_MATIERE_ALIAS_TARGETS = {
-    "eps": "educationphysiquesportive",
-    "techno": "technologie",
-    "sciencesdelavieetdelaterre": "sciencesvieterre",
-}
-
-
-def _matiere_canonical_key(name: str) -> str:
-    """Clé de rapprochement pour fusionner des libellés de matières proches."""
-    if not name:
-        return ""
-    normalized = unicodedata.normalize("NFD", str(name))
-    ascii_name = "".join(c for c in normalized if unicodedata.category(c) != "Mn")
-    key = re.sub(r"[^a-z0-9]", "", ascii_name.lower())
-    return _MATIERE_ALIAS_TARGETS.get(key, key)
-
-
-def _resolve_matiere_name(bulletin: Bulletin, other_name: str) -> Optional[str]:
-    """
-    Retrouve le nom de matière équivalent déjà présent dans `bulletin`.
-
-    Permet de fusionner « Anglais LV1 » (ancien export) avec « AnglaisLV1 ».
-    """
-    if bulletin.get_matiere(other_name) is not None:
-        return other_name
-    target = _matiere_canonical_key(other_name)
-    for name in bulletin.matieres:
-        if _matiere_canonical_key(name) == target:
-            return name
-    return None
-
-
 def merge_periods_into_bulletins(
     bulletins: List[Bulletin],
     other_bulletins: List[Bulletin],
     current_code: str,
+    registry: Optional[SubjectRegistry] = None,
 ) -> None:
     """
     Fusionne (sur place) les periodes d'une autre source dans `bulletins`.
@@ -659,11 +674,14 @@ def merge_periods_into_bulletins(
         bulletins: Bulletins de la periode courante (modifies sur place).
         other_bulletins: Bulletins charges depuis un fichier de periode lie.
         current_code: Code de la periode courante (protege de l'ecrasement).
+        registry: Registre des libelles de matieres de la classe, a partager
+            entre les fusions (defaut : alias par defaut).
     """
     if not other_bulletins:
         return
 
     current_code = (current_code or "").strip().upper()
+    registry = registry or SubjectRegistry()
     other_index = {_bulletin_key(b): b for b in other_bulletins}
 
     for bulletin in bulletins:
@@ -678,13 +696,17 @@ def merge_periods_into_bulletins(
             if code not in bulletin.appreciations_generales:
                 bulletin.appreciations_generales[code] = texte
 
-        # Donnees par matiere / periode
+        # Donnees par matiere / periode (index des libelles construit au
+        # premier libelle sans correspondance exacte)
+        names: Optional[Dict[str, str]] = None
         for other_name, other_app in other.matieres.items():
-            resolved_name = _resolve_matiere_name(bulletin, other_name)
+            if other_name not in bulletin.matieres and names is None:
+                names = registry.index(bulletin.matieres)
+            resolved_name = registry.resolve(other_name, bulletin.matieres, names)
             if resolved_name is None:
                 # Matiere absente de la periode courante : la cloner en ne
                 # gardant que les periodes autres que la periode courante.
-                clone = copy.deepcopy(other_app)
+                clone = other_app.clone()
                 clone.periodes = {
                     code: periode
                     for code, periode in clone.periodes.items()
@@ -692,6 +714,7 @@ def merge_periods_into_bulletins(
                 }
                 if clone.periodes:
                     bulletin.add_matiere(clone)
+                    names.setdefault(registry.key(clone.matiere), clone.matiere)
                 continue
 
             current_app = bulletin.get_matiere(resolved_name)
@@ -701,7 +724,7 @@ def merge_periods_into_bulletins(
                 if code == current_code:
                     continue
                 if code not in current_app.periodes:
-                    current_app.periodes[code] = copy.deepcopy(periode)
+                    current_app.periodes[code] = periode.clone()
 
 
 def normalize_trimestre_general_appreciations(bulletin: Bulletin) -> None:
@@ -724,31 +747,238 @@ def normalize_trimestre_general_appreciations(bulletin: Bulletin) -> None:
     bulletin.appreciations_generales.pop("S2", None)
 
 
+def _remap_codes(mapping: Mapping[str, Any], code_map: Mapping[str, str]) -> Dict[str, Any]:
+    """
+    Copie superficielle de `mapping` dont les cles de `code_map` sont renommees.
+
+    Une cle cible deja presente n'est pas ecrasee (comme l'ancien
+    `pop` + `setdefault`).
+    """
+    if not code_map or not any(code in mapping for code in code_map):
+        return dict(mapping)
+    result = {code: value for code, value in mapping.items() if code not in code_map}
+    for code, target in code_map.items():
+        if code in mapping:
+            result.setdefault(target, mapping[code])
+    return result
+
+
+class MatiereOverlay(AppreciationMatiere):
+    """
+    Matiere d'une vue fusionnee dont les periodes sont empruntees aux sources.
+
+    Le dictionnaire `periodes` appartient a la vue, mais les PeriodeData qu'il
+    reference sont celles des bulletins courants ou lies. Elles ne doivent
+    etre modifiees qu'au travers de `ensure_periode` (ou des proprietes
+    S1/S2), qui remplace d'abord la periode empruntee par une copie.
+    """
+
+    __slots__ = ("_owned",)
+
+    def __init__(self, matiere: str, periodes: Dict[str, PeriodeData]):
+        self.matiere = matiere
+        self.periodes = periodes
+        self._owned: Optional[set] = None
+
+    def ensure_periode(self, code: str) -> PeriodeData:
+        """Comme `AppreciationMatiere.ensure_periode`, avec copie a l'ecriture."""
+        if self._owned is None:
+            self._owned = set()
+        if code not in self._owned:
+            self._owned.add(code)
+            if code in self.periodes:
+                self.periodes[code] = self.periodes[code].clone()
+        return super().ensure_periode(code)
+
+
+def _layer(bulletin: Bulletin) -> Tuple[Bulletin, Dict[str, str]]:
+    """Couche (bulletin, renommage) d'un bulletin lie."""
+    if (
+        isinstance(bulletin, BulletinOverlay)
+        and len(bulletin._layers) == 1
+        and bulletin._matieres is None
+        and bulletin._generales is None
+    ):
+        return bulletin._layers[0]
+    return bulletin, {}
+
+
+class BulletinOverlay(Bulletin):
+    """
+    Vue d'un bulletin courant enrichie des bulletins lies, sans copie.
+
+    Les couches sont consultees dans l'ordre : bulletin courant (dont les
+    codes de periode peuvent etre renommes par `code_map`), puis bulletins
+    lies. Une periode ou une appreciation generale d'une couche liee n'est
+    reprise que si elle manque aux couches precedentes et n'est pas la periode
+    courante, comme `merge_periods_into_bulletins`.
+
+    La fusion est faite au premier acces a `matieres` ou a
+    `appreciations_generales` et ne cree que des dictionnaires propres a la
+    vue : les PeriodeData restent partagees avec les sources jusqu'a leur
+    premiere modification (voir `MatiereOverlay`). `clone()` rend un Bulletin
+    ordinaire independant.
+    """
+
+    __slots__ = ("_layers", "_current_code", "_trimestre", "_registry", "_matieres", "_generales")
+
+    def __init__(
+        self,
+        current: Bulletin,
+        linked: Tuple[Bulletin, ...] = (),
+        current_code: Optional[str] = None,
+        code_map: Optional[Mapping[str, str]] = None,
+        trimestre: bool = False,
+        registry: Optional[SubjectRegistry] = None,
+    ):
+        """
+        Args:
+            current: Bulletin de la periode courante (jamais modifie).
+            linked: Bulletins du meme eleve dans les fichiers lies, par ordre
+                de priorite.
+            current_code: Code de la periode courante (protege des couches liees).
+            code_map: Renommage des codes de periode du bulletin courant.
+            trimestre: Si True, expose les appreciations generales S1/S2 sous
+                T1/T2 (voir `normalize_trimestre_general_appreciations`).
+            registry: Registre des libelles de matieres, partage par les vues
+                d'une classe (defaut : alias par defaut).
+        """
+        self.eleve = current.eleve
+        # Couches (bulletin, renommage des codes) ; une vue de renumerotation
+        # pas encore lue est remplacee par sa source pour eviter un niveau
+        self._layers = ((current, dict(code_map or {})), *(_layer(b) for b in linked))
+        self._current_code = (current_code or "").strip().upper()
+        self._trimestre = trimestre
+        self._registry = registry
+        self._matieres: Optional[Dict[str, AppreciationMatiere]] = None
+        self._generales: Optional[Dict[str, str]] = None
+
+    @property
+    def matieres(self) -> Dict[str, AppreciationMatiere]:
+        if self._matieres is None:
+            self._matieres = self._merge_matieres()
+        return self._matieres
+
+    @matieres.setter
+    def matieres(self, value: Dict[str, AppreciationMatiere]) -> None:
+        self._matieres = value
+
+    def period_codes(self) -> Set[str]:
+        """
+        Comme `Bulletin.period_codes`, sans fusionner les matieres : union des
+        codes (renommes) des couches, la periode courante n'etant reprise que
+        de la couche courante.
+        """
+        if self._matieres is not None:
+            return super().period_codes()
+        (current, code_map), *linked = self._layers
+        codes = set(_remap_codes(dict.fromkeys(current.period_codes()), code_map))
+        for other, other_map in linked:
+            codes.update(code for code in _remap_codes(dict.fromkeys(other.period_codes()), other_map)
+                         if code != self._current_code)
+        return codes
+
+    @property
+    def appreciations_generales(self) -> Dict[str, str]:
+        if self._generales is None:
+            self._generales = self._merge_generales()
+        return self._generales
+
+    @appreciations_generales.setter
+    def appreciations_generales(self, value: Dict[str, str]) -> None:
+        self._generales = value
+
+    def _merge_matieres(self) -> Dict[str, AppreciationMatiere]:
+        (current, code_map), *linked = self._layers
+        current_code = self._current_code
+        merged: Dict[str, AppreciationMatiere] = {
+            name: MatiereOverlay(app.matiere, _remap_codes(app.periodes, code_map))
+            for name, app in current.matieres.items()
+        }
+        # Premier libelle de chaque cle canonique, construit au premier
+        # libelle sans correspondance exacte
+        canonical: Optional[Dict[str, str]] = None
+        registry = self._registry or SubjectRegistry()
+
+        for other, other_map in linked:
+            for other_name, other_app in other.matieres.items():
+                target = merged.get(other_name)
+                if target is None:
+                    if canonical is None:
+                        canonical = registry.index(merged)
+                    key = registry.key(other_name)
+                    name = canonical.get(key)
+                    if name is None:
+                        periodes = {
+                            code: periode
+                            for code, periode in _remap_codes(other_app.periodes, other_map).items()
+                            if code != current_code
+                        }
+                        if periodes:
+                            merged[other_app.matiere] = MatiereOverlay(other_app.matiere, periodes)
+                            canonical.setdefault(key, other_app.matiere)
+                        continue
+                    target = merged[name]
+                periodes = target.periodes
+                other_periodes = other_app.periodes
+                if other_map:
+                    other_periodes = _remap_codes(other_periodes, other_map)
+                for code, periode in other_periodes.items():
+                    if code != current_code and code not in periodes:
+                        periodes[code] = periode
+        return merged
+
+    def _merge_generales(self) -> Dict[str, str]:
+        (current, code_map), *linked = self._layers
+        generales = _remap_codes(current.appreciations_generales, code_map)
+        for other, other_map in linked:
+            for code, texte in _remap_codes(other.appreciations_generales, other_map).items():
+                if code != self._current_code and code not in generales:
+                    generales[code] = texte
+        if self._trimestre:
+            for legacy, code in (("S1", "T1"), ("S2", "T2")):
+                texte = generales.pop(legacy, None)
+                if texte and not generales.get(code):
+                    generales[code] = texte
+        return generales
+
+
 def build_display_bulletins(
     current_bulletins: List[Bulletin],
     history_by_code: Mapping[str, List[Bulletin]],
     current_code: str,
+    registry: Optional[SubjectRegistry] = None,
 ) -> List[Bulletin]:
     """
     Construit une liste de bulletins enrichie des periodes liees, destinee a
     l'affichage en lecture seule.
 
-    Les bulletins courants ne sont pas modifies : une copie profonde est
-    realisee avant fusion.
+    Chaque bulletin est une `BulletinOverlay` : les bulletins courants et lies
+    ne sont ni copies ni modifies, la fusion n'a lieu qu'a la lecture et une
+    periode n'est copiee que si l'appelant la modifie.
 
     Args:
         current_bulletins: Bulletins de la periode courante.
         history_by_code: Bulletins des periodes liees (par code).
         current_code: Code de la periode courante.
+        registry: Registre des libelles de matieres (alias du dossier, voir
+            `SubjectRegistry.for_directory`) ; un registre est cree sinon.
 
     Returns:
         Nouvelle liste de Bulletin fusionnes pour l'affichage.
     """
-    display = copy.deepcopy(current_bulletins)
-    for _code, other_bulletins in history_by_code.items():
-        merge_periods_into_bulletins(display, other_bulletins, current_code)
+    registry = registry or SubjectRegistry()
+    indexes = [
+        {_bulletin_key(b): b for b in other_bulletins}
+        for other_bulletins in history_by_code.values()
+        if other_bulletins
+    ]
     current_period = Period.from_code(current_code)
-    if current_period and current_period.system == PeriodSystem.TRIMESTRE:
-        for bulletin in display:
-            normalize_trimestre_general_appreciations(bulletin)
+    trimestre = bool(current_period and current_period.system == PeriodSystem.TRIMESTRE)
+    display: List[Bulletin] = []
+    for bulletin in current_bulletins:
+        key = _bulletin_key(bulletin)
+        linked = tuple(index[key] for index in indexes if key in index)
+        display.append(BulletinOverlay(bulletin, linked, current_code,
+                                       trimestre=trimestre, registry=registry))
     return display
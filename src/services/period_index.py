@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Détection rapide de la période des fichiers JSON d'un dossier.
+
+La découverte des périodes liées (`discover_sibling_period_files`) détermine
+le code de période de chaque `*.json` du dossier du fichier courant. Lire ces
+fichiers en entier coûte cher dès que le dossier contient de gros JSON, qu'ils
+soient des bulletins ou non. Deux mécanismes l'évitent :
+
+- `sniff_metadata` lit le début du fichier et s'arrête après le premier
+  élément `{"_metadata": ...}` du tableau, sans analyser les bulletins ;
+- `PeriodIndex` mémorise, dans un fichier `.pyconseil-periods.idx` du
+  dossier, le code de période de chaque JSON avec sa taille et sa date de
+  modification (et celles de son annexe `.meta`) : un fichier inchangé n'est
+  plus ouvert du tout, même après un redémarrage de l'application.
+
+L'index est un cache : il est ignoré s'il est illisible, d'une autre version
+ou d'un autre dossier, et son écriture est facultative (dossier en lecture
+seule).
+"""
+
+import os
+import re
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Import conditionnel pour gérer les imports relatifs
+try:
+    from . import json_backend
+    from .metadata_sidecar import sidecar_signature
+    from .payload_cache import Signature, file_signature
+except ImportError:
+    # Fallback pour l'exécution directe via PYTHONPATH
+    from services import json_backend
+    from services.metadata_sidecar import sidecar_signature
+    from services.payload_cache import Signature, file_signature
+
+
+INDEX_FILENAME = ".pyconseil-periods.idx"
+INDEX_VERSION = 1
+
+_CHUNK_SIZE = 64 * 1024
+# Au-delà, le premier élément n'est plus un bloc de métadonnées raisonnable :
+# lecture complète du fichier
+MAX_SNIFF_BYTES = 8 * 1024 * 1024
+
+_WHITESPACE = b" \t\r\n"
+_STRUCTURE_RE = re.compile(rb'[{}\[\]"]')
+_STRING_RE = re.compile(rb'["\\]')
+
+_NOT_A_LIST = object()
+_NO_LEADING_OBJECT = object()
+_UNDELIMITED = object()
+
+
+def sniff_metadata(path: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Lit le bloc `_metadata` en tête d'un JSON de bulletins sans lire la suite.
+
+    Le premier élément du tableau est délimité par un parcours des accolades
+    et des chaînes, puis seul cet élément est décodé. Le reste du fichier
+    n'est pas validé.
+
+    Args:
+        path: Chemin du fichier JSON
+
+    Returns:
+        Tuple (tableau, metadata) : `tableau` est faux si le fichier n'est pas
+        un tableau JSON (ou est illisible), `metadata` est None si le premier
+        élément n'est pas un bloc `_metadata`.
+    """
+    try:
+        with open(path, "rb") as f:
+            head = _read_first_element(f)
+    except OSError:
+        return False, None
+    if head is _UNDELIMITED:
+        return _sniff_full(path)
+    if head is _NOT_A_LIST:
+        return False, None
+    if head is _NO_LEADING_OBJECT:
+        return True, None
+    try:
+        first = json_backend.loads(head)
+    except ValueError:
+        # JSONDecodeError, ou UnicodeDecodeError pour un fichier non UTF-8
+        return _sniff_full(path)
+    return True, _metadata_of(first)
+
+
+def _read_first_element(f) -> Any:
+    """
+    Octets du premier élément du tableau s'il s'agit d'un objet, sinon l'une
+    des sentinelles `_NOT_A_LIST`, `_NO_LEADING_OBJECT` ou `_UNDELIMITED`
+    (fichier tronqué ou élément trop gros).
+    """
+    buf = bytearray(f.read(_CHUNK_SIZE))
+    pos = _skip_whitespace(buf, 0)
+    if buf[pos:pos + 1] != b"[":
+        return _NOT_A_LIST
+    pos = _skip_whitespace(buf, pos + 1)
+    while pos >= len(buf):
+        more = f.read(_CHUNK_SIZE)
+        if not more:
+            return _NOT_A_LIST
+        buf += more
+        pos = _skip_whitespace(buf, pos)
+    if buf[pos:pos + 1] != b"{":
+        return _NO_LEADING_OBJECT
+
+    start = pos
+    depth = 0
+    in_string = False
+    while True:
+        match = (_STRING_RE if in_string else _STRUCTURE_RE).search(buf, pos)
+        if match is None:
+            if len(buf) - start > MAX_SNIFF_BYTES:
+                return _UNDELIMITED
+            more = f.read(_CHUNK_SIZE)
+            if not more:
+                return _UNDELIMITED
+            # `pos` peut dépasser la fin si le tampon finit sur un échappement
+            pos = max(pos, len(buf))
+            buf += more
+            continue
+        char = buf[match.start()]
+        pos = match.end()
+        if in_string:
+            if char == ord("\\"):
+                pos += 1
+            else:
+                in_string = False
+        elif char == ord('"'):
+            in_string = True
+        elif char in b"{[":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return bytes(buf[start:pos])
+
+
+def _skip_whitespace(buf: bytearray, pos: int) -> int:
+    while pos < len(buf) and buf[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _metadata_of(first: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(first, dict) and "_metadata" in first:
+        metadata = first.get("_metadata") or {}
+        return metadata if isinstance(metadata, dict) else {}
+    return None
+
+
+def _sniff_full(path: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    # Élément de tête indélimitable : même résultat qu'une lecture complète
+    try:
+        data = json_backend.load(path)
+    except (OSError, ValueError):
+        return False, None
+    if not isinstance(data, list):
+        return False, None
+    return True, (_metadata_of(data[0]) if data else None)
+
+
+class PeriodIndex:
+    """
+    Index {nom de fichier: code de période} d'un dossier, persistant.
+
+    Exemple :
+        index = PeriodIndex(directory)
+        code = index.period_code(path, period_code_of_file)
+        index.save()
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Dossier indexé (l'index est lu s'il existe)
+        """
+        self.directory = os.path.abspath(directory)
+        self.path = os.path.join(self.directory, INDEX_FILENAME)
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, Any]] = self._read()
+        self._dirty = False
+
+    def period_code(self, path: str, compute: Callable[[str], Optional[str]]) -> Optional[str]:
+        """
+        Code de période d'un fichier du dossier, depuis l'index s'il est à jour.
+
+        Args:
+            path: Fichier JSON du dossier
+            compute: Détection utilisée si l'index n'a pas d'entrée à jour
+                (ex. `period_code_of_file`)
+        """
+        signature = file_signature(path)
+        if signature is None or os.path.dirname(os.path.abspath(path)) != self.directory:
+            return compute(path)
+        key = os.path.basename(path)
+        current = {"file": list(signature), "sidecar": _as_list(sidecar_signature(path))}
+        entry = self._entries.get(key)
+        if entry is not None and entry.get("file") == current["file"] \
+                and entry.get("sidecar") == current["sidecar"]:
+            self.hits += 1
+            return entry.get("code")
+        self.misses += 1
+        code = compute(path)
+        self._entries[key] = dict(current, code=code)
+        self._dirty = True
+        return code
+
+    def save(self) -> None:
+        """Écrit l'index s'il a changé (les fichiers disparus en sont retirés)."""
+        if not self._dirty:
+            return
+        entries = {
+            name: entry for name, entry in self._entries.items()
+            if os.path.exists(os.path.join(self.directory, name))
+        }
+        try:
+            json_backend.dump({
+                "version": INDEX_VERSION,
+                "directory": self.directory,
+                "files": entries,
+            }, self.path, compact=True)
+        except OSError:
+            # Dossier en lecture seule : l'index reste un simple cache
+            return
+        self._dirty = False
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = json_backend.load(self.path)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return {}
+        # Dossier déplacé ou renommé : le code déduit du nom du dossier a pu changer
+        if data.get("directory") != self.directory:
+            return {}
+        files = data.get("files")
+        if not isinstance(files, dict):
+            return {}
+        return {name: entry for name, entry in files.items() if isinstance(entry, dict)}
+
+
+def _as_list(signature: Optional[Signature]) -> Optional[list]:
+    return list(signature) if signature is not None else None
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Index d'identité des élèves pour rapprocher les lignes CSV des bulletins.
+
+PRONOTE n'écrit pas toujours un nom exactement comme dans source.xlsx :
+accents composés ou décomposés, espaces doublés, traits d'union typographiques,
+apostrophes courbes. Une jointure sur la chaîne exacte « NOM Prénom » perd
+alors la ligne sans le signaler. `StudentIndex` précalcule pour chaque
+bulletin une clé normalisée (Unicode NFKD sans diacritiques, casse repliée,
+tirets/apostrophes unifiés, espaces réduits) et sert des recherches en O(1),
+mémorisées d'un CSV matière à l'autre. En option, un nom sans clé exacte est
+rapproché par distance d'édition bornée parmi les élèves de même clé de bloc.
+Les lignes non rapprochées ou ambiguës sont consignées dans un rapport.
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+# Import conditionnel pour gérer les imports relatifs
+try:
+    from ..models.bulletin import Bulletin
+except ImportError:
+    # Fallback pour l'exécution directe via PYTHONPATH
+    from models.bulletin import Bulletin
+
+
+# Statuts de rapprochement retournés par `StudentIndex.match`
+MATCH_EXACT = "exact"
+MATCH_NORMALIZED = "normalise"
+MATCH_FUZZY = "approche"
+MATCH_AMBIGUOUS = "ambigu"
+MATCH_NONE = "absent"
+
+_DASHES = re.compile(r"[‐‑‒–—―−\-]+")
+_APOSTROPHES = re.compile(r"[‘’ʼ´`]")
+_SPACES = re.compile(r"\s+")
+
+
+def student_key(name: Any) -> str:
+    """
+    Clé de rapprochement d'un nom d'élève.
+
+    "DUPONT  Hélène-Marie", "Dupont Helene–Marie" et la forme décomposée
+    "DUPONT Hélène-Marie" donnent la même clé.
+
+    Args:
+        name: Nom complet (« NOM Prénom »), éventuellement entre guillemets
+
+    Returns:
+        Clé normalisée ("" si vide)
+    """
+    if name is None:
+        return ""
+    text = unicodedata.normalize("NFKD", str(name).strip().strip('"'))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = _APOSTROPHES.sub("'", text.casefold())
+    text = _DASHES.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def blocking_key(key: str) -> str:
+    """Clé de bloc pour la recherche approchée : deux premières lettres du nom."""
+    return key[:2]
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Distance de Levenshtein si elle ne dépasse pas `max_distance`.
+
+    Seule la bande diagonale de largeur 2 × max_distance + 1 est calculée, et
+    le calcul s'arrête dès qu'une ligne dépasse la borne.
+
+    Returns:
+        La distance, ou None si elle est supérieure à la borne
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+    inf = max_distance + 1
+    previous = [j if j <= max_distance else inf for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        current = [inf] * (len(b) + 1)
+        current[0] = i if i <= max_distance else inf
+        char = a[i - 1]
+        for j in range(low, high + 1):
+            cost = 0 if char == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+        if min(current[max(0, low - 1):high + 1]) > max_distance:
+            return None
+        previous = current
+    distance = previous[len(b)]
+    return distance if distance <= max_distance else None
+
+
+class StudentIndex:
+    """
+    Index des bulletins d'une classe par nom exact et par clé normalisée.
+
+    Construit une fois par classe et partagé par tous les CSV matières : le
+    résultat de chaque nom rencontré est mémorisé, les lignes suivantes (autres
+    matières) sont résolues par une seule recherche de dictionnaire.
+    """
+
+    def __init__(self, bulletins: Sequence[Bulletin], fuzzy: bool = False, max_distance: int = 2):
+        """
+        Args:
+            bulletins: Bulletins de la classe (issus de source.xlsx)
+            fuzzy: Si True, rapproche par distance d'édition bornée les noms
+                sans clé normalisée connue
+            max_distance: Distance d'édition maximale acceptée
+        """
+        self.fuzzy = fuzzy
+        self.max_distance = max_distance
+        self._exact: Dict[str, Bulletin] = {}
+        self._by_key: Dict[str, Bulletin] = {}
+        self._ambiguous_keys: Set[str] = set()
+        self._blocks: Dict[str, List[Tuple[str, Bulletin]]] = {}
+        self._resolved: Dict[str, Tuple[Optional[Bulletin], str]] = {}
+        self.unmatched: Dict[str, Set[str]] = {}
+        self.ambiguous: Dict[str, Set[str]] = {}
+        self.approximate: Dict[str, str] = {}
+
+        for bulletin in bulletins:
+            full_name = f"{bulletin.eleve.nom} {bulletin.eleve.prenom}"
+            self._exact.setdefault(full_name, bulletin)
+            key = student_key(full_name)
+            if key in self._by_key and self._by_key[key] is not bulletin:
+                self._ambiguous_keys.add(key)
+                continue
+            self._by_key[key] = bulletin
+            self._blocks.setdefault(blocking_key(key), []).append((key, bulletin))
+
+    def match(self, name: Any) -> Tuple[Optional[Bulletin], str]:
+        """
+        Rapproche un nom de son bulletin.
+
+        Returns:
+            (bulletin ou None, statut parmi MATCH_EXACT, MATCH_NORMALIZED,
+            MATCH_FUZZY, MATCH_AMBIGUOUS, MATCH_NONE)
+        """
+        raw = str(name).strip('"').strip() if name is not None else ""
+        cached = self._resolved.get(raw)
+        if cached is not None:
+            return cached
+
+        result: Tuple[Optional[Bulletin], str]
+        bulletin = self._exact.get(raw)
+        key = student_key(raw)
+        if bulletin is not None:
+            result = (bulletin, MATCH_EXACT)
+        elif key in self._ambiguous_keys:
+            result = (None, MATCH_AMBIGUOUS)
+        elif key in self._by_key:
+            result = (self._by_key[key], MATCH_NORMALIZED)
+        elif self.fuzzy and key:
+            result = self._fuzzy_match(key)
+        else:
+            result = (None, MATCH_NONE)
+        self._resolved[raw] = result
+        return result
+
+    def _fuzzy_match(self, key: str) -> Tuple[Optional[Bulletin], str]:
+        best: List[Bulletin] = []
+        best_distance = self.max_distance + 1
+        for candidate_key, bulletin in self._blocks.get(blocking_key(key), ()):
+            distance = bounded_edit_distance(key, candidate_key, self.max_distance)
+            if distance is None or distance > best_distance:
+                continue
+            # Une clé partagée par plusieurs élèves compte pour deux candidats
+            found = [bulletin] * (2 if candidate_key in self._ambiguous_keys else 1)
+            if distance < best_distance:
+                best, best_distance = found, distance
+            else:
+                best.extend(found)
+        if len(best) == 1:
+            return best[0], MATCH_FUZZY
+        return None, MATCH_AMBIGUOUS if best else MATCH_NONE
+
+    def lookup(self, name: Any, matiere: Optional[str] = None) -> Optional[Bulletin]:
+        """
+        Comme `match`, en consignant les lignes non rapprochées ou ambiguës.
+
+        Args:
+            name: Nom lu dans le CSV
+            matiere: Matière du CSV (pour le rapport)
+
+        Returns:
+            Bulletin de l'élève, ou None
+        """
+        bulletin, status = self.match(name)
+        raw = str(name).strip('"').strip()
+        if status == MATCH_NONE:
+            self.unmatched.setdefault(matiere or "", set()).add(raw)
+        elif status == MATCH_AMBIGUOUS:
+            self.ambiguous.setdefault(matiere or "", set()).add(raw)
+        elif status == MATCH_FUZZY:
+            self.approximate[raw] = f"{bulletin.eleve.nom} {bulletin.eleve.prenom}"
+        return bulletin
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Rapport des rapprochements difficiles.
+
+        Returns:
+            {"unmatched": {matière: [noms]}, "ambiguous": {matière: [noms]},
+             "approximate": {nom CSV: "NOM Prénom" retenu}}
+        """
+        return {
+            'unmatched': {m: sorted(names) for m, names in sorted(self.unmatched.items())},
+            'ambiguous': {m: sorted(names) for m, names in sorted(self.ambiguous.items())},
+            'approximate': dict(sorted(self.approximate.items())),
+        }
+
+    def warnings(self) -> List[str]:
+        """Messages d'avertissement pour les lignes ambiguës ou approchées."""
+        messages = []
+        for matiere, names in sorted(self.ambiguous.items()):
+            for name in sorted(names):
+                messages.append(f"Élève ambigu ignoré: {name} ({matiere})")
+        for name, target in sorted(self.approximate.items()):
+            messages.append(f"Élève rapproché approximativement: {name} -> {target}")
+        return messages
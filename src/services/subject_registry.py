@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Registre des libellés de matières d'une classe et table d'alias.
+
+Les exports PRONOTE successifs n'écrivent pas toujours une matière de la même
+façon (« Anglais LV1 » / « AnglaisLV1 », « EPS » / « Education physique et
+sportive »). Les fusions multi-périodes rapprochent ces libellés par une clé
+canonique : minuscules ASCII sans accents ni séparateurs, puis table d'alias.
+
+`SubjectRegistry` calcule la clé de chaque libellé une seule fois et indexe
+les libellés par clé, pour une résolution en O(1) partagée par toutes les
+fusions d'une classe (historique du traitement, périodes liées des fenêtres).
+La table d'alias par défaut peut être complétée par un fichier JSON
+`matieres_alias.json` placé dans le dossier de la classe ou son parent :
+
+    {"SVT": "Sciences de la vie et de la Terre", "Physique": "Physique-Chimie"}
+
+Les deux côtés sont normalisés ; un fichier invalide est ignoré.
+"""
+
+import json
+import logging
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+
+class SubjectRegistryError(Exception):
+    """Exception levée en cas de fichier d'alias invalide."""
+    pass
+
+
+ALIAS_FILENAME = "matieres_alias.json"
+
+# Abréviations Pronote / anciens exports -> clé canonique des noms normalisés
+DEFAULT_ALIASES: Dict[str, str] = {
+    "eps": "educationphysiquesportive",
+    "educationphysiqueetsportive": "educationphysiquesportive",
+    "techno": "technologie",
+    "sciencesdelavieetdelaterre": "sciencesvieterre",
+}
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+# Fichiers d'alias déjà lus : chemin -> (mtime_ns, alias)
+_alias_files: Dict[str, Tuple[int, Dict[str, str]]] = {}
+
+
+@lru_cache(maxsize=4096)
+def normalize_subject_name(name: str) -> str:
+    """
+    Forme normalisée d'un libellé, avant application des alias.
+
+    "Anglais LV1", "anglais-lv1" et "AnglaisLV1" donnent "anglaislv1".
+    """
+    if not name:
+        return ""
+    normalized = unicodedata.normalize("NFD", str(name))
+    ascii_name = "".join(c for c in normalized if unicodedata.category(c) != "Mn")
+    return _NON_ALNUM.sub("", ascii_name.lower())
+
+
+def load_aliases(path: str) -> Dict[str, str]:
+    """
+    Lit un fichier d'alias {libellé: libellé cible}.
+
+    Args:
+        path: Chemin du fichier JSON
+
+    Returns:
+        Alias normalisés {clé: clé cible}
+
+    Raises:
+        SubjectRegistryError: Si le fichier est illisible ou mal formé
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise SubjectRegistryError(f"Fichier d'alias illisible {path}: {e}")
+    if not isinstance(data, dict):
+        raise SubjectRegistryError(f"Fichier d'alias {path}: objet JSON attendu")
+
+    aliases = {}
+    for alias, target in data.items():
+        if not isinstance(target, str):
+            raise SubjectRegistryError(f"Fichier d'alias {path}: cible invalide pour {alias!r}")
+        key = normalize_subject_name(alias)
+        if key:
+            aliases[key] = normalize_subject_name(target)
+    return aliases
+
+
+def aliases_for_directory(directory: Optional[str]) -> Dict[str, str]:
+    """
+    Alias par défaut complétés par les fichiers `matieres_alias.json` du
+    dossier et de son parent (le plus proche l'emporte).
+
+    Les fichiers sont relus uniquement si leur date de modification change.
+
+    Args:
+        directory: Dossier de la classe (ou du fichier JSON), None = défauts
+
+    Returns:
+        Table d'alias {clé: clé cible}
+    """
+    aliases = dict(DEFAULT_ALIASES)
+    if not directory:
+        return aliases
+    directory = os.path.abspath(directory)
+    for folder in (os.path.dirname(directory), directory):
+        path = os.path.join(folder, ALIAS_FILENAME)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        cached = _alias_files.get(path)
+        if cached is None or cached[0] != mtime_ns:
+            try:
+                cached = (mtime_ns, load_aliases(path))
+            except SubjectRegistryError as e:
+                logging.warning("%s (ignoré)", e)
+                continue
+            _alias_files[path] = cached
+        aliases.update(cached[1])
+    return aliases
+
+
+class SubjectRegistry:
+    """
+    Libellés de matières d'une classe indexés par clé canonique.
+
+    Chaque libellé rencontré n'est normalisé qu'une fois ; le premier libellé
+    enregistré pour une clé en est le libellé de référence.
+    """
+
+    def __init__(self, names: Iterable[str] = (), aliases: Optional[Mapping[str, str]] = None):
+        """
+        Args:
+            names: Libellés à enregistrer, par ordre de priorité
+            aliases: Table d'alias normalisée (défaut : `DEFAULT_ALIASES`)
+        """
+        self.aliases: Dict[str, str] = dict(DEFAULT_ALIASES if aliases is None else aliases)
+        self._keys: Dict[str, str] = {}
+        self._labels: Dict[str, str] = {}
+        for name in names:
+            self.register(name)
+
+    @classmethod
+    def for_directory(cls, directory: Optional[str], names: Iterable[str] = ()) -> 'SubjectRegistry':
+        """Registre utilisant les alias du dossier (voir `aliases_for_directory`)."""
+        return cls(names, aliases_for_directory(directory))
+
+    def key(self, name: Any) -> str:
+        """Clé canonique d'un libellé (mémorisée)."""
+        key = self._keys.get(name)
+        if key is None:
+            key = normalize_subject_name(name)
+            key = self.aliases.get(key, key)
+            self._keys[name] = key
+        return key
+
+    def register(self, name: str) -> str:
+        """
+        Enregistre un libellé.
+
+        Returns:
+            Libellé de référence de sa clé (le premier enregistré)
+        """
+        return self._labels.setdefault(self.key(name), name)
+
+    def label(self, name: str) -> Optional[str]:
+        """Libellé de référence équivalent à `name`, ou None."""
+        return self._labels.get(self.key(name))
+
+    def index(self, names: Iterable[str]) -> Dict[str, str]:
+        """
+        Index {clé: premier libellé} d'un ensemble de libellés (ex. les
+        matières d'un bulletin), pour `resolve`.
+        """
+        index: Dict[str, str] = {}
+        for name in names:
+            index.setdefault(self.key(name), name)
+        return index
+
+    def resolve(self, name: str, names: Mapping[str, Any],
+                index: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        Retrouve dans `names` le libellé équivalent à `name`.
+
+        Args:
+            name: Libellé cherché
+            names: Libellés disponibles (ex. `bulletin.matieres`)
+            index: Index de `names` déjà construit par `index` (sinon calculé)
+
+        Returns:
+            Le libellé exact s'il est présent, sinon le premier libellé de
+            même clé, ou None
+        """
+        if name in names:
+            return name
+        if index is None:
+            index = self.index(names)
+        return index.get(self.key(name))
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Moteur de règles de validation des bulletins d'une classe.
+
+Chaque règle est déclarée par un `ValidationRule` (nom, gravité, portée et
+fonction de contrôle). Les bulletins sont parcourus une seule fois : les
+règles de portée « periode » et « bulletin » sont évaluées au fil du
+parcours, qui construit en même temps des index (`ClassIndex` : compteur des
+noms, matières par élève, élèves connus) ; les règles de portée « classe »
+exploitent ensuite ces index en temps constant par recherche, au lieu de
+balayer des listes. Les index sont propres à chaque appel de `validate` : un
+même contexte peut être validé plusieurs fois.
+
+Le rapport indique, pour chaque règle, sa gravité, le nombre de problèmes
+relevés et le temps passé. `validate_classes` valide plusieurs classes en
+parallèle (pool de processus, comme le traitement par lot).
+"""
+
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+# Import conditionnel pour gérer les imports relatifs
+try:
+    from ..models.bulletin import Bulletin, PeriodeData, absence_to_hours
+    from .student_index import student_key
+except ImportError:
+    # Fallback pour l'exécution directe via PYTHONPATH
+    from models.bulletin import Bulletin, PeriodeData, absence_to_hours
+    from services.student_index import student_key
+
+
+class ValidationError(Exception):
+    """Exception levée en cas de règle de validation mal déclarée."""
+    pass
+
+
+SEVERITY_ERREUR = "erreur"
+SEVERITY_AVERTISSEMENT = "avertissement"
+SEVERITY_INFO = "info"
+SEVERITIES = (SEVERITY_ERREUR, SEVERITY_AVERTISSEMENT, SEVERITY_INFO)
+
+SCOPE_PERIODE = "periode"
+SCOPE_BULLETIN = "bulletin"
+SCOPE_CLASSE = "classe"
+SCOPES = (SCOPE_PERIODE, SCOPE_BULLETIN, SCOPE_CLASSE)
+
+
+@dataclass(frozen=True)
+class ValidationRule:
+    """
+    Règle de validation déclarative.
+
+    Signature de `check` selon la portée (chaque appel produit des messages) :
+        - "periode" : check(context, nom_eleve, matiere, code, periode)
+        - "bulletin" : check(context, nom_eleve, bulletin)
+        - "classe" : check(context, index), après le parcours (`ClassIndex`)
+
+    Les fonctions doivent être définies au niveau module (ou via
+    `functools.partial`) pour rester utilisables en parallèle.
+    """
+    name: str
+    severity: str
+    scope: str
+    check: Callable[..., Iterable[str]]
+    description: str = ""
+
+    def __post_init__(self):
+        if self.severity not in SEVERITIES:
+            raise ValidationError(f"Gravité inconnue pour {self.name}: {self.severity}")
+        if self.scope not in SCOPES:
+            raise ValidationError(f"Portée inconnue pour {self.name}: {self.scope}")
+
+
+@dataclass
+class ValidationContext:
+    """
+    Données d'une classe à valider.
+
+    Attributs:
+        bulletins: Bulletins de la classe
+        period_code: Période courante (règles sur les appréciations)
+        expected_subjects: Matières attendues (défaut : toutes celles vues)
+        csv_students: Noms lus dans chaque CSV {matière: {"NOM Prénom"}}
+        label: Nom de la classe (rapports multi-classes)
+    """
+    bulletins: Sequence[Bulletin]
+    period_code: Optional[str] = None
+    expected_subjects: Optional[Set[str]] = None
+    csv_students: Dict[str, Set[str]] = field(default_factory=dict)
+    label: Optional[str] = None
+
+
+@dataclass
+class ClassIndex:
+    """
+    Index construits par `validate` pendant le parcours des bulletins.
+
+    Attributs:
+        student_counts: Nombre de bulletins par "NOM Prénom"
+        subjects_by_student: Matières de chaque élève
+        seen_subjects: Matières vues dans la classe
+    """
+    student_counts: Counter = field(default_factory=Counter)
+    subjects_by_student: Dict[str, Set[str]] = field(default_factory=dict)
+    seen_subjects: Set[str] = field(default_factory=set)
+
+
+# ----------------------------------------------------------------------
+# Règles par défaut
+# ----------------------------------------------------------------------
+def _check_value_range(extract: Callable[[PeriodeData], Any], minimum: float, maximum: float,
+                       message: str, context: ValidationContext, nom_eleve: str,
+                       matiere: str, code: str, periode: PeriodeData) -> Iterable[str]:
+    value = extract(periode)
+    if value is None:
+        return ()
+    try:
+        # NaN (valeur absente mal lue) n'est ni dans ni hors des bornes
+        if not value < minimum and not value > maximum:
+            return ()
+    except TypeError:
+        return ()
+    return (f"{nom_eleve} - {matiere} {code}: {message.format(value=value, periode=periode)}",)
+
+
+def _moyenne(periode: PeriodeData):
+    return periode.moyenne
+
+
+def _heures_absence(periode: PeriodeData):
+    return absence_to_hours(periode.heures_absence)
+
+
+def value_range_rule(name: str, extract: Callable[[PeriodeData], Any],
+                     minimum: float, maximum: float, message: str,
+                     severity: str = SEVERITY_AVERTISSEMENT) -> ValidationRule:
+    """
+    Déclare une règle de plage de valeurs sur chaque période.
+
+    Args:
+        name: Nom de la règle
+        extract: Fonction (niveau module) extrayant la valeur d'une PeriodeData
+        minimum, maximum: Bornes incluses
+        message: Gabarit du message ({value} et {periode} disponibles)
+        severity: Gravité
+
+    Returns:
+        La règle
+    """
+    return ValidationRule(
+        name, severity, SCOPE_PERIODE,
+        partial(_check_value_range, extract, minimum, maximum, message),
+        f"valeur hors de [{minimum}, {maximum}]",
+    )
+
+
+def _check_doublons(context: ValidationContext, index: ClassIndex) -> Iterable[str]:
+    for nom, count in index.student_counts.items():
+        for _ in range(count - 1):
+            yield f"Élève en doublon: {nom}"
+
+
+def _check_matieres_manquantes(context: ValidationContext, index: ClassIndex) -> Iterable[str]:
+    expected = context.expected_subjects or index.seen_subjects
+    for nom, subjects in index.subjects_by_student.items():
+        missing = expected.difference(subjects)
+        if missing:
+            yield f"{nom}: matière(s) absente(s) du bulletin: {', '.join(sorted(missing))}"
+
+
+def _check_absents_source(context: ValidationContext, index: ClassIndex) -> Iterable[str]:
+    known = {student_key(nom) for nom in index.student_counts}
+    for matiere in sorted(context.csv_students):
+        for nom in sorted(context.csv_students[matiere]):
+            if student_key(nom) not in known:
+                yield f"Élève absent de source.xlsx: {nom} ({matiere})"
+
+
+def _check_appreciation_vide(context: ValidationContext, nom_eleve: str, matiere: str,
+                             code: str, periode: PeriodeData) -> Iterable[str]:
+    if code != context.period_code:
+        return ()
+    if periode.appreciation and str(periode.appreciation).strip():
+        return ()
+    return (f"{nom_eleve} - {matiere} {code}: appréciation vide",)
+
+
+DEFAULT_RULES = (
+    ValidationRule("doublons", SEVERITY_AVERTISSEMENT, SCOPE_CLASSE, _check_doublons,
+                   "élève présent plusieurs fois"),
+    value_range_rule("moyenne_hors_bornes", _moyenne, 0, 20, "Moyenne suspecte ({value})"),
+    value_range_rule("absences_excessives", _heures_absence, 0, 100,
+                     "Heures d'absence élevées ({periode.heures_absence})"),
+    ValidationRule("matiere_manquante", SEVERITY_INFO, SCOPE_CLASSE, _check_matieres_manquantes,
+                   "matière de la classe absente d'un bulletin"),
+    ValidationRule("eleve_absent_source", SEVERITY_AVERTISSEMENT, SCOPE_CLASSE, _check_absents_source,
+                   "élève d'un CSV absent de source.xlsx"),
+    ValidationRule("appreciation_vide", SEVERITY_INFO, SCOPE_PERIODE, _check_appreciation_vide,
+                   "appréciation de la période courante vide"),
+)
+
+
+# ----------------------------------------------------------------------
+# Moteur
+# ----------------------------------------------------------------------
+def csv_student_names(matiere_data: Iterable[Dict[str, Any]]) -> Set[str]:
+    """Noms d'élèves d'un CSV matière, nettoyés comme à la fusion."""
+    names = set()
+    for ligne in matiere_data:
+        nom = ligne.get('Élève')
+        if nom:
+            names.add(str(nom).strip('"').strip())
+    return names
+
+
+def validate(context: ValidationContext,
+             rules: Sequence[ValidationRule] = DEFAULT_RULES) -> Dict[str, Any]:
+    """
+    Valide une classe en un seul parcours des bulletins.
+
+    Args:
+        context: Classe à valider
+        rules: Règles à appliquer (défaut : `DEFAULT_RULES`)
+
+    Returns:
+        {"label", "issues": [{"rule", "severity", "message"}],
+         "rules": {nom: {"severity", "count", "duration_s"}}, "duration_s"}
+    """
+    started = time.perf_counter()
+    clock = time.perf_counter
+    issues: List[Dict[str, str]] = []
+    durations = {rule.name: 0.0 for rule in rules}
+    counts = {rule.name: 0 for rule in rules}
+    periode_rules = [r for r in rules if r.scope == SCOPE_PERIODE]
+    bulletin_rules = [r for r in rules if r.scope == SCOPE_BULLETIN]
+    classe_rules = [r for r in rules if r.scope == SCOPE_CLASSE]
+
+    def run(rule: ValidationRule, *args) -> None:
+        t0 = clock()
+        for message in rule.check(context, *args):
+            issues.append({'rule': rule.name, 'severity': rule.severity, 'message': message})
+            counts[rule.name] += 1
+        durations[rule.name] += clock() - t0
+
+    if not context.bulletins:
+        issues.append({'rule': 'bulletins', 'severity': SEVERITY_ERREUR,
+                       'message': "Aucun bulletin à valider"})
+
+    index = ClassIndex()
+    student_counts = index.student_counts
+    subjects_by_student = index.subjects_by_student
+    seen_subjects = index.seen_subjects
+    for bulletin in context.bulletins:
+        nom_eleve = f"{bulletin.eleve.nom} {bulletin.eleve.prenom}"
+        student_counts[nom_eleve] += 1
+        subjects = subjects_by_student.setdefault(nom_eleve, set())
+        subjects.update(bulletin.matieres)
+        seen_subjects.update(bulletin.matieres)
+        for rule in bulletin_rules:
+            run(rule, nom_eleve, bulletin)
+        if not periode_rules:
+            continue
+        for matiere, appreciation in bulletin.matieres.items():
+            for code, periode in appreciation.periodes.items():
+                for rule in periode_rules:
+                    run(rule, nom_eleve, matiere, code, periode)
+
+    for rule in classe_rules:
+        run(rule, index)
+
+    return {
+        'label': context.label,
+        'issues': issues,
+        'rules': {
+            rule.name: {
+                'severity': rule.severity,
+                'count': counts[rule.name],
+                'duration_s': round(durations[rule.name], 6),
+            }
+            for rule in rules
+        },
+        'duration_s': round(time.perf_counter() - started, 6),
+    }
+
+
+def validate_classes(contexts: Sequence[ValidationContext],
+                     rules: Sequence[ValidationRule] = DEFAULT_RULES,
+                     max_workers: Optional[int] = 1) -> List[Dict[str, Any]]:
+    """
+    Valide plusieurs classes, en parallèle si `max_workers` > 1.
+
+    Args:
+        contexts: Classes à valider
+        rules: Règles à appliquer
+        max_workers: Nombre de processus (None = nombre de cœurs, 1 = séquentiel)
+
+    Returns:
+        Un rapport `validate` par classe, dans l'ordre des contextes
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    workers = max(1, min(max_workers, len(contexts)))
+    if workers == 1:
+        return [validate(context, rules) for context in contexts]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(validate, contexts, [rules] * len(contexts)))
+
+
+def report_messages(report: Dict[str, Any],
+                    min_severity: str = SEVERITY_AVERTISSEMENT) -> List[str]:
+    """
+    Messages d'un rapport d'une gravité au moins égale à `min_severity`.
+
+    Args:
+        report: Rapport produit par `validate`
+        min_severity: Gravité minimale ("erreur" > "avertissement" > "info")
+
+    Returns:
+        Messages, dans l'ordre de détection
+    """
+    allowed = SEVERITIES[:SEVERITIES.index(min_severity) + 1]
+    return [issue['message'] for issue in report['issues'] if issue['severity'] in allowed]
@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+Base SQLite d'une année scolaire, alternative aux fichiers JSON par période.
+
+La vue multi-périodes est reconstruite à chaque ouverture en découvrant les
+fichiers voisins, en analysant chaque JSON lié puis en fusionnant en mémoire.
+Une base `YearStore` regroupe dans un seul fichier les élèves, matières,
+périodes et appréciations de plusieurs classes et années ; les fenêtres
+peuvent n'en lire que la tranche affichée (périodes, élèves, matières) :
+
+    with YearStore(path) as store:
+        store.import_json("output_T1.json", "3A", "2025-2026")
+        history = store.load_bulletins("3A", "2025-2026", codes=["T1"])
+        display = build_display_bulletins(current, history, "T2")
+
+Le format d'échange reste `output_<CODE>.json` (`import_json` /
+`export_json`) ; la base est facultative et n'est utilisée que si on
+l'ouvre explicitement.
+
+Schéma (une ligne de `grades` par élève, matière et période) :
+
+    classes(id, name, year)
+    periods(class_id, code, metadata)               -- bloc `_metadata` (JSON)
+    students(id, class_id, nom, prenom, occurrence)
+                                                    -- rang parmi les homonymes
+    subjects(id, class_id, name)
+    bulletins(student_id, code, position, appreciation_generale)
+    grades(student_id, subject_id, code, position, heures_absence, retards,
+           moyenne, moyenne_min, moyenne_max, appreciation)
+           -- clé primaire (élève, matière, période)
+
+Accès concurrents (plusieurs postes ouvrant la même base sur un partage
+réseau) : journal `DELETE` (le mode WAL exige une mémoire partagée que les
+partages réseau ne garantissent pas), attente `busy_timeout` sur un verrou
+occupé, et écritures en `BEGIN IMMEDIATE` : un seul écrivain à la fois, qui
+prend son verrou avant de lire, les lecteurs voyant toujours un état validé.
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Import conditionnel pour gérer les imports relatifs
+try:
+    from ..models.bulletin import AppreciationMatiere, Bulletin, Eleve, PeriodeData
+    from . import json_backend
+    from .json_generator import JsonGeneratorError, load_output_json, save_output_json
+    from .period_history import normalize_linked_bulletins, period_code_of_file
+except ImportError:
+    # Fallback pour l'exécution directe via PYTHONPATH
+    from models.bulletin import AppreciationMatiere, Bulletin, Eleve, PeriodeData
+    from services import json_backend
+    from services.json_generator import JsonGeneratorError, load_output_json, save_output_json
+    from services.period_history import normalize_linked_bulletins, period_code_of_file
+
+
+SCHEMA_VERSION = 2
+DEFAULT_TIMEOUT_S = 30.0
+
+# Nombre maximal de paramètres par clause IN (limite historique de SQLite : 999)
+_IN_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS classes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    year TEXT NOT NULL,
+    UNIQUE (name, year)
+);
+CREATE TABLE IF NOT EXISTS periods (
+    class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+    code TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    PRIMARY KEY (class_id, code)
+);
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+    nom TEXT NOT NULL,
+    prenom TEXT NOT NULL,
+    occurrence INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (class_id, nom, prenom, occurrence)
+);
+CREATE TABLE IF NOT EXISTS subjects (
+    id INTEGER PRIMARY KEY,
+    class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    UNIQUE (class_id, name)
+);
+CREATE TABLE IF NOT EXISTS bulletins (
+    student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    code TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    appreciation_generale TEXT,
+    PRIMARY KEY (student_id, code)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS grades (
+    student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    subject_id INTEGER NOT NULL REFERENCES subjects(id) ON DELETE CASCADE,
+    code TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    heures_absence TEXT,
+    retards INTEGER,
+    moyenne REAL,
+    moyenne_min REAL,
+    moyenne_max REAL,
+    appreciation TEXT,
+    PRIMARY KEY (student_id, subject_id, code)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS grades_by_period ON grades (code, subject_id);
+"""
+
+# Migrations {version de départ: script} ; la version 1 identifiait les
+# élèves par leur seul nom (homonymes d'une classe refusés)
+_MIGRATIONS = {
+    1: """
+CREATE TABLE students_v2 (
+    id INTEGER PRIMARY KEY,
+    class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+    nom TEXT NOT NULL,
+    prenom TEXT NOT NULL,
+    occurrence INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (class_id, nom, prenom, occurrence)
+);
+INSERT INTO students_v2 (id, class_id, nom, prenom) SELECT id, class_id, nom, prenom FROM students;
+DROP TABLE students;
+ALTER TABLE students_v2 RENAME TO students;
+""",
+}
+
+_PERIODE_FIELDS = ("heures_absence", "retards", "moyenne", "moyenne_min", "moyenne_max", "appreciation")
+
+
+class YearStoreError(Exception):
+    """Exception levée en cas d'erreur d'accès à la base d'une année scolaire."""
+    pass
+
+
+StudentKey = Tuple[str, str]
+
+_STUDENTS_QUERY = "SELECT nom, prenom, occurrence, id FROM students WHERE class_id = ?"
+
+
+class YearStore:
+    """
+    Base SQLite (un fichier) des bulletins de plusieurs classes et années.
+
+    Une instance garde une connexion ouverte (à fermer avec `close`, ou via
+    `with`) et peut être partagée entre threads.
+    """
+
+    def __init__(self, path: str, timeout: float = DEFAULT_TIMEOUT_S):
+        """
+        Ouvre (en la créant si besoin) une base.
+
+        Args:
+            path: Chemin du fichier SQLite
+            timeout: Attente maximale (secondes) d'un verrou tenu par un
+                autre poste avant d'abandonner
+
+        Raises:
+            YearStoreError: Si la base est illisible, verrouillée au-delà du
+                délai, ou créée par une version plus récente
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None,
+                                         check_same_thread=False)
+        except sqlite3.Error as e:
+            raise YearStoreError(f"Impossible d'ouvrir la base {path}: {e}")
+        try:
+            self._conn.execute("PRAGMA journal_mode=DELETE")
+            self._conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+            # Clés étrangères activées après une éventuelle migration : la
+            # reconstruction d'une table ne doit pas supprimer en cascade
+            self._ensure_schema()
+            self._conn.execute("PRAGMA foreign_keys=ON")
+        except (sqlite3.Error, YearStoreError) as e:
+            self._conn.close()
+            if isinstance(e, YearStoreError):
+                raise
+            raise YearStoreError(f"Impossible d'ouvrir la base {path}: {e}")
+
+    def close(self) -> None:
+        """Ferme la connexion."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> 'YearStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+    def import_bulletins(self, class_name: str, year: str, code: str,
+                         bulletins: Sequence[Bulletin],
+                         metadata: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Enregistre une période d'une classe, en remplaçant son contenu actuel.
+
+        Seules les données de la période `code` des bulletins sont
+        enregistrées (les autres périodes d'un ancien fichier multi-périodes
+        sont ignorées). L'ordre des élèves et des matières est conservé.
+        Les homonymes sont distingués par leur rang dans `bulletins` : le
+        n-ième « DUPONT Alice » d'une période est le même élève que le n-ième
+        des autres périodes.
+
+        Args:
+            class_name: Nom de la classe (ex: "3A")
+            year: Année scolaire (ex: "2025-2026")
+            code: Code de la période (S1/S2/T1/T2/T3)
+            bulletins: Bulletins de la période
+            metadata: Bloc `_metadata` à conserver pour l'export
+
+        Returns:
+            Nombre de bulletins enregistrés
+
+        Raises:
+            YearStoreError: Si l'écriture échoue (ex: base verrouillée
+                au-delà du délai)
+        """
+        code = code.strip().upper()
+        with self._transaction(write=True) as conn:
+            class_id = self._class_id(conn, class_name, year, create=True)
+            _delete_period(conn, class_id, code)
+            conn.execute("INSERT INTO periods (class_id, code, metadata) VALUES (?, ?, ?)",
+                         (class_id, code, json_backend.dumps(metadata or {}, compact=True).decode("utf-8")))
+
+            students = _ids(conn, _STUDENTS_QUERY, class_id)
+            occurrences: Dict[StudentKey, int] = {}
+            subjects = {name: id_ for (name,), id_ in
+                        _ids(conn, "SELECT name, id FROM subjects WHERE class_id = ?", class_id).items()}
+            bulletin_rows = []
+            grade_rows = []
+            for position, bulletin in enumerate(bulletins):
+                name = (bulletin.eleve.nom, bulletin.eleve.prenom)
+                occurrence = occurrences[name] = occurrences.get(name, -1) + 1
+                key = (*name, occurrence)
+                student_id = students.get(key)
+                if student_id is None:
+                    student_id = students[key] = conn.execute(
+                        "INSERT INTO students (class_id, nom, prenom, occurrence) VALUES (?, ?, ?, ?)",
+                        (class_id, *key)).lastrowid
+                bulletin_rows.append((student_id, code, position,
+                                      bulletin.appreciations_generales.get(code)))
+                for subject_position, (name, appreciation) in enumerate(bulletin.matieres.items()):
+                    subject_id = subjects.get(name)
+                    if subject_id is None:
+                        subject_id = subjects[name] = conn.execute(
+                            "INSERT INTO subjects (class_id, name) VALUES (?, ?)",
+                            (class_id, name)).lastrowid
+                    periode = appreciation.periodes.get(code) or PeriodeData()
+                    grade_rows.append((student_id, subject_id, code, subject_position,
+                                       *(getattr(periode, field) for field in _PERIODE_FIELDS)))
+            conn.executemany(
+                "INSERT INTO bulletins (student_id, code, position, appreciation_generale) "
+                "VALUES (?, ?, ?, ?)", bulletin_rows)
+            conn.executemany(
+                "INSERT INTO grades (student_id, subject_id, code, position, heures_absence, retards, "
+                "moyenne, moyenne_min, moyenne_max, appreciation) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                grade_rows)
+        return len(bulletin_rows)
+
+    def import_json(self, json_path: str, class_name: str, year: str,
+                    code: Optional[str] = None) -> str:
+        """
+        Importe un fichier `output_<CODE>.json` comme période d'une classe.
+
+        Args:
+            json_path: Fichier JSON de bulletins
+            class_name: Nom de la classe
+            year: Année scolaire
+            code: Période à importer (défaut : détectée comme pour les
+                périodes liées, voir `period_code_of_file`)
+
+        Returns:
+            Code de la période importée
+
+        Raises:
+            YearStoreError: Si le fichier est illisible, sa période
+                indéterminable, ou l'écriture impossible
+        """
+        try:
+            metadata, bulletins = load_output_json(json_path)
+        except JsonGeneratorError as e:
+            raise YearStoreError(str(e))
+        code = (code or period_code_of_file(json_path) or "").strip().upper()
+        if not code:
+            raise YearStoreError(f"Période indéterminable pour {json_path}")
+        # Fichier S2 importé en T2 (ou inversement) : même alignement que les liens
+        bulletins = normalize_linked_bulletins(bulletins, code, json_path)
+        self.import_bulletins(class_name, year, code, bulletins, metadata)
+        return code
+
+    def delete_period(self, class_name: str, year: str, code: str) -> None:
+        """Supprime une période d'une classe (sans effet si elle est absente)."""
+        with self._transaction(write=True) as conn:
+            class_id = self._class_id(conn, class_name, year)
+            if class_id is not None:
+                _delete_period(conn, class_id, code.strip().upper())
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+    def classes(self) -> List[Tuple[str, str]]:
+        """Classes enregistrées : liste de (nom, année)."""
+        with self._transaction() as conn:
+            return [tuple(row) for row in conn.execute("SELECT name, year FROM classes ORDER BY year, name")]
+
+    def periods(self, class_name: str, year: str) -> List[str]:
+        """Codes des périodes enregistrées pour une classe."""
+        with self._transaction() as conn:
+            class_id = self._class_id(conn, class_name, year)
+            if class_id is None:
+                return []
+            return [code for (code,) in conn.execute(
+                "SELECT code FROM periods WHERE class_id = ? ORDER BY code", (class_id,))]
+
+    def metadata(self, class_name: str, year: str, code: str) -> Optional[Dict[str, Any]]:
+        """Bloc `_metadata` d'une période, ou None si elle est absente."""
+        with self._transaction() as conn:
+            class_id = self._class_id(conn, class_name, year)
+            row = None if class_id is None else conn.execute(
+                "SELECT metadata FROM periods WHERE class_id = ? AND code = ?",
+                (class_id, code.strip().upper())).fetchone()
+        return json_backend.loads(row[0]) if row else None
+
+    def load_bulletins(self, class_name: str, year: str,
+                       codes: Optional[Iterable[str]] = None,
+                       students: Optional[Iterable[StudentKey]] = None,
+                       subjects: Optional[Iterable[str]] = None) -> Dict[str, List[Bulletin]]:
+        """
+        Charge une tranche des bulletins d'une classe.
+
+        Le résultat a la forme de `load_history_bulletins` et peut être passé
+        tel quel à `build_display_bulletins`.
+
+        Args:
+            class_name: Nom de la classe
+            year: Année scolaire
+            codes: Périodes à charger (défaut : toutes)
+            students: Élèves à charger, en (nom, prénom) (défaut : tous ;
+                tous les homonymes d'un nom sont renvoyés)
+            subjects: Matières à charger (défaut : toutes) ; les bulletins
+                des élèves sont renvoyés même sans ces matières
+
+        Returns:
+            Dictionnaire {code_periode: liste de Bulletin}, dans l'ordre
+            d'import des élèves et des matières
+        """
+        codes = None if codes is None else sorted({c.strip().upper() for c in codes})
+        with self._transaction() as conn:
+            class_id = self._class_id(conn, class_name, year)
+            if class_id is None:
+                return {}
+            if codes is None:
+                codes = [code for (code,) in conn.execute(
+                    "SELECT code FROM periods WHERE class_id = ? ORDER BY code", (class_id,))]
+            names = {id_: (nom, prenom) for (nom, prenom, _occurrence), id_ in
+                     _ids(conn, _STUDENTS_QUERY, class_id).items()}
+            if students is not None:
+                wanted = set(students)
+                names = {id_: key for id_, key in names.items() if key in wanted}
+            subject_names = {id_: name for (name,), id_ in
+                             _ids(conn, "SELECT name, id FROM subjects WHERE class_id = ?", class_id).items()}
+            if subjects is not None:
+                wanted_subjects = set(subjects)
+                subject_names = {id_: n for id_, n in subject_names.items() if n in wanted_subjects}
+
+            student_ids = None if students is None else list(names)
+            result: Dict[str, List[Bulletin]] = {}
+            for code in codes:
+                bulletins = self._load_period(conn, class_id, code, names, subject_names, student_ids)
+                if bulletins:
+                    result[code] = bulletins
+            return result
+
+    def export_json(self, json_path: str, class_name: str, year: str, code: str,
+                    pretty_print: bool = True) -> int:
+        """
+        Exporte une période au format `output_<CODE>.json`.
+
+        Returns:
+            Nombre de bulletins exportés
+
+        Raises:
+            YearStoreError: Si la période est absente ou l'écriture impossible
+        """
+        code = code.strip().upper()
+        metadata = self.metadata(class_name, year, code)
+        if metadata is None:
+            raise YearStoreError(f"Période {code} absente pour {class_name} ({year})")
+        bulletins = self.load_bulletins(class_name, year, codes=[code]).get(code, [])
+        try:
+            save_output_json(bulletins, json_path, metadata=metadata, pretty_print=pretty_print)
+        except JsonGeneratorError as e:
+            raise YearStoreError(str(e))
+        return len(bulletins)
+
+    # ------------------------------------------------------------------
+    # Interne
+    # ------------------------------------------------------------------
+    @contextmanager
+    def _transaction(self, write: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Transaction unique : `BEGIN IMMEDIATE` pour écrire (verrou d'écriture
+        pris d'emblée, pas d'interblocage entre deux écrivains), `BEGIN` pour
+        lire (instantané cohérent sur plusieurs requêtes).
+        """
+        with self._lock:
+            conn = self._conn
+            try:
+                conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+            except sqlite3.Error as e:
+                raise YearStoreError(f"Base {self.path} indisponible: {e}")
+            try:
+                yield conn
+            except sqlite3.Error as e:
+                conn.rollback()
+                raise YearStoreError(f"Erreur sur la base {self.path}: {e}")
+            except BaseException:
+                conn.rollback()
+                raise
+            try:
+                conn.commit()
+            except sqlite3.Error as e:
+                conn.rollback()
+                raise YearStoreError(f"Erreur sur la base {self.path}: {e}")
+
+    def _ensure_schema(self) -> None:
+        # Lecture seule si le schéma est à jour : l'ouverture n'attend pas un
+        # écrivain en cours sur un autre poste
+        with self._transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == SCHEMA_VERSION:
+            return
+        with self._transaction(write=True) as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise YearStoreError(
+                    f"Base {self.path} créée par une version plus récente (schéma {version})")
+            if version < SCHEMA_VERSION:
+                scripts = [_SCHEMA] if version == 0 else \
+                    [_MIGRATIONS[v] for v in range(version, SCHEMA_VERSION)]
+                for script in scripts:
+                    for statement in script.split(";"):
+                        if statement.strip():
+                            conn.execute(statement)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    @staticmethod
+    def _class_id(conn: sqlite3.Connection, class_name: str, year: str,
+                  create: bool = False) -> Optional[int]:
+        row = conn.execute("SELECT id FROM classes WHERE name = ? AND year = ?",
+                           (class_name, year)).fetchone()
+        if row is not None:
+            return row[0]
+        if not create:
+            return None
+        return conn.execute("INSERT INTO classes (name, year) VALUES (?, ?)",
+                            (class_name, year)).lastrowid
+
+    @staticmethod
+    def _load_period(conn: sqlite3.Connection, class_id: int, code: str,
+                     names: Dict[int, StudentKey], subject_names: Dict[int, str],
+                     student_ids: Optional[List[int]]) -> List[Bulletin]:
+        rows = sorted(_select_students(
+            conn, "SELECT position, student_id, appreciation_generale FROM bulletins "
+                  "WHERE code = ? AND student_id IN ({})",
+            code, class_id, student_ids))
+        bulletins: Dict[int, Bulletin] = {}
+        for _position, student_id, texte in rows:
+            nom, prenom = names[student_id]
+            bulletin = Bulletin(Eleve(nom, prenom))
+            if texte is not None:
+                bulletin.appreciations_generales[code] = texte
+            bulletins[student_id] = bulletin
+
+        for student_id, subject_id, *values in _select_students(
+                conn, "SELECT student_id, subject_id, heures_absence, retards, moyenne, "
+                      "moyenne_min, moyenne_max, appreciation FROM grades "
+                      "WHERE code = ? AND student_id IN ({}) ORDER BY student_id, position",
+                code, class_id, student_ids):
+            bulletin = bulletins.get(student_id)
+            name = subject_names.get(subject_id)
+            if bulletin is None or name is None:
+                continue
+            appreciation = AppreciationMatiere(name)
+            if any(value is not None for value in values):
+                appreciation.periodes[code] = PeriodeData(*values)
+            bulletin.add_matiere(appreciation)
+        return list(bulletins.values())
+
+
+def _ids(conn: sqlite3.Connection, query: str, class_id: int) -> Dict[Tuple, int]:
+    """{(colonnes...): id} pour une requête `SELECT <colonnes>, id`."""
+    return {tuple(row[:-1]): row[-1] for row in conn.execute(query, (class_id,))}
+
+
+def _select_students(conn: sqlite3.Connection, query: str, code: str, class_id: int,
+                     student_ids: Optional[List[int]]) -> Iterator[Tuple]:
+    """
+    Exécute `query` (paramètres : code, puis élèves de `IN ({})`) pour tous
+    les élèves de la classe, ou par paquets pour une liste d'élèves.
+    """
+    if student_ids is None:
+        yield from conn.execute(query.format("SELECT id FROM students WHERE class_id = ?"),
+                                (code, class_id))
+        return
+    for start in range(0, len(student_ids), _IN_CHUNK):
+        chunk = student_ids[start:start + _IN_CHUNK]
+        yield from conn.execute(query.format(",".join("?" * len(chunk))), (code, *chunk))
+
+
+def _delete_period(conn: sqlite3.Connection, class_id: int, code: str) -> None:
+    students = "SELECT id FROM students WHERE class_id = ?"
+    conn.execute(f"DELETE FROM grades WHERE code = ? AND student_id IN ({students})", (code, class_id))
+    conn.execute(f"DELETE FROM bulletins WHERE code = ? AND student_id IN ({students})", (code, class_id))
+    conn.execute("DELETE FROM periods WHERE class_id = ? AND code = ?", (class_id, code))
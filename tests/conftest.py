@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Configuration pytest commune : fabriques de données synthétiques.
+"""
+
+import os
+
+import pytest
+
+
+SYNTHETIC_STUDENTS = [
+    ("DUPONT", "Alice"), ("MARTIN", "Paul"), ("BERNARD", "Marie"), ("PETIT", "Léa"),
+]
+
+
+def write_class_directory(directory, subjects=("Maths", "Francais", "Anglais"),
+                          code="T2", students=SYNTHETIC_STUDENTS):
+    """Crée un dossier classe synthétique (source.xlsx + un CSV par matière)."""
+    import pandas as pd
+
+    os.makedirs(directory, exist_ok=True)
+    pd.DataFrame({
+        'Élève': [f"{nom} {prenom}" for nom, prenom in students],
+    }).to_excel(os.path.join(directory, "source.xlsx"), index=False)
+    for s_index, subject in enumerate(subjects):
+        lines = [f"Élève;Moy. {code};H.Abs.;Ret.;App. A : Appréciations"]
+        for e_index, (nom, prenom) in enumerate(students):
+            moyenne = f"{8 + (s_index * 3 + e_index * 2) % 12},50"
+            lines.append(
+                f'"{nom} {prenom}";{moyenne};{e_index}h30;{e_index % 2};'
+                f'{subject} : appréciation de {prenom}'
+            )
+        with open(os.path.join(directory, f"{subject}.csv"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    return directory
+
+
+@pytest.fixture
+def make_class_directory():
+    """Fabrique de dossiers classe synthétiques (voir `write_class_directory`)."""
+    return write_class_directory
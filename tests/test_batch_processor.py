@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le traitement par lot sans interface (batch_processor).
+"""
+
+import json
+import os
+import tempfile
+
+import pytest
+
+from src.services.batch_processor import (
+    find_class_directories, process_tree, main, BatchProcessorError
+)
+from src.utils.semester import Period
+
+
+def _make_tree(root, make_class_directory):
+    make_class_directory(os.path.join(root, "3A", "T2"), code="T2")
+    make_class_directory(os.path.join(root, "10B"), code="T3")
+    make_class_directory(os.path.join(root, "2C"), code="T1")
+    os.makedirs(os.path.join(root, "vide"))
+    return root
+
+
+class TestBatchProcessor:
+    def test_find_class_directories(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as tmp:
+            _make_tree(tmp, make_class_directory)
+            found = [os.path.relpath(d, tmp) for d in find_class_directories(tmp)]
+            assert found == ["2C", os.path.join("3A", "T2"), "10B"]
+
+    def test_find_class_directories_missing_root(self):
+        with pytest.raises(BatchProcessorError):
+            find_class_directories("/chemin/inexistant")
+
+    def test_process_tree_serial(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as tmp:
+            _make_tree(tmp, make_class_directory)
+            summary = process_tree(tmp, max_workers=1, period_overrides={"2C": "T2"})
+
+            assert summary['counts']['directories'] == 3
+            assert summary['counts']['failed'] == 0
+            assert summary['counts']['bulletins'] == 12
+            by_dir = {os.path.relpath(e['directory'], tmp): e for e in summary['directories']}
+            # Période : nom du dossier, détection depuis les CSV, surcharge
+            assert by_dir[os.path.join("3A", "T2")]['output_file'].endswith("output_T2.json")
+            assert by_dir["10B"]['period'] == "T3"
+            assert os.path.exists(os.path.join(tmp, "10B", "output_T3.json"))
+            assert not os.path.exists(os.path.join(tmp, "10B", ".output_en_cours.json"))
+            assert by_dir["2C"]['output_file'].endswith("output_T2.json")
+            assert all(e['duration_s'] >= 0 for e in summary['directories'])
+
+    def test_failure_is_reported(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as tmp:
+            make_class_directory(os.path.join(tmp, "3A"))
+            # source.xlsx sans colonne 'Élève' : échec du dossier
+            import pandas as pd
+            broken = make_class_directory(os.path.join(tmp, "3B"))
+            pd.DataFrame({'Nom': ['X']}).to_excel(os.path.join(broken, "source.xlsx"), index=False)
+
+            summary = process_tree(tmp, max_workers=1, period_override=Period.T2)
+
+            assert summary['counts']['succeeded'] == 1
+            assert summary['counts']['failed'] == 1
+            assert summary['failures'][0]['directory'] == broken
+            assert "Élève" in summary['failures'][0]['error']
+
+    def test_cli_with_process_pool(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as tmp:
+            _make_tree(tmp, make_class_directory)
+            summary_path = os.path.join(tmp, "resume.json")
+            code = main([tmp, "--workers", "2", "--period", "T3", "--summary", summary_path])
+
+            assert code == 0
+            with open(summary_path, encoding="utf-8") as f:
+                summary = json.load(f)
+            assert summary['workers'] == 2
+            assert summary['counts']['succeeded'] == 3
+            assert {e['period'] for e in summary['directories']} == {"T3"}
+
+    def test_existing_outputs_are_kept(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as tmp:
+            _make_tree(tmp, make_class_directory)
+            process_tree(tmp, max_workers=1)
+            output = os.path.join(tmp, "10B", "output_T3.json")
+            with open(output, encoding="utf-8") as f:
+                data = json.load(f)
+            data[1]['AppreciationGeneraleT3'] = "Synthèse retouchée"
+            with open(output, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            edited = os.path.getmtime(output)
+
+            summary = process_tree(tmp, max_workers=1)
+            assert (summary['counts']['skipped'], summary['counts']['succeeded']) == (3, 0)
+            assert {"directory": os.path.join(tmp, "10B"), "output_file": output} in summary['skipped']
+            assert os.path.getmtime(output) == edited
+
+            # Incrémental : période détectée depuis les en-têtes, retouches conservées
+            summary = process_tree(tmp, max_workers=1, incremental=True)
+            assert summary['counts']['succeeded'] == 3
+            with open(output, encoding="utf-8") as f:
+                assert json.load(f)[1]['AppreciationGeneraleT3'] == "Synthèse retouchée"
+
+            assert main([tmp, "--workers", "1", "--force", "--summary", os.path.join(tmp, "r.json")]) == 0
+            with open(output, encoding="utf-8") as f:
+                assert 'AppreciationGeneraleT3' not in json.load(f)[1]
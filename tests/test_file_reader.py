@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour la conversion colonne par colonne de file_reader
+et la réparation des exports CSV mal formés.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.services.file_reader import (
+    read_csv_matiere, read_source_xlsx, _frame_to_records, repair_csv_text,
+    iter_source_xlsx, list_source_classes, FileReaderError
+)
+from src.services.bulletin_processor import create_bulletins_by_class
+from src.services.parse_cache import ParseCache
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "csv_malformes")
+
+
+def _legacy_records(df, strip_strings=False, leading=None):
+    """Ancienne conversion `iterrows()` cellule par cellule (référence)."""
+    records = []
+    for _, row in df.iterrows():
+        record = dict(leading or {})
+        for col in df.columns:
+            value = row[col]
+            if pd.isna(value):
+                value = None
+            elif strip_strings and isinstance(value, str):
+                value = value.strip()
+            record[col] = value
+        records.append(record)
+    return records
+
+
+CSV_CONTENT = (
+    "Élève;Moy. T2;H.Abs.;Ret.;App. A : Appréciations;Evol.\n"
+    "\"DUPONT Alice\";14,50;1h30;2;  Bon trimestre  ;\n"
+    "MARTIN Paul;N.Not;;;;<b>+</b>\n"
+    "BERNARD Marie;;0h00;0;   ;\n"
+)
+
+
+class TestColumnarConversion:
+    """La conversion vectorisée retourne exactement l'ancienne structure."""
+
+    def test_read_csv_matiere_matches_legacy(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "Maths.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(CSV_CONTENT)
+
+            records = read_csv_matiere(path, "Maths")
+            df = pd.read_csv(path, sep=';', encoding='utf-8')
+            expected = _legacy_records(df, strip_strings=True, leading={'matiere': 'Maths'})
+
+            assert records == expected
+            assert list(records[0].keys())[0] == 'matiere'
+            assert records[0]['App. A : Appréciations'] == "Bon trimestre"
+            assert records[1]['H.Abs.'] is None
+            assert records[2]['App. A : Appréciations'] == ""
+
+    def test_read_source_xlsx_matches_legacy(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "source.xlsx")
+            pd.DataFrame({
+                'Élève': ['DUPONT Alice', 'MARTIN Paul'],
+                'AppreciationGeneraleT1': ['Bien', None],
+                'Rang': [1, 2],
+            }).to_excel(path, index=False)
+
+            records = read_source_xlsx(path)
+            expected = _legacy_records(pd.read_excel(path))
+
+            assert records == expected
+            assert records[1]['AppreciationGeneraleT1'] is None
+
+    def test_mixed_and_typed_columns(self):
+        df = pd.DataFrame({
+            'Élève': [' A ', None, 'C'],
+            'mixte': pd.Series([1, ' x ', np.nan], dtype=object),
+            'entier': [1, 2, 3],
+            'reel': [1.5, np.nan, 2.0],
+            'date': pd.to_datetime(['2024-01-01', None, '2024-03-01']),
+            'bool': [True, False, True],
+        })
+        for strip in (False, True):
+            records = _frame_to_records(df, strip_strings=strip)
+            assert records == _legacy_records(df, strip_strings=strip)
+            assert [type(v) for v in records[0].values()] == [
+                type(v) for v in _legacy_records(df, strip_strings=strip)[0].values()
+            ]
+
+    def test_empty_frame(self):
+        df = pd.DataFrame(columns=['Élève', 'Moy.'])
+        assert _frame_to_records(df, strip_strings=True, leading={'matiere': 'X'}) == []
+
+
+class TestMalformedCsvRepair:
+    """Réparation en une passe des exports PRONOTE mal formés."""
+
+    # fichier -> (lignes réparées, valeur attendue de Evol. pour DUPONT Alice)
+    CORPUS = {
+        "evol_guillemets.csv": ([2, 3], '<span style="color:#008000">&#8599;</span>'),
+        "evol_point_virgule.csv": ([2], '<img src="fleche.png" alt="hausse;forte">'),
+        "evol_non_referme.csv": ([2], '<b>'),
+        "appreciations_multilignes.csv": ([2, 3], '='),
+        "bom_crlf.csv": ([2], '<font color="green">+</font>'),
+        "champs_en_trop.csv": ([3], '='),
+    }
+
+    @pytest.mark.parametrize("filename", sorted(CORPUS))
+    def test_corpus_keeps_every_student(self, filename):
+        expected_lines, expected_evol = self.CORPUS[filename]
+        repaired = []
+        records = read_csv_matiere(os.path.join(FIXTURES_DIR, filename), "Maths",
+                                   repaired_lines=repaired)
+
+        assert [r['Élève'] for r in records] == ["DUPONT Alice", "MARTIN Paul", "BERNARD Marie"]
+        assert repaired == expected_lines
+        assert records[0]['Evol.'] == expected_evol
+        assert records[1]['Moy. T2'] == "9,00"
+
+    def test_unrepairable_line_is_reported(self, monkeypatch):
+        # Réparation neutralisée : le parseur échoue encore après l'examen complet
+        monkeypatch.setattr("src.services.file_reader.repair_csv_text", lambda text, **_kw: (text, []))
+        with pytest.raises(FileReaderError, match="non réparable.*line 3"):
+            read_csv_matiere(os.path.join(FIXTURES_DIR, "champs_en_trop.csv"), "Maths")
+
+    def test_student_filter_with_and_without_cache(self):
+        path = os.path.join(FIXTURES_DIR, "appreciations_multilignes.csv")
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ParseCache(tmp)
+            for _ in range(2):
+                repaired = []
+                records = read_csv_matiere(path, "Maths", cache=cache, repaired_lines=repaired,
+                                           students=["BERNARD  Marie"])
+                assert [r['Élève'] for r in records] == ["BERNARD Marie"]
+                assert repaired == [2, 3]
+            assert cache.stats() == {'hits': 1, 'misses': 1}
+        records = read_csv_matiere(path, "Maths", students=["bernard marie"])
+        assert records == read_csv_matiere(path, "Maths")[2:]
+
+    def test_multiline_appreciation_preserved(self):
+        records = read_csv_matiere(os.path.join(FIXTURES_DIR, "appreciations_multilignes.csv"), "Maths")
+        apps = [r['App. A : Appréciations'] for r in records]
+        assert apps == [
+            'Elle a dit "merci" en classe.',
+            "Ensemble correct.\nDes progrès à confirmer.",
+            'Excellent, "bravo".',
+        ]
+
+    def test_well_formed_text_untouched(self):
+        text = (
+            "Élève;Moy. T2;App.\n"
+            'DUPONT Alice;12,50;"Très bien, ""sérieux"""\n'
+            "MARTIN Paul;;\n"
+        )
+        assert repair_csv_text(text) == (text, [])
+
+    def test_repaired_lines_reported_in_result(self, make_class_directory):
+        from src.services.main_processor import process_directory_to_json
+
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = make_class_directory(tmp, subjects=("Maths",))
+            with open(os.path.join(directory, "Maths.csv"), encoding="utf-8") as f:
+                lines = f.read().split("\n")
+            lines[2] += ';"<span style="color:red">-</span>"'
+            lines[0] += ";Evol."
+            with open(os.path.join(directory, "Maths.csv"), "w", encoding="utf-8") as f:
+                f.write("\n".join(lines))
+
+            result = process_directory_to_json(directory, os.path.join(tmp, "out.json"))
+
+            assert result['success']
+            assert result['bulletins_count'] == 4
+            assert any("Maths" in w and "réparée(s): 3" in w for w in result['warnings'])
+
+
+class TestStreamingSourceXlsx:
+    """Lecture en flux d'un source.xlsx consolidé."""
+
+    def _write_consolidated(self, path):
+        pd.DataFrame({
+            'Classe': ['3A', '10B', '3A', '2C', None],
+            'Élève': ['DUPONT Alice', 'MARTIN Paul', 'BERNARD Marie', 'PETIT Léa', 'SANS Classe'],
+            'AppreciationGeneraleT1': ['Bien', None, 'Très bien', None, 'Ok'],
+            'Rang': [1, 2, 3, 4, 5],
+            'Note': [12.5, None, 8.0, 14.25, 10.0],
+        }).to_excel(path, index=False)
+
+    def test_matches_read_source_xlsx(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "source.xlsx")
+            self._write_consolidated(path)
+            streamed = list(iter_source_xlsx(path))
+            full = read_source_xlsx(path)
+
+            assert [r['Élève'] for r in streamed] == [r['Élève'] for r in full]
+            assert [r['AppreciationGeneraleT1'] for r in streamed] == [
+                r['AppreciationGeneraleT1'] for r in full
+            ]
+            assert [r['Rang'] for r in streamed] == [1, 2, 3, 4, 5]
+            assert streamed[1]['Note'] is None
+
+    def test_class_filter(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "source.xlsx")
+            self._write_consolidated(path)
+
+            assert [r['Élève'] for r in iter_source_xlsx(path, classe="3A")] == [
+                'DUPONT Alice', 'BERNARD Marie'
+            ]
+            assert len(list(iter_source_xlsx(path, classe=["2C", "10B"]))) == 2
+            assert list_source_classes(path) == ["2C", "3A", "10B"]
+
+    def test_student_filter(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "source.xlsx")
+            self._write_consolidated(path)
+            assert [r['Élève'] for r in iter_source_xlsx(path, students=["petit lea", "X Y"])] == [
+                'PETIT Léa'
+            ]
+            assert [r['Élève'] for r in iter_source_xlsx(path, classe="3A", students=["PETIT Léa"])] == []
+
+    def test_missing_columns(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "source.xlsx")
+            pd.DataFrame({'Élève': ['DUPONT Alice']}).to_excel(path, index=False)
+            with pytest.raises(FileReaderError):
+                list(iter_source_xlsx(path, classe="3A"))
+            pd.DataFrame({'Nom': ['X']}).to_excel(path, index=False)
+            with pytest.raises(FileReaderError):
+                list(iter_source_xlsx(path))
+
+    def test_create_bulletins_by_class(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "source.xlsx")
+            self._write_consolidated(path)
+            by_class = {
+                classe: [b.eleve.nom for b in bulletins]
+                for classe, bulletins in create_bulletins_by_class(path)
+            }
+            assert by_class == {"2C": ["PETIT"], "3A": ["DUPONT", "BERNARD"], "10B": ["MARTIN"]}
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires de l'instrumentation par étape (temps, compteurs, trace).
+"""
+
+import json
+import os
+import tempfile
+
+from src.services.instrumentation import (
+    BYTES_READ, DISABLED, ROWS, Instrumentation, format_stage_summary,
+)
+from src.services.main_processor import process_directory, process_directory_to_json
+
+
+class TestInstrumentation:
+    """Mesures et compteurs d'une étape."""
+
+    def test_stage_records_time_and_counters(self):
+        instrumentation = Instrumentation()
+        with instrumentation.stage("csv") as stage:
+            stage.add(ROWS, 3)
+            stage.add(BYTES_READ, 100)
+        with instrumentation.stage("csv") as stage:
+            stage.add(ROWS, 2)
+        report = instrumentation.report()
+        csv = report['stages']['csv']
+        assert csv['calls'] == 2
+        assert csv['rows'] == 5
+        assert csv['bytes_read'] == 100
+        assert csv['wall_s'] >= 0 and csv['cpu_s'] >= 0
+        assert report['wall_s'] == csv['wall_s']
+
+    def test_stages_keep_first_run_order(self):
+        instrumentation = Instrumentation()
+        for name in ("lecture", "fusion", "lecture"):
+            with instrumentation.stage(name):
+                pass
+        assert list(instrumentation.report()['stages']) == ["lecture", "fusion"]
+
+    def test_disabled_is_a_no_op(self):
+        instrumentation = Instrumentation(enabled=False)
+        with instrumentation.stage("csv") as stage:
+            stage.add(ROWS, 3)
+        assert instrumentation.report() == {}
+        with DISABLED.stage("csv") as stage:
+            stage.add(ROWS, 3)
+        assert DISABLED.report() == {}
+
+    def test_exception_still_records_stage(self):
+        instrumentation = Instrumentation()
+        try:
+            with instrumentation.stage("csv"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        assert instrumentation.report()['stages']['csv']['calls'] == 1
+
+    def test_write_trace(self):
+        instrumentation = Instrumentation()
+        with instrumentation.stage("csv") as stage:
+            stage.add(ROWS, 3)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "trace.json")
+            instrumentation.write_trace(path, {"source_directory": "classe"})
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+        assert trace['source_directory'] == "classe"
+        assert trace['stages']['csv']['rows'] == 3
+        assert "generated_at" in trace
+
+    def test_format_stage_summary(self):
+        report = {'stages': {'csv': {'wall_s': 0.12, 'cpu_s': 1.5, 'calls': 1,
+                                     'rows': 42, 'bytes_read': 2048, 'cache_hits': 2}}}
+        assert format_stage_summary(report) == [
+            "csv : 120 ms (CPU 1.50 s) · 42 lignes · 2 Ko lus · cache 2"
+        ]
+        assert format_stage_summary({}) == []
+
+
+class TestPipelineInstrumentation:
+    """Mesures des étapes du traitement d'un dossier classe."""
+
+    def test_disabled_by_default(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(temp_dir)
+            assert process_directory(source)['instrumentation'] == {}
+
+    def test_stages_and_counters(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(temp_dir)
+            output = os.path.join(temp_dir, "output.json")
+            trace_path = os.path.join(temp_dir, "trace.json")
+            result = process_directory_to_json(source, output, instrument=True,
+                                               trace_path=trace_path)
+            stages = result['instrumentation']['stages']
+            assert list(stages) == ["source_xlsx", "csv", "construction", "fusion_csv",
+                                    "statistiques", "validation", "ecriture_json"]
+            assert stages['source_xlsx']['rows'] == 4
+            assert stages['csv']['rows'] == 12
+            assert stages['csv']['bytes_read'] > 0
+            assert stages['ecriture_json']['bytes_written'] == os.path.getsize(output)
+            with open(trace_path, encoding="utf-8") as f:
+                trace = json.load(f)
+            assert trace['stages'] == stages
+            assert trace['bulletins_count'] == 4
+
+    def test_cache_hits_are_counted(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(temp_dir)
+            process_directory(source, use_cache=True)
+            stages = process_directory(source, use_cache=True, instrument=True)['instrumentation']['stages']
+            assert stages['source_xlsx']['cache_hits'] == 1
+            assert stages['csv']['cache_hits'] == 3
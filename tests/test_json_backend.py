@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires de la sérialisation JSON (orjson ou module standard).
+"""
+
+import json
+import math
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from src.services import json_backend
+from src.services.json_generator import JsonGeneratorError, load_output_json, save_output_json
+from src.services.main_processor import process_directory
+from src.services.period_history import read_payload, update_file_metadata
+
+BACKENDS = ["json"] + (["orjson"] if json_backend.orjson is not None else [])
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = json_backend.use_backend(request.param)
+    yield request.param
+    json_backend.use_backend(previous)
+
+
+class TestJsonBackend:
+    """Même contenu quel que soit le backend."""
+
+    def test_pretty_matches_stdlib(self, backend):
+        data = [{"_metadata": {"semester": "T2"}}, {"Nom": "PETIT", "Prenom": "Léa",
+                                                   "Matieres": {}, "Notes": [12.5, None]}]
+        expected = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        assert json_backend.dumps(data) == expected
+
+    def test_compact(self, backend):
+        data = {"Prenom": "Léa", "moyennes": [1, 2.5]}
+        assert json_backend.dumps(data, compact=True) == '{"Prenom":"Léa","moyennes":[1,2.5]}'.encode("utf-8")
+
+    def test_numpy_scalars(self, backend):
+        if backend == "json":
+            pytest.skip("le module standard refuse numpy.int64")
+        data = {"moyenne": np.float64(12.5), "count": np.int64(3)}
+        assert json_backend.loads(json_backend.dumps(data)) == {"moyenne": 12.5, "count": 3}
+
+    def test_invalid_json_raises_decode_error(self, backend):
+        with pytest.raises(json_backend.JSONDecodeError):
+            json_backend.loads(b"[{")
+
+    def test_legacy_nan_is_readable(self, backend):
+        assert math.isnan(json_backend.loads(b'[{"moyenne": NaN}]')[0]["moyenne"])
+
+    def test_unknown_backend(self):
+        with pytest.raises(json_backend.JsonBackendError):
+            json_backend.use_backend("simplejson")
+
+
+class TestBulletinFiles:
+    """Fichiers de bulletins écrits et relus via le backend."""
+
+    def test_round_trip_is_identical_across_backends(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = process_directory(make_class_directory(temp_dir))
+            contents = {}
+            for name in BACKENDS:
+                previous = json_backend.use_backend(name)
+                try:
+                    path = os.path.join(temp_dir, f"output_{name}.json")
+                    save_output_json(result['bulletins'], path, metadata=result['metadata'])
+                    with open(path, "rb") as f:
+                        contents[name] = f.read()
+                    metadata, bulletins = load_output_json(path)
+                finally:
+                    json_backend.use_backend(previous)
+                assert metadata == result['metadata']
+                assert [b.to_dict() for b in bulletins] == [b.to_dict() for b in result['bulletins']]
+            assert len(set(contents.values())) == 1
+            assert "Léa".encode("utf-8") in contents[BACKENDS[0]]
+
+    def test_compact_save(self, backend, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = process_directory(make_class_directory(temp_dir))
+            path = os.path.join(temp_dir, "output_T2.json")
+            save_output_json(result['bulletins'], path, metadata=result['metadata'], pretty_print=False)
+            with open(path, encoding="utf-8") as f:
+                assert "\n" not in f.read()
+            metadata, data = read_payload(path)
+            assert metadata == result['metadata']
+            assert len(data) == 4
+
+    def test_update_file_metadata_keeps_bulletins(self, backend, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = process_directory(make_class_directory(temp_dir))
+            path = os.path.join(temp_dir, "output_T2.json")
+            save_output_json(result['bulletins'], path, metadata=result['metadata'])
+            _meta, before = read_payload(path)
+            update_file_metadata(path, {"semester": "T2", "linked_periods": {"T1": "output_T1.json"}})
+            metadata, after = read_payload(path)
+            assert metadata["linked_periods"] == {"T1": "output_T1.json"}
+            assert after == before
+
+
+class TestAtomicWrite:
+    """Écriture atomique et en flux des fichiers JSON."""
+
+    def test_dump_items_matches_dump(self, backend):
+        items = [{"_metadata": {"semester": "T2"}},
+                 {"Nom": "PETIT", "Prenom": "Léa", "Texte": "ligne 1\nligne 2", "Vide": []}]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for compact in (False, True):
+                for data in (items, []):
+                    streamed = os.path.join(temp_dir, "streamed.json")
+                    whole = os.path.join(temp_dir, "whole.json")
+                    json_backend.dump_items(iter(data), streamed, compact=compact)
+                    json_backend.dump(data, whole, compact=compact)
+                    with open(streamed, "rb") as a, open(whole, "rb") as b:
+                        assert a.read() == b.read()
+                    assert json_backend.load(streamed) == data
+
+    def test_failed_write_keeps_previous_file(self):
+        def items():
+            yield {"Nom": "PETIT"}
+            raise RuntimeError("arrêt en cours d'écriture")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "output_T2.json")
+            json_backend.dump([{"Nom": "DUPONT"}], path)
+            with pytest.raises(RuntimeError):
+                json_backend.dump_items(items(), path)
+            assert json_backend.load(path) == [{"Nom": "DUPONT"}]
+            assert os.listdir(temp_dir) == ["output_T2.json"]
+
+    def test_failed_save_keeps_previous_output(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = process_directory(make_class_directory(temp_dir))
+            path = os.path.join(temp_dir, "output_T2.json")
+            save_output_json(result['bulletins'], path, metadata=result['metadata'])
+            with open(path, "rb") as f:
+                before = f.read()
+
+            broken = result['bulletins'][:2] + [object()]
+            with pytest.raises(JsonGeneratorError):
+                save_output_json(broken, path, metadata=result['metadata'])
+            with open(path, "rb") as f:
+                assert f.read() == before
+            assert not [n for n in os.listdir(temp_dir) if n.endswith(".tmp")]
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires de l'annexe de métadonnées (`<nom>.json.meta`).
+"""
+
+import os
+import tempfile
+
+from src.services import json_backend
+from src.services.json_generator import load_output_json, save_output_json
+from src.services.main_processor import process_directory, process_directory_to_json
+from src.services.metadata_sidecar import read_sidecar, sidecar_path
+from src.services.period_history import (
+    add_period_link, discover_sibling_period_files, read_metadata, read_payload,
+    update_file_metadata,
+)
+
+
+def _write_output(temp_dir, make_class_directory, name="output_T2.json"):
+    result = process_directory(make_class_directory(temp_dir))
+    path = os.path.join(temp_dir, name)
+    save_output_json(result['bulletins'], path, metadata=result['metadata'])
+    return path, result
+
+
+class TestMetadataSidecar:
+    """Mise à jour des métadonnées sans réécriture des bulletins."""
+
+    def test_update_writes_sidecar_only(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path, result = _write_output(temp_dir, make_class_directory)
+            with open(path, "rb") as f:
+                before = f.read()
+
+            metadata = dict(result['metadata'], period_links={"T1": "output_T1.json"})
+            update_file_metadata(path, metadata)
+
+            with open(path, "rb") as f:
+                assert f.read() == before
+            assert os.path.exists(sidecar_path(path))
+            assert read_payload(path)[0]["period_links"] == {"T1": "output_T1.json"}
+            assert read_metadata(path)["period_links"] == {"T1": "output_T1.json"}
+            assert load_output_json(path)[0]["period_links"] == {"T1": "output_T1.json"}
+            assert len(read_payload(path)[1]) == 4
+
+    def test_without_sidecar_reads_embedded_metadata(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path, result = _write_output(temp_dir, make_class_directory)
+            assert read_sidecar(path) is None
+            assert read_metadata(path) == result['metadata']
+
+    def test_sidecar_ignored_when_json_changed(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path, result = _write_output(temp_dir, make_class_directory)
+            update_file_metadata(path, {"semester": "T2", "period_links": {"T1": "a.json"}})
+            # Réécriture par un autre outil : taille et date changent
+            data = json_backend.load(path)
+            data[0]["_metadata"]["note"] = "modifié ailleurs"
+            json_backend.dump(data, path)
+            assert read_sidecar(path) is None
+            assert read_metadata(path)["note"] == "modifié ailleurs"
+            assert "period_links" not in read_metadata(path)
+
+    def test_full_save_embeds_metadata_and_removes_sidecar(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path, result = _write_output(temp_dir, make_class_directory)
+            update_file_metadata(path, dict(result['metadata'], period_links={"T1": "a.json"}))
+            metadata, bulletins = load_output_json(path)
+            save_output_json(bulletins, path, metadata=metadata)
+            assert not os.path.exists(sidecar_path(path))
+            assert json_backend.load(path)[0]["_metadata"]["period_links"] == {"T1": "a.json"}
+
+    def test_incremental_run_keeps_sidecar_links(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(temp_dir)
+            path = os.path.join(temp_dir, "output_T2.json")
+            process_directory_to_json(source, path)
+            update_file_metadata(path, dict(read_metadata(path), period_links={"T1": "a.json"}))
+            result = process_directory_to_json(source, path, incremental=True)
+            assert result['incremental']
+            assert not os.path.exists(sidecar_path(path))
+            assert read_metadata(path)["period_links"] == {"T1": "a.json"}
+
+    def test_update_missing_file_creates_it(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "output_T1.json")
+            update_file_metadata(path, {"semester": "T1"})
+            assert json_backend.load(path) == [{"_metadata": {"semester": "T1"}}]
+            assert not os.path.exists(sidecar_path(path))
+
+    def test_sidecar_is_not_a_period_file(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path, result = _write_output(temp_dir, make_class_directory)
+            other, _ = _write_output(temp_dir, make_class_directory, name="output_T1.json")
+            metadata = dict(result['metadata'])
+            add_period_link(metadata, path, other, "T1")
+            update_file_metadata(path, metadata)
+            siblings = discover_sibling_period_files(path, "T2", read_metadata(path))
+            assert all(not p.endswith(".meta") for p in siblings.values())
@@ -3,7 +3,13 @@
 Tests unitaires pour les modèles de données de l'application de conseil de classe.
 """
 
+import copy
+import pickle
+
+import numpy as np
 import pytest
+import random
+import struct
 import sys
 from pathlib import Path
 
@@ -12,6 +18,11 @@ root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
 from src.models import Eleve, AppreciationMatiere, Bulletin, parse_heures_absence, parse_moyenne
+from src.models.bulletin import (
+    LazyBulletin, normalize_absence, absence_to_hours, parse_retards, bulletins_from_dicts,
+    parse_moyenne_bulk, normalize_absence_bulk, absence_to_hours_bulk, parse_retards_bulk,
+)
+from src.models.class_matrix import ClassMatrix
 
 
 class TestEleve:
@@ -197,6 +208,316 @@ class TestParseFunctions:
         assert parse_moyenne("16,00") == 16.0
 
 
+
+def _random_raw_value(rng):
+    """Valeur brute tirée d'un alphabet couvrant les formats PRONOTE et JSON."""
+    kind = rng.randrange(9)
+    if kind == 0:
+        return f"{rng.randint(0, 20)},{rng.randint(0, 99):02d}"
+    if kind == 1:
+        return rng.choice(["N.Not", "", "  ", "Abs", "Disp", "nan", "NaN", "-0,0", "0,0", "1e3", "inf"])
+    if kind == 2:
+        sep = rng.choice(["h", " h ", "h ", "H"])
+        return f"{rng.randint(0, 150)}{sep}{rng.choice(['', '5', '05', '30', '59', '123'])}"
+    if kind == 3:
+        return f"{rng.uniform(0, 120):.{rng.randint(0, 6)}f}".replace(".", rng.choice([".", ","]))
+    if kind == 4:
+        # Heures décimales proches d'une heure pleine (arrondi des minutes à 60)
+        return rng.randint(0, 20) + rng.choice([0.9999, 0.99, 0.5, 0.0083, 0.25])
+    if kind == 5:
+        return rng.choice([None, 0, 1, 3, 12, True, False, -0.0, 0.0, float("nan")])
+    if kind == 6:
+        return rng.uniform(-5, 25)
+    if kind == 7:
+        return f" {rng.randint(0, 9)} "
+    return rng.choice(["1.0", "2,0", "3", "x", "1h", "0h00", "12,50", "10h30"])
+
+
+def _same(a, b):
+    """Égalité stricte : même type, même valeur, même bit de signe / NaN."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, float):
+        return struct.pack("<d", a) == struct.pack("<d", b)
+    return a == b
+
+
+class TestBulkParsers:
+    """Les conversions en bloc sont identiques bit à bit aux fonctions unitaires."""
+
+    PAIRS = [
+        (parse_moyenne, parse_moyenne_bulk),
+        (normalize_absence, normalize_absence_bulk),
+        (absence_to_hours, absence_to_hours_bulk),
+        (parse_retards, parse_retards_bulk),
+    ]
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_property_identical_to_scalar(self, seed):
+        rng = random.Random(seed)
+        values = [_random_raw_value(rng) for _ in range(300)]
+        # Doublons fréquents comme dans un export réel
+        values += rng.sample(values, 100)
+        for scalar, bulk in self.PAIRS:
+            expected = []
+            for value in values:
+                try:
+                    expected.append(scalar(value))
+                except OverflowError:
+                    expected = None
+                    break
+            if expected is None:
+                with pytest.raises(OverflowError):
+                    bulk(values)
+                continue
+            results = bulk(values)
+            assert len(results) == len(values)
+            for value, got, want in zip(values, results, expected):
+                assert _same(got, want), (scalar.__name__, value, got, want)
+
+    def test_accepts_series(self):
+        import pandas as pd
+        series = pd.Series(["12,50", None, "N.Not", "12,50"], dtype=object)
+        assert parse_moyenne_bulk(series) == [12.5, None, None, 12.5]
+        assert normalize_absence_bulk(pd.Series([1.5, 0.9999, 2.0])) == ["1h30", "1h00", "2h00"]
+
+    def test_bulletins_from_dicts_matches_from_dict(self):
+        rng = random.Random(7)
+        items = []
+        for i in range(30):
+            matieres = {}
+            for m in range(4):
+                entry = {}
+                for code in ("T1", "T2", "T3"):
+                    entry[f"Moyenne{code}"] = rng.choice([None, 12.5, 8, "14,5", -0.0])
+                    entry[f"Moyenne{code}Min"] = rng.choice([None, 3.25])
+                    entry[f"HeuresAbsence{code}"] = rng.choice([None, "1h30", 2.5, ""])
+                    entry[f"Retards{code}"] = rng.choice([None, 1, "2", 0])
+                    entry[f"Appreciation{code}"] = f"App {i} {m} {code}"
+                matieres[f"Matiere{m}"] = entry
+            items.append({"Nom": f"NOM{i}", "Prenom": "X", "Matieres": matieres})
+
+        bulk = bulletins_from_dicts(items)
+        single = [Bulletin.from_dict(item) for item in items]
+        assert [b.to_dict() for b in bulk] == [b.to_dict() for b in single]
+        for b_bulk, b_single in zip(bulk, single):
+            for name, app in b_single.matieres.items():
+                for code, periode in app.periodes.items():
+                    other = b_bulk.matieres[name].periodes[code]
+                    for attr in ("moyenne", "moyenne_min", "moyenne_max", "heures_absence", "retards"):
+                        assert _same(getattr(other, attr), getattr(periode, attr))
+
 if __name__ == "__main__":
     # Lancer les tests
-    pytest.main([__file__, "-v"]) 
\ No newline at end of file
+    pytest.main([__file__, "-v"])
+
+
+def _random_class(seed, students=30, subjects=("Maths", "Francais", "Anglais", "SVT")):
+    """Classe aléatoire : matières et périodes manquantes, moyennes None."""
+    rng = random.Random(seed)
+    bulletins = []
+    for i in range(students):
+        bulletin = Bulletin(eleve=Eleve(nom=f"ELEVE{i}", prenom="Test"))
+        for nom in subjects:
+            if rng.random() < 0.15:
+                continue
+            appreciation = AppreciationMatiere(matiere=nom)
+            for code in ("T1", "T2", "T3"):
+                if rng.random() < 0.2:
+                    continue
+                periode = appreciation.ensure_periode(code)
+                if rng.random() < 0.85:
+                    periode.moyenne = round(rng.uniform(0, 20), 2)
+                if rng.random() < 0.5:
+                    periode.heures_absence = f"{rng.randint(0, 12)}h{rng.choice([0, 30]):02d}"
+                periode.retards = rng.choice([None, 0, 1, 3])
+            bulletin.add_matiere(appreciation)
+        bulletins.append(bulletin)
+    return bulletins
+
+
+class TestClassMatrix:
+    """Matrice [élève, matière, période] d'une classe."""
+
+    def test_values_and_masks(self):
+        bulletins = _random_class(1)
+        matrix = ClassMatrix.from_bulletins(bulletins)
+
+        assert matrix.periods == ["T1", "T2", "T3"]
+        assert matrix.subjects == ["Anglais", "Francais", "Maths", "SVT"]
+        for i, bulletin in enumerate(bulletins):
+            for s, nom in enumerate(matrix.subjects):
+                appreciation = bulletin.get_matiere(nom)
+                assert matrix.has_subject[i, s] == (appreciation is not None)
+                for p, code in enumerate(matrix.periods):
+                    periode = appreciation.get_periode(code) if appreciation else None
+                    assert matrix.has_period[i, s, p] == (periode is not None)
+                    moyenne = periode.moyenne if periode else None
+                    if moyenne is None:
+                        assert np.isnan(matrix.moyennes[i, s, p])
+                    else:
+                        assert matrix.moyennes[i, s, p] == moyenne
+
+    def test_min_max_matches_legacy_loop(self):
+        bulletins = _random_class(2)
+        matrix = ClassMatrix.from_bulletins(bulletins)
+        minimum, maximum = matrix.min_max()
+        for s, nom in enumerate(matrix.subjects):
+            for p, code in enumerate(matrix.periods):
+                values = [
+                    b.get_matiere(nom).get_periode(code).moyenne
+                    for b in bulletins
+                    if b.get_matiere(nom) and b.get_matiere(nom).get_periode(code)
+                    and b.get_matiere(nom).get_periode(code).moyenne is not None
+                ]
+                if values:
+                    assert (minimum[s, p], maximum[s, p]) == (min(values), max(values))
+                else:
+                    assert np.isnan(minimum[s, p]) and np.isnan(maximum[s, p])
+
+    def test_statistics_match_numpy(self):
+        bulletins = _random_class(5, students=40)
+        matrix = ClassMatrix.from_bulletins(bulletins)
+        stats = matrix.statistics()
+        for s in range(len(matrix.subjects)):
+            for p in range(len(matrix.periods)):
+                column = matrix.moyennes[:, s, p]
+                values = column[~np.isnan(column)]
+                assert stats['count'][s, p] == len(values)
+                if not len(values):
+                    assert np.isnan(stats['mean'][s, p])
+                    continue
+                expected = {
+                    'min': values.min(), 'max': values.max(), 'mean': values.mean(),
+                    'median': np.median(values), 'std': values.std(),
+                    'q1': np.percentile(values, 25), 'q3': np.percentile(values, 75),
+                }
+                for name, value in expected.items():
+                    assert stats[name][s, p] == pytest.approx(value)
+                for i, moyenne in enumerate(column):
+                    if np.isnan(moyenne):
+                        assert np.isnan(stats['rank'][i, s, p])
+                    else:
+                        assert stats['rank'][i, s, p] == 1 + (values > moyenne).sum()
+
+        assert ClassMatrix.from_bulletins([]).statistics()['count'].shape == (0, 0)
+
+    def test_set_values_updates_bulletin_and_matrix(self):
+        bulletins = _random_class(3, students=3)
+        matrix = ClassMatrix.from_bulletins(bulletins, subjects=["Maths", "Physique"],
+                                            periods=["T1", "T2", "T3"])
+        periode = matrix.set_values(1, "Physique", "T2", moyenne=15.5, heures_absence="2h30")
+
+        assert bulletins[1].get_matiere("Physique").get_periode("T2") is periode
+        s, p = matrix.subject_index("Physique"), matrix.period_index("T2")
+        assert matrix.moyennes[1, s, p] == 15.5
+        assert matrix.heures_absence[1, s, p] == 2.5
+        assert matrix.has_subject[1, s] and matrix.has_period[1, s, p]
+
+        bulletins[0].get_matiere("Maths").ensure_periode("T1").moyenne = 3.0
+        matrix.refresh_student(0)
+        assert matrix.moyennes[0, matrix.subject_index("Maths"), 0] == 3.0
+
+    def test_export_round_trip(self):
+        bulletins = _random_class(4, students=10)
+        before = [b.to_dict() for b in bulletins]
+        matrix = ClassMatrix.from_bulletins(bulletins)
+        matrix.export_to_bulletins()
+        assert [b.to_dict() for b in bulletins] == before
+
+        copies = bulletins_from_dicts(before)
+        matrix.moyennes[0] = 10.0
+        matrix.export_to_bulletins(copies)
+        for appreciation in copies[0].matieres.values():
+            assert all(p.moyenne == 10.0 for p in appreciation.periodes.values())
+
+    def test_evolution(self):
+        bulletin = Bulletin(eleve=Eleve(nom="DUPONT", prenom="Alice"))
+        appreciation = AppreciationMatiere(matiere="Maths")
+        appreciation.ensure_periode("T1").moyenne = 12.0
+        appreciation.ensure_periode("T2")
+        appreciation.ensure_periode("T3").moyenne = 13.5
+        bulletin.add_matiere(appreciation)
+        matrix = ClassMatrix.from_bulletins([bulletin])
+
+        assert matrix.evolution(0, "Maths") == pytest.approx(1.5)
+        assert matrix.evolution(0, "Maths", ["T1", "T2"]) is None
+        assert matrix.evolution(0, "Anglais") is None
+
+
+class TestCompactModels:
+    """Instances sans __dict__ et copies explicites `clone()`."""
+
+    def test_no_instance_dict(self):
+        bulletin = _random_class(6, students=1)[0]
+        appreciation = next(iter(bulletin.matieres.values()))
+        for obj in (bulletin, appreciation):
+            assert not hasattr(obj, "__dict__")
+            with pytest.raises(AttributeError):
+                obj.attribut_inconnu = 1
+        if sys.version_info >= (3, 10):
+            assert not hasattr(bulletin.eleve, "__dict__")
+            assert not hasattr(next(iter(appreciation.periodes.values())), "__dict__")
+
+    def test_clone_matches_deepcopy_and_is_independent(self):
+        for bulletin in _random_class(7, students=5):
+            bulletin.appreciation_generale_s1 = "Bien"
+            clone = bulletin.clone()
+            assert clone.to_dict() == copy.deepcopy(bulletin).to_dict() == bulletin.to_dict()
+            assert clone.eleve == bulletin.eleve and clone.eleve is not bulletin.eleve
+
+            clone.appreciation_generale_s1 = "Modifié"
+            for nom, appreciation in clone.matieres.items():
+                assert appreciation is not bulletin.matieres[nom]
+                for code, periode in appreciation.periodes.items():
+                    assert periode == bulletin.matieres[nom].periodes[code]
+                    periode.moyenne = -1.0
+                appreciation.periodes.clear()
+            assert bulletin.appreciation_generale_s1 == "Bien"
+            assert all(app.periodes for app in bulletin.matieres.values())
+
+    def test_legacy_properties_and_pickle(self):
+        appreciation = AppreciationMatiere(matiere="Maths", moyenne_s1=12.0, appreciation_s2="Ok")
+        clone = appreciation.clone()
+        assert (clone.moyenne_s1, clone.appreciation_s2, clone.moyenne_s2) == (12.0, "Ok", None)
+        bulletin = Bulletin(eleve=Eleve(nom="DUPONT", prenom="Alice"), appreciation_generale_s2="Bien")
+        bulletin.add_matiere(appreciation)
+        restored = pickle.loads(pickle.dumps(bulletin))
+        assert restored.to_dict() == bulletin.to_dict()
+
+
+class TestLazyBulletin:
+    """Matières construites au premier accès, à l'identique de `from_dict`."""
+
+    def test_same_as_from_dict(self):
+        for bulletin in _random_class(8, students=10):
+            bulletin.appreciation_generale_s1 = "Bien"
+            bulletin.matieres.setdefault("Maths", AppreciationMatiere("Maths")).ensure_periode("T2").moyenne = "12,5"
+            data = bulletin.to_dict()
+            lazy = LazyBulletin.from_dict(data)
+            eager = Bulletin.from_dict(data)
+            assert lazy.period_codes() == eager.period_codes()
+            assert not lazy.is_materialized
+            assert lazy.to_dict() == eager.to_dict()
+            assert lazy.is_materialized
+            assert lazy.appreciation_generale_s1 == "Bien"
+            assert lazy.clone().to_dict() == eager.to_dict()
+
+    def test_raw_dict_is_not_modified(self):
+        data = {"Nom": "DUPONT", "Prenom": "Alice",
+                "Matieres": {"Maths": {"MoyenneS1": "12,5", "HeuresAbsenceS1": "3", "Inconnu": 1}}}
+        lazy = LazyBulletin(data)
+        assert lazy.get_matiere("Maths").moyenne_s1 == 12.5
+        lazy.get_matiere("Maths").moyenne_s1 = 15.0
+        lazy.add_matiere(AppreciationMatiere("SVT", moyenne_s2=10.0))
+        assert data["Matieres"] == {"Maths": {"MoyenneS1": "12,5", "HeuresAbsenceS1": "3", "Inconnu": 1}}
+        assert lazy.to_dict()["Matieres"]["Maths"]["MoyenneS1"] == 15.0
+        assert lazy.period_codes() == {"S1", "S2"}
+
+    def test_compact_copy_and_pickle(self):
+        data = _random_class(9, students=1)[0].to_dict()
+        lazy = LazyBulletin(data)
+        assert not hasattr(lazy, "__dict__")
+        assert copy.deepcopy(lazy).to_dict() == pickle.loads(pickle.dumps(lazy)).to_dict() == data
+        lazy.matieres = {}
+        assert lazy.to_dict() == {"Nom": data["Nom"], "Prenom": data["Prenom"]}
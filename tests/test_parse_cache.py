@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le cache disque des fichiers source (parse_cache).
+"""
+
+import os
+import pickle
+import tempfile
+
+from src.services import json_backend
+from src.services.file_reader import read_csv_matiere
+from src.services.main_processor import process_directory_to_json
+from src.services.parse_cache import ParseCache, CACHE_DIRNAME, file_fingerprint
+
+
+def _write(path, content):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+class TestParseCache:
+    def test_hit_after_first_read(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "Maths.csv")
+            _write(path, "Élève;Moy. T1\nDUPONT Alice;12\n")
+            cache = ParseCache.for_directory(tmp)
+
+            first = read_csv_matiere(path, "Maths", cache=cache)
+            second = read_csv_matiere(path, "Maths", cache=cache)
+
+            assert first == second == read_csv_matiere(path, "Maths")
+            assert cache.stats() == {'hits': 1, 'misses': 1}
+
+    def test_content_change_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "Maths.csv")
+            _write(path, "Élève;Moy. T1\nDUPONT Alice;12\n")
+            cache = ParseCache.for_directory(tmp)
+            read_csv_matiere(path, "Maths", cache=cache)
+
+            _write(path, "Élève;Moy. T1\nDUPONT Alice;15\n")
+            records = read_csv_matiere(path, "Maths", cache=cache)
+
+            assert records[0]['Moy. T1'] == 15
+            assert cache.stats() == {'hits': 0, 'misses': 2}
+
+    def test_variant_is_part_of_the_key(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "Maths.csv")
+            _write(path, "Élève;Moy. T1\nDUPONT Alice;12\n")
+            cache = ParseCache.for_directory(tmp)
+            read_csv_matiere(path, "Maths", cache=cache)
+            records = read_csv_matiere(path, "Mathématiques", cache=cache)
+            assert records[0]['matiere'] == "Mathématiques"
+            assert cache.stats()['misses'] == 2
+
+    def test_invalidate_and_eviction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for i in range(4):
+                path = os.path.join(tmp, f"M{i}.csv")
+                _write(path, f"Élève;Moy. T1\nDUPONT Alice;{i}\n")
+                paths.append(path)
+            cache = ParseCache.for_directory(tmp, max_entries=3)
+            for i, path in enumerate(paths):
+                read_csv_matiere(path, f"M{i}", cache=cache)
+            cache_dir = os.path.join(tmp, CACHE_DIRNAME)
+            assert len(os.listdir(cache_dir)) == 3
+
+            assert cache.invalidate(paths[-1]) == 1
+            assert len(os.listdir(cache_dir)) == 2
+            assert cache.clear() == 2
+
+    def test_entries_are_json_and_pickles_are_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "Maths.csv")
+            _write(path, "Élève;Moy. T1\nDUPONT Alice;12\n")
+            cache = ParseCache.for_directory(tmp)
+            expected = read_csv_matiere(path, "Maths", cache=cache)
+            [name] = os.listdir(os.path.join(tmp, CACHE_DIRNAME))
+            entry_path = os.path.join(tmp, CACHE_DIRNAME, name)
+            assert json_backend.load(entry_path)['payload'][0] == expected
+
+            # Un pickle déposé à la place de l'entrée n'est jamais désérialisé
+            with open(entry_path, "wb") as f:
+                pickle.dump({'version': 3}, f)
+            assert read_csv_matiere(path, "Maths", cache=cache) == expected
+            assert cache.stats() == {'hits': 0, 'misses': 2}
+
+    def test_results_not_restored_identically_are_not_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "f.csv")
+            _write(path, "abc")
+            cache = ParseCache.for_directory(tmp)
+            payload = ("tuple", None)
+            assert cache.get_or_parse(path, "test", lambda: payload) is payload
+            assert not os.path.exists(os.path.join(tmp, CACHE_DIRNAME))
+
+    def test_file_fingerprint(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "f.csv")
+            _write(path, "abc")
+            fingerprint = file_fingerprint(path)
+            assert fingerprint['size'] == 3
+            assert fingerprint['sha256'].startswith("ba7816bf")
+
+    def test_process_directory_reports_counters(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = make_class_directory(os.path.join(tmp, "classe"))
+            output = os.path.join(tmp, "out.json")
+
+            first = process_directory_to_json(source, output, use_cache=True)
+            second = process_directory_to_json(source, output, use_cache=True)
+            disabled = process_directory_to_json(source, output)
+
+            # source.xlsx + 3 CSV
+            assert (first['cache_hits'], first['cache_misses']) == (0, 4)
+            assert (second['cache_hits'], second['cache_misses']) == (4, 0)
+            assert (disabled['cache_hits'], disabled['cache_misses']) == (0, 0)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires du cache mémoire des JSON de bulletins analysés.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from src.services import json_backend
+from src.services.json_generator import load_bulletins_from_json, save_output_json
+from src.services.payload_cache import PAYLOADS, PayloadCache
+from src.services.period_history import (
+    load_history_bulletins, period_code_of_file, read_metadata, read_payload,
+    resolve_period_links, update_file_metadata,
+)
+
+
+def _period_file(directory, code, moyenne=12.0, name=None):
+    path = os.path.join(directory, name or f"output_{code}.json")
+    json_backend.dump([
+        {"_metadata": {"semester": code}},
+        {"Nom": "DUPONT", "Prenom": "Alice", "Matieres": {"Maths": {f"Moyenne{code}": moyenne}}},
+    ], path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    PAYLOADS.clear()
+    yield
+    PAYLOADS.clear()
+
+
+class TestPayloadCache:
+    """Réutilisation, invalidation et éviction."""
+
+    def test_load_hits_until_file_changes(self):
+        cache = PayloadCache()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = _period_file(temp_dir, "T1")
+            first = cache.load(path)
+            assert cache.load(path) is first
+            assert cache.stats() == {'hits': 1, 'misses': 1, 'entries': 1}
+
+            _period_file(temp_dir, "T1", moyenne=15.25)
+            assert cache.load(path)[1]["Matieres"]["Maths"]["MoyenneT1"] == 15.25
+            assert cache.stats()['misses'] == 2
+
+    def test_explicit_invalidation(self):
+        cache = PayloadCache()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = _period_file(temp_dir, "T1")
+            cache.load(path)
+            cache.invalidate(path)
+            cache.load(path)
+            assert cache.stats()['misses'] == 2
+
+    def test_derived_values(self):
+        cache = PayloadCache()
+        calls = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = _period_file(temp_dir, "T1")
+
+            def compute():
+                calls.append(1)
+                return "T1"
+
+            assert cache.derived(path, "code", compute) == "T1"
+            assert cache.derived(path, "code", compute) == "T1"
+            assert cache.derived(path, ("code", "autre"), compute) == "T1"
+            assert len(calls) == 2
+
+    def test_lru_eviction(self):
+        cache = PayloadCache(max_entries=2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [_period_file(temp_dir, code) for code in ("T1", "T2", "T3")]
+            for path in paths:
+                cache.load(path)
+            cache.load(paths[2])
+            assert cache.stats()['entries'] == 2
+            cache.load(paths[0])
+            assert cache.stats() == {'hits': 1, 'misses': 4, 'entries': 2}
+
+    def test_large_files_are_not_kept(self):
+        cache = PayloadCache(max_bytes=10)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = _period_file(temp_dir, "T1")
+            cache.load(path)
+            assert cache.stats()['entries'] == 0
+
+    def test_missing_file_raises(self):
+        with pytest.raises(OSError):
+            PayloadCache().load("/nonexistent/output_T1.json")
+
+
+class TestPeriodHistoryCache:
+    """Lectures des fichiers de périodes via le cache partagé."""
+
+    def test_resolution_reuses_parsed_siblings(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            current = _period_file(temp_dir, "T3")
+            siblings = {code: _period_file(temp_dir, code) for code in ("T1", "T2")}
+            links = resolve_period_links(current, {}, "T3")
+            assert links == siblings
+            assert set(load_history_bulletins(links)) == {"T1", "T2"}
+            misses = PAYLOADS.stats()['misses']
+
+            assert resolve_period_links(current, {}, "T3") == links
+            assert set(load_history_bulletins(links)) == {"T1", "T2"}
+            # Ni redécouverte ni rechargement de l'historique ne relisent les fichiers
+            assert PAYLOADS.stats()['misses'] == misses
+
+    def test_metadata_copies_are_independent(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = _period_file(temp_dir, "T1")
+            metadata, _data = read_payload(path)
+            metadata["semester"] = "T2"
+            assert read_payload(path)[0]["semester"] == "T1"
+
+    def test_own_writes_invalidate(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = _period_file(temp_dir, "T1", name="output.json")
+            assert period_code_of_file(path) == "T1"
+
+            update_file_metadata(path, {"semester": "T2"})
+            assert period_code_of_file(path) == "T2"
+            assert read_metadata(path) == {"semester": "T2"}
+
+            bulletins = load_bulletins_from_json(path)
+            save_output_json(bulletins, path, metadata={"semester": "T3"})
+            assert period_code_of_file(path) == "T3"
@@ -10,7 +10,7 @@ from pathlib import Path
 
 import pytest
 
-from src.models.bulletin import Bulletin, Eleve, AppreciationMatiere, PeriodeData
+from src.models.bulletin import Bulletin, Eleve, AppreciationMatiere, LazyBulletin, PeriodeData
 from src.services.json_generator import save_output_json
 from src.utils.semester import Period
 from src.services.period_history import (
@@ -29,6 +29,9 @@ from src.services.period_history import (
     build_display_bulletins,
     normalize_linked_bulletins,
     remap_bulletins_period_code,
+    merge_periods_into_bulletins,
+    normalize_trimestre_general_appreciations,
+    BulletinOverlay,
 )
 
 
@@ -356,6 +359,102 @@ class TestLinkedPeriodNormalization:
             assert maths.get_periode("T1") is None
             assert maths.get_periode("T3").moyenne == 14.0
 
+    def test_display_period_codes_without_materializing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cur = os.path.join(tmp, "output_T3.json")
+            other = os.path.join(tmp, "output_T1.json")
+            _write_period_file(cur, "T3", [
+                ("DUPONT", "Alice", {"Maths": PeriodeData(moyenne=14.0)}),
+            ])
+            other_b = _make_bulletin("DUPONT", "Alice", "S1", {"SVT": PeriodeData(moyenne=5.0)})
+            other_b.matieres["SVT"].periodes["T3"] = PeriodeData(moyenne=99.0)
+            save_output_json([other_b], other, metadata={"current_period": "S1"})
+
+            _meta, data = read_payload(cur)
+            current = [LazyBulletin(d) for d in data]
+            history = load_history_bulletins({"T1": other})
+            display = build_display_bulletins(current, history, "T3")
+
+            assert display[0].period_codes() == {"T1", "T3"}
+            assert not current[0].is_materialized
+            # Fichier S1 lié en T1 : vue de renommage sur le bulletin paresseux
+            source, _code_map = history["T1"][0]._layers[0]
+            assert not source.is_materialized
+            merged = {code for app in display[0].matieres.values() for code in app.periodes}
+            assert merged == {"T1", "T3"}
+
+
+
+def _overlay_sources():
+    """Bulletins courants (T3) et lies (T1, T2 en S2) avec des variantes de libelles."""
+    current = [
+        _make_bulletin("DUPONT", "Alice", "T3", {
+            "AnglaisLV1": PeriodeData(moyenne=14.0), "Maths": PeriodeData(moyenne=12.0),
+        }),
+        _make_bulletin("MARTIN", "Paul", "T3", {"Maths": PeriodeData(moyenne=9.0)}),
+    ]
+    current[0].set_appreciation_generale("T3", "Bon trimestre")
+    current[0].set_appreciation_generale("S1", "Ancien S1")
+    t1 = [
+        _make_bulletin("DUPONT", "Alice", "T1", {
+            "Anglais LV1": PeriodeData(moyenne=11.0), "EPS": PeriodeData(moyenne=15.0),
+        }),
+        _make_bulletin("INCONNU", "Jean", "T1", {"Maths": PeriodeData(moyenne=3.0)}),
+    ]
+    t1[0].matieres["EPS"].periodes["T3"] = PeriodeData(moyenne=99.0)
+    t1[0].set_appreciation_generale("T1", "Premier trimestre")
+    t2 = [_make_bulletin("DUPONT", "Alice", "S2", {"Maths": PeriodeData(moyenne=10.0)})]
+    t2[0].set_appreciation_generale("S2", "Second")
+    return current, {"T1": t1, "T2": remap_bulletins_period_code(t2, "S2", "T2")}
+
+
+class TestDisplayOverlay:
+    """Vue fusionnee sans copie des bulletins courants et lies."""
+
+    def test_matches_in_place_merge(self):
+        current, history = _overlay_sources()
+        expected = [b.clone() for b in current]
+        for others in history.values():
+            merge_periods_into_bulletins(expected, others, "T3")
+        for bulletin in expected:
+            normalize_trimestre_general_appreciations(bulletin)
+
+        display = build_display_bulletins(current, history, "T3")
+
+        assert [b.to_dict() for b in display] == [b.to_dict() for b in expected]
+        assert display[0].get_appreciation_generale("T1") == "Premier trimestre"
+        assert display[0].get_matiere("EPS").get_periode("T3") is None
+
+    def test_periods_are_shared_not_copied(self):
+        current, history = _overlay_sources()
+        display = build_display_bulletins(current, history, "T3")
+        maths = display[0].get_matiere("Maths")
+
+        assert isinstance(display[0], BulletinOverlay)
+        assert maths.get_periode("T3") is current[0].get_matiere("Maths").get_periode("T3")
+        assert maths.get_periode("T2") is history["T2"][0].get_matiere("Maths").get_periode("T2")
+        assert "S2" not in history["T2"][0].get_matiere("Maths").periodes
+
+    def test_copy_on_write(self):
+        current, history = _overlay_sources()
+        source_t2 = history["T2"][0].get_matiere("Maths").get_periode("T2")
+        display = build_display_bulletins(current, history, "T3")
+        maths = display[0].get_matiere("Maths")
+
+        maths.ensure_periode("T2").moyenne = 0.0
+        maths.ensure_periode("T3").appreciation = "Modifiee"
+        display[0].set_appreciation_generale("T3", "Autre")
+
+        assert maths.get_periode("T2").moyenne == 0.0
+        assert source_t2.moyenne == 10.0
+        assert current[0].get_matiere("Maths").get_periode("T3").appreciation is None
+        assert current[0].get_appreciation_generale("T3") == "Bon trimestre"
+        assert current[0].get_appreciation_generale("S1") == "Ancien S1"
+
+        clone = display[0].clone()
+        assert type(clone) is Bulletin
+        assert clone.to_dict() == display[0].to_dict()
+
 
 EXEMPLES_DIR = Path("exemples")
 HAS_EXAMPLES = (EXEMPLES_DIR / "source.xlsx").exists() and any(EXEMPLES_DIR.glob("*.csv"))
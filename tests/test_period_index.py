@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires de la lecture du bloc `_metadata` de tête et de l'index des
+périodes d'un dossier.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from src.services import json_backend, period_history
+from src.services.main_processor import process_directory_to_json
+from src.services.payload_cache import PAYLOADS
+from src.services.period_history import (
+    discover_sibling_period_files, period_code_of_file, read_metadata, update_file_metadata,
+)
+from src.services.period_index import INDEX_FILENAME, PeriodIndex, sniff_metadata
+
+
+def _write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def _period_file(directory, name, metadata=None, moyenne_key="MoyenneT1"):
+    items = [{"_metadata": metadata}] if metadata is not None else []
+    items.append({"Nom": "DUPONT", "Prenom": "Alice", "Matieres": {"Maths": {moyenne_key: 12.0}}})
+    path = os.path.join(directory, name)
+    json_backend.dump(items, path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    PAYLOADS.clear()
+    yield
+    PAYLOADS.clear()
+
+
+class TestSniffMetadata:
+    """Lecture du seul premier élément du tableau."""
+
+    def test_stops_after_metadata(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # La suite du fichier n'est pas du JSON valide : elle n'est pas lue
+            path = _write(os.path.join(temp_dir, "a.json"),
+                          '[\n  {"_metadata": {"semester": "T2", "note": "a } \\" ]"}},\n  {"Nom": ')
+            assert sniff_metadata(path) == (True, {"semester": "T2", "note": 'a } " ]'})
+
+    def test_metadata_larger_than_a_chunk(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            metadata = {"semester": "T1", "notes": ['\\"{' * 20000, "é" * 50000]}
+            path = os.path.join(temp_dir, "a.json")
+            json_backend.dump([{"_metadata": metadata}, {"Nom": "DUPONT"}], path)
+            assert sniff_metadata(path) == (True, metadata)
+
+    def test_without_metadata(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bulletins = _period_file(temp_dir, "a.json")
+            empty = _write(os.path.join(temp_dir, "b.json"), "[ ]")
+            other = _write(os.path.join(temp_dir, "c.json"), '{"_metadata": {"semester": "T1"}}')
+            assert sniff_metadata(bulletins) == (True, None)
+            assert sniff_metadata(empty) == (True, None)
+            assert sniff_metadata(other) == (False, None)
+            assert sniff_metadata(os.path.join(temp_dir, "absent.json")) == (False, None)
+
+    def test_truncated_metadata_falls_back_to_full_read(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = _write(os.path.join(temp_dir, "a.json"), '[{"_metadata": {"semester": "T')
+            assert sniff_metadata(path) == (False, None)
+
+    def test_matches_full_read(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "output_T2.json")
+            process_directory_to_json(make_class_directory(temp_dir), path)
+            with open(path, encoding="utf-8") as f:
+                expected = json.load(f)[0]["_metadata"]
+            assert sniff_metadata(path) == (True, expected)
+            assert read_metadata(path) == expected
+
+
+class TestPeriodDetection:
+    """Détection du code de période sans lire les bulletins."""
+
+    def test_metadata_read_without_bulletins(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = _period_file(temp_dir, "export.json", {"semester": "T2"})
+            monkeypatch.setattr(period_history, "read_payload", pytest.fail)
+            assert period_code_of_file(path) == "T2"
+
+    def test_content_inference_when_metadata_missing(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = _period_file(temp_dir, "export.json", moyenne_key="MoyenneT3")
+            assert period_code_of_file(path) == "T3"
+
+    def test_unrelated_json_is_not_parsed(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            current = _period_file(temp_dir, "output_T3.json", {"semester": "T3"})
+            sibling = _period_file(temp_dir, "output_T1.json", {"semester": "T1"})
+            _write(os.path.join(temp_dir, "config.json"), json.dumps({"items": list(range(1000))}))
+            monkeypatch.setattr(period_history, "read_payload", pytest.fail)
+            assert discover_sibling_period_files(current, "T3") == {"T1": sibling}
+
+    def test_non_utf8_json_is_skipped(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            current = _period_file(temp_dir, "output_T3.json", {"semester": "T3"})
+            sibling = _period_file(temp_dir, "output_T1.json", {"semester": "T1"})
+            binary = os.path.join(temp_dir, "export.json")
+            with open(binary, "wb") as f:
+                f.write(b'[{"_metadata": {"semester": "T2\xff"}}]')
+            assert sniff_metadata(binary) == (False, None)
+            assert discover_sibling_period_files(current, "T3") == {"T1": sibling}
+
+
+class TestPeriodIndex:
+    """Index persistant `.pyconseil-periods.idx`."""
+
+    def _discover(self, current):
+        PAYLOADS.clear()
+        return discover_sibling_period_files(current, "T3")
+
+    def test_unchanged_files_are_not_reopened(self, monkeypatch):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            current = _period_file(temp_dir, "output_T3.json", {"semester": "T3"})
+            sibling = _period_file(temp_dir, "export.json", {"semester": "T1"})
+            assert self._discover(current) == {"T1": sibling}
+            assert os.path.exists(os.path.join(temp_dir, INDEX_FILENAME))
+
+            monkeypatch.setattr(period_history, "sniff_metadata", pytest.fail)
+            assert self._discover(current) == {"T1": sibling}
+
+    def test_changed_files_are_detected_again(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            current = _period_file(temp_dir, "output_T3.json", {"semester": "T3"})
+            sibling = _period_file(temp_dir, "export.json", {"semester": "T1"})
+            assert self._discover(current) == {"T1": sibling}
+
+            _period_file(temp_dir, "export.json", {"semester": "T2", "note": "réécrit"})
+            assert self._discover(current) == {"T2": sibling}
+
+            update_file_metadata(sibling, {"semester": "T1"})
+            assert self._discover(current) == {"T1": sibling}
+
+    def test_hits_and_removed_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [_period_file(temp_dir, f"export{i}.json", {"semester": "T1"}) for i in range(3)]
+            index = PeriodIndex(temp_dir)
+            for path in paths:
+                index.period_code(path, period_code_of_file)
+            index.save()
+
+            os.remove(paths[0])
+            index = PeriodIndex(temp_dir)
+            assert [index.period_code(p, pytest.fail) for p in paths[1:]] == ["T1", "T1"]
+            assert (index.hits, index.misses) == (2, 0)
+            index.period_code(_period_file(temp_dir, "export3.json", {"semester": "T2"}), period_code_of_file)
+            index.save()
+            files = json_backend.load(os.path.join(temp_dir, INDEX_FILENAME))["files"]
+            assert sorted(files) == ["export1.json", "export2.json", "export3.json"]
+
+    def test_moved_directory_ignores_index(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = os.path.join(temp_dir, "T1")
+            os.mkdir(source)
+            path = _period_file(source, "export.json")
+            index = PeriodIndex(source)
+            assert index.period_code(path, period_code_of_file) == "T1"
+            index.save()
+
+            moved = shutil.move(source, os.path.join(temp_dir, "T2"))
+            index = PeriodIndex(moved)
+            assert index.period_code(os.path.join(moved, "export.json"), period_code_of_file) == "T2"
+
+    def test_invalid_index_is_ignored(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            current = _period_file(temp_dir, "output_T3.json", {"semester": "T3"})
+            sibling = _period_file(temp_dir, "export.json", {"semester": "T1"})
+            _write(os.path.join(temp_dir, INDEX_FILENAME), "{pas du json")
+            assert self._discover(current) == {"T1": sibling}
@@ -21,23 +21,24 @@ EXAMPLES_REASON = "Données d'exemple non disponibles dans le dépôt local"
 from src.services.file_reader import (
     read_source_xlsx, read_csv_matiere, get_csv_files_in_directory,
     extract_matiere_name_from_filename, validate_source_directory,
-    FileReaderError
+    read_csv_headers, count_source_xlsx_rows, FileReaderError
 )
 from src.services.bulletin_processor import (
     create_bulletins_from_source, populate_bulletins_from_csv,
-    calculate_min_max_moyennes, validate_bulletins_consistency,
+    calculate_min_max_moyennes, compute_class_statistics, validate_bulletins_consistency,
     parse_rappel_s1, BulletinProcessorError
 )
 from src.services.json_generator import (
     bulletins_to_json, save_output_json, load_bulletins_from_json,
-    get_all_matieres, JsonGeneratorError
+    load_output_json, get_all_matieres, generate_summary_stats, JsonGeneratorError
 )
 from src.services.main_processor import (
-    process_directory_to_json, get_processing_summary,
-    MainProcessorError
+    process_directory_to_json, process_directory, process_single_bulletin, ClassPipeline,
+    get_processing_summary, sniff_directory_period, MainProcessorError
 )
 from src.models.bulletin import Eleve, AppreciationMatiere, Bulletin
-from src.utils.semester import Semester, infer_semester_from_bulletins_data
+from src.utils.semester import Period, Semester, infer_semester_from_bulletins_data
+
 
 
 @pytest.mark.skipif(not HAS_FULL_EXAMPLES, reason=EXAMPLES_REASON)
@@ -224,6 +225,59 @@ class TestBulletinProcessor:
             assert appreciation.moyenne_s2_min == 11.0
             assert appreciation.moyenne_s2_max == 18.0
     
+    def test_calculate_min_max_moyennes_subset_and_missing(self):
+        """Min/max posés sur toute période présente, même sans moyenne."""
+        bulletins = []
+        for nom, moyenne in (("A", 9.0), ("B", None), ("C", 15.0)):
+            bulletin = Bulletin(eleve=Eleve(nom=nom, prenom="X"))
+            for matiere in ("Maths", "Anglais"):
+                appreciation = AppreciationMatiere(matiere=matiere)
+                appreciation.ensure_periode("T2").moyenne = moyenne
+                bulletin.add_matiere(appreciation)
+            bulletins.append(bulletin)
+        
+        calculate_min_max_moyennes(bulletins, matieres=["Maths"])
+        
+        for bulletin in bulletins:
+            maths = bulletin.get_matiere("Maths").get_periode("T2")
+            assert (maths.moyenne_min, maths.moyenne_max) == (9.0, 15.0)
+            assert bulletin.get_matiere("Anglais").get_periode("T2").moyenne_min is None
+    
+    def test_compute_class_statistics(self):
+        """Statistiques de classe et rangs ex aequo, une entrée par (matière, période)."""
+        bulletins = []
+        for nom, moyenne in (("A", 12.0), ("B", 16.0), ("C", 12.0), ("D", None), ("E", 8.0)):
+            bulletin = Bulletin(eleve=Eleve(nom=nom, prenom="X"))
+            appreciation = AppreciationMatiere(matiere="Maths")
+            appreciation.ensure_periode("T1").moyenne = moyenne
+            bulletin.add_matiere(appreciation)
+            bulletins.append(bulletin)
+        
+        stats = compute_class_statistics(bulletins)
+        
+        assert stats['matieres'] == {'Maths': {'T1': {
+            'count': 4, 'min': 8.0, 'max': 16.0, 'mean': 12.0, 'median': 12.0,
+            'std': pytest.approx(8.0 ** 0.5), 'q1': 11.0, 'q3': 13.0,
+        }}}
+        assert stats['rangs'] == {'Maths': {'T1': {'A X': 2, 'B X': 1, 'C X': 2, 'E X': 4}}}
+        assert json.loads(json.dumps(stats)) == stats
+    
+    def test_compute_class_statistics_homonyms(self):
+        """Deux « DUPONT Jean » : un rang chacun, dans l'ordre des bulletins."""
+        bulletins = []
+        for nom, moyenne in (("DUPONT", 9.0), ("MARTIN", 12.0), ("DUPONT", 15.0)):
+            bulletin = Bulletin(eleve=Eleve(nom=nom, prenom="Jean"))
+            appreciation = AppreciationMatiere(matiere="Maths")
+            appreciation.ensure_periode("T1").moyenne = moyenne
+            bulletin.add_matiere(appreciation)
+            bulletins.append(bulletin)
+        
+        stats = compute_class_statistics(bulletins)
+        
+        assert stats['rangs'] == {'Maths': {'T1': {
+            'DUPONT Jean': 3, 'MARTIN Jean': 2, 'DUPONT Jean (2)': 1,
+        }}}
+    
     def test_validate_bulletins_consistency(self):
         """Test la validation de cohérence des bulletins."""
         eleve = Eleve(nom="TEST", prenom="Test")
@@ -312,6 +366,28 @@ class TestJsonGenerator:
         matieres = get_all_matieres(bulletins)
         
         assert sorted(matieres) == ["Anglais", "Français", "Histoire", "Math"]
+    
+    def test_generate_summary_stats(self):
+        """Statistiques par matière et par période présente."""
+        bulletins = []
+        for nom, moyennes in (("A", (12.0, None)), ("B", (14.0, 10.0)), ("C", (None, None))):
+            bulletin = Bulletin(eleve=Eleve(nom=nom, prenom="X"), appreciation_generale_s1="Ok")
+            appreciation = AppreciationMatiere(matiere="Math", moyenne_s1=moyennes[0],
+                                               moyenne_s2=moyennes[1])
+            bulletin.add_matiere(appreciation)
+            bulletins.append(bulletin)
+        bulletins[2].add_matiere(AppreciationMatiere(matiere="Anglais"))
+        
+        stats = generate_summary_stats(bulletins)
+        
+        assert stats['total_bulletins'] == 3
+        assert stats['matieres_list'] == ["Anglais", "Math"]
+        assert stats['appreciation_generale_counts'] == {"S1": 3}
+        assert stats['matieres_stats']['Anglais'] == {'bulletins_count': 1, 'periodes': {}}
+        assert stats['matieres_stats']['Math'] == {
+            'bulletins_count': 3,
+            'periodes': {'S1': {'count': 2, 'avg': 13.0}, 'S2': {'count': 1, 'avg': 10.0}},
+        }
 
 
 @pytest.mark.skipif(not HAS_FULL_EXAMPLES, reason=EXAMPLES_REASON)
@@ -353,6 +429,264 @@ class TestMainProcessor:
             assert all('Nom' in item and 'Prenom' in item for item in bulletins_data)
 
 
+class TestParallelIngest:
+    """Lecture parallèle des CSV matières."""
+
+    def test_parallel_output_identical_to_serial(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(
+                os.path.join(temp_dir, "classe"),
+                subjects=[f"Matiere{i}" for i in range(12)]
+            )
+            serial_path = os.path.join(temp_dir, "serial.json")
+            parallel_path = os.path.join(temp_dir, "parallel.json")
+
+            serial = process_directory_to_json(source, serial_path, max_workers=1)
+            parallel = process_directory_to_json(source, parallel_path, max_workers=6)
+
+            assert serial['period'] == parallel['period'] == "T2"
+            assert serial['matieres_count'] == parallel['matieres_count'] == 12
+            with open(serial_path, encoding='utf-8') as f:
+                serial_data = json.load(f)[1:]
+            with open(parallel_path, encoding='utf-8') as f:
+                parallel_data = json.load(f)[1:]
+            assert serial_data == parallel_data
+            # Ordre des matières = tri naturel des fichiers
+            assert list(parallel_data[0]['Matieres']) == [f"Matiere{i}" for i in range(12)]
+
+    def test_period_detected_from_first_non_empty_file(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(os.path.join(temp_dir, "classe"), code="T3")
+            # Premier fichier (tri naturel) vide : la période vient du suivant
+            with open(os.path.join(source, "Allemand.csv"), "w", encoding="utf-8") as f:
+                f.write("Élève;Moy. S1\n")
+            result = process_directory_to_json(
+                source, os.path.join(temp_dir, "out.json"), max_workers=4
+            )
+            assert result['period'] == "T3"
+
+    def test_unreadable_file_becomes_warning(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(os.path.join(temp_dir, "classe"))
+            with open(os.path.join(source, "Cassé.csv"), "w", encoding="utf-8") as f:
+                f.write("Nom;Moy. T2\nX;12\n")
+            result = process_directory_to_json(
+                source, os.path.join(temp_dir, "out.json"), max_workers=4
+            )
+            assert result['matieres_count'] == 3
+            assert any("Cassé" in w for w in result['warnings'])
+
+
+class TestHeaderSniffing:
+    """Détection de période et résumé sans lecture complète des fichiers."""
+
+    def test_read_csv_headers(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(temp_dir, subjects=("Maths",), code="T3")
+            headers, has_rows = read_csv_headers(os.path.join(source, "Maths.csv"))
+            assert headers == ["Élève", "Moy. T3", "H.Abs.", "Ret.", "App. A : Appréciations"]
+            assert has_rows
+
+            empty = os.path.join(temp_dir, "Vide.csv")
+            with open(empty, "w", encoding="utf-8") as f:
+                f.write("Élève;Moy. S1\n\n")
+            assert read_csv_headers(empty) == (["Élève", "Moy. S1"], False)
+
+    def test_count_source_xlsx_rows_matches_full_read(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(temp_dir)
+            xlsx = os.path.join(source, "source.xlsx")
+            assert count_source_xlsx_rows(xlsx) == len(read_source_xlsx(xlsx)) == 4
+
+    def test_sniffed_period_matches_full_detection(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(os.path.join(temp_dir, "classe"), code="T3")
+            # Fichiers ignorés par le traitement : vide, sans colonne 'Élève'
+            with open(os.path.join(source, "Allemand.csv"), "w", encoding="utf-8") as f:
+                f.write("Élève;Moy. S1\n")
+            with open(os.path.join(source, "Arts.csv"), "w", encoding="utf-8") as f:
+                f.write("Nom;Moy. S1\nX;12\n")
+
+            assert sniff_directory_period(source) == Period.T3
+            result = process_directory_to_json(source, os.path.join(temp_dir, "out.json"))
+            assert result['period'] == "T3"
+
+    def test_summary_uses_sniffing(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(temp_dir, code="T1")
+            summary = get_processing_summary(source)
+            assert summary['estimated_bulletins'] == 4
+            assert summary['detected_period'] == "T1"
+            assert summary['errors'] == []
+
+
+class TestInMemoryPipeline:
+    """Traitement en mémoire, sans aller-retour par un fichier JSON."""
+
+    def test_in_memory_matches_saved_json(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(os.path.join(temp_dir, "classe"))
+            result = process_directory(source)
+
+            assert os.listdir(temp_dir) == ["classe"]
+            assert result['success'] and result['periods'] == ["T2"]
+            assert result['metadata']['current_period'] == "T2"
+            assert "Maths" in result['metadata']['class_stats']['matieres']
+
+            output = os.path.join(temp_dir, "out.json")
+            saved = process_directory_to_json(source, output)
+            metadata, bulletins = load_output_json(output)
+            assert [b.to_dict() for b in result['bulletins']] == [b.to_dict() for b in bulletins]
+            assert saved['metadata']['class_stats'] == result['metadata']['class_stats']
+            assert metadata['class_stats'] == result['metadata']['class_stats']
+
+    def test_serial_and_parallel_are_interchangeable(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(temp_dir, subjects=[f"Matiere{i}" for i in range(8)])
+            serial = process_directory(source, max_workers=1)
+            parallel = process_directory(source, max_workers=4)
+
+            assert [b.to_dict() for b in serial['bulletins']] == [b.to_dict() for b in parallel['bulletins']]
+            assert serial['metadata']['class_stats'] == parallel['metadata']['class_stats']
+            assert serial['warnings'] == parallel['warnings']
+
+    def test_stages_can_be_composed(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(temp_dir, subjects=("Maths",))
+            previous = Bulletin(Eleve(nom="DUPONT", prenom="Alice"))
+            previous.add_matiere(AppreciationMatiere("Maths"))
+            previous.get_matiere("Maths").ensure_periode("T1").moyenne = 7.0
+
+            pipeline = ClassPipeline(source, validate_data=False)
+            pipeline.read().build().populate().merge_history([previous])
+            maths = pipeline.bulletins[0].get_matiere("Maths")
+            assert (maths.get_periode("T1").moyenne, maths.get_periode("T2").moyenne) == (7.0, 8.5)
+            assert maths.get_periode("T2").moyenne_min is None
+
+            result = pipeline.compute_stats().validate().finish()
+            assert result['periods'] == ["T1", "T2"]
+            assert maths.get_periode("T2").moyenne_min == 8.5
+            pipeline.save(os.path.join(temp_dir, "out.json"))
+            assert load_bulletins_from_json(os.path.join(temp_dir, "out.json"))[0].to_dict() == \
+                pipeline.bulletins[0].to_dict()
+
+    def test_single_bulletin_only_builds_that_student(self, make_class_directory, monkeypatch):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(temp_dir)
+            # source.xlsx lu en flux : pas de lecture complète du classeur
+            monkeypatch.setattr("src.services.main_processor.read_source_xlsx", pytest.fail)
+            result = process_directory(source, students=["martin  paul"], statistics=False)
+            assert [b.eleve.nom for b in result['bulletins']] == ["MARTIN"]
+            assert result['student_matching']['unmatched'] == {}
+
+            bulletin = process_single_bulletin(source, "MARTIN Paul")
+            assert bulletin.get_matiere("Maths").get_periode("T2").moyenne == 10.5
+            assert list(bulletin.matieres) == ["Anglais", "Francais", "Maths"]
+            with pytest.raises(MainProcessorError):
+                process_single_bulletin(source, "INCONNU Jean")
+
+
+class TestIncrementalProcessing:
+    """Mode incrémental : seules les matières modifiées sont refusionnées."""
+
+    def _hand_edit(self, output_path):
+        """Simule des retouches manuelles (matière Francais + appréciation générale)."""
+        with open(output_path, encoding='utf-8') as f:
+            data = json.load(f)
+        data[1]['Matieres']['Francais']['AppreciationT2'] = "Retouche manuelle"
+        data[1]['AppreciationGeneraleT2'] = "Synthèse générée par l'IA"
+        data[1]['Matieres']['Maths']['MoyenneT1'] = 9.0  # historique d'une autre période
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def test_only_changed_subject_is_refreshed(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(os.path.join(temp_dir, "classe"))
+            output = os.path.join(temp_dir, "output_T2.json")
+            process_directory_to_json(source, output)
+            self._hand_edit(output)
+
+            maths_path = os.path.join(source, "Maths.csv")
+            with open(maths_path, encoding='utf-8') as f:
+                content = f.read()
+            with open(maths_path, 'w', encoding='utf-8') as f:
+                f.write(content.replace("8,50", "19,50"))
+
+            result = process_directory_to_json(source, output, incremental=True)
+
+            assert result['incremental'] is True
+            assert result['matieres_mises_a_jour'] == ["Maths"]
+            assert result['matieres_count'] == 3
+            metadata, bulletins = load_output_json(output)
+            alice = bulletins[0]
+            assert alice.get_matiere("Francais").get_periode("T2").appreciation == "Retouche manuelle"
+            assert alice.get_appreciation_generale("T2") == "Synthèse générée par l'IA"
+            maths = alice.get_matiere("Maths")
+            assert maths.get_periode("T2").moyenne == 19.5
+            assert maths.get_periode("T2").moyenne_max == 19.5
+            assert maths.get_periode("T1").moyenne == 9.0
+            assert metadata['source_fingerprints']['matieres']['Maths']['size'] == os.path.getsize(maths_path)
+            maths_stats = metadata['class_stats']['matieres']['Maths']['T2']
+            assert (maths_stats['count'], maths_stats['max'], maths_stats['median']) == (4, 19.5, 13.5)
+            assert metadata['class_stats']['rangs']['Maths']['T2']['DUPONT Alice'] == 1
+
+    def test_unchanged_directory_refreshes_nothing(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(os.path.join(temp_dir, "classe"))
+            output = os.path.join(temp_dir, "output_T2.json")
+            process_directory_to_json(source, output)
+            self._hand_edit(output)
+
+            result = process_directory_to_json(source, output, incremental=True)
+
+            assert result['incremental'] is True
+            assert result['matieres_mises_a_jour'] == []
+            _metadata, bulletins = load_output_json(output)
+            assert bulletins[0].get_matiere("Francais").get_periode("T2").appreciation == "Retouche manuelle"
+
+    def test_source_change_falls_back_to_full_run(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(os.path.join(temp_dir, "classe"))
+            output = os.path.join(temp_dir, "output_T2.json")
+            process_directory_to_json(source, output)
+            self._hand_edit(output)
+            make_class_directory(source, students=[("DUPONT", "Alice"), ("NOUVEL", "Élève")])
+
+            result = process_directory_to_json(source, output, incremental=True)
+
+            assert result['incremental'] is False
+            assert any("source.xlsx modifié" in w for w in result['warnings'])
+            _metadata, bulletins = load_output_json(output)
+            assert len(bulletins) == 2
+
+    def test_fallback_does_not_repeat_warnings(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(os.path.join(temp_dir, "classe"))
+            output = os.path.join(temp_dir, "output_T2.json")
+            process_directory_to_json(source, output)
+            # Maths réexporté pour une autre période, avec une ligne mal formée
+            make_class_directory(source, subjects=("Maths",), code="T3")
+            maths_path = os.path.join(source, "Maths.csv")
+            with open(maths_path, encoding='utf-8') as f:
+                content = f.read()
+            with open(maths_path, 'w', encoding='utf-8') as f:
+                f.write(content.replace("Maths : appréciation de Paul", '"Elle a dit "bof" en classe."'))
+
+            result = process_directory_to_json(source, output, incremental=True)
+
+            assert result['incremental'] is False
+            repairs = [w for w in result['warnings'] if "mal formée" in w]
+            assert len(repairs) == 1
+
+    def test_without_existing_output_runs_full(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = make_class_directory(os.path.join(temp_dir, "classe"))
+            output = os.path.join(temp_dir, "output_T2.json")
+            result = process_directory_to_json(source, output, incremental=True)
+            assert result['incremental'] is False
+            assert result['warnings'] == []
+
+
 @pytest.mark.skipif(not HAS_FULL_EXAMPLES, reason=EXAMPLES_REASON)
 class TestIntegration:
     """Tests d'intégration end-to-end."""
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires de l'index d'identité des élèves (jointure CSV → bulletins).
+"""
+
+import os
+import random
+import tempfile
+import unicodedata
+
+from src.models.bulletin import Eleve, Bulletin
+from src.services.student_index import (
+    MATCH_AMBIGUOUS, MATCH_EXACT, MATCH_FUZZY, MATCH_NONE, MATCH_NORMALIZED,
+    StudentIndex, bounded_edit_distance, student_key,
+)
+
+
+def _levenshtein(a, b):
+    """Distance de Levenshtein complète (référence)."""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def _bulletins(*names):
+    bulletins = []
+    for name in names:
+        nom, prenom = name.split(" ", 1)
+        bulletins.append(Bulletin(eleve=Eleve(nom=nom, prenom=prenom)))
+    return bulletins
+
+
+class TestStudentKey:
+    """Clés normalisées."""
+
+    def test_variants_share_a_key(self):
+        decomposed = unicodedata.normalize("NFD", "DUPONT Hélène-Marie")
+        variants = [
+            "DUPONT Hélène-Marie", '"DUPONT  Hélène-Marie"', decomposed,
+            "Dupont Helene–Marie", "DUPONT Hélène Marie ",
+        ]
+        assert {student_key(v) for v in variants} == {"dupont helene marie"}
+        assert student_key("O’NEIL Sean") == student_key("O'NEIL Sean")
+        assert student_key(None) == ""
+
+    def test_bounded_edit_distance_matches_reference(self):
+        rng = random.Random(7)
+        for _ in range(3000):
+            a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+            b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+            bound = rng.randint(0, 3)
+            expected = _levenshtein(a, b)
+            assert bounded_edit_distance(a, b, bound) == (expected if expected <= bound else None)
+
+
+class TestStudentIndex:
+    """Recherches, repli approché et rapport."""
+
+    def test_match_statuses(self):
+        index = StudentIndex(_bulletins("DUPONT Alice", "MARTIN Paul", "Martin paul", "BERNARD Marie"))
+
+        assert index.match("DUPONT Alice")[1] == MATCH_EXACT
+        bulletin, status = index.match('"dupont  ALICE"')
+        assert (bulletin.eleve.prenom, status) == ("Alice", MATCH_NORMALIZED)
+        assert index.match("MARTIN  Paul")[1] == MATCH_AMBIGUOUS
+        assert index.match("MARTIN Paul")[1] == MATCH_EXACT
+        assert index.match("BERNARD Mari") == (None, MATCH_NONE)
+
+    def test_fuzzy_fallback(self):
+        index = StudentIndex(_bulletins("BERNARD Marie", "BERNARD Maria", "DUPONT Alice"), fuzzy=True)
+
+        bulletin, status = index.match("DUPONT Alcie")
+        assert (bulletin.eleve.prenom, status) == ("Alice", MATCH_FUZZY)
+        assert index.match("BERNARD Mari")[1] == MATCH_AMBIGUOUS
+        # Clé de bloc différente (première lettre) : pas de rapprochement
+        assert index.match("EUPONT Alice")[1] == MATCH_NONE
+
+    def test_report_and_shared_lookups(self):
+        bulletins = _bulletins("DUPONT Alice", "MARTIN Paul")
+        index = StudentIndex(bulletins, fuzzy=True)
+        for matiere in ("Maths", "Anglais"):
+            assert index.lookup("DUPONT  Alice", matiere) is bulletins[0]
+            assert index.lookup("MARTIN Pol", matiere) is bulletins[1]
+            assert index.lookup("INCONNU Jean", matiere) is None
+
+        assert len(index._resolved) == 3
+        assert index.report() == {
+            'unmatched': {'Anglais': ["INCONNU Jean"], 'Maths': ["INCONNU Jean"]},
+            'ambiguous': {},
+            'approximate': {"MARTIN Pol": "MARTIN Paul"},
+        }
+        assert index.warnings() == ["Élève rapproché approximativement: MARTIN Pol -> MARTIN Paul"]
+
+
+class TestCsvJoin:
+    """Jointure des CSV d'une classe avec des noms mal orthographiés."""
+
+    def test_variants_are_joined(self, make_class_directory):
+        from src.services.main_processor import process_directory_to_json
+
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = make_class_directory(tmp, subjects=("Maths",),
+                                             students=[("PETIT", "Léa"), ("DUPONT", "Alice")])
+            path = os.path.join(directory, "Maths.csv")
+            with open(path, encoding="utf-8") as f:
+                content = f.read()
+            content = content.replace("PETIT Léa", unicodedata.normalize("NFD", "PETIT  Léa"))
+            content += '"INCONNU Jean";12,00;0h00;0;Appréciation\n'
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+            result = process_directory_to_json(directory, os.path.join(tmp, "out.json"))
+
+            assert result['student_matching']['unmatched'] == {'Maths': ["INCONNU Jean"]}
+            assert "Élève absent de source.xlsx: INCONNU Jean (Maths)" in result['warnings']
+            from src.services.json_generator import load_bulletins_from_json
+            bulletins = load_bulletins_from_json(os.path.join(tmp, "out.json"))
+            assert bulletins[0].get_matiere("Maths").get_periode("T2").moyenne == 8.5
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires du registre des libellés de matières (clés canoniques, alias).
+"""
+
+import json
+import os
+import tempfile
+
+import pytest
+
+from src.models.bulletin import AppreciationMatiere, Bulletin, Eleve, PeriodeData
+from src.services.main_processor import merge_history_into_bulletins
+from src.services.period_history import merge_periods_into_bulletins
+from src.services.subject_registry import (
+    ALIAS_FILENAME, SubjectRegistry, SubjectRegistryError,
+    aliases_for_directory, load_aliases,
+)
+
+
+def _bulletin(code, **moyennes):
+    bulletin = Bulletin(Eleve(nom="DUPONT", prenom="Alice"))
+    for matiere, moyenne in moyennes.items():
+        bulletin.add_matiere(AppreciationMatiere(matiere, {code: PeriodeData(moyenne=moyenne)}))
+    return bulletin
+
+
+def _write_aliases(directory, aliases):
+    path = os.path.join(directory, ALIAS_FILENAME)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(aliases, f)
+    return path
+
+
+class TestSubjectRegistry:
+    """Clés, libellés de référence et résolution."""
+
+    def test_keys_and_labels(self):
+        registry = SubjectRegistry(["AnglaisLV1", "Education Physique Sportive"])
+
+        assert registry.key("Anglais LV1") == registry.key("anglais-lv1") == "anglaislv1"
+        assert registry.key("EPS") == "educationphysiquesportive"
+        assert registry.label("Anglais LV1") == "AnglaisLV1"
+        assert registry.label("EPS") == "Education Physique Sportive"
+        assert registry.register("Anglais  LV1") == "AnglaisLV1"
+        assert registry.label("Histoire") is None
+
+    def test_resolve_prefers_exact_then_first_equivalent(self):
+        registry = SubjectRegistry()
+        names = {"Anglais LV1": 1, "AnglaisLV1": 2}
+
+        assert registry.resolve("AnglaisLV1", names) == "AnglaisLV1"
+        assert registry.resolve("ANGLAIS-LV1", names) == "Anglais LV1"
+        assert registry.resolve("Maths", names) is None
+
+
+class TestAliasFile:
+    """Table d'alias complétée par `matieres_alias.json`."""
+
+    def test_directory_and_parent_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            classe = os.path.join(tmp, "3A")
+            os.mkdir(classe)
+            _write_aliases(tmp, {"SVT": "Sciences vie terre", "PC": "Physique"})
+            _write_aliases(classe, {"PC": "Physique-Chimie"})
+
+            registry = SubjectRegistry.for_directory(classe, ["Physique Chimie", "SciencesVieTerre"])
+
+            assert registry.label("SVT") == "SciencesVieTerre"
+            assert registry.label("PC") == "Physique Chimie"
+            assert registry.label("EPS") is None
+            assert aliases_for_directory(None)["eps"] == "educationphysiquesportive"
+
+    def test_reloaded_when_modified_and_invalid_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = _write_aliases(tmp, {"Maths": "Mathematiques"})
+            assert aliases_for_directory(tmp)["maths"] == "mathematiques"
+
+            _write_aliases(tmp, {"Maths": "Mathematiques", "SES": "Economie"})
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            assert aliases_for_directory(tmp)["ses"] == "economie"
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("[1, 2]")
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+            with pytest.raises(SubjectRegistryError):
+                load_aliases(path)
+            assert "ses" not in aliases_for_directory(tmp)
+
+
+class TestMergesUseRegistry:
+    """Fusions multi-périodes avec libellés et alias différents."""
+
+    def test_merge_periods_with_aliases(self):
+        current = [_bulletin("T3", SVT=14.0, Maths=12.0)]
+        other = [_bulletin("T1", **{"Sciences de la vie et de la Terre": 11.0, "Histoire": 9.0})]
+        registry = SubjectRegistry(aliases={"svt": "sciencesvieterre",
+                                            "sciencesdelavieetdelaterre": "sciencesvieterre"})
+
+        merge_periods_into_bulletins(current, other, "T3", registry)
+
+        assert current[0].get_matiere("SVT").get_periode("T1").moyenne == 11.0
+        assert list(current[0].matieres) == ["SVT", "Maths", "Histoire"]
+
+    def test_merge_history_matches_renamed_subject(self):
+        bulletins = [_bulletin("T2", AnglaisLV1=15.0)]
+        previous = [_bulletin("T1", **{"Anglais LV1": 13.0})]
+
+        merge_history_into_bulletins(bulletins, previous, "T2")
+
+        assert list(bulletins[0].matieres) == ["AnglaisLV1"]
+        assert bulletins[0].get_matiere("AnglaisLV1").get_periode("T1").moyenne == 13.0
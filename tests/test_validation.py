@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires du moteur de règles de validation.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+from src.models.bulletin import Eleve, AppreciationMatiere, Bulletin
+from src.services.validation import (
+    DEFAULT_RULES, SEVERITY_ERREUR, SEVERITY_INFO, SCOPE_BULLETIN,
+    ValidationContext, ValidationError, ValidationRule,
+    csv_student_names, report_messages, validate, validate_classes, value_range_rule,
+)
+
+
+def _bulletin(nom, prenom="X", matieres=None, code="T2"):
+    bulletin = Bulletin(eleve=Eleve(nom=nom, prenom=prenom))
+    for matiere, (moyenne, absence, appreciation) in (matieres or {}).items():
+        app = AppreciationMatiere(matiere=matiere)
+        periode = app.ensure_periode(code)
+        periode.moyenne, periode.heures_absence, periode.appreciation = moyenne, absence, appreciation
+        bulletin.add_matiere(app)
+    return bulletin
+
+
+def _class():
+    return [
+        _bulletin("DUPONT", "Alice", {"Maths": (25.0, "1h00", "Bien"), "Anglais": (12.0, None, "")}),
+        _bulletin("MARTIN", "Paul", {"Maths": (11.0, "150h00", "Ok")}),
+        _bulletin("DUPONT", "Alice", {"Maths": (10.0, None, "Ok"), "Anglais": (9.0, None, "Ok")}),
+    ]
+
+
+def _by_rule(report):
+    issues = {}
+    for issue in report['issues']:
+        issues.setdefault(issue['rule'], []).append(issue['message'])
+    return issues
+
+
+class TestDefaultRules:
+    """Règles par défaut, évaluées en un seul parcours."""
+
+    def test_each_rule(self):
+        context = ValidationContext(
+            _class(), period_code="T2",
+            csv_students={"Maths": {"DUPONT Alice", "MARTIN Paul", "NOUVEL Élève"}},
+        )
+        issues = _by_rule(validate(context))
+
+        assert issues['doublons'] == ["Élève en doublon: DUPONT Alice"]
+        assert issues['moyenne_hors_bornes'] == ["DUPONT Alice - Maths T2: Moyenne suspecte (25.0)"]
+        assert issues['absences_excessives'] == [
+            "MARTIN Paul - Maths T2: Heures d'absence élevées (150h00)"
+        ]
+        assert issues['matiere_manquante'] == ["MARTIN Paul: matière(s) absente(s) du bulletin: Anglais"]
+        assert issues['eleve_absent_source'] == ["Élève absent de source.xlsx: NOUVEL Élève (Maths)"]
+        assert issues['appreciation_vide'] == ["DUPONT Alice - Anglais T2: appréciation vide"]
+
+    def test_report_has_severity_count_and_timing(self):
+        report = validate(ValidationContext(_class(), period_code="T2"))
+
+        assert list(report['rules']) == [rule.name for rule in DEFAULT_RULES]
+        assert report['rules']['appreciation_vide']['severity'] == SEVERITY_INFO
+        assert report['rules']['doublons']['count'] == 1
+        assert report['rules']['eleve_absent_source']['count'] == 0
+        assert all(r['duration_s'] >= 0 for r in report['rules'].values())
+        messages = report_messages(report)
+        assert not any("appréciation vide" in m for m in messages)
+        assert any("appréciation vide" in m for m in report_messages(report, SEVERITY_INFO))
+
+    def test_no_period_code_skips_appreciation_rule(self):
+        issues = _by_rule(validate(ValidationContext(_class())))
+        assert 'appreciation_vide' not in issues
+
+    def test_empty_class(self):
+        report = validate(ValidationContext([]))
+        assert report['issues'][0]['severity'] == SEVERITY_ERREUR
+        assert report_messages(report) == ["Aucun bulletin à valider"]
+
+    def test_many_duplicates_are_counted_by_index(self):
+        bulletins = [_bulletin(f"ELEVE{i % 2000}") for i in range(4000)]
+        report = validate(ValidationContext(bulletins), DEFAULT_RULES[:1])
+        assert report['rules']['doublons']['count'] == 2000
+
+    def test_same_context_validated_twice(self):
+        context = ValidationContext(_class(), period_code="T2")
+        first = validate(context)
+        assert validate(context)['issues'] == first['issues']
+        assert first['rules']['doublons']['count'] == 1
+
+    def test_nan_average_is_not_out_of_range(self):
+        bulletins = [_bulletin("DUPONT", "Alice", {"Maths": (float("nan"), None, "Ok")})]
+        assert 'moyenne_hors_bornes' not in _by_rule(validate(ValidationContext(bulletins)))
+
+
+class TestPluggableRules:
+    """Règles déclarées par l'appelant."""
+
+    def test_custom_rules(self):
+        rules = (
+            value_range_rule("moyenne_basse", _moyenne_attr, 10, 30, "sous 10 ({value})"),
+            ValidationRule("sans_matiere", SEVERITY_ERREUR, SCOPE_BULLETIN, _check_sans_matiere),
+        )
+        bulletins = _class() + [_bulletin("VIDE")]
+        issues = _by_rule(validate(ValidationContext(bulletins), rules))
+
+        assert issues == {
+            'moyenne_basse': ["DUPONT Alice - Anglais T2: sous 10 (9.0)"],
+            'sans_matiere': ["VIDE X: aucune matière"],
+        }
+
+    def test_invalid_declaration(self):
+        with pytest.raises(ValidationError):
+            ValidationRule("x", "grave", SCOPE_BULLETIN, _check_sans_matiere)
+        with pytest.raises(ValidationError):
+            ValidationRule("x", SEVERITY_INFO, "eleve", _check_sans_matiere)
+
+    def test_parallel_matches_serial(self):
+        contexts = [
+            ValidationContext(_class(), period_code="T2", label=f"classe{i}") for i in range(3)
+        ]
+        serial = validate_classes(contexts, max_workers=1)
+        parallel = validate_classes(
+            [ValidationContext(_class(), period_code="T2", label=f"classe{i}") for i in range(3)],
+            max_workers=2,
+        )
+        assert [r['label'] for r in parallel] == ["classe0", "classe1", "classe2"]
+        assert [r['issues'] for r in parallel] == [r['issues'] for r in serial]
+
+
+def _moyenne_attr(periode):
+    return periode.moyenne
+
+
+def _check_sans_matiere(context, nom_eleve, bulletin):
+    if not bulletin.matieres:
+        yield f"{nom_eleve}: aucune matière"
+
+
+class TestProcessingIntegration:
+    """Rapport de validation dans le résultat du traitement."""
+
+    def test_student_missing_from_source(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = make_class_directory(tmp, subjects=("Maths", "Anglais"))
+            with open(os.path.join(directory, "Maths.csv"), "a", encoding="utf-8") as f:
+                f.write('"INCONNU Jean";12,00;0h00;0;Appréciation\n')
+            from src.services.main_processor import process_directory_to_json
+
+            result = process_directory_to_json(directory, os.path.join(tmp, "out.json"))
+
+            assert "Élève absent de source.xlsx: INCONNU Jean (Maths)" in result['warnings']
+            assert result['validation']['rules']['eleve_absent_source']['count'] == 1
+            assert csv_student_names([{'Élève': '"A B"'}, {'Élève': None}]) == {"A B"}
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires de la base SQLite d'une année scolaire (`YearStore`).
+"""
+
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from src.models.bulletin import AppreciationMatiere, Bulletin, Eleve, PeriodeData
+from src.services import json_backend
+from src.services.json_generator import save_output_json
+from src.services.main_processor import process_directory
+from src.services.period_history import build_display_bulletins, load_history_bulletins
+from src.services.year_store import YearStore, YearStoreError
+
+CLASS, YEAR = "3A", "2025-2026"
+
+
+def _bulletin(nom, prenom, code, moyenne, matieres=("Maths", "Anglais")):
+    bulletin = Bulletin(Eleve(nom, prenom), {code: f"Bilan {code}"})
+    for name in matieres:
+        bulletin.add_matiere(AppreciationMatiere(name, {
+            code: PeriodeData(heures_absence="2h30", retards=1, moyenne=moyenne,
+                              appreciation=f"{name} {code}"),
+        }))
+    return bulletin
+
+
+def _period(code, moyenne=12.0):
+    return [_bulletin("DUPONT", "Alice", code, moyenne), _bulletin("MARTIN", "Paul", code, moyenne + 1)]
+
+
+class TestYearStore:
+    """Import, export et lecture par tranches."""
+
+    def test_json_round_trip(self, make_class_directory):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = process_directory(make_class_directory(temp_dir))
+            source = os.path.join(temp_dir, "output_T2.json")
+            save_output_json(result['bulletins'], source, metadata=result['metadata'])
+
+            with YearStore(os.path.join(temp_dir, "annee.sqlite")) as store:
+                assert store.import_json(source, CLASS, YEAR) == "T2"
+                exported = os.path.join(temp_dir, "export", "output_T2.json")
+                assert store.export_json(exported, CLASS, YEAR, "T2") == 4
+                assert store.periods(CLASS, YEAR) == ["T2"]
+                assert store.classes() == [(CLASS, YEAR)]
+            assert json_backend.load(exported) == json_backend.load(source)
+
+    def test_slices(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with YearStore(os.path.join(temp_dir, "annee.sqlite")) as store:
+                store.import_bulletins(CLASS, YEAR, "T1", _period("T1"), {"semester": "T1"})
+                store.import_bulletins(CLASS, YEAR, "T2", _period("T2", 14.0), {"semester": "T2"})
+
+                history = store.load_bulletins(CLASS, YEAR, codes=["t1"],
+                                               students=[("MARTIN", "Paul")], subjects=["Anglais"])
+                assert list(history) == ["T1"]
+                [bulletin] = history["T1"]
+                assert list(bulletin.matieres) == ["Anglais"]
+                assert bulletin.matieres["Anglais"].periodes["T1"].moyenne == 13.0
+                assert bulletin.get_appreciation_generale("T1") == "Bilan T1"
+
+                everything = store.load_bulletins(CLASS, YEAR)
+                assert sorted(everything) == ["T1", "T2"]
+                assert [b.to_dict() for b in everything["T2"]] == [b.to_dict() for b in _period("T2", 14.0)]
+                assert store.load_bulletins("4B", YEAR) == {}
+                assert store.metadata(CLASS, YEAR, "T2") == {"semester": "T2"}
+
+    def test_display_matches_linked_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            links = {}
+            with YearStore(os.path.join(temp_dir, "annee.sqlite")) as store:
+                for code in ("T1", "T2"):
+                    links[code] = os.path.join(temp_dir, f"output_{code}.json")
+                    save_output_json(_period(code), links[code], metadata={"semester": code})
+                    store.import_json(links[code], CLASS, YEAR)
+                current = _period("T3")
+                history = store.load_bulletins(CLASS, YEAR, codes=links,
+                                               students=[(b.eleve.nom, b.eleve.prenom) for b in current])
+            from_store = build_display_bulletins(current, history, "T3")
+            from_files = build_display_bulletins(current, load_history_bulletins(links), "T3")
+            assert [b.to_dict() for b in from_store] == [b.to_dict() for b in from_files]
+
+    def test_reimport_replaces_period(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with YearStore(os.path.join(temp_dir, "annee.sqlite")) as store:
+                store.import_bulletins(CLASS, YEAR, "T1", _period("T1"))
+                store.import_bulletins(CLASS, YEAR, "T2", _period("T2"))
+                store.import_bulletins(CLASS, YEAR, "T1", _period("T1")[1:])
+                assert len(store.load_bulletins(CLASS, YEAR, codes=["T1"])["T1"]) == 1
+                assert len(store.load_bulletins(CLASS, YEAR, codes=["T2"])["T2"]) == 2
+                store.delete_period(CLASS, YEAR, "T2")
+                assert store.periods(CLASS, YEAR) == ["T1"]
+
+    def test_homonyms_round_trip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = os.path.join(temp_dir, "output_T1.json")
+            bulletins = _period("T1") + [_bulletin("DUPONT", "Alice", "T1", 8.0, ("Maths",))]
+            save_output_json(bulletins, source, metadata={"semester": "T1"})
+
+            with YearStore(os.path.join(temp_dir, "annee.sqlite")) as store:
+                store.import_json(source, CLASS, YEAR)
+                store.import_bulletins(CLASS, YEAR, "T2", _period("T2")[::-1] + _period("T2")[:1])
+                exported = os.path.join(temp_dir, "export", "output_T1.json")
+                assert store.export_json(exported, CLASS, YEAR, "T1") == 3
+                homonyms = store.load_bulletins(CLASS, YEAR, students=[("DUPONT", "Alice")])
+                assert [len(b.matieres) for b in homonyms["T1"]] == [2, 1]
+                assert len(homonyms["T2"]) == 2
+            assert json_backend.load(exported) == json_backend.load(source)
+
+    def test_export_missing_period(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with YearStore(os.path.join(temp_dir, "annee.sqlite")) as store:
+                with pytest.raises(YearStoreError):
+                    store.export_json(os.path.join(temp_dir, "out.json"), CLASS, YEAR, "T1")
+
+
+class TestYearStoreConcurrency:
+    """Plusieurs postes sur le même fichier."""
+
+    def test_readers_during_write_and_single_writer(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "annee.sqlite")
+            with YearStore(path) as store:
+                store.import_bulletins(CLASS, YEAR, "T1", _period("T1"))
+                assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+            writer = sqlite3.connect(path, isolation_level=None)
+            try:
+                writer.execute("BEGIN IMMEDIATE")
+                writer.execute("DELETE FROM grades")
+                with YearStore(path, timeout=0.1) as other:
+                    # Lecture : l'état validé, sans attendre l'écrivain
+                    assert len(other.load_bulletins(CLASS, YEAR)["T1"][0].matieres) == 2
+                    with pytest.raises(YearStoreError):
+                        other.import_bulletins(CLASS, YEAR, "T2", _period("T2"))
+                writer.execute("ROLLBACK")
+            finally:
+                writer.close()
+
+            with YearStore(path) as store:
+                assert store.periods(CLASS, YEAR) == ["T1"]
+
+    def test_version_1_is_migrated(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "annee.sqlite")
+            with YearStore(path) as store:
+                store.import_bulletins(CLASS, YEAR, "T1", _period("T1"))
+            # Table `students` de la version 1 : élèves identifiés par leur nom
+            conn = sqlite3.connect(path)
+            conn.executescript("""
+                CREATE TABLE students_v1 (
+                    id INTEGER PRIMARY KEY,
+                    class_id INTEGER NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+                    nom TEXT NOT NULL,
+                    prenom TEXT NOT NULL,
+                    UNIQUE (class_id, nom, prenom)
+                );
+                INSERT INTO students_v1 SELECT id, class_id, nom, prenom FROM students;
+                DROP TABLE students;
+                ALTER TABLE students_v1 RENAME TO students;
+                PRAGMA user_version=1;
+            """)
+            conn.close()
+
+            with YearStore(path) as store:
+                store.import_bulletins(CLASS, YEAR, "T2", _period("T2") * 2)
+                history = store.load_bulletins(CLASS, YEAR)
+            assert [b.to_dict() for b in history["T1"]] == [b.to_dict() for b in _period("T1")]
+            assert len(history["T2"]) == 4
+
+    def test_newer_schema_is_rejected(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "annee.sqlite")
+            YearStore(path).close()
+            conn = sqlite3.connect(path)
+            conn.execute("PRAGMA user_version=99")
+            conn.close()
+            with pytest.raises(YearStoreError):
+                YearStore(path)